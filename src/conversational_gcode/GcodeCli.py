@@ -0,0 +1,191 @@
+"""
+Command line entry point to generate GCode from job files.
+
+A job file is the JSON form of GcodeGenerator.to_dict(), with the options and a list of operations, each of which
+names its type. For example:
+    {"options": {"tool": {"tool_diameter": 6}}, "operations": [{"type": "CircularPocket", "diameter": 20, "depth": 2}]}
+
+Functions:
+- load_job()
+  - Load a GcodeGenerator from a job file.
+- write_job()
+  - Generate a job, writing the GCode as each operation is generated.
+- main()
+  - Parse the command line arguments and generate the requested jobs, or serve generation requests.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import TextIO
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.validate.generation_error import GenerationError
+
+
+def load_job(job_file: TextIO) -> GcodeGenerator:
+    """
+    Load a GcodeGenerator from a job file.
+    :param job_file: Open job file, containing the JSON job description.
+    :return: The generator, ready to generate the job.
+    """
+    return GcodeGenerator.from_dict(json.load(job_file))
+
+
+def write_job(generator: GcodeGenerator, output: TextIO) -> int:
+    """
+    Generate a job, writing the GCode as each operation is generated.
+    :param generator: Generator of the job.
+    :param output: Open text file to which to write the GCode.
+    :return: Number of lines written.
+    :raises GenerationError: If the job is invalid or fails to generate.
+    """
+    count = 0
+    for chunk in generator.stream_text():
+        output.write(chunk)
+        count += chunk.count('\n')
+    return count
+
+
+def _run_job(job_path: str, output_path: str) -> tuple[str, int, float, str]:
+    """
+    Generate a single job file to an output file. Runs in a worker process when generating in parallel.
+    :return: Tuple of the job path, number of lines, time taken in seconds and error message, if any.
+    """
+    start = perf_counter()
+    try:
+        with open(job_path, 'r') as job_file:
+            generator = load_job(job_file)
+        with open(output_path, 'w') as output:
+            count = write_job(generator, output)
+    except (GenerationError, OSError, ValueError, TypeError, KeyError) as error:
+        Path(output_path).unlink(missing_ok=True)
+        return job_path, 0, perf_counter() - start, str(error)
+
+    return job_path, count, perf_counter() - start, None
+
+
+def _parse_arguments(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='conversational-gcode',
+        description='Generate GCode from JSON job descriptions.'
+    )
+    parser.add_argument('job', nargs='?', help='Job file to generate, or - to read from standard input.')
+    parser.add_argument('-o', '--output', help='File to which to write the GCode. Defaults to standard output.')
+    parser.add_argument('--jobs-dir', help='Directory of *.json job files to generate, each to a matching *.nc file.')
+    parser.add_argument('--output-dir', help='Directory in which to write the GCode of --jobs-dir. Defaults to the jobs directory.')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='Number of jobs to generate in parallel.')
+    parser.add_argument('--stats', action='store_true', help='Print the line count and time taken to standard error.')
+    parser.add_argument('--serve', action='store_true', help='Serve generation requests over HTTP, using -j worker processes.')
+    parser.add_argument('--host', default='127.0.0.1', help='Host name on which to serve. Defaults to 127.0.0.1.')
+    parser.add_argument('--port', type=int, default=8080, help='TCP port on which to serve. Defaults to 8080.')
+    parser.add_argument('--socket', help='Unix socket on which to serve instead of a TCP port.')
+    parser.add_argument('--cache-size', type=int, default=128, help='Number of generated jobs for the server to cache.')
+    parser.add_argument('--max-seconds', type=float, default=60, help='Time limit for the server to generate each job. Defaults to 60.')
+
+    arguments = parser.parse_args(argv)
+    if [arguments.job is not None, arguments.jobs_dir is not None, arguments.serve].count(True) != 1:
+        parser.error('exactly one of a job file, --jobs-dir or --serve is required')
+    if arguments.workers < 1:
+        parser.error('the number of workers must be 1 or more')
+    return arguments
+
+
+def _main_single(arguments: argparse.Namespace) -> int:
+    start = perf_counter()
+    try:
+        if arguments.job == '-':
+            generator = load_job(sys.stdin)
+        else:
+            with open(arguments.job, 'r') as job_file:
+                generator = load_job(job_file)
+
+        if arguments.output is None:
+            count = write_job(generator, sys.stdout)
+        else:
+            with open(arguments.output, 'w') as output:
+                count = write_job(generator, output)
+    except (GenerationError, OSError, ValueError, TypeError, KeyError) as error:
+        if arguments.output is not None:
+            Path(arguments.output).unlink(missing_ok=True)
+        print(f'{arguments.job}: {error}', file=sys.stderr)
+        return 1
+
+    if arguments.stats:
+        print(f'{arguments.job}: {count} lines in {perf_counter() - start:.3f}s', file=sys.stderr)
+    return 0
+
+
+def _main_batch(arguments: argparse.Namespace) -> int:
+    start = perf_counter()
+    output_dir = Path(arguments.output_dir if arguments.output_dir is not None else arguments.jobs_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = [
+        (str(job_path), str(output_dir / job_path.with_suffix('.nc').name))
+        for job_path in sorted(Path(arguments.jobs_dir).glob('*.json'))
+    ]
+
+    if arguments.workers > 1 and len(tasks) > 1:
+        # Only import the process pool when it is needed, to keep start up fast
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=arguments.workers) as executor:
+            results = list(executor.map(_run_job, *zip(*tasks)))
+    else:
+        results = [_run_job(job_path, output_path) for job_path, output_path in tasks]
+
+    failures = 0
+    for job_path, count, seconds, error in results:
+        if error is not None:
+            failures += 1
+            print(f'{job_path}: {error}', file=sys.stderr)
+        elif arguments.stats:
+            print(f'{job_path}: {count} lines in {seconds:.3f}s', file=sys.stderr)
+
+    if arguments.stats:
+        total_lines = sum(result[1] for result in results)
+        print(
+            f'{len(results)} jobs, {failures} failed, {total_lines} lines in {perf_counter() - start:.3f}s',
+            file=sys.stderr
+        )
+    return 1 if failures > 0 else 0
+
+
+def _main_serve(arguments: argparse.Namespace) -> int:
+    # Only import the server when it is needed, to keep start up fast
+    from conversational_gcode.GcodeServer import GcodeServer
+
+    server = GcodeServer(
+        host=arguments.host,
+        port=arguments.port,
+        unix_socket=arguments.socket,
+        workers=arguments.workers,
+        cache_size=arguments.cache_size,
+        max_seconds=arguments.max_seconds,
+        verbose=arguments.stats
+    )
+    print(f'Serving on {server.address}', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Parse the command line arguments and generate the requested jobs.
+    :param argv: Command line arguments. Defaults to None to use sys.argv.
+    :return: Exit code, which is 0 if every job was generated.
+    """
+    arguments = _parse_arguments(argv)
+    if arguments.serve:
+        return _main_serve(arguments)
+    if arguments.jobs_dir is not None:
+        return _main_batch(arguments)
+    return _main_single(arguments)
@@ -4,17 +4,38 @@ Generates GCode from configures objects.
 Classes:
 - _CommandPrinter
   - Debugging tool to print commands as they are added to the list.
+- _CommandBudget
+  - Command list which abandons generation once a command count or time limit is exceeded, or it is cancelled.
 - GcodeGenerator
   - Iterates through configured operations and collates the GCode commands.
 """
 
-import json
+from time import monotonic
+from typing import AsyncIterator, Iterator, TYPE_CHECKING
 
 from conversational_gcode.operations.Operation import Operation
 from conversational_gcode.options.OutputOptions import OutputOptions
 from conversational_gcode.options.Options import Options
-from conversational_gcode.validate.validation_result import ValidationResult
-from conversational_gcode.gcodes.GCodes import GCode, M2, M3, M5, G0
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+from conversational_gcode.validate.generation_error import GenerationError
+from conversational_gcode.validate.collision_validation import validate_collisions
+from conversational_gcode.gcodes.GCodes import GCode, CommentBlock, M2, M3, M5, G0
+from conversational_gcode.gcodes.StreamDigest import StreamDigest
+from conversational_gcode.estimate.Estimate import Estimate, distance
+from conversational_gcode.estimate.MachiningStatistics import MachiningStatistics
+from conversational_gcode.feeds.FeedsAndSpeeds import FeedsAndSpeeds, calculate_feeds_and_speeds
+from conversational_gcode.feeds.Material import Material
+from conversational_gcode.feeds.parameter_search import ParameterSearch, search_parameters
+from conversational_gcode.geometry.Footprint import Footprint
+from conversational_gcode.stock.Heightmap import Heightmap
+from conversational_gcode.stock.RetractPlanner import RetractPlanner
+from conversational_gcode.stock.StockSimulation import VerificationReport, verify_commands
+from conversational_gcode.postprocess.feed_optimisation import optimise_feed_rates
+from conversational_gcode.postprocess.quantisation import Quantiser
+from conversational_gcode.serialise.Serialisation import operation_to_dict, operation_from_dict
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 
 class _CommandPrinter:
@@ -43,6 +64,47 @@ class _CommandPrinter:
         return self.commands.__iter__()
 
 
+class _CommandBudget(list):
+    """
+    Command list which abandons generation once a command count or time limit is exceeded, or it is cancelled.
+    """
+
+    def __init__(self, max_commands: int = None, max_seconds: float = None):
+        """
+        Initialise the budget.
+        :param max_commands: Maximum number of commands to generate. Defaults to None for no limit.
+        :param max_seconds: Maximum time in seconds to spend generating. Defaults to None for no limit.
+        """
+        super().__init__()
+        self._max_commands = max_commands
+        self._deadline = monotonic() + max_seconds if max_seconds is not None else None
+        self._max_seconds = max_seconds
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Abandon generation when the next command is added. Safe to call from a different thread to the generation.
+        """
+        self._cancelled = True
+
+    def _check(self, count: int) -> None:
+        if self._cancelled:
+            raise GenerationError('Generation was cancelled')
+        if self._max_commands is not None and len(self) + count > self._max_commands:
+            raise GenerationError(f'Generation exceeded the budget of {self._max_commands} commands')
+        if self._deadline is not None and monotonic() > self._deadline:
+            raise GenerationError(f'Generation exceeded the budget of {self._max_seconds} seconds')
+
+    def append(self, command: GCode) -> None:
+        self._check(1)
+        super().append(command)
+
+    def extend(self, commands) -> None:
+        commands = list(commands)
+        self._check(len(commands))
+        super().extend(commands)
+
+
 class GcodeGenerator:
     """
     Iterates through configured operations and collates the GCode commands.
@@ -56,6 +118,8 @@ class GcodeGenerator:
         self._options = options
         self._operations = []
 
+    options = property(fget=lambda self: self._options)
+
     def add_operation(self, operation: Operation) -> None:
         """
         Add an operation to the list.
@@ -64,63 +128,492 @@ class GcodeGenerator:
         """
         self._operations.append(operation)
 
-    def _validate(self) -> list[ValidationResult]:
+    def validate(self, fail_fast: bool = False, collisions: bool = False, position: list[float] = None) -> list[ValidationResult]:
         """
         Validate the operations and options.
+        :param fail_fast: True to stop at the first option or operation which is invalid, rather than collecting the
+        failures of all of them. Defaults to False.
+        :param collisions: True to also check the valid job for operations which overlap each other and rapid moves
+        through material. Defaults to False.
+        :param position: Starting position of the job, for checking collisions. Defaults to None to start at [0, 0, 0]
         :return: List of ValidationResults.
         Contains only 1 item if every option and operation is valid.
         """
-        results = []
-        results.extend(self._options.validate())
-        for op in self._operations:
-            results.extend(op.validate(self._options))
+        results = [result for result in self._options.validate() if not result.success]
+        for operation in self._operations:
+            if fail_fast and len(results) > 0:
+                break
+            results.extend(result for result in operation.validate(self._options) if not result.success)
 
-        results = list(filter(lambda result: not result.success, results))
+        if collisions and len(results) == 0:
+            results.extend(
+                result for result in validate_collisions(self._operations, self._options, position) if not result.success
+            )
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            return [SUCCESS]
 
-        return results
+        return results[:1] if fail_fast else results
 
-    def generate(self, position: list[float] = None) -> list[GCode]:
+    def generate(self,
+                 position: list[float] = None,
+                 max_commands: int = None,
+                 max_seconds: float = None,
+                 fail_fast: bool = False,
+                 collisions: bool = False,
+                 stock: Heightmap = None) -> list[GCode]:
         """
         Generate the GCode for all of the operations.
         :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
-        :return: List of generated GCode commands
+        :param max_commands: Maximum number of commands to generate before abandoning generation.
+        Defaults to None for no limit.
+        :param max_seconds: Maximum time in seconds to spend generating before abandoning generation.
+        Defaults to None for no limit.
+        :param fail_fast: True to return only the first validation failure. Defaults to False to return them all.
+        :param collisions: True to refuse to generate jobs whose operations overlap or whose rapid moves collide with
+        material. Defaults to False.
+        :param stock: Model of the stock to be cut, to be lowered as each operation is generated. Operations start at
+        the highest remaining stock rather than their start depth, and are skipped if there is none.
+        Defaults to None to assume uncut stock for every operation.
+        :return: List of generated GCode commands, or the failure messages if the job is invalid or generation was
+        abandoned.
         """
-        results = self._validate()
+        results = self.validate(fail_fast, collisions, position)
 
         if len(results) > 1 or not results[0].success:
             return [result.message for result in results]
 
         if position is None:
             position = [0, 0, 0]
+        quantiser = self._quantiser(position)
         # commands = _CommandPrinter(self._options.output)
+        if max_commands is None and max_seconds is None:
+            commands = []
+        else:
+            commands = _CommandBudget(max_commands, max_seconds)
+
+        try:
+            for _ in self._generate_sections(position, commands, stock):
+                pass
+        except GenerationError as error:
+            return [error.result.message]
+
+        if quantiser is not None:
+            commands[:] = [rounded for command in commands if (rounded := quantiser.quantise(command)) is not None]
+        return commands
+
+    def stream(self, position: list[float] = None) -> Iterator[GCode]:
+        """
+        Generate the GCode for all of the operations, yielding each operation's commands as soon as it is generated,
+        so that they can be written out without holding the whole job in memory.
+        :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
+        :return: Iterator of generated GCode commands.
+        :raises GenerationError: If the job is invalid or fails to generate.
+        """
+        position = self._prepare_stream(position)
+        quantiser = self._quantiser(position)
         commands = []
 
-        for line in json.dumps(json.loads(self._options.to_json()), indent=2).split('\n'):
-            commands.append(GCode(line))
+        for _ in self._generate_sections(position, commands):
+            if quantiser is None:
+                yield from commands
+            else:
+                for command in commands:
+                    if (rounded := quantiser.quantise(command)) is not None:
+                        yield rounded
+            commands.clear()
+
+    def stream_text(self, position: list[float] = None, max_seconds: float = None) -> Iterator[str]:
+        """
+        Generate the GCode for all of the operations, yielding the formatted lines of each operation as soon as it is
+        generated.
+        :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
+        :param max_seconds: Maximum time in seconds to spend generating before abandoning generation.
+        Defaults to None for no limit.
+        :return: Iterator of chunks of GCode text, each ending in a newline.
+        :raises GenerationError: If the job is invalid, fails to generate or exceeds the time limit.
+        """
+        position = self._prepare_stream(position)
+        commands = [] if max_seconds is None else _CommandBudget(max_seconds=max_seconds)
+        yield from self._format_sections(position, commands)
+
+    def digest(self, position: list[float] = None, ignore_comments: bool = False) -> str:
+        """
+        Generate the GCode for all of the operations and digest it a section at a time, without holding the whole job in
+        memory, to identify the program which the job would write.
+        :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
+        :param ignore_comments: Whether to leave comments out of the digest. Defaults to False.
+        :return: Hexadecimal digest, equal to that of the text returned by stream_text().
+        :raises GenerationError: If the job is invalid or fails to generate.
+        """
+        stream_digest = StreamDigest(self._options, ignore_comments)
+        for command in self.stream(position):
+            stream_digest.update(command)
+        return stream_digest.hexdigest()
+
+    async def generate_async(self,
+                             position: list[float] = None,
+                             executor: 'Executor' = None,
+                             max_seconds: float = None) -> AsyncIterator[str]:
+        """
+        Generate the GCode for all of the operations without blocking the event loop, yielding the formatted lines of
+        each operation as soon as it is generated.
+
+        Each operation is generated and formatted in the executor. If the consumer stops iterating, for example because
+        a client disconnected and its task was cancelled, the operation being generated is abandoned.
+        :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
+        :param executor: Thread pool in which to generate. Defaults to None for the event loop's default executor.
+        :param max_seconds: Maximum time in seconds to spend generating before abandoning generation.
+        Defaults to None for no limit.
+        :return: Asynchronous iterator of chunks of GCode text, each ending in a newline.
+        :raises GenerationError: If the job is invalid, fails to generate or exceeds the time limit.
+        """
+        # Only import asyncio when it is needed, to keep start up fast
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        position = self._prepare_stream(position)
+        commands = _CommandBudget(max_seconds=max_seconds)
+        sections = self._format_sections(position, commands)
+
+        try:
+            while (chunk := await loop.run_in_executor(executor, next, sections, None)) is not None:
+                yield chunk
+        finally:
+            commands.cancel()
+
+    def _prepare_stream(self, position: list[float]) -> list[float]:
+        """
+        Validate the job before streaming it.
+        :param position: Starting position of the job, or None to start at [0, 0, 0]
+        :return: Starting position of the job.
+        :raises GenerationError: If the job is invalid, with a line for each failure message.
+        """
+        results = self.validate()
+
+        if len(results) > 1 or not results[0].success:
+            raise GenerationError('\n'.join(result.message for result in results))
+
+        return [0, 0, 0] if position is None else position
+
+    def _format_sections(self, position: list[float], commands: list[GCode]) -> Iterator[str]:
+        """
+        Generate the GCode for all of the operations, formatting the commands of each section as it is generated.
+        :param position: Starting position of the job. To be mutated to keep up to date.
+        :param commands: Empty list to which to add the commands of each section.
+        :return: Iterator of chunks of GCode text, each ending in a newline.
+        """
+        output_options = self._options.output
+        quantiser = self._quantiser(position)
+        for _ in self._generate_sections(position, commands):
+            if quantiser is not None:
+                commands[:] = [rounded for command in commands if (rounded := quantiser.quantise(command)) is not None]
+            text = ''.join(f'{command.format(output_options)}\n' for command in commands)
+            commands.clear()
+            yield text
+
+    def estimate(self, position: list[float] = None) -> Estimate | list[str]:
+        """
+        Estimate the cost of the GCode for all of the operations without generating it.
+        :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
+        :return: Estimated command count, toolpath length and cycle time, or the failure messages if invalid.
+        """
+        results = self.validate()
+
+        if len(results) > 1 or not results[0].success:
+            return [result.message for result in results]
+
+        if position is None:
+            position = [0, 0, 0]
+        position = [*position]
+        options = self._options.snapshot()
+        job_options = options.job
+
+        planner = RetractPlanner(options, self._footprints()) if job_options.local_retract else None
+
+        estimate = Estimate(start=[*position])
+        # Header, clearing the tool and starting the spindle
+        estimate.add_commands(6)
+        estimate.add_rapid(abs(job_options.clearance_height - position[2]), job_options.rapid_rate)
+        position[2] = job_options.clearance_height
+
+        for index, operation in enumerate(self._operations):
+            operation_estimate = operation.estimate(options)
+            if planner is not None and index > 0:
+                # Clearing the tool after the previous operation
+                top = max(footprint.top for footprint in operation.footprints(options))
+                retract_height = planner.safe_height(position, operation_estimate.start, top)
+                estimate.add_commands(2)
+                estimate.add_rapid(abs(retract_height - position[2]), job_options.rapid_rate)
+                position[2] = retract_height
+
+            estimate.add_rapid(distance(position, [*operation_estimate.start[0:2], position[2]]), job_options.rapid_rate)
+            estimate += operation_estimate
+            # Operations are estimated as moving down from the clearance height
+            estimate.add_rapid(position[2] - job_options.clearance_height, job_options.rapid_rate)
+            position = [*operation_estimate.end]
+
+            if planner is None or index == len(self._operations) - 1:
+                # Clearing the tool after the operation
+                estimate.add_commands(2)
+                estimate.add_rapid(abs(job_options.clearance_height - position[2]), job_options.rapid_rate)
+                position[2] = job_options.clearance_height
+
+        # Stopping the spindle and ending the program
+        estimate.add_commands(2)
+        estimate.end = position
+        return estimate
+
+    def statistics(self, position: list[float] = None) -> list[MachiningStatistics] | list[str]:
+        """
+        Generate the GCode for all of the operations, and measure how heavily each operation loads the tool.
+        :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
+        :return: Machining statistics of each operation, in order, or the failure messages if the job is invalid.
+        """
+        results = self.validate()
+
+        if len(results) > 1 or not results[0].success:
+            return [result.message for result in results]
+
+        position = [0, 0, 0] if position is None else [*position]
+        statistics = []
+        try:
+            for _ in self._generate_sections(position, [], statistics=statistics):
+                pass
+        except GenerationError as error:
+            return [error.result.message]
+        return statistics
+
+    def _generate_sections(self,
+                           position: list[float],
+                           commands: list[GCode],
+                           stock: Heightmap = None,
+                           statistics: list[MachiningStatistics] = None) -> Iterator[None]:
+        """
+        Generate the GCode for all of the operations into a list of commands.
+        Yields after the program start, after each operation and after the program end, so that the commands so far may
+        be written out.
+        :param position: Starting position of the job. To be mutated to keep up to date.
+        :param commands: List of GCode commands to which to add.
+        :param stock: Model of the stock, to be lowered as each operation is generated. Defaults to None.
+        :param statistics: List to which to add the machining statistics of each operation as it is generated.
+        Defaults to None to not measure them.
+        :return: Iterator to advance through the sections.
+        """
+        # Generated from a snapshot, so that the options cannot change part way through, and derived values are found once
+        options = self._options.snapshot()
+        commands.append(CommentBlock(options.header))
 
         commands.append(GCode())
 
-        position[2] = self._options.job.clearance_height
+        position[2] = options.job.clearance_height
         commands.append(G0(z=position[2], comment='Clear tool'))
 
         commands.append(GCode())
-        commands.append(M3(s=self._options.tool.spindle_speed, comment='Start spindle'))
+        commands.append(M3(s=options.tool.spindle_speed, comment='Start spindle'))
         commands.append(GCode())
+        yield
 
+        planner = RetractPlanner(options, self._footprints(), stock) if options.job.local_retract else None
+        retract_pending = False
         for operation in self._operations:
-            operation.generate(position, commands, self._options)
+            footprints = []
+            if stock is not None:
+                footprints = operation.footprints(options)
+                trimmed_operation = self._trim_to_stock(operation, footprints, stock)
+
+                if trimmed_operation is None:
+                    for footprint in footprints:
+                        stock.cut(footprint)
+                    commands.append(GCode(f'Skipped {operation!r}, which would only cut air'))
+                    commands.append(GCode())
+                    yield
+                    continue
+                operation = trimmed_operation
+
+            if retract_pending:
+                # Clearing the tool after the previous operation, before the stock is cut by this one
+                top = max(footprint.top for footprint in operation.footprints(options))
+                position[2] = planner.safe_height(position, operation.start_point(options), top)
+                commands.append(G0(z=position[2], comment='Clear tool'))
+                commands.append(GCode())
+
+            for footprint in footprints:
+                stock.cut(footprint)
+
+            try:
+                if statistics is None:
+                    operation.generate(position, commands, options)
+                else:
+                    statistics.append(operation.generate_with_statistics(position, commands, options))
+            except GenerationError as error:
+                raise GenerationError(f'{operation!r} failed to generate: {error}') from error
+
+            if planner is None:
+                position[2] = options.job.clearance_height
+                commands.append(G0(z=position[2], comment='Clear tool'))
+                commands.append(GCode())
+            else:
+                retract_pending = True
+            yield
 
-            position[2] = self._options.job.clearance_height
+        if retract_pending:
+            position[2] = options.job.clearance_height
             commands.append(G0(z=position[2], comment='Clear tool'))
             commands.append(GCode())
 
         commands.append(M5(comment='Stop spindle'))
         commands.append(M2(comment='End program'))
+        yield
 
-        return commands
+    def create_stock(self, cell_size: float = 1, top: float = 0) -> Heightmap:
+        """
+        Create a model of uncut stock covering every operation, for generating with stock.
+        :param cell_size: Width and length of each cell of the model. Defaults to 1mm.
+        :param top: Z-axis height of the top of the stock. Defaults to 0mm.
+        :return: The stock model.
+        """
+        return Heightmap.around(self._footprints(), cell_size, top)
+
+    def verify(self,
+               commands: list[GCode],
+               position: list[float] = None,
+               cell_size: float = 1,
+               top: float = 0) -> VerificationReport:
+        """
+        Simulate generated commands cutting uncut stock, and check that they cut the operations to their depths.
+        :param commands: Commands returned by generate().
+        :param position: Starting position passed to generate(). Defaults to None to start at [0, 0, 0]
+        :param cell_size: Width and length of each cell of the simulated stock. Smaller cells are more accurate but
+        slower, and a job of around a hundred thousand lines takes ten seconds or more at 1mm cells. Defaults to 1mm.
+        :param top: Z-axis height of the top of the stock. Defaults to 0mm.
+        :return: Report of the engagement of every command and the cells cut too deep or left too high.
+        """
+        return verify_commands(commands, self._options, self._footprints(), cell_size, top, position)
+
+    def optimise_feed_rates(self,
+                            commands: list[GCode],
+                            position: list[float] = None,
+                            cell_size: float = 1,
+                            top: float = 0) -> list[GCode]:
+        """
+        Scale the feed rate of each generated cut by the width of material it engages, between the minimum and maximum
+        feed rates of the tool options.
+        :param commands: Commands returned by generate().
+        :param position: Starting position passed to generate(). Defaults to None to start at [0, 0, 0]
+        :param cell_size: Width and length of each cell of the simulated stock. Defaults to 1mm.
+        :param top: Z-axis height of the top of the stock. Defaults to 0mm.
+        :return: New list of commands with optimised feed rates.
+        """
+        return optimise_feed_rates(commands, self._options, self._footprints(), cell_size, top, position)
+
+    def fill_feeds_and_speeds(self,
+                              material: Material,
+                              max_spindle_speed: float = 24000,
+                              max_feed_rate: float = None,
+                              max_power: float = None) -> FeedsAndSpeeds:
+        """
+        Set the spindle speed, feed rate, stepover and step down of the tool options to remove a material fastest.
+        The feeds and speeds are found for the diameter and flute count of the tool options.
+        :param material: Material to cut, such as one loaded by load_materials().
+        :param max_spindle_speed: Fastest speed of the spindle, in RPM. Defaults to 24000RPM.
+        :param max_feed_rate: Fastest rate at which the machine may feed the tool, in mm per minute.
+        Defaults to None to limit it to the rapid rate.
+        :param max_power: Power of the spindle, in W. Defaults to None for no limit.
+        :return: The feeds and speeds which were applied.
+        """
+        tool_options = self._options.tool
+        feeds_and_speeds = calculate_feeds_and_speeds(
+            material,
+            tool_options.tool_diameter,
+            tool_options.tool_flutes,
+            max_spindle_speed,
+            max_feed_rate if max_feed_rate is not None else self._options.job.rapid_rate,
+            max_power
+        )
+        feeds_and_speeds.apply(tool_options)
+        return feeds_and_speeds
+
+    def search_parameters(self,
+                          material: Material = None,
+                          max_power: float = None,
+                          max_engagement: float = 0.5,
+                          max_stepdown: float = None,
+                          workers: int = 1) -> ParameterSearch | list[str]:
+        """
+        Find the stepover, step down and helical stepover which minimise the estimated cycle time of all of the
+        operations, without changing the options.
+        :param material: Material to cut, which sets the chip load and power limits. Defaults to None for no limits.
+        :param max_power: Power of the spindle, in W. Defaults to None for no limit.
+        :param max_engagement: Heaviest stepover, in tool diameters. Defaults to half of the tool diameter.
+        :param max_stepdown: Deepest step down, in mm. Defaults to None for the material's deepest step down, or one
+        tool diameter if no material is given.
+        :param workers: Number of processes across which to search. Defaults to 1 to search in this process.
+        :return: The best parameters found, which may be applied to the tool options, or the failure messages if the
+        job is invalid.
+        """
+        results = self.validate()
+
+        if len(results) > 1 or not results[0].success:
+            return [result.message for result in results]
+
+        return search_parameters(
+            self._operations, self._options, material, max_power, max_engagement, max_stepdown, workers=workers
+        )
+
+    def _quantiser(self, position: list[float]) -> Quantiser | None:
+        """
+        Create a quantiser to round the generated commands, if the output options ask for it.
+        :param position: Starting position of the job.
+        :return: The quantiser, or None to leave positions as generated.
+        """
+        return Quantiser(self._options, position) if self._options.output.quantise_positions else None
+
+    def _footprints(self) -> list[Footprint]:
+        options = self._options.snapshot()
+        return [footprint for operation in self._operations for footprint in operation.footprints(options)]
+
+    def _trim_to_stock(self, operation: Operation, footprints: list[Footprint], stock: Heightmap) -> Operation | None:
+        """
+        Trim an operation to start at the highest stock remaining in its footprints.
+        :param operation: Operation to trim.
+        :param footprints: Footprints of the operation.
+        :param stock: Model of the remaining stock.
+        :return: The operation, a trimmed copy of it, or None if there is no stock left to cut.
+        """
+        tolerance = self._options.output.tolerance
+        heights = [height for height in map(stock.highest, footprints) if height is not None]
+        if len(heights) == 0:
+            return operation
+
+        highest = max(heights)
+        if highest <= min(footprint.bottom for footprint in footprints) + tolerance:
+            return None
+        if highest < max(footprint.top for footprint in footprints) - tolerance:
+            return operation.trimmed(highest)
+        return operation
+
+    def to_dict(self) -> dict:
+        """
+        Convert the job to a dictionary, for storing or sending between processes.
+        :return: Dictionary of the options and operations.
+        """
+        return {
+            'options': self._options.to_dict(),
+            'operations': [operation_to_dict(operation) for operation in self._operations]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GcodeGenerator':
+        """
+        Create a job from the dictionary written by to_dict().
+        :param data: Dictionary of the options and operations.
+        :return: The generator, ready to generate the job.
+        """
+        generator = cls(Options.from_dict(data.get('options', {})))
+        for operation_data in data.get('operations', []):
+            generator.add_operation(operation_from_dict(operation_data))
+        return generator
 
     def __repr__(self) -> str:
         return (
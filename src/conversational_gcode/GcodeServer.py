@@ -0,0 +1,426 @@
+"""
+Long-running HTTP service to generate GCode, avoiding the start up cost of a new process for every job.
+
+Jobs are generated by a pool of worker processes which have already imported every operation. Each worker streams the
+GCode of a job back through a queue as it is generated, so the response starts before the whole job is generated. The
+queue only holds a few chunks, so a worker waits for a slow client, and stops if the client disconnects or the job runs
+out of time.
+Generated GCode is cached by the digest of its job, so repeated jobs are served without generating them again.
+
+Endpoints:
+- POST /generate
+  - Generate the JSON job in the request body, in the format of GcodeGenerator.to_dict(). The GCode is streamed with
+    chunked transfer encoding, or a JSON list of messages is returned with status 400 if the job is invalid, or 500 if
+    it fails unexpectedly. If generation fails after the GCode has started, the response is cut off before its final
+    chunk.
+- GET /metrics
+  - JSON counts of requests and cache hits, and latency statistics of recent requests.
+
+Classes:
+- JobCache
+  - Least recently used cache of generated GCode, keyed by job digest.
+- LatencyMetrics
+  - Request counts and latency statistics of recent requests.
+- GcodeServer
+  - HTTP server, on a TCP port or a Unix socket, which generates GCode in a pool of warm worker processes.
+"""
+
+import json
+import socket
+from os import unlink
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Manager
+from queue import Empty, Full, Queue
+from socketserver import ThreadingMixIn, UnixStreamServer
+from threading import Event, Lock
+from time import monotonic, perf_counter
+from typing import Iterator
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.serialise.Serialisation import digest, import_operations
+from conversational_gcode.validate.generation_error import GenerationError
+
+_CHUNK_SIZE = 64 * 1024
+
+# Number of chunks a worker may generate ahead of the client
+_QUEUED_CHUNKS = 4
+
+# Time to wait for a worker to stream more GCode before checking whether it has stopped
+_POLL_SECONDS = 0.5
+
+# Kinds of message streamed back by a worker
+_GCODE = 'gcode'
+_END = 'end'
+_INVALID = 'invalid'
+_FAILED = 'failed'
+
+
+def _stream_job(job: dict, queue: Queue, cancelled: Event, max_seconds: float = None) -> None:
+    """
+    Generate a job in a worker process, streaming the GCode back through a queue.
+
+    The queue receives (_GCODE, text) for each chunk of GCode of up to about _CHUNK_SIZE characters, then (_END, None).
+    If the job is invalid or fails, it instead receives (_INVALID, messages) or (_FAILED, messages) and nothing more.
+    :param job: Dictionary of the job, as written by GcodeGenerator.to_dict().
+    :param queue: Bounded queue to which to stream the GCode.
+    :param cancelled: Event set when nothing is reading the queue any more.
+    :param max_seconds: Maximum time in seconds to spend on the job. Defaults to None for no limit.
+    :raises GenerationError: If the job is cancelled, or runs out of time while waiting for the queue.
+    """
+    deadline = monotonic() + max_seconds if max_seconds is not None else None
+
+    def put(kind: str, value: str | list[str] | None) -> None:
+        # Wait for the queue to have room, so that a slow client does not make the whole job build up in the queue
+        while not cancelled.is_set():
+            try:
+                queue.put((kind, value), timeout=_POLL_SECONDS)
+                return
+            except Full:
+                if deadline is not None and monotonic() > deadline:
+                    raise GenerationError(f'Generation exceeded the budget of {max_seconds} seconds')
+        raise GenerationError('Generation was cancelled')
+
+    try:
+        generator = GcodeGenerator.from_dict(job)
+        results = generator.validate()
+    except (ValueError, TypeError, KeyError, AttributeError) as error:
+        put(_INVALID, [f'Invalid job: {error}'])
+        return
+
+    if len(results) > 1 or not results[0].success:
+        put(_INVALID, [result.message for result in results])
+        return
+
+    try:
+        # Sections are gathered into larger chunks, so that small operations do not each cost a message
+        chunks = []
+        size = 0
+        for text in generator.stream_text(max_seconds=max_seconds):
+            chunks.append(text)
+            size += len(text)
+            if size >= _CHUNK_SIZE:
+                put(_GCODE, ''.join(chunks))
+                chunks = []
+                size = 0
+        if size > 0:
+            put(_GCODE, ''.join(chunks))
+    except GenerationError as error:
+        put(_INVALID, str(error).split('\n'))
+        return
+    except Exception as error:
+        put(_FAILED, [f'Failed to generate job: {error!r}'])
+        return
+
+    put(_END, None)
+
+
+class JobCache:
+    """
+    Least recently used cache of generated GCode, keyed by job digest. Safe to share between request threads.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialise the cache.
+        :param max_entries: Maximum number of jobs to keep. Defaults to 128.
+        """
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> str | None:
+        """
+        Get the GCode of a job, marking it as recently used.
+        :param key: Digest of the job.
+        :return: The GCode text, or None if the job is not cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, gcode: str) -> None:
+        """
+        Cache the GCode of a job, removing the least recently used job if the cache is full.
+        :param key: Digest of the job.
+        :param gcode: The GCode text.
+        """
+        if self._max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = gcode
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LatencyMetrics:
+    """
+    Request counts and latency statistics of recent requests. Safe to share between request threads.
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialise the metrics.
+        :param window: Number of recent requests from which to calculate latency statistics. Defaults to 1000.
+        """
+        self._latencies = deque(maxlen=window)
+        self._counts = {'requests': 0, 'failures': 0, 'cache_hits': 0, 'cache_misses': 0}
+        self._lock = Lock()
+
+    def record(self, seconds: float, success: bool, cache_hit: bool) -> None:
+        """
+        Record a generation request.
+        :param seconds: Time taken to serve the request.
+        :param success: True if the job was generated.
+        :param cache_hit: True if the GCode was served from the cache.
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+            self._counts['requests'] += 1
+            if not success:
+                self._counts['failures'] += 1
+            elif cache_hit:
+                self._counts['cache_hits'] += 1
+            else:
+                self._counts['cache_misses'] += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+
+        if len(latencies) == 0:
+            return {**counts, 'latency': None}
+
+        return {
+            **counts,
+            'latency': {
+                'count': len(latencies),
+                'mean': sum(latencies) / len(latencies),
+                'p50': latencies[(len(latencies) - 1) // 2],
+                'p95': latencies[int(0.95 * (len(latencies) - 1))],
+                'max': latencies[-1]
+            }
+        }
+
+
+class _GcodeRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self) -> str:
+        # Clients of a Unix socket have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args) -> None:
+        if self.server.gcode_server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        if self.path != '/metrics':
+            self._send_json(404, ['Not found'])
+            return
+
+        gcode_server = self.server.gcode_server
+        self._send_json(200, {**gcode_server.metrics.to_dict(), 'cached_jobs': len(gcode_server.cache)})
+
+    def do_POST(self) -> None:
+        if self.path != '/generate':
+            self._send_json(404, ['Not found'])
+            return
+
+        start = perf_counter()
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError as error:
+            self._send_json(400, [f'Invalid JSON: {error}'])
+            self.server.gcode_server.metrics.record(perf_counter() - start, False, False)
+            return
+
+        status, result, cache_hit = self.server.gcode_server.generate(job)
+        seconds = perf_counter() - start
+
+        if status != 200:
+            self._send_json(status, result)
+            self.server.gcode_server.metrics.record(seconds, False, cache_hit)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('X-Generation-Seconds', f'{seconds:.6f}')
+        self.send_header('X-Cache', 'hit' if cache_hit else 'miss')
+        self.end_headers()
+
+        try:
+            for text in result:
+                body = text.encode('utf-8')
+                for offset in range(0, len(body), _CHUNK_SIZE):
+                    chunk = body[offset:offset + _CHUNK_SIZE]
+                    self.wfile.write(f'{len(chunk):X}\r\n'.encode('ascii') + chunk + b'\r\n')
+        except GenerationError as error:
+            # The status has already been sent, so the response is cut off to show the client that it is incomplete
+            self.log_error('Generation failed part way through: %s', error)
+            self.close_connection = True
+            self.server.gcode_server.metrics.record(perf_counter() - start, False, cache_hit)
+            return
+        except OSError:
+            # The client disconnected, so the worker is cancelled and the rest of the GCode is not cached
+            result.close()
+            self.close_connection = True
+            self.server.gcode_server.metrics.record(perf_counter() - start, False, cache_hit)
+            return
+
+        self.wfile.write(b'0\r\n\r\n')
+        self.server.gcode_server.metrics.record(perf_counter() - start, True, cache_hit)
+
+    def _send_json(self, status: int, data) -> None:
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class GcodeServer:
+    """
+    HTTP server, on a TCP port or a Unix socket, which generates GCode in a pool of warm worker processes.
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 8080,
+                 unix_socket: str = None,
+                 workers: int = 1,
+                 cache_size: int = 128,
+                 max_seconds: float = 60,
+                 verbose: bool = False):
+        """
+        Initialise the server and start its worker processes.
+        :param host: Host name on which to listen. Defaults to the local host only.
+        :param port: TCP port on which to listen. Defaults to 8080. Use 0 to choose any free port.
+        :param unix_socket: Path of a Unix socket on which to listen instead of a TCP port. Defaults to None.
+        :param workers: Number of worker processes. Defaults to 1.
+        :param cache_size: Maximum number of generated jobs to cache. Defaults to 128.
+        :param max_seconds: Maximum time in seconds for a worker to spend on a job, including waiting for a slow client.
+        Defaults to 60. Use None for no limit.
+        :param verbose: True to log every request to standard error. Defaults to False.
+        """
+        self.cache = JobCache(cache_size)
+        self.metrics = LatencyMetrics()
+        self.verbose = verbose
+        self._max_seconds = max_seconds
+
+        # Queues shared with the worker processes are served by a manager process
+        self._manager = Manager()
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=import_operations)
+        # Start every worker now rather than on the first requests
+        for future in [self._executor.submit(import_operations) for _ in range(workers)]:
+            future.result()
+
+        if unix_socket is not None:
+            self._http_server = _ThreadingUnixHTTPServer(unix_socket, _GcodeRequestHandler)
+        else:
+            self._http_server = ThreadingHTTPServer((host, port), _GcodeRequestHandler)
+        self._http_server.gcode_server = self
+
+    address = property(fget=lambda self: self._http_server.server_address)
+
+    def generate(self, job: dict) -> tuple[int, Iterator[str] | list[str], bool]:
+        """
+        Generate a job in a worker process, or fetch it from the cache.
+
+        Waits for the worker to stream the first chunk of GCode, so that an invalid job is found before responding.
+        The rest of the GCode is streamed as it is generated, and cached once it is complete.
+        :param job: Dictionary of the job, as written by GcodeGenerator.to_dict().
+        :return: Tuple of the HTTP status, a generator of chunks of GCode text or a list of failure messages,
+        and whether the GCode was cached. The generator raises GenerationError if generation fails part way through,
+        and closing it before the end cancels generation.
+        """
+        try:
+            key = digest(job)
+        except (TypeError, ValueError) as error:
+            return 400, [f'Invalid job: {error}'], False
+
+        gcode = self.cache.get(key)
+        if gcode is not None:
+            return 200, (text for text in [gcode]), True
+
+        queue = self._manager.Queue(maxsize=_QUEUED_CHUNKS)
+        cancelled = self._manager.Event()
+        future = self._executor.submit(_stream_job, job, queue, cancelled, self._max_seconds)
+        kind, value = self._receive(queue, future)
+        if kind == _INVALID:
+            return 400, value, False
+        if kind == _FAILED:
+            return 500, value, False
+        return 200, self._stream(key, kind, value, queue, cancelled, future), False
+
+    def _stream(self, key: str, kind: str, value: str | None, queue: Queue, cancelled: Event, future: Future) -> Iterator[str]:
+        chunks = []
+        try:
+            while kind == _GCODE:
+                chunks.append(value)
+                yield value
+                kind, value = self._receive(queue, future)
+        finally:
+            if kind == _GCODE:
+                # Closed before the end, so stop the worker rather than let it generate for nobody
+                cancelled.set()
+
+        if kind != _END:
+            raise GenerationError('\n'.join(value))
+        self.cache.put(key, ''.join(chunks))
+
+    @staticmethod
+    def _receive(queue: Queue, future: Future) -> tuple[str, str | list[str] | None]:
+        """
+        Wait for the next message streamed by a worker.
+        :return: Tuple of the kind of message and its value, or _FAILED if the worker stopped without finishing.
+        """
+        while True:
+            try:
+                return queue.get(timeout=_POLL_SECONDS)
+            except Empty:
+                if not future.done():
+                    continue
+            # The worker may have finished just after the queue was checked
+            try:
+                return queue.get_nowait()
+            except Empty:
+                error = future.exception()
+                return _FAILED, [f'Failed to generate job: {error!r}' if error is not None else 'Failed to generate job']
+
+    def serve_forever(self) -> None:
+        """
+        Handle requests until shutdown() is called.
+        """
+        self._http_server.serve_forever()
+
+    def shutdown(self) -> None:
+        """
+        Stop handling requests. Must be called from a different thread to serve_forever().
+        """
+        self._http_server.shutdown()
+
+    def close(self) -> None:
+        """
+        Close the listening socket and stop the worker processes.
+        """
+        self._http_server.server_close()
+        self._executor.shutdown()
+        self._manager.shutdown()
+        if self._http_server.socket.family == getattr(socket, 'AF_UNIX', None):
+            unlink(self._http_server.server_address)
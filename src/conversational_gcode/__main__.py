@@ -0,0 +1,5 @@
+import sys
+
+from conversational_gcode.GcodeCli import main
+
+sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Estimates of the cost of running GCode.
+
+Classes:
+- Estimate
+  - Expected command count, toolpath length and cycle time of some GCode.
+
+Functions:
+- distance()
+  - Straight line distance between two points.
+- arc_length()
+  - Length of a circular or helical arc.
+- measure_commands()
+  - Measure the command count, toolpath length and cycle time of existing GCode commands.
+"""
+
+from dataclasses import dataclass
+from math import atan2, ceil, hypot, isclose, pi, sqrt
+
+from conversational_gcode.options.Options import Options
+from conversational_gcode.gcodes.GCodes import GCode, G0, G1, G2, G3, G80, G81, G82, G83, CyclePosition
+
+
+@dataclass
+class Estimate:
+    """
+    Expected command count, toolpath length and cycle time of some GCode.
+
+    Attributes:
+        command_count (int): Number of GCode commands, including comments.
+        feed_length (float): Length of the toolpath moved at a feed rate, in mm.
+        rapid_length (float): Length of the toolpath moved rapidly, in mm.
+        cycle_time (float): Time taken to move along the toolpath and dwell, in seconds.
+        start (list): [X, Y, Z] position at which the toolpath starts. Defaults to None if unknown.
+        end (list): [X, Y, Z] position at which the toolpath ends. Defaults to None if unknown.
+    """
+    command_count: int = 0
+    feed_length: float = 0  # mm
+    rapid_length: float = 0  # mm
+    cycle_time: float = 0  # s
+    start: list[float] = None
+    end: list[float] = None
+
+    toolpath_length = property(fget=lambda self: self.feed_length + self.rapid_length)
+
+    def add_commands(self, count: int = 1) -> None:
+        """
+        Add commands which take no time to run.
+        :param count: Number of commands to add.
+        """
+        self.command_count += count
+
+    def add_rapid(self, length: float, rapid_rate: float) -> None:
+        """
+        Add a rapid move.
+        :param length: Length of the move.
+        :param rapid_rate: Rate at which the machine moves rapidly, in mm per minute.
+        """
+        self.rapid_length += length
+        self.cycle_time += 60 * length / rapid_rate
+
+    def add_feed(self, length: float, feed_rate: float) -> None:
+        """
+        Add a move at a feed rate.
+        :param length: Length of the move.
+        :param feed_rate: Rate at which the tool is fed, in mm per minute.
+        """
+        self.feed_length += length
+        self.cycle_time += 60 * length / feed_rate
+
+    def add_dwell(self, seconds: float) -> None:
+        """
+        Add a dwell in which the tool does not move.
+        :param seconds: Time for which to dwell.
+        """
+        self.cycle_time += seconds
+
+    def rapid_to(self, position: list[float], new_position: list[float], rapid_rate: float) -> None:
+        """
+        Add a single rapid move command.
+        :param position: Start position of the move. To be mutated to keep up to date.
+        :param new_position: End position of the move.
+        :param rapid_rate: Rate at which the machine moves rapidly, in mm per minute.
+        """
+        self.add_commands()
+        self.add_rapid(distance(position, new_position), rapid_rate)
+        position[0:3] = new_position
+
+    def feed_to(self, position: list[float], new_position: list[float], feed_rate: float) -> None:
+        """
+        Add a single linear feed move command.
+        :param position: Start position of the move. To be mutated to keep up to date.
+        :param new_position: End position of the move.
+        :param feed_rate: Rate at which the tool is fed, in mm per minute.
+        """
+        self.add_commands()
+        self.add_feed(distance(position, new_position), feed_rate)
+        position[0:3] = new_position
+
+    def arc_to(self, position: list[float], new_position: list[float], centre: list[float], clockwise: bool, feed_rate: float) -> None:
+        """
+        Add a single arc feed move command.
+        :param position: Start position of the move. To be mutated to keep up to date.
+        :param new_position: End position of the move.
+        :param centre: [X, Y] centre of the arc.
+        :param clockwise: True if the arc moves clockwise.
+        :param feed_rate: Rate at which the tool is fed, in mm per minute.
+        """
+        self.add_commands()
+        self.add_feed(arc_length(position, new_position, centre, clockwise), feed_rate)
+        position[0:3] = new_position
+
+    def add_estimate(self, other: 'Estimate') -> None:
+        """
+        Add the cost of another estimate, such as a repeated section of toolpath. Its start and end are ignored.
+        :param other: Estimate to add.
+        """
+        self.command_count += other.command_count
+        self.feed_length += other.feed_length
+        self.rapid_length += other.rapid_length
+        self.cycle_time += other.cycle_time
+
+    def __add__(self, other: 'Estimate') -> 'Estimate':
+        return Estimate(
+            command_count=self.command_count + other.command_count,
+            feed_length=self.feed_length + other.feed_length,
+            rapid_length=self.rapid_length + other.rapid_length,
+            cycle_time=self.cycle_time + other.cycle_time,
+            start=self.start if self.start is not None else other.start,
+            end=other.end if other.end is not None else self.end
+        )
+
+    def __repr__(self) -> str:
+        return (
+            'Estimate(' +
+            f'command_count={self.command_count}, ' +
+            f'feed_length={self.feed_length}, rapid_length={self.rapid_length}, ' +
+            f'cycle_time={self.cycle_time}, ' +
+            f'start={self.start}, end={self.end}' +
+            ')'
+        )
+
+
+def distance(start: list[float], end: list[float]) -> float:
+    """
+    Straight line distance between two points. Unknown coordinates are treated as not moving.
+    :param start: [X, Y, Z] start position.
+    :param end: [X, Y, Z] end position.
+    :return: Distance between the points.
+    """
+    deltas = [
+        (end_value - start_value) if start_value is not None and end_value is not None else 0
+        for start_value, end_value in zip(start, end)
+    ]
+    return sqrt(sum(delta * delta for delta in deltas))
+
+
+def arc_length(start: list[float], end: list[float], centre: list[float], clockwise: bool) -> float:
+    """
+    Length of a circular arc in the XY-plane, or a helical arc if the Z-axis also moves.
+
+    An arc which ends where it starts is a full circle.
+    :param start: [X, Y, Z] start position.
+    :param end: [X, Y, Z] end position.
+    :param centre: [X, Y] centre of the arc.
+    :param clockwise: True if the arc moves clockwise.
+    :return: Length of the arc.
+    """
+    radius = hypot(start[0] - centre[0], start[1] - centre[1])
+    start_angle = atan2(start[1] - centre[1], start[0] - centre[0])
+    end_angle = atan2(end[1] - centre[1], end[0] - centre[0])
+
+    sweep = (start_angle - end_angle) if clockwise else (end_angle - start_angle)
+    sweep %= 2 * pi
+    if isclose(sweep, 0, abs_tol=1e-9) or isclose(sweep, 2 * pi, abs_tol=1e-9):
+        sweep = 2 * pi
+
+    height = (end[2] - start[2]) if start[2] is not None and end[2] is not None else 0
+    return hypot(radius * sweep, height)
+
+
+def _drill(estimate: Estimate, position: list[float], x: float, y: float, cycle: G81, options: Options) -> None:
+    """
+    Drill a single hole of a canned cycle. The tool retracts to the R-plane after each hole.
+    """
+    rapid_rate = options.job.rapid_rate
+
+    target = [
+        x if x is not None else position[0],
+        y if y is not None else position[1],
+        position[2]
+    ]
+    estimate.add_rapid(distance(position, target), rapid_rate)
+    if position[2] is not None:
+        estimate.add_rapid(abs(position[2] - cycle.r), rapid_rate)
+
+    hole_depth = cycle.r - cycle.z
+    estimate.add_feed(hole_depth, cycle.f)
+    if isinstance(cycle, G83) and cycle.q is not None and cycle.q > 0:
+        pecks = ceil(hole_depth / cycle.q)
+        estimate.add_rapid(cycle.q * pecks * (pecks - 1), rapid_rate)
+    if isinstance(cycle, G82) and cycle.p is not None:
+        estimate.add_dwell(cycle.p / 1000)
+    estimate.add_rapid(hole_depth, rapid_rate)
+
+    position[0:3] = [target[0], target[1], cycle.r]
+
+
+def measure_commands(commands: list[GCode], options: Options, position: list[float] = None) -> Estimate:
+    """
+    Measure the command count, toolpath length and cycle time of existing GCode commands.
+    :param commands: GCode commands to measure.
+    :param options: Options used to generate the commands.
+    :param position: Starting position of the commands. Defaults to None for an unknown position.
+    :return: Measured estimate.
+    """
+    position = [None, None, None] if position is None else [*position]
+    estimate = Estimate(start=[*position])
+    rapid_rate = options.job.rapid_rate
+    cycle = None
+
+    for command in commands:
+        estimate.add_commands()
+
+        if isinstance(command, CyclePosition):
+            if cycle is not None:
+                _drill(estimate, position, command.x, command.y, cycle, options)
+        elif isinstance(command, G81):
+            cycle = command
+            _drill(estimate, position, command.x, command.y, cycle, options)
+        elif isinstance(command, G80):
+            cycle = None
+        elif isinstance(command, G0):
+            new_position = [
+                command.x if command.x is not None else position[0],
+                command.y if command.y is not None else position[1],
+                command.z if command.z is not None else position[2]
+            ]
+            if isinstance(command, G2):
+                centre = [
+                    position[0] + (command.i if command.i is not None else 0),
+                    position[1] + (command.j if command.j is not None else 0)
+                ]
+                length = arc_length(position, new_position, centre, not isinstance(command, G3))
+                estimate.add_feed(length, command.f)
+            elif isinstance(command, G1):
+                estimate.add_feed(distance(position, new_position), command.f)
+            else:
+                estimate.add_rapid(distance(position, new_position), rapid_rate)
+            position = new_position
+
+    estimate.end = position
+    return estimate
@@ -0,0 +1,132 @@
+"""
+Statistics of the material removed by an operation, to show how heavily the tool is loaded.
+
+Classes:
+- MachiningStatistics
+  - Volume removed by an operation, the time spent in each class of feed move, and the material removal rates.
+
+Functions:
+- measure_statistics()
+  - Measure the time spent in each class of feed move by the commands of an operation.
+"""
+
+from dataclasses import dataclass, field
+
+from conversational_gcode.estimate.Estimate import measure_commands
+from conversational_gcode.gcodes.GCodes import GCode, G0, G1, G80, G81, CyclePosition, ROUGHING, PLUNGE, LINK, DISENGAGE
+from conversational_gcode.options.Options import Options
+
+# Classes of feed move which do not cut
+_NON_CUTTING = (LINK, DISENGAGE)
+
+
+@dataclass
+class MachiningStatistics:
+    """
+    Volume removed by an operation, the time spent in each class of feed move, and the material removal rates.
+
+    Attributes:
+        operation (Operation): Operation which removes the material.
+        volume (float): Volume of material removed, in mm³.
+        feed_times (dict): Time spent feeding in each class of feed move, such as ROUGHING or HELIX, in seconds.
+        rapid_time (float): Time spent moving rapidly, in seconds.
+        peak_material_removal_rate (float): Fastest rate at which any of the feed moves removes material,
+        in mm³ per minute.
+        cutting_time (float): Time spent in feed moves which cut, leaving out links and disengage moves, in seconds.
+        average_material_removal_rate (float): Volume removed per minute of cutting time, in mm³ per minute.
+        utilisation (float): Ratio of the average to the peak material removal rate. A low utilisation shows that the
+        tool spends much of its time lightly loaded.
+    """
+    operation: object = None
+    volume: float = 0  # mm³
+    feed_times: dict[str, float] = field(default_factory=dict)  # s
+    rapid_time: float = 0  # s
+    peak_material_removal_rate: float = 0  # mm³/min
+
+    cutting_time = property(
+        fget=lambda self: sum(time for move, time in self.feed_times.items() if move not in _NON_CUTTING)
+    )
+
+    def _get_average_material_removal_rate(self) -> float:
+        cutting_time = self.cutting_time
+        return 60 * self.volume / cutting_time if cutting_time > 0 else 0
+
+    average_material_removal_rate = property(fget=_get_average_material_removal_rate)
+
+    def _get_utilisation(self) -> float:
+        if self.peak_material_removal_rate <= 0:
+            return 0
+        return self.average_material_removal_rate / self.peak_material_removal_rate
+
+    utilisation = property(fget=_get_utilisation)
+
+
+def _move_of(command: GCode, cycle_move: str | None, move: str | None) -> str | None:
+    """
+    Class of the move made by a command, with None for rapid moves.
+    Commands which do not move keep the class of the move before them, so that they do not split a run of moves.
+    """
+    if isinstance(command, G81):
+        return command.move if command.move is not None else PLUNGE
+    if isinstance(command, (CyclePosition, G80)):
+        return cycle_move
+    if isinstance(command, G1):
+        return command.move if command.move is not None else ROUGHING
+    if isinstance(command, G0):
+        return None
+    return move
+
+
+def measure_statistics(commands: list[GCode],
+                       options: Options,
+                       volume: float,
+                       peak_removal_rates: dict[str, float],
+                       position: list[float],
+                       operation: object = None) -> MachiningStatistics:
+    """
+    Measure the time spent in each class of feed move by the commands of an operation.
+
+    Feed moves without a class are normal cuts, so are timed as ROUGHING, while canned drilling cycles are timed as
+    PLUNGE, apart from their rapid retractions. The peak rate is the highest of the given rates of the classes of feed
+    move which the commands use.
+    :param commands: GCode commands generated by the operation.
+    :param options: Options used to generate the commands.
+    :param volume: Volume of material removed by the operation, in mm³.
+    :param peak_removal_rates: Fastest rate at which each class of feed move removes material, in mm³ per minute.
+    :param position: Starting position of the commands.
+    :param operation: Operation which generated the commands. Defaults to None.
+    :return: The statistics.
+    """
+    statistics = MachiningStatistics(operation=operation, volume=volume)
+    rapid_rate = options.job.rapid_rate
+    position = [*position]
+
+    def add_run(run: list[GCode], move: str | None) -> None:
+        nonlocal position
+        estimate = measure_commands(run, options, position)
+        position = estimate.end
+        rapid_time = 60 * estimate.rapid_length / rapid_rate
+        statistics.rapid_time += rapid_time
+        if move is not None:
+            statistics.feed_times[move] = statistics.feed_times.get(move, 0) + estimate.cycle_time - rapid_time
+
+    # Runs of commands in the same class of move are measured together, keeping canned cycles with their positions
+    run = []
+    run_move = None
+    cycle_move = None
+    for command in commands:
+        move = _move_of(command, cycle_move, run_move)
+        if isinstance(command, G81):
+            cycle_move = move
+        if move != run_move and len(run) > 0:
+            add_run(run, run_move)
+            run = []
+        run.append(command)
+        run_move = move
+    if len(run) > 0:
+        add_run(run, run_move)
+
+    statistics.peak_material_removal_rate = max(
+        (peak_removal_rates.get(move, 0) for move, time in statistics.feed_times.items() if time > 0), default=0
+    )
+    return statistics
@@ -0,0 +1,129 @@
+"""
+Feeds and speeds for a tool cutting a material, chosen to remove material as fast as the tool and machine allow.
+
+Classes:
+- FeedsAndSpeeds
+  - Cutting parameters of a tool, and the rate at which they remove material.
+
+Functions:
+- chip_thinning_factor()
+  - Factor by which to raise the feed per tooth to keep the chip load at a light stepover.
+- calculate_feeds_and_speeds()
+  - Find the feeds and speeds which remove a material fastest within the chip load and power limits.
+"""
+
+from dataclasses import dataclass
+from math import pi, sqrt
+
+from conversational_gcode.feeds.Material import Material
+from conversational_gcode.options.ToolOptions import ToolOptions
+
+# Lightest and heaviest stepovers tried, in tool diameters. Beyond half of the diameter a cut gains no chip thinning,
+# and the tool is loaded more unevenly.
+_MIN_STEPOVER = 0.05
+_MAX_STEPOVER = 0.5
+_STEPOVER_STEP = 0.01
+
+
+@dataclass
+class FeedsAndSpeeds:
+    """
+    Cutting parameters of a tool, and the rate at which they remove material.
+
+    Attributes:
+        spindle_speed (float): Speed of the spindle, in RPM.
+        feed_rate (float): Rate at which to feed the tool while cutting, in mm per minute.
+        max_stepover (float): Tool stepover while cutting, in mm.
+        max_stepdown (float): Tool step down while cutting, in mm.
+        feed_per_tooth (float): Distance fed per tooth, in mm, raised above the chip load at light stepovers.
+        material_removal_rate (float): Volume removed while cutting at the full stepover and step down, in mm³ per minute.
+        power (float): Power needed to remove the material at that rate, in W.
+    """
+    spindle_speed: float
+    feed_rate: float
+    max_stepover: float
+    max_stepdown: float
+    feed_per_tooth: float
+    material_removal_rate: float
+    power: float
+
+    def apply(self, tool_options: ToolOptions) -> None:
+        """
+        Set the spindle speed, feed rate, stepover and step down of tool options.
+        :param tool_options: Tool options to which to apply the feeds and speeds.
+        """
+        tool_options.spindle_speed = self.spindle_speed
+        tool_options.feed_rate = self.feed_rate
+        tool_options.max_stepover = self.max_stepover
+        tool_options.max_stepdown = self.max_stepdown
+
+
+def chip_thinning_factor(stepover: float, tool_diameter: float) -> float:
+    """
+    Factor by which to raise the feed per tooth to keep the chip load at a light stepover.
+
+    When less than half of the tool is engaged, each tooth leaves the cut before it reaches its thickest chip, so the
+    chip is thinner than the distance fed per tooth.
+    :param stepover: Radial engagement of the tool.
+    :param tool_diameter: Diameter of the tool.
+    :return: Ratio of the feed per tooth to the chip load, at least 1.
+    """
+    if stepover >= tool_diameter / 2:
+        return 1
+    return tool_diameter / (2 * sqrt(stepover * (tool_diameter - stepover)))
+
+
+def calculate_feeds_and_speeds(material: Material,
+                               tool_diameter: float,
+                               tool_flutes: int,
+                               max_spindle_speed: float = 24000,
+                               max_feed_rate: float = None,
+                               max_power: float = None) -> FeedsAndSpeeds:
+    """
+    Find the feeds and speeds which remove a material fastest within the chip load and power limits.
+
+    The spindle runs at the surface speed of the material, unless the machine cannot spin that fast. Each stepover is
+    fed at the chip load raised by chip thinning, and cut as deep as the material allows, or as the power allows if
+    less. The stepover which removes material fastest is chosen, preferring the lightest stepover if the power limits
+    several of them to the same rate.
+    :param material: Material to cut.
+    :param tool_diameter: Diameter of the tool.
+    :param tool_flutes: Number of flutes on the tool.
+    :param max_spindle_speed: Fastest speed of the spindle, in RPM. Defaults to 24000RPM.
+    :param max_feed_rate: Fastest rate at which the machine may feed the tool, in mm per minute.
+    Defaults to None for no limit.
+    :param max_power: Power of the spindle, in W. Defaults to None for no limit.
+    :return: The feeds and speeds.
+    """
+    spindle_speed = min(1000 * material.surface_speed / (pi * tool_diameter), max_spindle_speed)
+    chip_load = material.chip_load * tool_diameter
+    max_stepdown = material.max_stepdown * tool_diameter
+
+    best = None
+    step_count = round((_MAX_STEPOVER - _MIN_STEPOVER) / _STEPOVER_STEP)
+    for step in range(step_count + 1):
+        stepover = round(_MIN_STEPOVER + step * _STEPOVER_STEP, 2) * tool_diameter
+        feed_per_tooth = chip_load * chip_thinning_factor(stepover, tool_diameter)
+        feed_rate = feed_per_tooth * tool_flutes * spindle_speed
+        if max_feed_rate is not None and feed_rate > max_feed_rate:
+            feed_rate = max_feed_rate
+            feed_per_tooth = feed_rate / (tool_flutes * spindle_speed)
+
+        stepdown = max_stepdown
+        if max_power is not None:
+            # Power in W is the volume removed per second times the energy per volume
+            stepdown = min(stepdown, 60 * max_power / (material.specific_energy * stepover * feed_rate))
+
+        material_removal_rate = stepover * stepdown * feed_rate
+        if best is None or material_removal_rate > best.material_removal_rate * (1 + 1e-9):
+            best = FeedsAndSpeeds(
+                spindle_speed=spindle_speed,
+                feed_rate=feed_rate,
+                max_stepover=stepover,
+                max_stepdown=stepdown,
+                feed_per_tooth=feed_per_tooth,
+                material_removal_rate=material_removal_rate,
+                power=material_removal_rate * material.specific_energy / 60
+            )
+
+    return best
@@ -0,0 +1,58 @@
+"""
+Cutting data of the materials which may be machined.
+
+Classes:
+- Material
+  - Cutting data of a material, relative to the diameter of the tool.
+
+Functions:
+- load_materials()
+  - Load a table of materials from a JSON file.
+
+Constants:
+- MATERIALS_PATH
+  - Path of the table of common materials included in the package.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+MATERIALS_PATH = Path(__file__).with_name('materials.json')
+
+
+@dataclass(frozen=True)
+class Material:
+    """
+    Cutting data of a material, relative to the diameter of the tool.
+
+    Attributes:
+        name (str): Name of the material.
+        surface_speed (float): Speed at which the cutting edge should pass through the material, in m per minute.
+        chip_load (float): Thickness of the chip cut by each tooth, per mm of tool diameter.
+        specific_energy (float): Energy needed to remove the material, in J per mm³.
+        max_stepdown (float): Deepest cut to take, in tool diameters.
+    """
+    name: str
+    surface_speed: float
+    chip_load: float
+    specific_energy: float
+    max_stepdown: float
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> 'Material':
+        return cls(name=name, **data)
+
+
+def load_materials(path: str | Path = None) -> dict[str, Material]:
+    """
+    Load a table of materials from a JSON file.
+
+    The file holds an object of materials by name, each with the surface_speed, chip_load, specific_energy and
+    max_stepdown of the material.
+    :param path: Path of the file. Defaults to None to load the common materials included in the package.
+    :return: Dictionary of the materials, by name.
+    """
+    with open(MATERIALS_PATH if path is None else path, 'r') as materials_file:
+        data = json.load(materials_file)
+    return {name: Material.from_dict(name, material) for name, material in data.items()}
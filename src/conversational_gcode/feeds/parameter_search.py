@@ -0,0 +1,222 @@
+"""
+Search for the cutting parameters which machine a job in the least time.
+
+Candidates are scored with the closed-form estimate() of each operation, rather than by generating them, so that a grid
+of thousands of candidates may be searched quickly. Each candidate is applied to an immutable snapshot of the options,
+so the candidates may also be scored across a process pool.
+
+Classes:
+- ParameterSearch
+  - Best cutting parameters found by a search, and the cycle time that they give.
+
+Functions:
+- candidate_parameters()
+  - Grid of stepovers, step downs and helical stepovers to search.
+- search_parameters()
+  - Find the cutting parameters which minimise the estimated cycle time of operations, within the engagement, chip
+    load and power limits.
+"""
+
+from dataclasses import dataclass, replace
+from math import ceil
+from typing import Iterable
+
+from conversational_gcode.feeds.FeedsAndSpeeds import chip_thinning_factor
+from conversational_gcode.feeds.Material import Material
+from conversational_gcode.operations.Operation import Operation
+from conversational_gcode.options.Options import Options
+from conversational_gcode.options.OptionsSnapshot import OptionsSnapshot, ToolOptionsSnapshot
+from conversational_gcode.options.ToolOptions import ToolOptions
+
+# Number of tasks given to each process when the search runs across a process pool, to balance the load
+_CHUNKS_PER_WORKER = 4
+
+
+@dataclass
+class ParameterSearch:
+    """
+    Best cutting parameters found by a search, and the cycle time that they give.
+
+    Attributes:
+        max_stepover (float): Best tool stepover while cutting, in mm.
+        max_stepdown (float): Best tool step down while cutting, in mm.
+        max_helix_stepover (float): Best tool stepover while cutting in a helix, in mm.
+        cycle_time (float): Estimated cycle time of the operations with the best parameters, in seconds.
+        initial_cycle_time (float): Estimated cycle time of the operations with the parameters of the options,
+        in seconds.
+        candidate_count (int): Number of candidates which were within the limits, and so were scored.
+        time_saved (float): Reduction in the cycle time from the initial parameters, in seconds.
+    """
+    max_stepover: float
+    max_stepdown: float
+    max_helix_stepover: float
+    cycle_time: float
+    initial_cycle_time: float
+    candidate_count: int
+
+    time_saved = property(fget=lambda self: self.initial_cycle_time - self.cycle_time)
+
+    def apply(self, tool_options: ToolOptions) -> None:
+        """
+        Set the stepover, step down and helical stepover of tool options.
+        :param tool_options: Tool options to which to apply the parameters.
+        """
+        tool_options.max_stepover = self.max_stepover
+        tool_options.max_stepdown = self.max_stepdown
+        tool_options.max_helix_stepover = self.max_helix_stepover
+
+
+def _steps(lowest: float, highest: float, count: int) -> list[float]:
+    if count <= 1:
+        return [highest]
+    return [lowest + (highest - lowest) * step / (count - 1) for step in range(count)]
+
+
+def candidate_parameters(tool_options: ToolOptions | ToolOptionsSnapshot,
+                         max_engagement: float = 0.5,
+                         max_stepdown: float = None,
+                         steps: int = 10,
+                         helix_steps: int = 5) -> list[tuple[float, float, float]]:
+    """
+    Grid of stepovers, step downs and helical stepovers to search.
+
+    Stepovers range from a tenth of the tool diameter up to the maximum engagement, step downs from a tenth of the
+    maximum step down up to it, and helical stepovers from a fifth of the tool radius up to the tool radius.
+    :param tool_options: Options for the tool.
+    :param max_engagement: Heaviest stepover, in tool diameters. Defaults to half of the tool diameter.
+    :param max_stepdown: Deepest step down, in mm. Defaults to None for one tool diameter.
+    :param steps: Number of stepovers and of step downs. Defaults to 10.
+    :param helix_steps: Number of helical stepovers. Defaults to 5.
+    :return: List of (stepover, step down, helical stepover) candidates, from the lightest to the heaviest.
+    """
+    tool_diameter = tool_options.tool_diameter
+    max_stepdown = tool_diameter if max_stepdown is None else max_stepdown
+    max_engagement = min(max_engagement, 1)
+    return [
+        (stepover, stepdown, helix_stepover)
+        for stepover in _steps(0.1 * tool_diameter, max_engagement * tool_diameter, steps)
+        for stepdown in _steps(0.1 * max_stepdown, max_stepdown, steps)
+        for helix_stepover in _steps(0.2 * tool_options.tool_radius, tool_options.tool_radius, helix_steps)
+    ]
+
+
+def _within_limits(stepover: float,
+                   stepdown: float,
+                   tool_options: ToolOptionsSnapshot,
+                   material: Material | None,
+                   max_power: float | None) -> bool:
+    """
+    Whether a candidate keeps the chip load and the power within the limits of the material and the machine.
+    """
+    if material is None:
+        return True
+    # The chip is thinned at light stepovers, so the feed per tooth may be above the chip load
+    feed_per_tooth = tool_options.feed_rate / (tool_options.tool_flutes * tool_options.spindle_speed)
+    chip_thickness = feed_per_tooth / chip_thinning_factor(stepover, tool_options.tool_diameter)
+    if chip_thickness > material.chip_load * tool_options.tool_diameter * (1 + 1e-9):
+        return False
+    if max_power is not None:
+        power = stepover * stepdown * tool_options.feed_rate * material.specific_energy / 60
+        if power > max_power * (1 + 1e-9):
+            return False
+    return True
+
+
+def _cycle_time(operations: list[Operation], options: OptionsSnapshot) -> float:
+    return sum(operation.estimate(options).cycle_time for operation in operations)
+
+
+def _score(operations: list[Operation],
+           options: OptionsSnapshot,
+           candidates: list[tuple[float, float, float]]) -> tuple[float, tuple[float, float, float] | None]:
+    """
+    Find the candidate with the least cycle time.
+    Run in a worker process when the search runs across a process pool, so it is a module level function.
+    :return: The least cycle time, and the candidate which gives it, or None if there are no candidates.
+    """
+    best_time = None
+    best = None
+    for candidate in candidates:
+        stepover, stepdown, helix_stepover = candidate
+        tool = replace(options.tool, max_stepover=stepover, max_stepdown=stepdown, max_helix_stepover=helix_stepover)
+        cycle_time = _cycle_time(operations, replace(options, tool=tool))
+        if best_time is None or cycle_time < best_time:
+            best_time = cycle_time
+            best = candidate
+    return best_time, best
+
+
+def search_parameters(operations: Iterable[Operation],
+                      options: Options | OptionsSnapshot,
+                      material: Material = None,
+                      max_power: float = None,
+                      max_engagement: float = 0.5,
+                      max_stepdown: float = None,
+                      steps: int = 10,
+                      helix_steps: int = 5,
+                      workers: int = 1) -> ParameterSearch:
+    """
+    Find the cutting parameters which minimise the estimated cycle time of operations, within the engagement, chip
+    load and power limits.
+
+    The feed rate and spindle speed of the options are kept, so the chip load limits how light the stepover may be
+    before chip thinning lets the chips get too thick, and the power limits the volume cut per minute. Operations
+    share the tool, so one set of parameters is found for all of them. The clearing strategy of each operation is
+    fixed, so it is not searched.
+    :param operations: Operations to machine, such as every operation of a job.
+    :param options: Options for the generation, which are left unchanged.
+    :param material: Material to cut, which sets the chip load and power limits, and the deepest step down if no
+    other is given. Defaults to None for no chip load or power limits.
+    :param max_power: Power of the spindle, in W. Only limits candidates if a material is given.
+    Defaults to None for no limit.
+    :param max_engagement: Heaviest stepover, in tool diameters. Defaults to half of the tool diameter.
+    :param max_stepdown: Deepest step down, in mm. Defaults to None for the material's deepest step down, or one tool
+    diameter if no material is given.
+    :param steps: Number of stepovers and of step downs to try. Defaults to 10.
+    :param helix_steps: Number of helical stepovers to try. Defaults to 5.
+    :param workers: Number of processes across which to score the candidates. Defaults to 1 to score them in this
+    process.
+    :return: The best parameters found, or the parameters of the options if they are within the limits and no
+    candidate improves on them, or if no candidate is within the limits.
+    """
+    operations = list(operations)
+    options = options.snapshot()
+    tool_options = options.tool
+
+    if max_stepdown is None and material is not None:
+        max_stepdown = material.max_stepdown * tool_options.tool_diameter
+    candidates = [
+        candidate
+        for candidate in candidate_parameters(tool_options, max_engagement, max_stepdown, steps, helix_steps)
+        if _within_limits(candidate[0], candidate[1], tool_options, material, max_power)
+    ]
+
+    chunk_size = max(1, ceil(len(candidates) / (_CHUNKS_PER_WORKER * workers)))
+    chunks = [candidates[start:start + chunk_size] for start in range(0, len(candidates), chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        # Only import the process pool when it is needed, to keep start up fast
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_score, [operations] * len(chunks), [options] * len(chunks), chunks))
+    else:
+        results = [_score(operations, options, chunk) for chunk in chunks]
+
+    initial_cycle_time = _cycle_time(operations, options)
+    initial = (tool_options.max_stepover, tool_options.max_stepdown, tool_options.max_helix_stepover)
+    # The parameters of the options are only kept over the candidates if they are within the limits themselves
+    best_time = initial_cycle_time if _within_limits(initial[0], initial[1], tool_options, material, max_power) else None
+    best = initial
+    for cycle_time, candidate in results:
+        if candidate is not None and (best_time is None or cycle_time < best_time):
+            best_time = cycle_time
+            best = candidate
+
+    return ParameterSearch(
+        max_stepover=best[0],
+        max_stepdown=best[1],
+        max_helix_stepover=best[2],
+        cycle_time=best_time if best_time is not None else initial_cycle_time,
+        initial_cycle_time=initial_cycle_time,
+        candidate_count=len(candidates)
+    )
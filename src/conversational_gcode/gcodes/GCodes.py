@@ -4,6 +4,8 @@ GCode command objects which are exported by the various operations.
 Classes:
 - GCode
   - Prints a line, starting with a semicolon, with text comment following it.
+- CommentBlock
+  - Prints several lines, each starting with a semicolon, from a multi-line comment.
 - M2
   - Prints an M2 command to stop the machine spindle.
 - M3
@@ -28,20 +30,35 @@ Classes:
   - Prints a G81 command to start a canned cycle for peck drilling.
 - CyclePosition
   - Prints an XY location for use within a canned cycle.
+
+Constants:
+- PLUNGE, HELIX, ROUGHING, FINISHING, LINK, DISENGAGE
+  - Classes of feed move, which select the feed rate of the move and are not printed.
 """
 
 from conversational_gcode.options.OutputOptions import OutputOptions
 from conversational_gcode.transform.Transformation import Transformation
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Self
 
+# Classes of feed move
+PLUNGE = 'plunge'
+HELIX = 'helix'
+ROUGHING = 'roughing'
+FINISHING = 'finishing'
+LINK = 'link'
+DISENGAGE = 'disengage'
+
 
-@dataclass
+@dataclass(eq=False)
 class GCode:
     """
     An empty line with a comment in a GCode file.
 
+    Commands compare and hash by their type and attributes, but stay mutable so that transform() can move them in place.
+    A command must not be changed once it has been hashed, such as by being stored in a set or as a dict key.
+
     Attributes:
         comment (str): An optional comment to print at the end of the line.
     """
@@ -53,17 +70,40 @@ class GCode:
     def transform(self, transformation: Transformation) -> Self:
         return self
 
+    def _key(self) -> tuple:
+        """
+        Attributes which are compared and hashed, along with the type of the command.
+        """
+        return self.comment,
+
     def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, GCode):
-            return False
+        return type(__o) is type(self) and self._key() == __o._key()
 
-        return self.comment == __o.comment
+    def __hash__(self) -> int:
+        # Changes with the attributes, so a command must not be changed while it is in a set or dict
+        return hash((type(self), self._key()))
 
     def __repr__(self) -> str:
         return f'GCode(comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
+class CommentBlock(GCode):
+    """
+    Several commented lines in a GCode file, printed from a single multi-line comment.
+
+    Attributes:
+        comment (str): The comment to print, with lines separated by newlines.
+    """
+
+    def format(self, output_options: OutputOptions) -> str:
+        return ';' if self.comment is None else '; ' + self.comment.replace('\n', '\n; ')
+
+    def __repr__(self) -> str:
+        return f'CommentBlock(comment={self.comment})'
+
+
+@dataclass(eq=False)
 class M2(GCode):
     """
     An M2 command to stop the machine spindle.
@@ -76,17 +116,11 @@ class M2(GCode):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'M2{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        return isinstance(__o, M2)
-
     def __repr__(self) -> str:
         return f'M2(comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class M3(GCode):
     """
     An M3 command to start the machine spindle.
@@ -103,20 +137,14 @@ class M3(GCode):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'M3{rpm}{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        if not isinstance(__o, M3):
-            return False
-
-        return self.s == __o.s
+    def _key(self) -> tuple:
+        return self.comment, self.s
 
     def __repr__(self) -> str:
         return f'M3(s={self.s}, comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class M5(GCode):
     """
     An M2 command to end the GCode program.
@@ -129,17 +157,11 @@ class M5(GCode):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'M5{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        return isinstance(__o, M5)
-
     def __repr__(self) -> str:
         return f'M5(comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class G0(GCode):
     """
     G0 command to rapidly move the tool to a given location.
@@ -171,22 +193,14 @@ class G0(GCode):
 
         return self
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        if not isinstance(__o, G0):
-            return False
-
-        return (self.x == __o.x and
-                self.y == __o.y and
-                self.z == __o.z)
+    def _key(self) -> tuple:
+        return self.comment, self.x, self.y, self.z
 
     def __repr__(self) -> str:
         return f'G0(x={self.x}, y={self.y}, z={self.z}, comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class G1(G0):
     """
     G1 command to feed the tool to a given location.
@@ -197,8 +211,10 @@ class G1(G0):
         z (float): The Z-axis location to which to move the tool.
         f (float): The feed rate at which to move the tool.
         comment (str): An optional comment to print at the end of the line.
+        move (str): An optional class of the move, such as ROUGHING or LINK, which is not printed or compared.
     """
     f: float = None  # mm per min
+    move: str = field(default=None, kw_only=True)
 
     def format(self, output_options: OutputOptions) -> str:
         position_precision = output_options.position_precision
@@ -210,20 +226,14 @@ class G1(G0):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'G1{x_pos}{y_pos}{z_pos}{feed}{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        if not isinstance(__o, G1):
-            return False
-
-        return self.f == __o.f
+    def _key(self) -> tuple:
+        return self.comment, self.x, self.y, self.z, self.f
 
     def __repr__(self) -> str:
         return f'G1(x={self.x}, y={self.y}, z={self.z}, f={self.f}, comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class G2(G1):
     """
     G2 command to feed the tool to a given location via a clockwise circular arc.
@@ -272,16 +282,8 @@ class G2(G1):
 
         return self
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        if not isinstance(__o, G2):
-            return False
-
-        return (self.i == __o.i and
-                self.j == __o.j and
-                self.k == __o.k)
+    def _key(self) -> tuple:
+        return self.comment, self.x, self.y, self.z, self.i, self.j, self.k, self.f
 
     def __repr__(self) -> str:
         return (
@@ -293,7 +295,7 @@ class G2(G1):
         )
 
 
-@dataclass
+@dataclass(eq=False)
 class G3(G2):
     """
     G3 command to feed the tool to a given location via an anticlockwise circular arc.
@@ -315,12 +317,6 @@ class G3(G2):
     def format(self, output_options: OutputOptions) -> str:
         return self._format_arc('G3', output_options)
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        return isinstance(__o, G3)
-
     def __repr__(self) -> str:
         return (
             'G3(' +
@@ -343,17 +339,11 @@ class G80(GCode):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'G80{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        return isinstance(__o, G80)
-
     def __repr__(self) -> str:
         return f'G80(comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class G81(G1):
     """
     G81 command to feed the tool to start a canned cycle for drilling.
@@ -379,20 +369,14 @@ class G81(G1):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'G81{x_pos}{y_pos}{z_pos}{r}{feed}{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        if not isinstance(__o, G81):
-            return False
-
-        return self.r == __o.r
+    def _key(self) -> tuple:
+        return self.comment, self.x, self.y, self.z, self.r, self.f
 
     def __repr__(self) -> str:
         return f'G81(x={self.x}, y={self.y}, z={self.z}, r={self.r}, f={self.f}, comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class G82(G81):
     """
     G82 command to feed the tool to start a canned cycle for spot drilling.
@@ -420,20 +404,14 @@ class G82(G81):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'G82{x_pos}{y_pos}{z_pos}{r}{p}{feed}{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        if not isinstance(__o, G82):
-            return False
-
-        return self.p == __o.p
+    def _key(self) -> tuple:
+        return self.comment, self.x, self.y, self.z, self.r, self.p, self.f
 
     def __repr__(self) -> str:
         return f'G82(x={self.x}, y={self.y}, z={self.z}, r={self.r}, p={self.p}, f={self.f}, comment={self.comment})'
 
 
-@dataclass
+@dataclass(eq=False)
 class G83(G82):
     """
     G83 command to feed the tool to start a canned cycle for peck drilling.
@@ -463,14 +441,8 @@ class G83(G82):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'G83{x_pos}{y_pos}{z_pos}{r}{q}{p}{feed}{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        if not isinstance(__o, G83):
-            return False
-
-        return self.q == __o.q
+    def _key(self) -> tuple:
+        return self.comment, self.x, self.y, self.z, self.r, self.q, self.p, self.f
 
     def __repr__(self) -> str:
         return (
@@ -482,7 +454,7 @@ class G83(G82):
         )
 
 
-@dataclass
+@dataclass(eq=False)
 class CyclePosition(G0):
     """
     A command for a position in a canned cycle.
@@ -507,11 +479,5 @@ class CyclePosition(G0):
         end = ';' if self.comment is None else f'; {self.comment}'
         return f'{x_pos}{spacer_xy}{y_pos}{spacer_yz}{z_pos}{end}'
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-
-        return isinstance(__o, CyclePosition)
-
     def __repr__(self) -> str:
         return f'CyclePosition(x={self.x}, y={self.y}, z={self.z}, comment={self.comment})'
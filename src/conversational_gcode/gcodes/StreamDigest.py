@@ -0,0 +1,92 @@
+"""
+Content digests of GCode commands and programs, which identify a program by the text which it prints.
+
+A program's digest is the BLAKE2b hash of its formatted lines, each followed by a newline, so the digest of generated
+commands equals the hash of the text written by GcodeGenerator.stream_text(), and of the same text parsed back with
+parse_gcode(). Comments may be left out of the digests, along with the lines which only hold a comment, so that programs
+differing only in their comments share a digest.
+
+Classes:
+- StreamDigest
+  - Digest of a stream of commands, updated a command at a time.
+
+Functions:
+- command_digest()
+  - Digest of a single command.
+"""
+
+from hashlib import blake2b
+from typing import Iterable, Iterator
+
+from conversational_gcode.gcodes.GCodes import GCode
+from conversational_gcode.options.Options import Options
+
+_COMMAND_DIGEST_SIZE = 16
+
+
+def _text(command: GCode, options: Options, ignore_comments: bool) -> bytes:
+    text = command.format(options.output)
+    if not ignore_comments:
+        return f'{text}\n'.encode()
+    # Lines with only a comment are left out, so that a comment block hashes the same as its lines parsed back one by one
+    lines = (line.partition(';')[0].rstrip() for line in text.split('\n'))
+    return ''.join(f'{line}\n' for line in lines if line).encode()
+
+
+def command_digest(command: GCode, options: Options, ignore_comments: bool = False) -> str:
+    """
+    Digest of a single command.
+    :param command: Command to digest.
+    :param options: Options used to format the command.
+    :param ignore_comments: Whether to leave the comment out of the digest. Defaults to False.
+    :return: Hexadecimal digest of the formatted command.
+    """
+    return blake2b(_text(command, options, ignore_comments), digest_size=_COMMAND_DIGEST_SIZE).hexdigest()
+
+
+class StreamDigest:
+    """
+    Digest of a stream of commands, updated a command at a time.
+
+    Attributes:
+        command_count (int): Number of commands digested so far.
+    """
+
+    def __init__(self, options: Options, ignore_comments: bool = False):
+        """
+        Initialise an empty digest.
+        :param options: Options used to format the commands.
+        :param ignore_comments: Whether to leave comments out of the digest. Defaults to False.
+        """
+        self._options = options
+        self._ignore_comments = ignore_comments
+        self._hash = blake2b()
+        self.command_count = 0
+
+    def update(self, command: GCode) -> None:
+        """
+        Add a command to the end of the digested stream.
+        :param command: Command to add.
+        """
+        self._hash.update(_text(command, self._options, self._ignore_comments))
+        self.command_count += 1
+
+    def watch(self, commands: Iterable[GCode]) -> Iterator[GCode]:
+        """
+        Digest commands as they pass through, such as those returned by GcodeGenerator.stream() as they are written out.
+        :param commands: Commands to digest.
+        :return: Iterator of the same commands.
+        """
+        for command in commands:
+            self.update(command)
+            yield command
+
+    def hexdigest(self) -> str:
+        """
+        Digest of the commands so far, which may continue to be updated.
+        :return: Hexadecimal digest.
+        """
+        return self._hash.hexdigest()
+
+    def __repr__(self) -> str:
+        return f'StreamDigest(command_count={self.command_count}, hexdigest={self.hexdigest()})'
@@ -0,0 +1,281 @@
+"""
+Semantic comparison of two GCode programs.
+
+Programs are compared as sections, each starting at a comment-only line such as 'Clear first corner'. Sections are
+aligned by their comments, with the numbers in the comments compared within a tolerance, so that a change of step-over
+is reported as a change to the passes rather than as different passes. The commands of aligned sections are compared
+in order, with their numbers compared within the tolerance and their comments ignored.
+
+Classes:
+- SectionChange
+  - A section which differs between the programs.
+- ProgramDiff
+  - Differences between two programs.
+
+Functions:
+- diff_programs()
+  - Compare two programs, streaming through them section by section.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from re import compile as compile_pattern
+from typing import Iterable, Iterator
+
+from conversational_gcode.estimate.Estimate import Estimate, measure_commands
+from conversational_gcode.gcodes.GCodes import GCode, CommentBlock
+from conversational_gcode.options.Options import Options
+
+CHANGED = 'changed'
+ADDED = 'added'
+REMOVED = 'removed'
+MOVED = 'moved'
+
+_NUMBER = compile_pattern(r'[-+]?(?:\d+\.?\d*|\.\d+)')
+
+
+@dataclass
+class SectionChange:
+    """
+    A section which differs between the programs.
+
+    Attributes:
+        kind (str): CHANGED, ADDED, REMOVED or MOVED.
+        heading (str): Comment which starts the section, or None for the commands before the first comment.
+        old_line (int): Line of the old program at which the section starts, or None if it was added.
+        new_line (int): Line of the new program at which the section starts, or None if it was removed.
+        detail (str): Description of the first difference within a changed section.
+    """
+    kind: str
+    heading: str | None
+    old_line: int | None
+    new_line: int | None
+    detail: str = None
+
+
+@dataclass
+class ProgramDiff:
+    """
+    Differences between two programs.
+
+    Attributes:
+        changes (list): SectionChanges in the order of the programs.
+        first_divergence (tuple): (old line, new line, description) of the first difference, or None if identical.
+        old (Estimate): Measurement of the old program.
+        new (Estimate): Measurement of the new program.
+    """
+    changes: list[SectionChange] = field(default_factory=list)
+    first_divergence: tuple[int | None, int | None, str] = None
+    old: Estimate = None
+    new: Estimate = None
+
+    identical = property(fget=lambda self: self.first_divergence is None)
+    cycle_time_delta = property(fget=lambda self: self.new.cycle_time - self.old.cycle_time)
+
+
+@dataclass
+class _Section:
+    heading: str | None
+    key: str | None
+    numbers: list[float]
+    line: int
+    commands: list[GCode]
+    estimate: Estimate
+
+
+def _values(command: GCode) -> list:
+    return [value for name, value in vars(command).items() if name not in ('comment', 'move')]
+
+
+def _numbers_differ(old: list, new: list, tolerance: float) -> bool:
+    if len(old) != len(new):
+        return True
+    for old_value, new_value in zip(old, new):
+        if old_value is None or new_value is None:
+            if old_value is not new_value:
+                return True
+        elif abs(old_value - new_value) > tolerance:
+            return True
+    return False
+
+
+def _describe(command: GCode, options: Options) -> str:
+    return command.format(options.output)
+
+
+def _sections(commands: Iterable[GCode], options: Options, position: list[float]) -> Iterator[_Section]:
+    """
+    Split a program into sections, each starting at a comment-only line, and measure each section.
+    """
+    line = 1
+    section = _Section(None, None, [], 1, [], None)
+    position = None if position is None else [*position]
+    # Comment-only commands, which count towards the command count of the sections which they start
+    heading_count = 0
+
+    def measure() -> None:
+        nonlocal position
+        section.estimate = measure_commands(section.commands, options, position)
+        section.estimate.add_commands(heading_count)
+        position = section.estimate.end
+
+    for command in commands:
+        if type(command) in (GCode, CommentBlock) and command.comment:
+            for heading in command.comment.split('\n'):
+                measure()
+                yield section
+                heading_count = 0
+                section = _Section(
+                    heading, _NUMBER.sub('#', heading), [float(number) for number in _NUMBER.findall(heading)],
+                    line, [], None
+                )
+                line += 1
+            heading_count = 1
+            continue
+
+        section.commands.append(command)
+        line += 1 if command.comment is None else command.comment.count('\n') + 1
+
+    measure()
+    yield section
+
+
+def _compare(old: _Section, new: _Section, options: Options, tolerance: float) -> tuple[int, int, str] | None:
+    """
+    Find the first difference between two aligned sections.
+    :return: (old line, new line, description) of the difference, or None if the sections match.
+    """
+    if old.key != new.key or _numbers_differ(old.numbers, new.numbers, tolerance):
+        return old.line, new.line, f'{old.heading!r} became {new.heading!r}'
+
+    for index, (old_command, new_command) in enumerate(zip(old.commands, new.commands)):
+        if type(old_command) is not type(new_command) or _numbers_differ(_values(old_command), _values(new_command), tolerance):
+            return (
+                old.line + 1 + index, new.line + 1 + index,
+                f'{_describe(old_command, options)} became {_describe(new_command, options)}'
+            )
+
+    if len(old.commands) != len(new.commands):
+        index = min(len(old.commands), len(new.commands))
+        return (
+            old.line + 1 + index, new.line + 1 + index,
+            f'{len(old.commands)} commands became {len(new.commands)}'
+        )
+    return None
+
+
+def _fill(window: deque, sections: Iterator[_Section], size: int) -> None:
+    while len(window) < size:
+        section = next(sections, None)
+        if section is None:
+            return
+        window.append(section)
+
+
+def _find(window: deque, key: str | None) -> int | None:
+    for index, section in enumerate(window):
+        if section.key == key:
+            return index
+    return None
+
+
+def diff_programs(old: Iterable[GCode],
+                  new: Iterable[GCode],
+                  options: Options,
+                  tolerance: float = None,
+                  position: list[float] = None,
+                  window: int = 16) -> ProgramDiff:
+    """
+    Compare two programs, streaming through them section by section.
+
+    When the comments of the next sections differ, the following sections of each program are searched for a match,
+    and the sections skipped over are reported as added or removed. A removed section matching one of the last window
+    of added sections, or the reverse, is reported as moved instead. Only a window of sections of each program is held
+    at once, so the time taken grows linearly with the programs and the memory used does not grow with them.
+    :param old: Commands of the old program, such as the iterator returned by parse_file().
+    :param new: Commands of the new program.
+    :param options: Options used to format and measure the programs.
+    :param tolerance: Largest difference between numbers which are considered equal.
+    Defaults to None for the position precision.
+    :param position: Starting position of the programs. Defaults to None for an unknown position.
+    :param window: Number of sections of each program to search for a matching section. Defaults to 16.
+    :return: Differences between the programs.
+    """
+    if tolerance is None:
+        tolerance = options.output.tolerance
+
+    diff = ProgramDiff(old=Estimate(), new=Estimate())
+    old_sections, new_sections = _sections(old, options, position), _sections(new, options, position)
+    old_window, new_window = deque(), deque()
+    # Contents of the last window of unmatched sections, to find moved sections
+    removed, added = {}, {}
+
+    def diverge(old_line: int | None, new_line: int | None, detail: str) -> None:
+        if diff.first_divergence is None:
+            diff.first_divergence = (old_line, new_line, detail)
+
+    def content(section: _Section) -> tuple:
+        return section.key, tuple(
+            (type(command).__name__, *(round(value / tolerance) if isinstance(value, float) else value for value in _values(command)))
+            for command in section.commands
+        )
+
+    def unmatched(section: _Section, is_old: bool) -> None:
+        if is_old:
+            diff.old += section.estimate
+            kind, change = REMOVED, SectionChange(REMOVED, section.heading, section.line, None)
+        else:
+            diff.new += section.estimate
+            kind, change = ADDED, SectionChange(ADDED, section.heading, None, section.line)
+        diverge(change.old_line, change.new_line, f'{section.heading!r} was {kind}')
+
+        section_content = content(section)
+        other = added if is_old else removed
+        if section_content in other:
+            moved = other.pop(section_content)
+            moved.kind = MOVED
+            if is_old:
+                moved.old_line = section.line
+            else:
+                moved.new_line = section.line
+            return
+        pending = removed if is_old else added
+        pending[section_content] = change
+        if len(pending) > window:
+            del pending[next(iter(pending))]
+        diff.changes.append(change)
+
+    while True:
+        _fill(old_window, old_sections, window)
+        _fill(new_window, new_sections, window)
+        if len(old_window) == 0 or len(new_window) == 0:
+            break
+
+        old_section, new_section = old_window[0], new_window[0]
+        if old_section.key != new_section.key:
+            skip_new = _find(new_window, old_section.key)
+            skip_old = _find(old_window, new_section.key)
+            if skip_new is not None and (skip_old is None or skip_new <= skip_old):
+                for _ in range(skip_new):
+                    unmatched(new_window.popleft(), False)
+                continue
+            if skip_old is not None:
+                for _ in range(skip_old):
+                    unmatched(old_window.popleft(), True)
+                continue
+
+        old_window.popleft()
+        new_window.popleft()
+        diff.old += old_section.estimate
+        diff.new += new_section.estimate
+        difference = _compare(old_section, new_section, options, tolerance)
+        if difference is not None:
+            diverge(*difference)
+            diff.changes.append(SectionChange(CHANGED, new_section.heading, old_section.line, new_section.line, difference[2]))
+
+    for section in old_window:
+        unmatched(section, True)
+    for section in new_window:
+        unmatched(section, False)
+
+    return diff
@@ -0,0 +1,41 @@
+"""
+Fixed-point coordinates, held as integer counts of the smallest printed step, 10^-position_precision mm.
+
+A float is converted to the integer count of the step which it prints as, so that positions which print the same compare
+equal exactly, and sums of integer positions do not accumulate floating point error. Converting back gives the float
+nearest to the printed value, which prints the same text.
+
+Functions:
+- to_units()
+  - Convert a position to an integer count of printed steps.
+- from_units()
+  - Convert an integer count of printed steps back to a position.
+"""
+
+
+def to_units(value: float | None, precision: int) -> int | None:
+    """
+    Convert a position to an integer count of printed steps.
+
+    The value is rounded as it would be printed, half to even on its exact binary value, so that the count matches the
+    printed digits.
+    :param value: Position to convert, or None.
+    :param precision: Number of decimal places to which positions are printed.
+    :return: Number of steps of 10^-precision, or None if the value is None.
+    """
+    if value is None:
+        return None
+    return round(round(value, precision) * pow(10, precision))
+
+
+def from_units(units: int | None, precision: int) -> float | None:
+    """
+    Convert an integer count of printed steps back to a position.
+    :param units: Number of steps of 10^-precision, or None.
+    :param precision: Number of decimal places to which positions are printed.
+    :return: Position nearest to the count of steps, or None if the count is None.
+    """
+    if units is None:
+        return None
+    return units / pow(10, precision)
+
@@ -0,0 +1,112 @@
+"""
+Parsing of GCode text back into the command objects which the operations export.
+
+The dialect is the one printed by the commands: one command per line, words separated by spaces and an optional comment
+following a semicolon. Comment-only lines, including those printed from a CommentBlock, are read as one GCode per line,
+which prints the same text.
+
+Functions:
+- parse_gcode()
+  - Parse GCode text, or an iterable of lines, into commands.
+- parse_file()
+  - Parse a GCode file into commands, reading it a line at a time.
+"""
+
+from os import PathLike
+from typing import Iterable, Iterator
+
+from conversational_gcode.gcodes.GCodes import GCode, M2, M3, M5, G0, G1, G2, G3, G80, G81, G82, G83, CyclePosition
+
+# Command type and the attributes of the words which it accepts
+_COMMANDS = {
+    'G0': (G0, 'xyz'),
+    'G00': (G0, 'xyz'),
+    'G1': (G1, 'xyzf'),
+    'G01': (G1, 'xyzf'),
+    'G2': (G2, 'xyzijkf'),
+    'G02': (G2, 'xyzijkf'),
+    'G3': (G3, 'xyzijkf'),
+    'G03': (G3, 'xyzijkf'),
+    'G80': (G80, ''),
+    'G81': (G81, 'xyzrf'),
+    'G82': (G82, 'xyzrpf'),
+    'G83': (G83, 'xyzrqpf'),
+    'M2': (M2, ''),
+    'M02': (M2, ''),
+    'M3': (M3, 's'),
+    'M03': (M3, 's'),
+    'M5': (M5, ''),
+    'M05': (M5, ''),
+}
+_CYCLE_POSITION = (CyclePosition, 'xyz')
+# Attribute set by each word letter, in either case
+_ATTRIBUTES = {letter: letter.lower() for letter in 'XYZIJKFRPQS'} | {letter.lower(): letter.lower() for letter in 'XYZIJKFRPQS'}
+
+
+def _parse_line(line: str, number: int) -> GCode:
+    """
+    Parse a single line of GCode.
+    :param line: Line to parse, without its newline.
+    :param number: Line number, for error messages.
+    :return: The command.
+    :raises ValueError: If the line is not a supported command.
+    """
+    code, separator, comment = line.partition(';')
+    if separator == '' or comment == '':
+        comment = None
+    elif comment[0] == ' ':
+        comment = comment[1:]
+
+    words = code.split()
+    if len(words) == 0:
+        return GCode(comment)
+
+    command_word = words[0].upper()
+    if command_word[0] in 'XYZ':
+        command_type, letters = _CYCLE_POSITION
+    else:
+        try:
+            command_type, letters = _COMMANDS[command_word]
+        except KeyError:
+            raise ValueError(f'Line {number}: Unsupported command {words[0]}') from None
+        words = words[1:]
+
+    values = {}
+    for word in words:
+        attribute = _ATTRIBUTES.get(word[0])
+        if attribute is None or attribute not in letters or len(word) == 1:
+            raise ValueError(f'Line {number}: Unexpected word {word} in {command_word}')
+        try:
+            values[attribute] = int(word[1:]) if attribute == 'p' else float(word[1:])
+        except ValueError:
+            raise ValueError(f'Line {number}: Invalid number in {word}') from None
+
+    return command_type(comment=comment, **values)
+
+
+def parse_gcode(source: str | Iterable[str | bytes]) -> Iterator[GCode]:
+    """
+    Parse GCode text, or an iterable of lines, into commands.
+
+    Lines are parsed lazily, so that an open file, a stream or a memory map read with iter(mmap.readline, b'') is never
+    held in memory at once.
+    :param source: GCode text, or an iterable of lines of text or bytes.
+    :return: Iterator of the parsed commands.
+    :raises ValueError: If a line is not a supported command.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode()
+        yield _parse_line(line.rstrip('\r\n'), number)
+
+
+def parse_file(path: str | PathLike) -> Iterator[GCode]:
+    """
+    Parse a GCode file into commands, reading it a line at a time.
+    :param path: Path of the file.
+    :return: Iterator of the parsed commands.
+    :raises ValueError: If a line is not a supported command.
+    """
+    with open(path) as file:
+        yield from parse_gcode(file)
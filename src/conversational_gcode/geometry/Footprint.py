@@ -0,0 +1,192 @@
+"""
+Region of the XY-plane and range of depths cut by an operation.
+
+Classes:
+- Footprint
+  - Circular or rectangular region cut by an operation, between two depths.
+
+Functions:
+- segment_intersects()
+  - Check whether a line segment in the XY-plane crosses a footprint.
+"""
+
+from dataclasses import dataclass
+from math import hypot
+
+POCKET = 'pocket'
+PROFILE = 'profile'
+BOSS = 'boss'
+DRILL = 'drill'
+
+
+@dataclass
+class Footprint:
+    """
+    Circular or rectangular region cut by an operation, between two depths. Rectangles are aligned with the axes.
+
+    Attributes:
+        operation (Operation): Operation which cuts the region.
+        kind (str): Kind of feature, one of POCKET, PROFILE, BOSS or DRILL.
+        centre (list): [X, Y] centre of the region.
+        radius (float): Radius of a circular region. None for a rectangular region.
+        size (list): [X, Y] size of a rectangular region. None for a circular region.
+        bottom (float): Deepest Z-axis height cut.
+        top (float): Z-axis height at which the cut starts.
+        inner_radius (float): Radius of an uncut circle at the centre of a circular region, such as a boss.
+        Defaults to None if the whole circle is cut.
+        inner_size (list): [X, Y] size of an uncut rectangle at the centre of a rectangular region, such as a profile.
+        Defaults to None if the whole rectangle is cut.
+
+    Intersection checks exclude any uncut centre, so a region inside the uncut centre of another does not intersect it.
+    """
+    operation: object
+    kind: str
+    centre: list[float]
+    radius: float = None
+    size: list[float] = None
+    bottom: float = 0
+    top: float = 0
+    inner_radius: float = None
+    inner_size: list[float] = None
+
+    def _get_bounds(self) -> tuple[float, float, float, float]:
+        if self.radius is not None:
+            half_size = [self.radius, self.radius]
+        else:
+            half_size = [self.size[0] / 2, self.size[1] / 2]
+        return (
+            self.centre[0] - half_size[0], self.centre[1] - half_size[1],
+            self.centre[0] + half_size[0], self.centre[1] + half_size[1]
+        )
+
+    bounds = property(fget=_get_bounds)
+
+    def overlaps_depth(self, other: 'Footprint', tolerance: float = 0) -> bool:
+        """
+        Check whether the depth ranges of two footprints overlap.
+        :param other: Footprint to check against.
+        :param tolerance: Overlap allowed before the ranges are considered to overlap.
+        :return: True if the ranges overlap by more than the tolerance.
+        """
+        return min(self.top, other.top) - max(self.bottom, other.bottom) > tolerance
+
+    def intersects(self, other: 'Footprint', tolerance: float = 0) -> bool:
+        """
+        Check whether the regions of two footprints intersect in the XY-plane, excluding any uncut centre.
+
+        Regions are rings around their uncut centres, so if their outlines overlap, the regions only miss each other
+        when one lies wholly inside the uncut centre of the other.
+        :param other: Footprint to check against.
+        :param tolerance: Overlap allowed before the regions are considered to intersect.
+        :return: True if the regions overlap by more than the tolerance.
+        """
+        return (
+            self._outlines_intersect(other, tolerance) and
+            not self._inside_centre_of(other, tolerance) and
+            not other._inside_centre_of(self, tolerance)
+        )
+
+    def _inside_centre_of(self, other: 'Footprint', tolerance: float) -> bool:
+        """
+        Check whether the outline of this footprint lies inside the uncut centre of another, within the tolerance.
+        """
+        offset = [abs(self.centre[0] - other.centre[0]), abs(self.centre[1] - other.centre[1])]
+
+        if other.inner_radius is not None:
+            if self.radius is not None:
+                return hypot(offset[0], offset[1]) + self.radius - other.inner_radius <= tolerance
+            # The furthest corner of the rectangle
+            return hypot(offset[0] + self.size[0] / 2, offset[1] + self.size[1] / 2) - other.inner_radius <= tolerance
+
+        if other.inner_size is not None:
+            half_size = [self.radius, self.radius] if self.radius is not None else [self.size[0] / 2, self.size[1] / 2]
+            return (
+                offset[0] + half_size[0] - other.inner_size[0] / 2 <= tolerance and
+                offset[1] + half_size[1] - other.inner_size[1] / 2 <= tolerance
+            )
+
+        return False
+
+    def _outlines_intersect(self, other: 'Footprint', tolerance: float) -> bool:
+        """
+        Check whether the outlines of two footprints intersect, treating the regions as solid.
+        """
+        if self.radius is not None and other.radius is not None:
+            distance = hypot(self.centre[0] - other.centre[0], self.centre[1] - other.centre[1])
+            return self.radius + other.radius - distance > tolerance
+
+        if self.radius is None and other.radius is None:
+            return (
+                (self.size[0] + other.size[0]) / 2 - abs(self.centre[0] - other.centre[0]) > tolerance and
+                (self.size[1] + other.size[1]) / 2 - abs(self.centre[1] - other.centre[1]) > tolerance
+            )
+
+        circle, rectangle = (self, other) if self.radius is not None else (other, self)
+        min_x, min_y, max_x, max_y = rectangle.bounds
+        nearest = [min(max(circle.centre[0], min_x), max_x), min(max(circle.centre[1], min_y), max_y)]
+        return circle.radius - hypot(circle.centre[0] - nearest[0], circle.centre[1] - nearest[1]) > tolerance
+
+    def signed_distance(self, point: list[float]) -> float:
+        """
+        Distance from a point in the XY-plane to the edge of the region, excluding any uncut centre.
+        :param point: [X, Y] point to measure.
+        :return: Distance to the edge, negative if the point is inside the region.
+        """
+        offset = [point[0] - self.centre[0], point[1] - self.centre[1]]
+
+        if self.radius is not None:
+            distance = hypot(offset[0], offset[1])
+            if self.inner_radius is None:
+                return distance - self.radius
+            return max(distance - self.radius, self.inner_radius - distance)
+
+        distance = _box_distance(offset, self.size)
+        if self.inner_size is None:
+            return distance
+        return max(distance, -_box_distance(offset, self.inner_size))
+
+
+def _box_distance(offset: list[float], size: list[float]) -> float:
+    """
+    Signed distance from a point to the edge of a rectangle, centred on the origin.
+    """
+    outside = [abs(offset[0]) - size[0] / 2, abs(offset[1]) - size[1] / 2]
+    return hypot(max(outside[0], 0), max(outside[1], 0)) + min(max(outside[0], outside[1]), 0)
+
+
+def segment_intersects(start: list[float], end: list[float], footprint: Footprint) -> bool:
+    """
+    Check whether a line segment in the XY-plane crosses a footprint.
+    :param start: [X, Y] start of the segment.
+    :param end: [X, Y] end of the segment.
+    :param footprint: Footprint to check against.
+    :return: True if any part of the segment is inside the footprint.
+    """
+    delta = [end[0] - start[0], end[1] - start[1]]
+
+    if footprint.radius is not None:
+        length_squared = delta[0] * delta[0] + delta[1] * delta[1]
+        if length_squared == 0:
+            fraction = 0
+        else:
+            fraction = ((footprint.centre[0] - start[0]) * delta[0] + (footprint.centre[1] - start[1]) * delta[1]) / length_squared
+            fraction = min(max(fraction, 0), 1)
+        nearest = [start[0] + fraction * delta[0], start[1] + fraction * delta[1]]
+        return hypot(footprint.centre[0] - nearest[0], footprint.centre[1] - nearest[1]) < footprint.radius
+
+    # Clip the segment to the rectangle, one axis at a time
+    min_x, min_y, max_x, max_y = footprint.bounds
+    entry, exit_ = 0, 1
+    for axis, (minimum, maximum) in enumerate([(min_x, max_x), (min_y, max_y)]):
+        if delta[axis] == 0:
+            if not minimum < start[axis] < maximum:
+                return False
+            continue
+        near = (minimum - start[axis]) / delta[axis]
+        far = (maximum - start[axis]) / delta[axis]
+        if near > far:
+            near, far = far, near
+        entry, exit_ = max(entry, near), min(exit_, far)
+        if entry >= exit_:
+            return False
+    return True
@@ -0,0 +1,65 @@
+"""
+Spatial index of bounding boxes in the XY-plane.
+
+Classes:
+- SpatialGrid
+  - Uniform grid of cells, each listing the items whose bounding boxes cover it.
+"""
+
+from math import floor
+
+
+class SpatialGrid:
+    """
+    Uniform grid of cells, each listing the items whose bounding boxes cover it.
+
+    Finding the items near a bounding box only checks the cells which it covers, so finding every overlapping pair of
+    items is close to linear in the number of items when the cell size is similar to the item size.
+    """
+
+    def __init__(self, cell_size: float):
+        """
+        Initialise an empty grid.
+        :param cell_size: Width and length of each cell. Must be positive.
+        """
+        self._cell_size = cell_size
+        self._cells = {}
+
+    def _cell_range(self, bounds: tuple[float, float, float, float]) -> tuple[range, range]:
+        min_x, min_y, max_x, max_y = bounds
+        return (
+            range(floor(min_x / self._cell_size), floor(max_x / self._cell_size) + 1),
+            range(floor(min_y / self._cell_size), floor(max_y / self._cell_size) + 1)
+        )
+
+    def insert(self, item: int, bounds: tuple[float, float, float, float]) -> None:
+        """
+        Add an item to the grid.
+        :param item: Item to add, usually an index into a list of the actual objects.
+        :param bounds: (min X, min Y, max X, max Y) bounding box of the item.
+        """
+        x_range, y_range = self._cell_range(bounds)
+        for x in x_range:
+            for y in y_range:
+                self._cells.setdefault((x, y), []).append(item)
+
+    def query(self, bounds: tuple[float, float, float, float]) -> set[int]:
+        """
+        Find the items whose cells are covered by a bounding box. These include every item whose bounding box overlaps
+        it, as well as some nearby items.
+        :param bounds: (min X, min Y, max X, max Y) bounding box in which to search.
+        :return: Set of items.
+        """
+        items = set()
+        x_range, y_range = self._cell_range(bounds)
+        if len(x_range) * len(y_range) > len(self._cells):
+            # Large areas, such as long rapid moves, cover fewer occupied cells than empty ones
+            for (x, y), cell_items in self._cells.items():
+                if x in x_range and y in y_range:
+                    items.update(cell_items)
+            return items
+
+        for x in x_range:
+            for y in y_range:
+                items.update(self._cells.get((x, y), ()))
+        return items
@@ -5,10 +5,15 @@ Classes:
 - Drill
   - Operation to drill multiple holes.
 """
+from math import ceil, hypot, pi
+
 from conversational_gcode.operations.Operation import Operation
 from conversational_gcode.options.Options import Options
-from conversational_gcode.validate.validation_result import ValidationResult
-from conversational_gcode.gcodes.GCodes import GCode, G80, G81, G82, G83, CyclePosition
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+from conversational_gcode.validate.point_validation import find_invalid_point
+from conversational_gcode.gcodes.GCodes import GCode, G80, G81, G82, G83, CyclePosition, PLUNGE
+from conversational_gcode.geometry.Footprint import Footprint, DRILL
+from conversational_gcode.estimate.Estimate import Estimate
 
 
 class Drill(Operation):
@@ -45,6 +50,8 @@ class Drill(Operation):
         results = []
         if self._centres is None or self._centres == []:
             results.append(ValidationResult(False, 'Drill centre coordinates must be specified'))
+        elif (invalid_index := find_invalid_point(self._centres)) is not None:
+            results.append(ValidationResult(False, f'Drill centre {invalid_index} must be a pair of finite [X, Y] coordinates'))
         if self._start_depth is None:
             results.append(ValidationResult(False, 'Drill start depth must be specified'))
         if self._depth is None or self._depth <= 0:
@@ -55,7 +62,7 @@ class Drill(Operation):
             results.append(ValidationResult(False, 'Drill dwell must be None, zero or positive'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
@@ -106,15 +113,15 @@ class Drill(Operation):
 
         if self._peck_interval is not None and self._peck_interval > 0:
             def drill_command(x, y, r, f, comment=None):
-                return G83(x=x, y=y, z=self._start_depth - self._depth, r=r, q=self._peck_interval, p=self._dwell, f=f, comment=comment)
+                return G83(x=x, y=y, z=self._start_depth - self._depth, r=r, q=self._peck_interval, p=self._dwell, f=f, move=PLUNGE, comment=comment)
         elif self._dwell is not None and self._dwell > 0:
             def drill_command(x, y, r, f, comment=None):
-                return G82(x=x, y=y, z=self._start_depth - self._depth, r=r, p=self._dwell, f=f, comment=comment)
+                return G82(x=x, y=y, z=self._start_depth - self._depth, r=r, p=self._dwell, f=f, move=PLUNGE, comment=comment)
         else:
             def drill_command(x, y, r, f, comment=None):
-                return G81(x=x, y=y, z=self._start_depth - self._depth, r=r, f=f, comment=comment)
+                return G81(x=x, y=y, z=self._start_depth - self._depth, r=r, f=f, move=PLUNGE, comment=comment)
 
-        commands.append(drill_command(x=position[0], y=position[1], r=job_options.lead_in, f=tool_options.feed_rate, comment='Start drilling cycle'))
+        commands.append(drill_command(x=position[0], y=position[1], r=job_options.lead_in, f=tool_options.plunge_feed_rate, comment='Start drilling cycle'))
 
         for centre in self._centres[1:]:
             position[0] = centre[0]
@@ -124,17 +131,60 @@ class Drill(Operation):
         commands.append(G80(comment='End drilling cycle'))
         commands.append(GCode(''))
 
-    def to_json(self) -> str:
-        centres_list = ','.join([f'[{centre[0]},{centre[1]}]' for centre in self._centres])
-        return (
-            '{' +
-            f'"centres":[{centres_list}],' +
-            (f'"depth":{self._depth},' if self._depth is not None else '') +
-            (f'"start_depth":{self._start_depth},' if self._start_depth is not None else '') +
-            (f'"peck_interval":{self._peck_interval},' if self._peck_interval is not None else '') +
-            (f'"dwell":{self._dwell}' if self._dwell is not None else '') +
-            '}'
-        ).replace(',}', '}').replace(',]', ']')
+    def start_point(self, options: Options) -> list[float]:
+        return [self._centres[0][0], self._centres[0][1], options.job.clearance_height]
+
+    def estimate(self, options: Options) -> Estimate:
+        job_options = options.job
+        rapid_rate = job_options.rapid_rate
+
+        estimate = Estimate(start=self.start_point(options))
+        estimate.add_commands(len(self._centres) + 2)
+
+        # Each hole is fed from the R-plane to depth, then retracted back to the R-plane
+        hole_depth = job_options.lead_in - (self._start_depth - self._depth)
+        hole_count = len(self._centres)
+        estimate.add_rapid(job_options.clearance_height - job_options.lead_in + hole_count * hole_depth, rapid_rate)
+        estimate.add_feed(hole_count * hole_depth, options.tool.plunge_feed_rate)
+
+        for centre, next_centre in zip(self._centres, self._centres[1:]):
+            estimate.add_rapid(hypot(next_centre[0] - centre[0], next_centre[1] - centre[1]), rapid_rate)
+
+        if self._peck_interval is not None and self._peck_interval > 0:
+            pecks = ceil(hole_depth / self._peck_interval)
+            estimate.add_rapid(hole_count * self._peck_interval * pecks * (pecks - 1), rapid_rate)
+        if self._dwell is not None and self._dwell > 0:
+            estimate.add_dwell(hole_count * self._dwell / 1000)
+
+        estimate.end = [self._centres[-1][0], self._centres[-1][1], job_options.lead_in]
+        return estimate
+
+    def footprints(self, options: Options) -> list[Footprint]:
+        radius = options.tool.tool_radius
+        return [
+            Footprint(
+                self, DRILL, [centre[0], centre[1]], radius=radius,
+                bottom=self._start_depth - self._depth, top=self._start_depth
+            )
+            for centre in self._centres
+        ]
+
+    def removed_volume(self, options: Options) -> float:
+        return len(self._centres) * pi * options.tool.tool_radius ** 2 * self._depth
+
+    def peak_removal_rates(self, options: Options) -> dict[str, float]:
+        return {PLUNGE: pi * options.tool.tool_radius ** 2 * options.tool.plunge_feed_rate}
+
+    def to_dict(self) -> dict:
+        return {
+            key: value for key, value in (
+                ('centres', [[centre[0], centre[1]] for centre in self._centres]),
+                ('depth', self._depth),
+                ('start_depth', self._start_depth),
+                ('peck_interval', self._peck_interval),
+                ('dwell', self._dwell)
+            ) if value is not None
+        }
 
     def __repr__(self) -> str:
         return f'Drill(centres={self.centres}, depth={self.depth}, start_depth={self.start_depth}, peck_interval={self.peck_interval}, dwell={self.dwell})'
@@ -1,5 +1,10 @@
+import json
+
 from conversational_gcode.gcodes.GCodes import GCode
 from conversational_gcode.options.Options import Options
+from conversational_gcode.estimate.Estimate import Estimate
+from conversational_gcode.estimate.MachiningStatistics import MachiningStatistics, measure_statistics
+from conversational_gcode.geometry.Footprint import Footprint
 
 
 class Operation:
@@ -9,3 +14,68 @@ class Operation:
 
     def generate(self, position: list[float], commands: list[GCode], options: Options) -> None:
         raise NotImplementedError
+
+    def estimate(self, options: Options) -> Estimate:
+        raise NotImplementedError
+
+    def start_point(self, options: Options) -> list[float]:
+        """
+        Position at the clearance height to which the tool first moves, found without estimating the operation.
+        :param options: Options for the generation.
+        :return: [X, Y, Z] start position, equal to the start of estimate().
+        """
+        raise NotImplementedError
+
+    def footprints(self, options: Options) -> list[Footprint]:
+        raise NotImplementedError
+
+    def removed_volume(self, options: Options) -> float:
+        raise NotImplementedError
+
+    def peak_removal_rates(self, options: Options) -> dict[str, float]:
+        raise NotImplementedError
+
+    def generate_with_statistics(self, position: list[float], commands: list[GCode], options: Options) -> MachiningStatistics:
+        """
+        Generate the GCode for the operation, and measure how heavily it loads the tool.
+        The volume and peak material removal rates are found from the geometry of the operation, and the time spent in
+        each class of feed move from the generated commands, without simulating the stock.
+        :param position: Starting position of the operation. To be mutated to keep up to date.
+        :param commands: List of GCode commands to which to add.
+        :param options: Options for the generation.
+        :return: Statistics of the material removed by the operation.
+        """
+        start = len(commands)
+        start_position = [*position]
+        self.generate(position, commands, options)
+        return measure_statistics(
+            commands[start:], options, self.removed_volume(options), self.peak_removal_rates(options), start_position,
+            self
+        )
+
+    def trimmed(self, top: float) -> 'Operation':
+        """
+        Copy the operation to start lower down, with the same final depth. Used to avoid cutting air above stock which
+        has already been cut away.
+        :param top: Z-axis height at which the copy starts.
+        :return: The copied operation.
+        """
+        data = self.to_dict()
+        data['depth'] -= data['start_depth'] - top
+        data['start_depth'] = top
+        return self.from_dict(data)
+
+    def to_dict(self) -> dict:
+        raise NotImplementedError
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Operation':
+        """
+        Create an operation from the dictionary written by to_dict().
+        :param data: Dictionary of the operation's constructor arguments.
+        :return: The operation.
+        """
+        return cls(**data)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
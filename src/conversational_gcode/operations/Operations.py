@@ -8,14 +8,63 @@ Functions:
   - Helical interpolation to a set depth.
 - spiral_out()
   - Spiral out from a given location to a final diameter.
+- spiral_in()
+  - Spiral in from a given location to a final diameter.
+- estimate_rapid_with_z_hop()
+  - Estimate the cost of rapid_with_z_hop() without generating commands.
+- estimate_helical_plunge()
+  - Estimate the cost of helical_plunge() without generating commands.
+- estimate_spiral_out()
+  - Estimate the cost of spiral_out() without generating commands.
+- estimate_spiral_in()
+  - Estimate the cost of spiral_in() without generating commands.
+- helix_removal_rate()
+  - Fastest rate at which helical_plunge() removes material.
+- spiral_stepover()
+  - Radial stepover taken by spiral_out() or spiral_in() between two radii.
+- max_pass_count()
+  - Maximum number of passes a toolpath loop may take to cover a distance.
+- check_pass_count()
+  - Abandon generation if a toolpath loop has exceeded its maximum pass count.
 """
 
-from math import pi, ceil, tan, isclose
+from math import pi, ceil, hypot, isclose, sqrt
 from typing import Tuple
 
 from conversational_gcode.options.JobOptions import JobOptions
 from conversational_gcode.options.ToolOptions import ToolOptions
-from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3
+from conversational_gcode.options.OutputOptions import OutputOptions
+from conversational_gcode.options.Options import Options
+from conversational_gcode.estimate.Estimate import Estimate, distance
+from conversational_gcode.validate.generation_error import GenerationError
+from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3, HELIX, ROUGHING
+
+
+def max_pass_count(distance: float, step: float) -> int:
+    """
+    Maximum number of passes a toolpath loop may take to cover a distance in steps of a given size.
+
+    One pass more than the ideal count is allowed to absorb floating point error.
+    :param distance: Distance to cover.
+    :param step: Size of each step.
+    :return: Maximum number of passes.
+    """
+    if distance == 0:
+        return 0
+    if step is None or step <= 0:
+        raise GenerationError(f'Step of {step}mm cannot cover a distance of {distance}mm')
+    return ceil(abs(distance) / step) + 1
+
+
+def check_pass_count(pass_count: int, maximum: int, description: str) -> None:
+    """
+    Abandon generation if a toolpath loop has exceeded its maximum pass count.
+    :param pass_count: Number of passes made so far.
+    :param maximum: Maximum number of passes permitted.
+    :param description: Description of the loop, for the error message.
+    """
+    if pass_count > maximum:
+        raise GenerationError(f'{description} did not finish within {maximum} passes')
 
 
 def rapid_with_z_hop(
@@ -76,7 +125,7 @@ def helical_plunge(
         position: list[float],
         commands: list,
         tool_options: ToolOptions,
-        precision: float,
+        output_options: OutputOptions,
         is_inner: bool = True,
         is_climb: bool = False) -> None:
     """
@@ -87,7 +136,7 @@ def helical_plunge(
     :param position: current position of the tool. To be mutated to keep up to date.
     :param commands: List of GCode commands to which to add.
     :param tool_options: Options for the tool.
-    :param precision: Positional precision to use.
+    :param output_options: Options for the output, from which to get the positional tolerance.
     :param is_inner: True if cutting inside a diameter.
     :param is_climb: True if using a climb cut rather than a conventional cut.
     """
@@ -100,7 +149,7 @@ def helical_plunge(
     # Helically plunge to depth
     commands.append(GCode('Helical interpolation down to step depth'))
     path_circumference = 2 * pi * path_radius
-    plunge_per_rev_using_angle = path_circumference * tan(tool_options.max_helix_angle * pi / 180)
+    plunge_per_rev_using_angle = path_circumference * tool_options.helix_slope
     average_plunge_per_rev_using_angle = plunge_depth / ceil(plunge_depth / plunge_per_rev_using_angle)
 
     plunge_per_rev = min(tool_options.max_stepdown, average_plunge_per_rev_using_angle)
@@ -112,12 +161,18 @@ def helical_plunge(
     else:
         command = G2
 
-    while not isclose(position[2], step_depth, abs_tol=pow(10, -precision)) and position[2] > step_depth:
+    maximum_passes = max_pass_count(plunge_depth, plunge_per_rev)
+    pass_count = 0
+    tolerance = output_options.tolerance
+    while not isclose(position[2], step_depth, abs_tol=tolerance) and position[2] > step_depth:
+        pass_count += 1
+        check_pass_count(pass_count, maximum_passes, 'Helical plunge')
         position[2] = position[2] - plunge_per_rev
         commands.append(
-            command(x=position[0], y=position[1], z=position[2], i=-path_radius, f=tool_options.feed_rate))
+            command(x=position[0], y=position[1], z=position[2], i=-path_radius, f=tool_options.helix_feed_rate,
+                    move=HELIX))
     commands.append(
-        command(x=position[0], y=position[1], z=position[2], i=-path_radius, f=tool_options.feed_rate,
+        command(x=position[0], y=position[1], z=position[2], i=-path_radius, f=tool_options.helix_feed_rate, move=HELIX,
                 comment='Final full pass at depth'))
 
 
@@ -127,7 +182,7 @@ def spiral_out(
         position: list[float],
         commands: list,
         tool_options: ToolOptions,
-        precision: int) -> None:
+        output_options: OutputOptions) -> None:
     """
     Spiral out from a given location to a final diameter.
 
@@ -137,28 +192,35 @@ def spiral_out(
     :param position: current position of the tool. To be mutated to keep up to date.
     :param commands: List of GCode commands to which to add.
     :param tool_options: Options for the tool.
-    :param precision: Positional precision to use.
+    :param output_options: Options for the output, from which to get the positional precision and tolerance.
     """
     radial_stepover = (final_path_radius - current_radius) / max(1, ceil(
         (final_path_radius - current_radius) / tool_options.max_stepover))
     path_radius = current_radius
+    precision = output_options.position_precision
 
     commands.append(
         GCode(f'Spiral out to final radius in {radial_stepover:.{precision}f}mm passes')
     )
-    while not isclose(path_radius, final_path_radius, abs_tol=pow(10, -precision)):
+    maximum_passes = max_pass_count(final_path_radius - current_radius, radial_stepover)
+    pass_count = 0
+    tolerance = output_options.tolerance
+    while not isclose(path_radius, final_path_radius, abs_tol=tolerance) and path_radius < final_path_radius:
+        pass_count += 1
+        check_pass_count(pass_count, maximum_passes, 'Spiral out')
         # Semicircle out increasing radius
         path_radius += radial_stepover / 2
         position[0] -= path_radius * 2
-        commands.append(G2(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate))
+        commands.append(G2(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate, move=ROUGHING))
         # Semi circle maintaining radius
         path_radius += radial_stepover / 2
         position[0] += path_radius * 2
-        commands.append(G2(x=position[0], y=position[1], i=path_radius, f=tool_options.feed_rate))
+        commands.append(G2(x=position[0], y=position[1], i=path_radius, f=tool_options.feed_rate, move=ROUGHING))
     # Complete circle at final radius
     position[0] -= path_radius * 2
     commands.append(
-        G2(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate, comment='Complete circle at final radius'))
+        G2(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate, move=ROUGHING,
+           comment='Complete circle at final radius'))
 
 
 def spiral_in(
@@ -167,7 +229,7 @@ def spiral_in(
         position: list[float],
         commands: list,
         tool_options: ToolOptions,
-        precision: int) -> None:
+        output_options: OutputOptions) -> None:
     """
     Spiral in from a given location to a final diameter.
 
@@ -177,23 +239,205 @@ def spiral_in(
     :param position: current position of the tool. To be mutated to keep up to date.
     :param commands: List of GCode commands to which to add.
     :param tool_options: Options for the tool.
-    :param precision: Positional precision to use.
+    :param output_options: Options for the output, from which to get the positional precision and tolerance.
     """
     radial_stepover = (current_radius - final_path_radius) / max(1, ceil(
         (current_radius - final_path_radius) / tool_options.max_stepover))
     path_radius = current_radius
+    precision = output_options.position_precision
 
     commands.append(GCode(f'Spiral in to final radius in {radial_stepover:.{precision}f}mm passes'))
-    while not isclose(path_radius, final_path_radius, abs_tol=pow(10, -precision)):
+    maximum_passes = max_pass_count(current_radius - final_path_radius, radial_stepover)
+    pass_count = 0
+    tolerance = output_options.tolerance
+    while not isclose(path_radius, final_path_radius, abs_tol=tolerance) and path_radius > final_path_radius:
+        pass_count += 1
+        check_pass_count(pass_count, maximum_passes, 'Spiral in')
         # Semicircle in decreasing radius
         path_radius -= radial_stepover / 2
         position[0] -= path_radius * 2
-        commands.append(G3(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate))
+        commands.append(G3(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate, move=ROUGHING))
         # Semi circle maintaining radius
         path_radius -= radial_stepover / 2
         position[0] += path_radius * 2
-        commands.append(G3(x=position[0], y=position[1], i=path_radius, f=tool_options.feed_rate))
+        commands.append(G3(x=position[0], y=position[1], i=path_radius, f=tool_options.feed_rate, move=ROUGHING))
     # Complete circle at final radius
     position[0] -= path_radius * 2
     commands.append(
-        G3(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate, comment='Complete circle at final radius'))
+        G3(x=position[0], y=position[1], i=-path_radius, f=tool_options.feed_rate, move=ROUGHING,
+           comment='Complete circle at final radius'))
+
+
+def estimate_rapid_with_z_hop(
+        position: list[float],
+        new_position: list[float],
+        estimate: Estimate,
+        options: Options
+) -> None:
+    """
+    Estimate the cost of rapid_with_z_hop() without generating commands.
+    :param position: Start position from which to move. To be mutated to keep up to date.
+    :param new_position: End position to which to move.
+    :param estimate: Estimate to which to add.
+    :param options: Options for the generation.
+    """
+    if position == new_position:
+        return
+
+    retract_height = max(new_position[2], position[2] if position[2] is not None else new_position[2]) + options.job.lead_in
+    retract_position = [position[0], position[1], retract_height]
+
+    estimate.add_commands(3)
+    estimate.add_rapid(
+        distance(position, retract_position) +
+        distance(retract_position, [new_position[0], new_position[1], retract_height]) +
+        retract_height - new_position[2],
+        options.job.rapid_rate
+    )
+
+    position[0:3] = new_position
+
+
+def estimate_helical_plunge(
+        centre: list[float],
+        path_radius: float,
+        plunge_depth: float,
+        position: list[float],
+        estimate: Estimate,
+        options: Options,
+        start_depth: float = None) -> None:
+    """
+    Estimate the cost of helical_plunge() without generating commands.
+    :param centre: XY centre of the helix.
+    :param path_radius: Radius of the helical path.
+    :param plunge_depth: Depth to which to plunge.
+    :param position: current position of the tool. To be mutated to keep up to date.
+    :param estimate: Estimate to which to add.
+    :param options: Options for the generation.
+    :param start_depth: Z-axis depth at which to start the helix. Defaults to None to start at the current depth.
+    """
+    tool_options = options.tool
+    tolerance = options.output.tolerance
+
+    start_position = [centre[0] + path_radius, centre[1], position[2] if start_depth is None else start_depth]
+    estimate.add_rapid(distance(position, start_position), options.job.rapid_rate)
+    position[0:3] = start_position
+
+    path_circumference = 2 * pi * path_radius
+    plunge_per_rev_using_angle = path_circumference * tool_options.helix_slope
+    average_plunge_per_rev_using_angle = plunge_depth / ceil(plunge_depth / plunge_per_rev_using_angle)
+
+    plunge_per_rev = min(tool_options.max_stepdown, average_plunge_per_rev_using_angle)
+    revolutions = max(0, ceil((plunge_depth - tolerance) / plunge_per_rev))
+
+    estimate.add_commands(3 + revolutions)
+    estimate.add_feed(
+        revolutions * sqrt(path_circumference * path_circumference + plunge_per_rev * plunge_per_rev) + path_circumference,
+        tool_options.helix_feed_rate
+    )
+    position[2] -= revolutions * plunge_per_rev
+
+
+def _estimate_spiral(
+        current_radius: float,
+        final_path_radius: float,
+        position: list[float],
+        estimate: Estimate,
+        options: Options) -> None:
+    """
+    Estimate the cost of spiral_out() or spiral_in(), depending on the direction of the final radius.
+    """
+    tool_options = options.tool
+    tolerance = options.output.tolerance
+
+    radial_distance = abs(final_path_radius - current_radius)
+    radial_stepover = radial_distance / max(1, ceil(radial_distance / tool_options.max_stepover))
+    passes = max(0, ceil((radial_distance - tolerance) / radial_stepover)) if radial_stepover > 0 else 0
+    direction = 1 if final_path_radius > current_radius else -1
+
+    # Each pass is a semicircle about a centre offset by half a stepover, then a semicircle about the true centre,
+    # followed by a final semicircle at the final radius
+    spiral_length = pi * (
+            2 * passes * current_radius +
+            direction * radial_stepover * passes * (passes - 1) +
+            direction * 1.5 * radial_stepover * passes
+    )
+    path_radius = current_radius + direction * passes * radial_stepover
+
+    estimate.add_commands(2 + 2 * passes)
+    estimate.add_feed(spiral_length + pi * path_radius, tool_options.feed_rate)
+    position[0] += direction * passes * radial_stepover - 2 * path_radius
+
+
+def estimate_spiral_out(
+        current_radius: float,
+        final_path_radius: float,
+        position: list[float],
+        estimate: Estimate,
+        options: Options) -> None:
+    """
+    Estimate the cost of spiral_out() without generating commands.
+    :param current_radius: Radius of the current path.
+    :param final_path_radius: Target radius of the final path.
+    :param position: current position of the tool. To be mutated to keep up to date.
+    :param estimate: Estimate to which to add.
+    :param options: Options for the generation.
+    """
+    _estimate_spiral(current_radius, final_path_radius, position, estimate, options)
+
+
+def estimate_spiral_in(
+        current_radius: float,
+        final_path_radius: float,
+        position: list[float],
+        estimate: Estimate,
+        options: Options) -> None:
+    """
+    Estimate the cost of spiral_in() without generating commands.
+    :param current_radius: Radius of the current path.
+    :param final_path_radius: Target radius of the final path.
+    :param position: current position of the tool. To be mutated to keep up to date.
+    :param estimate: Estimate to which to add.
+    :param options: Options for the generation.
+    """
+    _estimate_spiral(current_radius, final_path_radius, position, estimate, options)
+
+
+def helix_removal_rate(path_radius: float, tool_options: ToolOptions, stock_radius: float = None) -> float:
+    """
+    Fastest rate at which helical_plunge() removes material.
+
+    The tool sweeps a ring around the centre of the helix, which is a solid circle if the path is within the tool
+    radius, and descends by up to the step down or the helix angle on each turn.
+    :param path_radius: Radius of the helical path.
+    :param tool_options: Options for the tool.
+    :param stock_radius: Radius within which there is stock to cut, such as the initial diameter of a boss.
+    Defaults to None for stock all around the helix.
+    :return: Volume removed per minute, in mm³.
+    """
+    inner_radius = max(0.0, path_radius - tool_options.tool_radius)
+    outer_radius = path_radius + tool_options.tool_radius
+    if stock_radius is not None:
+        outer_radius = min(outer_radius, stock_radius)
+    if outer_radius <= inner_radius:
+        return 0
+
+    path_circumference = 2 * pi * path_radius
+    plunge_per_rev = min(tool_options.max_stepdown, path_circumference * tool_options.helix_slope)
+    turn_length = hypot(path_circumference, plunge_per_rev)
+    if turn_length == 0:
+        return 0
+    ring_area = pi * (outer_radius ** 2 - inner_radius ** 2)
+    return ring_area * plunge_per_rev * tool_options.helix_feed_rate / turn_length
+
+
+def spiral_stepover(current_radius: float, final_path_radius: float, tool_options: ToolOptions) -> float:
+    """
+    Radial stepover taken by spiral_out() or spiral_in() between two radii.
+    :param current_radius: Radius of the current path.
+    :param final_path_radius: Target radius of the final path.
+    :param tool_options: Options for the tool.
+    :return: The stepover of each turn.
+    """
+    distance_to_cover = abs(final_path_radius - current_radius)
+    return distance_to_cover / max(1, ceil(distance_to_cover / tool_options.max_stepover))
@@ -6,15 +6,19 @@ Classes:
   - Operation to create a circular boss.
 """
 
-from math import ceil, isclose
+from math import ceil, isclose, pi
 
 from conversational_gcode.operations.Operation import Operation
 from conversational_gcode.options.JobOptions import JobOptions
 from conversational_gcode.options.Options import Options
 from conversational_gcode.options.ToolOptions import ToolOptions
-from conversational_gcode.validate.validation_result import ValidationResult
-from conversational_gcode.operations.Operations import helical_plunge, spiral_in
-from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+from conversational_gcode.operations.Operations import helical_plunge, spiral_in, max_pass_count, check_pass_count
+from conversational_gcode.operations.Operations import estimate_helical_plunge, estimate_spiral_in
+from conversational_gcode.operations.Operations import helix_removal_rate, spiral_stepover
+from conversational_gcode.geometry.Footprint import Footprint, BOSS
+from conversational_gcode.estimate.Estimate import Estimate, distance
+from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3, HELIX, ROUGHING, FINISHING
 
 
 class CircularBoss(Operation):
@@ -63,7 +67,7 @@ class CircularBoss(Operation):
             results.append(ValidationResult(False, 'Boss height must be positive and non-zero'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
@@ -115,6 +119,7 @@ class CircularBoss(Operation):
         # Setup #
         #########
         precision = options.output.position_precision
+        tolerance = options.output.tolerance
         tool_options = options.tool
         job_options = options.job
 
@@ -135,20 +140,25 @@ class CircularBoss(Operation):
         # Mill away material in depth steps
         final_depth = self._top_height - self._height
         deepest_cut_depth = position[2]
-        while not isclose(deepest_cut_depth, final_depth, abs_tol=pow(10, -precision)):
+        maximum_passes = max_pass_count(total_plunge, step_plunge)
+        pass_count = 0
+        while not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance) and deepest_cut_depth > final_depth:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Circular boss depth steps')
             initial_path_radius = (self._initial_diameter + tool_options.tool_diameter) / 2
             position[2] = deepest_cut_depth
 
             # Helical interpolate to depth
             helical_plunge(self._centre, initial_path_radius, step_plunge, position,
-                           commands, tool_options, precision, is_inner=False)
+                           commands, tool_options, options.output, is_inner=False)
 
             deepest_cut_depth = position[2]
-            if not isclose(initial_path_radius, final_path_radius, abs_tol=pow(10, -precision)):
+            if not isclose(initial_path_radius, final_path_radius, abs_tol=tolerance):
                 # Spiral in to final radius
-                spiral_in(initial_path_radius, final_path_radius, position, commands, tool_options, precision)
+                spiral_in(initial_path_radius, final_path_radius, position,
+                          commands, tool_options, options.output)
 
-                if not isclose(deepest_cut_depth, final_depth, abs_tol=pow(10, -precision)):
+                if not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance):
                     self._clear_wall(position, commands, job_options)
                     position[2] = job_options.clearance_height
                     commands.append(G0(z=position[2]))
@@ -202,24 +212,144 @@ class CircularBoss(Operation):
 
         commands.append(
             finishing_command(x=position[0], y=position[1], i=relative_centre, f=tool_options.finishing_feed_rate,
-                              comment='Spiral out to finishing pass'))
+                              move=FINISHING, comment='Spiral out to finishing pass'))
         # Full circle at finishing depth
         relative_centre = -(path_radius - tool_options.finishing_pass) * relative_centre_multiplier
         commands.append(
             finishing_command(x=position[0], y=position[1], i=relative_centre, f=tool_options.finishing_feed_rate,
-                              comment='Complete circle at final radius'))
+                              move=FINISHING, comment='Complete circle at final radius'))
 
-    def to_json(self) -> str:
-        return (
-                '{' +
-                f'"centre":[{self._centre[0]},{self._centre[1]}],' +
-                f'"top_height":{self._top_height},' +
-                f'"initial_diameter":{self._initial_diameter},' +
-                f'"final_diameter":{self._final_diameter},' +
-                f'"height":{self._height},' +
-                f'"finishing_pass":{str(self._finishing_pass).lower()},' +
-                '}'
-        ).replace(',}', '}')
+    def start_point(self, options: Options) -> list[float]:
+        return [self._centre[0], self._centre[1], options.job.clearance_height]
+
+    def estimate(self, options: Options) -> Estimate:
+        #########
+        # Setup #
+        #########
+        tolerance = options.output.tolerance
+        tool_options = options.tool
+        job_options = options.job
+
+        roughing_diameter = self._final_diameter
+        has_finishing_pass = self._finishing_pass and tool_options.finishing_pass > 0
+
+        if has_finishing_pass:
+            roughing_diameter += 2 * tool_options.finishing_pass
+
+        final_path_radius = (roughing_diameter + tool_options.tool_diameter) / 2
+        initial_path_radius = (self._initial_diameter + tool_options.tool_diameter) / 2
+
+        estimate = Estimate(start=self.start_point(options))
+        position = [*estimate.start]
+
+        # Position tool ready to begin
+        estimate.add_commands(2)
+        estimate.add_rapid(position[2] - self._top_height - job_options.lead_in, job_options.rapid_rate)
+        position[2] = self._top_height + job_options.lead_in
+
+        total_plunge = job_options.lead_in + self._height
+        step_plunge = total_plunge / ceil(total_plunge / tool_options.max_stepdown)
+
+        final_depth = self._top_height - self._height
+        deepest_cut_depth = position[2]
+        maximum_passes = max_pass_count(total_plunge, step_plunge)
+        pass_count = 0
+        while not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance) and deepest_cut_depth > final_depth:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Circular boss depth steps')
+            estimate_helical_plunge(self._centre, initial_path_radius, step_plunge, position, estimate, options,
+                                    start_depth=deepest_cut_depth)
+
+            deepest_cut_depth = position[2]
+            if not isclose(initial_path_radius, final_path_radius, abs_tol=tolerance):
+                estimate_spiral_in(initial_path_radius, final_path_radius, position, estimate, options)
+
+                if not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance):
+                    self._estimate_clear_wall(position, estimate, job_options)
+                    estimate.add_commands(2)
+                    estimate.add_rapid(
+                        job_options.clearance_height - position[2] + abs(self._centre[0] + initial_path_radius - position[0]),
+                        job_options.rapid_rate
+                    )
+                    position[2] = job_options.clearance_height
+                    position[0] = self._centre[0] + initial_path_radius
+                estimate.add_commands()
+
+        if has_finishing_pass:
+            is_right = position[0] > self._centre[0]
+            path_radius = abs(position[0] - self._centre[0])
+            position[0] += (path_radius * 2 - tool_options.finishing_pass) * (-1 if is_right else 1)
+
+            estimate.add_commands(3)
+            estimate.add_feed(
+                pi * (path_radius - tool_options.finishing_pass / 2) + 2 * pi * (path_radius - tool_options.finishing_pass),
+                tool_options.finishing_feed_rate
+            )
+        self._estimate_clear_wall(position, estimate, job_options)
+
+        estimate.end = position
+        return estimate
+
+    def _estimate_clear_wall(self, position: list[float], estimate: Estimate, job_options: JobOptions) -> None:
+        start = [*position]
+        if position[0] > self._centre[0]:
+            position[0] = max(position[0] + 1, self._centre[0])
+        else:
+            position[0] = min(position[0] - 1, self._centre[0])
+        position[2] += job_options.lead_in
+
+        estimate.add_commands()
+        estimate.add_rapid(distance(start, position), job_options.rapid_rate)
+
+    def footprints(self, options: Options) -> list[Footprint]:
+        # The tool cuts outside of the initial diameter on its first pass
+        return [Footprint(
+            self, BOSS, [*self._centre], radius=self._initial_diameter / 2 + options.tool.tool_diameter,
+            bottom=self._top_height - self._height, top=self._top_height, inner_radius=self._final_diameter / 2
+        )]
+
+    def removed_volume(self, options: Options) -> float:
+        return pi * ((self._initial_diameter / 2) ** 2 - (self._final_diameter / 2) ** 2) * self._height
+
+    def peak_removal_rates(self, options: Options) -> dict[str, float]:
+        tool_options = options.tool
+        job_options = options.job
+
+        roughing_diameter = self._final_diameter
+        has_finishing_pass = self._finishing_pass and tool_options.finishing_pass > 0
+
+        if has_finishing_pass:
+            roughing_diameter += 2 * tool_options.finishing_pass
+
+        final_path_radius = (roughing_diameter + tool_options.tool_diameter) / 2
+        initial_path_radius = (self._initial_diameter + tool_options.tool_diameter) / 2
+
+        total_plunge = job_options.lead_in + self._height
+        step_depth = min(total_plunge / ceil(total_plunge / tool_options.max_stepdown), self._height)
+
+        # The helix runs around the outside of the initial diameter, so only cuts stock if it overlaps it
+        rates = {HELIX: helix_removal_rate(initial_path_radius, tool_options, stock_radius=self._initial_diameter / 2)}
+        stepover = spiral_stepover(initial_path_radius, final_path_radius, tool_options)
+        rates[ROUGHING] = stepover * step_depth * tool_options.feed_rate
+        if has_finishing_pass:
+            rates[FINISHING] = tool_options.finishing_pass * self._height * tool_options.finishing_feed_rate
+        return rates
+
+    def trimmed(self, top: float) -> 'CircularBoss':
+        data = self.to_dict()
+        data['height'] -= data['top_height'] - top
+        data['top_height'] = top
+        return self.from_dict(data)
+
+    def to_dict(self) -> dict:
+        return {
+            'centre': [self._centre[0], self._centre[1]],
+            'top_height': self._top_height,
+            'initial_diameter': self._initial_diameter,
+            'final_diameter': self._final_diameter,
+            'height': self._height,
+            'finishing_pass': self._finishing_pass
+        }
 
     def __repr__(self) -> str:
         return (
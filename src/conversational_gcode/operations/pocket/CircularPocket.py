@@ -6,15 +6,19 @@ Classes:
   - Operation to create a circular pocket.
 """
 
-from math import ceil, isclose
+from math import ceil, isclose, pi
 
 from conversational_gcode.operations.Operation import Operation
 from conversational_gcode.options.JobOptions import JobOptions
 from conversational_gcode.options.Options import Options
 from conversational_gcode.options.ToolOptions import ToolOptions
-from conversational_gcode.validate.validation_result import ValidationResult
-from conversational_gcode.operations.Operations import helical_plunge, spiral_out
-from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+from conversational_gcode.operations.Operations import helical_plunge, spiral_out, max_pass_count, check_pass_count
+from conversational_gcode.operations.Operations import estimate_helical_plunge, estimate_spiral_out
+from conversational_gcode.operations.Operations import helix_removal_rate, spiral_stepover
+from conversational_gcode.geometry.Footprint import Footprint, POCKET
+from conversational_gcode.estimate.Estimate import Estimate, distance
+from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3, HELIX, ROUGHING, FINISHING
 
 
 class CircularPocket(Operation):
@@ -67,7 +71,7 @@ class CircularPocket(Operation):
                 results.append(ValidationResult(False, f'Hole diameter {self._diameter}mm must be greater than tool diameter {options.tool.tool_diameter}mm and give room for a finishing pass of {options.tool.finishing_pass}mm'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
@@ -112,6 +116,7 @@ class CircularPocket(Operation):
         # Setup #
         #########
         precision = options.output.position_precision
+        tolerance = options.output.tolerance
         tool_options = options.tool
         job_options = options.job
 
@@ -133,26 +138,31 @@ class CircularPocket(Operation):
         if final_path_radius <= tool_options.max_helix_stepover:
             # Helical interpolate to final depth as there is no need to spiral out to final diameter
             helical_plunge(self._centre, initial_path_radius, total_plunge, position,
-                           commands, tool_options, precision)
+                           commands, tool_options, options.output)
         else:
             # Mill out material in depth steps
             final_depth = self._start_depth - self._depth
             deepest_cut_depth = position[2]
-            while not isclose(deepest_cut_depth, final_depth, abs_tol=pow(10, -precision)):
+            maximum_passes = max_pass_count(total_plunge, step_plunge)
+            pass_count = 0
+            while not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance) and deepest_cut_depth > final_depth:
+                pass_count += 1
+                check_pass_count(pass_count, maximum_passes, 'Circular pocket depth steps')
                 path_radius = initial_path_radius
                 position[2] = deepest_cut_depth
 
                 # Helical interpolate to depth
                 helical_plunge(self._centre, path_radius, step_plunge, position,
-                               commands, tool_options, precision)
+                               commands, tool_options, options.output)
 
                 deepest_cut_depth = position[2]
-                if not isclose(path_radius, final_path_radius, abs_tol=pow(10, -precision)):
+                if not isclose(path_radius, final_path_radius, abs_tol=tolerance):
                     # Spiral out to final radius
-                    spiral_out(path_radius, final_path_radius, position, commands, tool_options, precision)
+                    spiral_out(path_radius, final_path_radius, position,
+                               commands, tool_options, options.output)
 
                     # Return to centre
-                    if not isclose(deepest_cut_depth, final_depth, abs_tol=pow(10, -precision)):
+                    if not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance):
                         self._clear_wall(position, commands, job_options)
                     commands.append(GCode())
 
@@ -202,23 +212,134 @@ class CircularPocket(Operation):
 
         commands.append(
             finishing_command(x=position[0], y=position[1], i=relative_centre, f=tool_options.finishing_feed_rate,
-                              comment='Spiral out to finishing pass'))
+                              move=FINISHING, comment='Spiral out to finishing pass'))
         # Full circle at finishing depth
         relative_centre = -(path_radius + tool_options.finishing_pass) * relative_centre_multiplier
         commands.append(
             finishing_command(x=position[0], y=position[1], i=relative_centre, f=tool_options.finishing_feed_rate,
-                              comment='Complete circle at final radius'))
+                              move=FINISHING, comment='Complete circle at final radius'))
 
-    def to_json(self) -> str:
-        return (
-                '{' +
-                f'"centre":[{self._centre[0]},{self._centre[1]}],' +
-                f'"start_depth":{self._start_depth},' +
-                f'"diameter":{self._diameter},' +
-                f'"depth":{self._depth},' +
-                f'"finishing_pass":{str(self._finishing_pass).lower()},' +
-                '}'
-        ).replace(',}', '}')
+    def start_point(self, options: Options) -> list[float]:
+        return [self._centre[0], self._centre[1], options.job.clearance_height]
+
+    def estimate(self, options: Options) -> Estimate:
+        #########
+        # Setup #
+        #########
+        tolerance = options.output.tolerance
+        tool_options = options.tool
+        job_options = options.job
+
+        roughing_diameter = self._diameter
+        has_finishing_pass = self._finishing_pass and tool_options.finishing_pass > 0
+
+        if has_finishing_pass:
+            roughing_diameter -= 2 * tool_options.finishing_pass
+
+        final_path_radius = (roughing_diameter - tool_options.tool_diameter) / 2
+        initial_path_radius = min(final_path_radius, tool_options.max_helix_stepover)
+
+        estimate = Estimate(start=self.start_point(options))
+        position = [*estimate.start]
+
+        # Position tool ready to begin
+        estimate.add_commands(2)
+        estimate.add_rapid(position[2] - self._start_depth - job_options.lead_in, job_options.rapid_rate)
+        position[2] = self._start_depth + job_options.lead_in
+
+        total_plunge = job_options.lead_in + self._depth
+        step_plunge = total_plunge / ceil(total_plunge / tool_options.max_stepdown)
+
+        if final_path_radius <= tool_options.max_helix_stepover:
+            estimate_helical_plunge(self._centre, initial_path_radius, total_plunge, position, estimate, options)
+        else:
+            final_depth = self._start_depth - self._depth
+            deepest_cut_depth = position[2]
+            maximum_passes = max_pass_count(total_plunge, step_plunge)
+            pass_count = 0
+            while not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance) and deepest_cut_depth > final_depth:
+                pass_count += 1
+                check_pass_count(pass_count, maximum_passes, 'Circular pocket depth steps')
+                path_radius = initial_path_radius
+
+                estimate_helical_plunge(self._centre, path_radius, step_plunge, position, estimate, options,
+                                        start_depth=deepest_cut_depth)
+
+                deepest_cut_depth = position[2]
+                if not isclose(path_radius, final_path_radius, abs_tol=tolerance):
+                    estimate_spiral_out(path_radius, final_path_radius, position, estimate, options)
+
+                    if not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance):
+                        self._estimate_clear_wall(position, estimate, job_options)
+                    estimate.add_commands()
+
+        if has_finishing_pass:
+            is_right = position[0] > self._centre[0]
+            path_radius = abs(position[0] - self._centre[0])
+            position[0] += (path_radius * 2 + tool_options.finishing_pass) * (-1 if is_right else 1)
+
+            estimate.add_commands(3)
+            estimate.add_feed(
+                pi * (path_radius + tool_options.finishing_pass / 2) + 2 * pi * (path_radius + tool_options.finishing_pass),
+                tool_options.finishing_feed_rate
+            )
+        self._estimate_clear_wall(position, estimate, job_options)
+
+        estimate.end = position
+        return estimate
+
+    def _estimate_clear_wall(self, position: list[float], estimate: Estimate, job_options: JobOptions) -> None:
+        start = [*position]
+        if position[0] > self._centre[0]:
+            position[0] = max(position[0] - 1, self._centre[0])
+        else:
+            position[0] = min(position[0] + 1, self._centre[0])
+        position[2] += job_options.lead_in
+
+        estimate.add_commands()
+        estimate.add_rapid(distance(start, position), job_options.rapid_rate)
+
+    def footprints(self, options: Options) -> list[Footprint]:
+        return [Footprint(
+            self, POCKET, [*self._centre], radius=self._diameter / 2,
+            bottom=self._start_depth - self._depth, top=self._start_depth
+        )]
+
+    def removed_volume(self, options: Options) -> float:
+        return pi * (self._diameter / 2) ** 2 * self._depth
+
+    def peak_removal_rates(self, options: Options) -> dict[str, float]:
+        tool_options = options.tool
+        job_options = options.job
+
+        roughing_diameter = self._diameter
+        has_finishing_pass = self._finishing_pass and tool_options.finishing_pass > 0
+
+        if has_finishing_pass:
+            roughing_diameter -= 2 * tool_options.finishing_pass
+
+        final_path_radius = (roughing_diameter - tool_options.tool_diameter) / 2
+        initial_path_radius = min(final_path_radius, tool_options.max_helix_stepover)
+
+        total_plunge = job_options.lead_in + self._depth
+        step_depth = min(total_plunge / ceil(total_plunge / tool_options.max_stepdown), self._depth)
+
+        rates = {HELIX: helix_removal_rate(initial_path_radius, tool_options)}
+        if final_path_radius > tool_options.max_helix_stepover:
+            stepover = spiral_stepover(initial_path_radius, final_path_radius, tool_options)
+            rates[ROUGHING] = stepover * step_depth * tool_options.feed_rate
+        if has_finishing_pass:
+            rates[FINISHING] = tool_options.finishing_pass * self._depth * tool_options.finishing_feed_rate
+        return rates
+
+    def to_dict(self) -> dict:
+        return {
+            'centre': [self._centre[0], self._centre[1]],
+            'start_depth': self._start_depth,
+            'diameter': self._diameter,
+            'depth': self._depth,
+            'finishing_pass': self._finishing_pass
+        }
 
     def __repr__(self) -> str:
         return (
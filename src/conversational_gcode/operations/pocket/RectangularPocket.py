@@ -6,16 +6,20 @@ Classes:
   - Operation to create a rectangular pocket.
 """
 
-from math import ceil,  isclose, sqrt
+from math import atan2, ceil, hypot, isclose, pi, sqrt
 from copy import deepcopy
 from typing import Tuple, Callable
 
 from conversational_gcode.operations.Operation import Operation
 from conversational_gcode.options.JobOptions import JobOptions
 from conversational_gcode.options.Options import Options
-from conversational_gcode.validate.validation_result import ValidationResult
-from conversational_gcode.operations.Operations import rapid_with_z_hop, helical_plunge, spiral_out
-from conversational_gcode.gcodes.GCodes import GCode, G0, G1, G2
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+from conversational_gcode.operations.Operations import rapid_with_z_hop, helical_plunge, spiral_out, max_pass_count, check_pass_count
+from conversational_gcode.operations.Operations import estimate_rapid_with_z_hop, estimate_helical_plunge, estimate_spiral_out
+from conversational_gcode.operations.Operations import helix_removal_rate
+from conversational_gcode.geometry.Footprint import Footprint, POCKET
+from conversational_gcode.estimate.Estimate import Estimate
+from conversational_gcode.gcodes.GCodes import GCode, G0, G1, G2, HELIX, ROUGHING, FINISHING, DISENGAGE
 from conversational_gcode.transform.Transformation import Transformation
 
 
@@ -87,7 +91,7 @@ class RectangularPocket(Operation):
                 results.append(ValidationResult(False, f'Pocket size [{self._width}, {self._length}]mm must be greater than tool diameter {options.tool.tool_diameter}mm and give room for a finishing pass of {options.tool.finishing_pass}mm'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
@@ -145,9 +149,11 @@ class RectangularPocket(Operation):
         #########
         # Setup #
         #########
-        operation_commands = []
+        # Commands are added directly so that any limits on the command list apply as they are generated
+        operation_commands = commands
+        operation_start = len(commands)
 
-        precision = options.output.position_precision
+        tolerance = options.output.tolerance
         tool_options = options.tool
         job_options = options.job
 
@@ -187,19 +193,24 @@ class RectangularPocket(Operation):
         ####################################
         final_depth = self._start_depth - self._depth
         deepest_cut_depth = position[2]
-        while not isclose(deepest_cut_depth, final_depth, abs_tol=pow(10, -precision)):
+        maximum_passes = max_pass_count(total_plunge, step_plunge)
+        pass_count = 0
+        while not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance) and deepest_cut_depth > final_depth:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket depth steps')
             clearing_radius = initial_clearing_radius
             position[2] = deepest_cut_depth
 
             operation_commands.append(GCode('Clear out circle at edge of pocket'))
             # Helical interpolate to depth
             helical_plunge(pocket_clearing_centre, clearing_radius, step_plunge, position,
-                           operation_commands, tool_options, precision)
+                           operation_commands, tool_options, options.output)
 
             # Spiral out to final radius
             deepest_cut_depth = position[2]
-            if not isclose(clearing_radius, final_clearing_radius, abs_tol=pow(10, -precision)):
-                spiral_out(clearing_radius, final_clearing_radius, position, operation_commands, tool_options, precision)
+            if not isclose(clearing_radius, final_clearing_radius, abs_tol=tolerance):
+                spiral_out(clearing_radius, final_clearing_radius, position,
+                           operation_commands, tool_options, options.output)
 
             # Clear bottom corners
             corner_commands = self._clear_near_corners(pocket_clearing_centre, final_clearing_radius, position, operation_commands, options)
@@ -210,7 +221,7 @@ class RectangularPocket(Operation):
             # Clear far corners
             self._clear_far_corners(pocket_clearing_centre, final_clearing_radius, pocket_clearing_size, corner_commands, position, operation_commands, options)
 
-            if not isclose(deepest_cut_depth, final_depth, abs_tol=pow(10, -precision)):
+            if not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance):
                 # Clear wall
                 self._clear_wall(centre, position, operation_commands, job_options)
 
@@ -224,7 +235,7 @@ class RectangularPocket(Operation):
         if rotated:
             position[0] = position[1]
             position[1] = -position[0]
-            for command in operation_commands:
+            for command in operation_commands[operation_start:]:
                 command.transform(
                     Transformation(
                         [
@@ -240,9 +251,6 @@ class RectangularPocket(Operation):
                     )
                 )
 
-        for operation_command in operation_commands:
-            commands.append(operation_command)
-
     def _move_to_start(self, start_position: list[float], position: list[float], commands: list[GCode], job_options: JobOptions) -> None:
         # Position tool at hole centre
         position[0] = start_position[0]
@@ -253,6 +261,7 @@ class RectangularPocket(Operation):
 
     def _clear_near_corners(self, pocket_clearing_centre: list[float], final_clearing_radius: float, position: list[float], operation_commands: list[GCode], options: Options) -> None:
         precision = options.output.position_precision
+        tolerance = options.output.tolerance
         tool_options = options.tool
 
         br_corner_commands = []
@@ -276,7 +285,12 @@ class RectangularPocket(Operation):
 
         total_radial_cut_engagement = 0
         last_cartesian_cut_engagement = 0
-        while not isclose(last_cartesian_cut_engagement, final_clearing_radius, abs_tol=pow(10, -precision)):
+        maximum_passes = max_pass_count(radial_distance_to_corner, bottom_corner_radial_stepover)
+        pass_count = 0
+        while (not isclose(last_cartesian_cut_engagement, final_clearing_radius, abs_tol=tolerance)
+               and last_cartesian_cut_engagement < final_clearing_radius):
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket near corner clearing')
             total_radial_cut_engagement += bottom_corner_radial_stepover
             total_cartesian_cut_engagement = min(
                 sqrt((final_clearing_radius + total_radial_cut_engagement) * (
@@ -284,19 +298,19 @@ class RectangularPocket(Operation):
                 final_clearing_radius)
             # Engage cut
             position[1] = pocket_clearing_centre[1] - total_cartesian_cut_engagement
-            br_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate))
+            br_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate, move=ROUGHING))
 
-            final_pass = isclose(total_cartesian_cut_engagement, final_clearing_radius, abs_tol=pow(10, -precision))
+            final_pass = isclose(total_cartesian_cut_engagement, final_clearing_radius, abs_tol=tolerance)
             if not final_pass:
                 # Arc around original clearing centre
                 position[0] = pocket_clearing_centre[0] + total_cartesian_cut_engagement
                 position[1] = pocket_clearing_centre[1] - final_clearing_radius
                 br_corner_commands.append(
                     G2(x=position[0], y=position[1], i=-final_clearing_radius, j=total_cartesian_cut_engagement,
-                       f=tool_options.feed_rate))
+                       f=tool_options.feed_rate, move=ROUGHING))
             # Disengage cut
             position[0] = pocket_clearing_centre[0] + last_cartesian_cut_engagement
-            br_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate))
+            br_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.link_feed_rate, move=DISENGAGE))
             # Move to original cut start
             if not final_pass:
                 br_corner_commands.extend(
@@ -347,10 +361,11 @@ class RectangularPocket(Operation):
 
     def _clear_centre(self, pocket_clearing_centre: list[float], final_clearing_radius: float, pocket_clearing_size: list[float], position: list[float], operation_commands: list[GCode], options: Options) -> None:
         precision = options.output.position_precision
+        tolerance = options.output.tolerance
         tool_options = options.tool
 
         total_arc_distance = pocket_clearing_size[1] - 2 * final_clearing_radius
-        if isclose(total_arc_distance, 0, abs_tol=pow(10, -precision)):
+        if isclose(total_arc_distance, 0, abs_tol=tolerance):
             return
 
         arcing_stepover = total_arc_distance / ceil(total_arc_distance / tool_options.max_stepover)
@@ -372,20 +387,24 @@ class RectangularPocket(Operation):
 
         total_radial_cut_engagement = 0
         last_cartesian_stepover = 0
-        while not isclose(total_radial_cut_engagement, total_arc_distance, abs_tol=pow(10, -precision)):
+        maximum_passes = max_pass_count(total_arc_distance, arcing_stepover)
+        pass_count = 0
+        while not isclose(total_radial_cut_engagement, total_arc_distance, abs_tol=tolerance) and total_radial_cut_engagement < total_arc_distance:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket centre clearing')
             total_radial_cut_engagement += arcing_stepover
             total_cartesian_stepover = sqrt((final_clearing_radius + total_radial_cut_engagement) * (
                             final_clearing_radius + total_radial_cut_engagement) - final_clearing_radius * final_clearing_radius)
 
             # Engage cut
             position[1] = pocket_clearing_centre[1] + total_cartesian_stepover
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate, move=ROUGHING))
             # Traverse arc
             position[0] = pocket_clearing_centre[0] + final_clearing_radius
-            operation_commands.append(G2(x=position[0], y=position[1], i=final_clearing_radius, j=pocket_clearing_centre[1] - position[1], f=tool_options.feed_rate))
+            operation_commands.append(G2(x=position[0], y=position[1], i=final_clearing_radius, j=pocket_clearing_centre[1] - position[1], f=tool_options.feed_rate, move=ROUGHING))
             # Disengage cut
             position[1] = pocket_clearing_centre[1] + last_cartesian_stepover
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.link_feed_rate, move=DISENGAGE))
 
             # Move to previous start position
             operation_commands.extend(
@@ -405,10 +424,11 @@ class RectangularPocket(Operation):
     def _clear_far_corners(self, pocket_clearing_centre: list[float], final_clearing_radius: float, pocket_clearing_size: list[float], corner_commands: list[GCode], position: list[float], operation_commands: list[GCode], options: Options) -> None:
         tool_options = options.tool
         precision = options.output.position_precision
+        tolerance = options.output.tolerance
 
         final_arcing_radius = pocket_clearing_size[1] - final_clearing_radius
 
-        if isclose(final_arcing_radius, final_clearing_radius, abs_tol=pow(10, -precision)):
+        if isclose(final_arcing_radius, final_clearing_radius, abs_tol=tolerance):
             operation_commands.append(GCode('Clear furthest corners'))
             # Repeat existing corner commands
             rotation = Transformation(
@@ -457,7 +477,11 @@ class RectangularPocket(Operation):
         total_radial_cut_engagement = 0
         last_cartesian_stepin = sqrt(final_arcing_radius * final_arcing_radius - final_clearing_radius * final_clearing_radius)
         last_cartesian_stepout = 0
-        while not isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=pow(10, -precision)):
+        maximum_passes = max_pass_count(radial_distance_to_corner, radial_stepover)
+        pass_count = 0
+        while not isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=tolerance) and total_radial_cut_engagement < radial_distance_to_corner:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket far corner clearing')
             total_radial_cut_engagement += radial_stepover
             total_radius = final_arcing_radius + total_radial_cut_engagement
             total_cartesian_stepin = sqrt(total_radius * total_radius - final_clearing_radius * final_clearing_radius)
@@ -465,34 +489,34 @@ class RectangularPocket(Operation):
 
             # Engage cut
             position[1] = pocket_clearing_centre[1] + total_cartesian_stepin
-            tl_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate))
+            tl_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate, move=ROUGHING))
             tr_corner_commands_and_positions.append([
                 [pocket_clearing_centre[0] + total_cartesian_stepout, tr_corner_commands_and_positions[-1][0][1], position[2]],
-                lambda x, y, z: G1(x=x, y=y, f=tool_options.feed_rate)
+                lambda x, y, z: G1(x=x, y=y, f=tool_options.feed_rate, move=ROUGHING)
             ])
 
-            if not isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=pow(10, -precision)):
+            if not isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=tolerance):
                 # Traverse arc
                 position[0] = pocket_clearing_centre[0] - total_cartesian_stepout
                 j = pocket_clearing_centre[1] - position[1]
                 position[1] = pocket_clearing_centre[1] + pocket_clearing_size[1] - final_clearing_radius
-                tl_corner_commands.append(G2(x=position[0], y=position[1], i=final_clearing_radius, j=j, f=tool_options.feed_rate))
+                tl_corner_commands.append(G2(x=position[0], y=position[1], i=final_clearing_radius, j=j, f=tool_options.feed_rate, move=ROUGHING))
 
                 tr_corner_commands_and_positions.append([
                     [pocket_clearing_centre[0] + final_clearing_radius, pocket_clearing_centre[1] + total_cartesian_stepin, position[2]],
-                    (lambda tmp_step: lambda x, y, z: G2(x=x, y=y, i=-tmp_step, j=-final_arcing_radius, f=tool_options.feed_rate))(total_cartesian_stepout)
+                    (lambda tmp_step: lambda x, y, z: G2(x=x, y=y, i=-tmp_step, j=-final_arcing_radius, f=tool_options.feed_rate, move=ROUGHING))(total_cartesian_stepout)
                 ])
 
             # Disengage cut
             position[0] = pocket_clearing_centre[0] - last_cartesian_stepout
-            tl_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate))
+            tl_corner_commands.append(G1(x=position[0], y=position[1], f=tool_options.link_feed_rate, move=DISENGAGE))
 
             tr_corner_commands_and_positions.append([
                 [pocket_clearing_centre[0] + final_clearing_radius, pocket_clearing_centre[1] + last_cartesian_stepin, position[2]],
-                lambda x, y, z: G1(x=x, y=y, f=tool_options.feed_rate)
+                lambda x, y, z: G1(x=x, y=y, f=tool_options.link_feed_rate, move=DISENGAGE)
             ])
 
-            if not isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=pow(10, -precision)):
+            if not isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=tolerance):
                 # Move to previous start position
                 tl_corner_commands.extend(
                     rapid_with_z_hop(
@@ -539,31 +563,31 @@ class RectangularPocket(Operation):
 
         # Feed into cut
         position[0] = centre[0] + pocket_final_size[0] / 2
-        operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+        operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
 
         initial_y_position = position[1]
         if tool_options.finishing_climb:
             position[1] = centre[1] + pocket_final_size[1] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[0] = centre[0] - pocket_final_size[0] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[1] = centre[1] - pocket_final_size[1] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[0] = centre[0] + pocket_final_size[0] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[1] = initial_y_position
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
         else:
             position[1] = centre[1] - pocket_final_size[1] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[0] = centre[0] - pocket_final_size[0] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[1] = centre[1] + pocket_final_size[1] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[0] = centre[0] + pocket_final_size[0] / 2
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
             position[1] = initial_y_position
-            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate))
+            operation_commands.append(G1(x=position[0], y=position[1], f=tool_options.finishing_feed_rate, move=FINISHING))
 
     def _clear_wall(self, centre: list[float], position: list[float], operation_commands: list[GCode], job_options: JobOptions) -> None:
         position[0] = max(centre[0], position[0] - 1)
@@ -571,18 +595,416 @@ class RectangularPocket(Operation):
         position[2] += job_options.lead_in
         operation_commands.append(G0(x=position[0], y=position[1], z=position[2], comment='Clear wall'))
 
-    def to_json(self) -> str:
-        return (
-                '{' +
-                f'"width":{self._width},' +
-                f'"length":{self._length},' +
-                f'"depth":{self._depth},' +
-                f'"centre":[{self._centre[0]},{self._centre[1]}],' +
-                f'"corner":[{self._corner[0]},{self._corner[1]}],' +
-                f'"start_depth":{self._start_depth},' +
-                f'"finishing_pass":{str(self._finishing_pass).lower()},' +
-                '}'
-        ).replace(',}', '}')
+    def start_point(self, options: Options) -> list[float]:
+        tool_options = options.tool
+
+        pocket_clearing_size = [self._width - tool_options.tool_diameter, self._length - tool_options.tool_diameter]
+        if self._finishing_pass and tool_options.finishing_pass > 0:
+            pocket_clearing_size[0] -= 2 * tool_options.finishing_pass
+            pocket_clearing_size[1] -= 2 * tool_options.finishing_pass
+
+        if self._centre is not None:
+            centre = self._centre
+        else:
+            centre = [self._corner[0] + self._width / 2, self._corner[1] + self._length / 2]
+
+        # The pocket is cleared in a frame where it is never wider than it is long, then rotated back
+        if self._width > self._length:
+            pocket_clearing_size.reverse()
+        start = [centre[0], centre[1] + (pocket_clearing_size[0] - pocket_clearing_size[1]) / 2]
+        if self._width > self._length:
+            start = [start[1] + centre[0] - centre[1], centre[0] + centre[1] - start[0]]
+
+        return [*start, options.job.clearance_height]
+
+    def estimate(self, options: Options) -> Estimate:
+        #########
+        # Setup #
+        #########
+        tolerance = options.output.tolerance
+        tool_options = options.tool
+        job_options = options.job
+
+        has_finishing_pass = self._finishing_pass and tool_options.finishing_pass > 0
+
+        pocket_clearing_size = [self._width - tool_options.tool_diameter, self._length - tool_options.tool_diameter]
+        pocket_final_size = [self._width - tool_options.tool_diameter, self._length - tool_options.tool_diameter]
+        if has_finishing_pass:
+            pocket_clearing_size[0] -= 2 * tool_options.finishing_pass
+            pocket_clearing_size[1] -= 2 * tool_options.finishing_pass
+
+        if self._centre is not None:
+            centre = self._centre
+        else:
+            centre = [self._corner[0] + self._width / 2, self._corner[1] + self._length / 2]
+
+        # Estimate in the same frame as generation, where the pocket is never wider than it is long
+        rotated = False
+        if self._width > self._length:
+            pocket_clearing_size.reverse()
+            pocket_final_size.reverse()
+            rotated = True
+        pocket_clearing_centre = [centre[0], centre[1] + (pocket_clearing_size[0] - pocket_clearing_size[1]) / 2]
+
+        final_clearing_radius = pocket_clearing_size[0] / 2
+        initial_clearing_radius = min(final_clearing_radius, tool_options.max_helix_stepover)
+
+        estimate = Estimate(start=[*pocket_clearing_centre, job_options.clearance_height])
+        position = [*estimate.start]
+
+        # Position tool ready to begin
+        estimate.add_commands(2)
+        estimate.add_rapid(position[2] - self._start_depth - job_options.lead_in, job_options.rapid_rate)
+        position[2] = self._start_depth + job_options.lead_in
+
+        total_plunge = job_options.lead_in + self._depth
+        step_plunge = total_plunge / ceil(total_plunge / tool_options.max_stepdown)
+
+        # Every depth step clears the same pattern from the end of its helical plunge, so it is only estimated once
+        layer = Estimate()
+        layer_position = [pocket_clearing_centre[0] + initial_clearing_radius, pocket_clearing_centre[1], 0]
+        if not isclose(initial_clearing_radius, final_clearing_radius, abs_tol=tolerance):
+            estimate_spiral_out(initial_clearing_radius, final_clearing_radius, layer_position, layer, options)
+
+        corner = self._estimate_near_corners(pocket_clearing_centre, final_clearing_radius, layer_position, layer, options)
+        self._estimate_centre(pocket_clearing_centre, final_clearing_radius, pocket_clearing_size, layer_position, layer, options)
+        self._estimate_far_corners(pocket_clearing_centre, final_clearing_radius, pocket_clearing_size, corner, layer_position, layer, options)
+
+        ####################################
+        # Mill out material in depth steps #
+        ####################################
+        final_depth = self._start_depth - self._depth
+        deepest_cut_depth = position[2]
+        maximum_passes = max_pass_count(total_plunge, step_plunge)
+        pass_count = 0
+        while not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance) and deepest_cut_depth > final_depth:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket depth steps')
+            estimate.add_commands()
+            estimate_helical_plunge(pocket_clearing_centre, initial_clearing_radius, step_plunge, position, estimate,
+                                    options, start_depth=deepest_cut_depth)
+
+            deepest_cut_depth = position[2]
+            estimate.add_estimate(layer)
+            position[0:2] = layer_position[0:2]
+
+            if not isclose(deepest_cut_depth, final_depth, abs_tol=tolerance):
+                self._estimate_clear_wall(centre, position, estimate, job_options)
+
+        if has_finishing_pass:
+            self._estimate_finishing_pass(centre, pocket_final_size, position, estimate, options)
+
+        self._estimate_clear_wall(centre, position, estimate, job_options)
+
+        if rotated:
+            for point in [estimate.start, position]:
+                point[0:2] = [point[1] + centre[0] - centre[1], centre[0] + centre[1] - point[0]]
+
+        estimate.end = position
+        return estimate
+
+    def _estimate_near_corners(self, pocket_clearing_centre: list[float], final_clearing_radius: float, position: list[float], estimate: Estimate, options: Options) -> tuple:
+        """
+        Estimate the bottom-right corner, then add it and its rotation as the bottom-left corner.
+        :return: The corner, as (True if it is entered by a rapid, entry point, estimate after entry, end point).
+        """
+        tolerance = options.output.tolerance
+        tool_options = options.tool
+        hop_length = 2 * options.job.lead_in
+
+        radial_distance_to_corner = final_clearing_radius * (sqrt(2) - 1)
+        bottom_corner_radial_stepover = radial_distance_to_corner / ceil(radial_distance_to_corner / tool_options.max_stepover)
+
+        # The corner is entered by a rapid unless the tool is already at the start of the first cut
+        entry_is_rapid = position[0] != pocket_clearing_centre[0] + final_clearing_radius
+        entry = [pocket_clearing_centre[0] + final_clearing_radius, position[1]]
+        end = [*entry]
+        body = Estimate()
+
+        total_radial_cut_engagement = 0
+        last_cartesian_cut_engagement = 0
+        maximum_passes = max_pass_count(radial_distance_to_corner, bottom_corner_radial_stepover)
+        pass_count = 0
+        while (not isclose(last_cartesian_cut_engagement, final_clearing_radius, abs_tol=tolerance)
+               and last_cartesian_cut_engagement < final_clearing_radius):
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket near corner clearing')
+            total_radial_cut_engagement += bottom_corner_radial_stepover
+            total_cartesian_cut_engagement = min(
+                sqrt((final_clearing_radius + total_radial_cut_engagement) * (
+                            final_clearing_radius + total_radial_cut_engagement) - final_clearing_radius * final_clearing_radius),
+                final_clearing_radius)
+            # Engage cut
+            if pass_count > 1:
+                body.add_commands()
+                body.add_feed(total_cartesian_cut_engagement - last_cartesian_cut_engagement, tool_options.feed_rate)
+            elif entry_is_rapid:
+                body.add_commands()
+                body.add_feed(abs(pocket_clearing_centre[1] - total_cartesian_cut_engagement - entry[1]), tool_options.feed_rate)
+            else:
+                entry = [pocket_clearing_centre[0] + final_clearing_radius, pocket_clearing_centre[1] - total_cartesian_cut_engagement]
+
+            final_pass = isclose(total_cartesian_cut_engagement, final_clearing_radius, abs_tol=tolerance)
+            if not final_pass:
+                # Arc around original clearing centre
+                body.add_commands()
+                body.add_feed(
+                    hypot(final_clearing_radius, total_cartesian_cut_engagement) *
+                    (pi / 2 - 2 * atan2(total_cartesian_cut_engagement, final_clearing_radius)),
+                    tool_options.feed_rate
+                )
+            # Disengage cut
+            body.add_commands()
+            body.add_feed(
+                (final_clearing_radius if final_pass else total_cartesian_cut_engagement) - last_cartesian_cut_engagement,
+                tool_options.link_feed_rate
+            )
+            end = [pocket_clearing_centre[0] + last_cartesian_cut_engagement, pocket_clearing_centre[1] - total_cartesian_cut_engagement]
+            # Move to original cut start
+            if not final_pass:
+                body.add_commands(3)
+                body.add_rapid(
+                    hop_length + hypot(final_clearing_radius - last_cartesian_cut_engagement,
+                                       final_clearing_radius - total_cartesian_cut_engagement),
+                    options.job.rapid_rate
+                )
+
+            last_cartesian_cut_engagement = total_cartesian_cut_engagement
+
+        corner = (entry_is_rapid, entry, body, end)
+        estimate.add_commands(3)
+        self._estimate_corner(corner, 0, pocket_clearing_centre, position, estimate, options)
+        self._estimate_corner(corner, 1, pocket_clearing_centre, position, estimate, options)
+
+        return corner
+
+    @staticmethod
+    def _estimate_corner(corner: tuple, quarter_turns: int, pocket_clearing_centre: list[float], position: list[float], estimate: Estimate, options: Options) -> None:
+        """
+        Add a corner from _estimate_near_corners(), rotated clockwise by quarter turns about the clearing centre as the
+        corner clearing commands are. Only the move into the corner depends on where the tool starts.
+        """
+        entry_is_rapid, entry, body, end = corner
+        for _ in range(quarter_turns):
+            entry = [entry[1] + pocket_clearing_centre[0] - pocket_clearing_centre[1], pocket_clearing_centre[0] + pocket_clearing_centre[1] - entry[0]]
+            end = [end[1] + pocket_clearing_centre[0] - pocket_clearing_centre[1], pocket_clearing_centre[0] + pocket_clearing_centre[1] - end[0]]
+
+        entry_distance = hypot(entry[0] - position[0], entry[1] - position[1])
+        if entry_is_rapid:
+            estimate.add_commands(3)
+            estimate.add_rapid(2 * options.job.lead_in + entry_distance, options.job.rapid_rate)
+        else:
+            estimate.add_commands()
+            estimate.add_feed(entry_distance, options.tool.feed_rate)
+        estimate.add_estimate(body)
+
+        position[0:2] = end
+
+    def _estimate_centre(self, pocket_clearing_centre: list[float], final_clearing_radius: float, pocket_clearing_size: list[float], position: list[float], estimate: Estimate, options: Options) -> None:
+        tolerance = options.output.tolerance
+        tool_options = options.tool
+
+        total_arc_distance = pocket_clearing_size[1] - 2 * final_clearing_radius
+        if isclose(total_arc_distance, 0, abs_tol=tolerance):
+            return
+
+        arcing_stepover = total_arc_distance / ceil(total_arc_distance / tool_options.max_stepover)
+        estimate.add_commands()
+
+        estimate_rapid_with_z_hop(
+            position,
+            [pocket_clearing_centre[0] - final_clearing_radius, pocket_clearing_centre[1], position[2]],
+            estimate,
+            options
+        )
+
+        total_radial_cut_engagement = 0
+        last_cartesian_stepover = 0
+        arc_length = 0
+        hop_length = 0
+        maximum_passes = max_pass_count(total_arc_distance, arcing_stepover)
+        pass_count = 0
+        while not isclose(total_radial_cut_engagement, total_arc_distance, abs_tol=tolerance) and total_radial_cut_engagement < total_arc_distance:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket centre clearing')
+            total_radial_cut_engagement += arcing_stepover
+            total_cartesian_stepover = sqrt((final_clearing_radius + total_radial_cut_engagement) * (
+                            final_clearing_radius + total_radial_cut_engagement) - final_clearing_radius * final_clearing_radius)
+
+            # Traverse arc about the clearing centre, then move back to the start of the next
+            arc_length += hypot(final_clearing_radius, total_cartesian_stepover) * (pi - 2 * atan2(total_cartesian_stepover, final_clearing_radius))
+            hop_length += hypot(2 * final_clearing_radius, total_cartesian_stepover - last_cartesian_stepover)
+
+            last_cartesian_stepover = total_cartesian_stepover
+
+        # Each pass engages and disengages the cut by one stepover, so both add up to the last stepover
+        estimate.add_commands(6 * pass_count)
+        estimate.add_feed(last_cartesian_stepover + arc_length, tool_options.feed_rate)
+        estimate.add_feed(last_cartesian_stepover, tool_options.link_feed_rate)
+        estimate.add_rapid(2 * options.job.lead_in * pass_count + hop_length, options.job.rapid_rate)
+        position[0:2] = [pocket_clearing_centre[0] - final_clearing_radius, pocket_clearing_centre[1] + last_cartesian_stepover]
+
+    def _estimate_far_corners(self, pocket_clearing_centre: list[float], final_clearing_radius: float, pocket_clearing_size: list[float], corner: tuple, position: list[float], estimate: Estimate, options: Options) -> None:
+        tool_options = options.tool
+        tolerance = options.output.tolerance
+        hop_length = 2 * options.job.lead_in
+
+        final_arcing_radius = pocket_clearing_size[1] - final_clearing_radius
+
+        if isclose(final_arcing_radius, final_clearing_radius, abs_tol=tolerance):
+            # Repeat the near corners, rotated by a half turn
+            estimate.add_commands(3)
+            self._estimate_corner(corner, 2, pocket_clearing_centre, position, estimate, options)
+            self._estimate_corner(corner, 3, pocket_clearing_centre, position, estimate, options)
+            return
+
+        radial_distance_to_corner = sqrt(final_arcing_radius * final_arcing_radius + final_clearing_radius * final_clearing_radius) - final_arcing_radius
+        radial_stepover = radial_distance_to_corner / ceil(radial_distance_to_corner / tool_options.max_stepover)
+
+        estimate.add_commands(2)
+
+        # Both far corners are estimated in the same passes, as they mirror each other
+        tl_position = [position[0], position[1]]
+        tr_position = [pocket_clearing_centre[0], pocket_clearing_centre[1] + final_arcing_radius]
+        command_count = 0
+        feed_length = 0
+        link_length = 0
+        rapid_length = 0
+
+        total_radial_cut_engagement = 0
+        last_cartesian_stepin = sqrt(final_arcing_radius * final_arcing_radius - final_clearing_radius * final_clearing_radius)
+        last_cartesian_stepout = 0
+        maximum_passes = max_pass_count(radial_distance_to_corner, radial_stepover)
+        pass_count = 0
+        while not isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=tolerance) and total_radial_cut_engagement < radial_distance_to_corner:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular pocket far corner clearing')
+            total_radial_cut_engagement += radial_stepover
+            total_radius = final_arcing_radius + total_radial_cut_engagement
+            total_cartesian_stepin = sqrt(total_radius * total_radius - final_clearing_radius * final_clearing_radius)
+            total_cartesian_stepout = sqrt(total_radius * total_radius - final_arcing_radius * final_arcing_radius)
+            final_pass = isclose(total_radial_cut_engagement, radial_distance_to_corner, abs_tol=tolerance)
+
+            # Engage cut
+            command_count += 2
+            feed_length += abs(pocket_clearing_centre[1] + total_cartesian_stepin - tl_position[1])
+            feed_length += abs(pocket_clearing_centre[0] + total_cartesian_stepout - tr_position[0])
+            tl_position[1] = pocket_clearing_centre[1] + total_cartesian_stepin
+            tr_position[0] = pocket_clearing_centre[0] + total_cartesian_stepout
+
+            if not final_pass:
+                # Traverse arc
+                command_count += 2
+                feed_length += 2 * total_radius * (atan2(final_arcing_radius, total_cartesian_stepout) - atan2(total_cartesian_stepin, final_clearing_radius))
+                tl_position = [pocket_clearing_centre[0] - total_cartesian_stepout, pocket_clearing_centre[1] + pocket_clearing_size[1] - final_clearing_radius]
+                tr_position = [pocket_clearing_centre[0] + final_clearing_radius, pocket_clearing_centre[1] + total_cartesian_stepin]
+
+            # Disengage cut
+            command_count += 2
+            disengaged_position = [pocket_clearing_centre[0] + final_clearing_radius, pocket_clearing_centre[1] + last_cartesian_stepin]
+            link_length += abs(pocket_clearing_centre[0] - last_cartesian_stepout - tl_position[0])
+            link_length += hypot(disengaged_position[0] - tr_position[0], disengaged_position[1] - tr_position[1])
+            tl_position[0] = pocket_clearing_centre[0] - last_cartesian_stepout
+            tr_position = disengaged_position
+
+            if not final_pass:
+                # Move to previous start position
+                for corner_position, new_position in [
+                    (tl_position, [pocket_clearing_centre[0] - final_clearing_radius, pocket_clearing_centre[1] + total_cartesian_stepin]),
+                    (tr_position, [pocket_clearing_centre[0] + total_cartesian_stepout, pocket_clearing_centre[1] + final_arcing_radius])
+                ]:
+                    if corner_position != new_position:
+                        command_count += 3
+                        rapid_length += hop_length + hypot(new_position[0] - corner_position[0], new_position[1] - corner_position[1])
+                        corner_position[0:2] = new_position
+
+            last_cartesian_stepin = total_cartesian_stepin
+            last_cartesian_stepout = total_cartesian_stepout
+
+        # The second corner starts by moving from the end of the first to the start of its arcs
+        command_count += 4
+        rapid_length += hop_length + hypot(pocket_clearing_centre[0] - tl_position[0], pocket_clearing_centre[1] + final_arcing_radius - tl_position[1])
+
+        estimate.add_commands(command_count)
+        estimate.add_feed(feed_length, tool_options.feed_rate)
+        estimate.add_feed(link_length, tool_options.link_feed_rate)
+        estimate.add_rapid(rapid_length, options.job.rapid_rate)
+        position[0:2] = tr_position
+
+    def _estimate_finishing_pass(self, centre: list[float], pocket_final_size: list[float], position: list[float], estimate: Estimate, options: Options) -> None:
+        tool_options = options.tool
+        feed_rate = tool_options.finishing_feed_rate
+
+        estimate.add_commands()
+
+        half_size = [pocket_final_size[0] / 2, pocket_final_size[1] / 2]
+        direction = 1 if tool_options.finishing_climb else -1
+        initial_y_position = position[1]
+
+        estimate.feed_to(position, [centre[0] + half_size[0], position[1], position[2]], feed_rate)
+        estimate.feed_to(position, [position[0], centre[1] + direction * half_size[1], position[2]], feed_rate)
+        estimate.feed_to(position, [centre[0] - half_size[0], position[1], position[2]], feed_rate)
+        estimate.feed_to(position, [position[0], centre[1] - direction * half_size[1], position[2]], feed_rate)
+        estimate.feed_to(position, [centre[0] + half_size[0], position[1], position[2]], feed_rate)
+        estimate.feed_to(position, [position[0], initial_y_position, position[2]], feed_rate)
+
+    def _estimate_clear_wall(self, centre: list[float], position: list[float], estimate: Estimate, job_options: JobOptions) -> None:
+        estimate.rapid_to(
+            position,
+            [max(centre[0], position[0] - 1), max(centre[1], position[1] - 1), position[2] + job_options.lead_in],
+            job_options.rapid_rate
+        )
+
+    def footprints(self, options: Options) -> list[Footprint]:
+        if self._centre is not None:
+            centre = [*self._centre]
+        else:
+            centre = [self._corner[0] + self._width / 2, self._corner[1] + self._length / 2]
+        return [Footprint(
+            self, POCKET, centre, size=[self._width, self._length],
+            bottom=self._start_depth - self._depth, top=self._start_depth
+        )]
+
+    def removed_volume(self, options: Options) -> float:
+        # The tool leaves a fillet of its radius in each corner
+        corner_area = (4 - pi) * options.tool.tool_radius ** 2
+        return (self._width * self._length - corner_area) * self._depth
+
+    def peak_removal_rates(self, options: Options) -> dict[str, float]:
+        tool_options = options.tool
+        job_options = options.job
+
+        has_finishing_pass = self._finishing_pass and tool_options.finishing_pass > 0
+
+        clearing_width = min(self._width, self._length) - tool_options.tool_diameter
+        if has_finishing_pass:
+            clearing_width -= 2 * tool_options.finishing_pass
+        initial_clearing_radius = min(clearing_width / 2, tool_options.max_helix_stepover)
+
+        total_plunge = job_options.lead_in + self._depth
+        step_depth = min(total_plunge / ceil(total_plunge / tool_options.max_stepdown), self._depth)
+
+        # Spiralling out and clearing the corners and centre all step over by up to the maximum stepover
+        rates = {
+            HELIX: helix_removal_rate(initial_clearing_radius, tool_options),
+            ROUGHING: min(tool_options.max_stepover, tool_options.tool_diameter) * step_depth * tool_options.feed_rate
+        }
+        if has_finishing_pass:
+            rates[FINISHING] = tool_options.finishing_pass * self._depth * tool_options.finishing_feed_rate
+        return rates
+
+    def to_dict(self) -> dict:
+        return {
+            key: value for key, value in (
+                ('width', self._width),
+                ('length', self._length),
+                ('depth', self._depth),
+                ('centre', [self._centre[0], self._centre[1]] if self._centre is not None else None),
+                ('corner', [self._corner[0], self._corner[1]] if self._corner is not None else None),
+                ('start_depth', self._start_depth),
+                ('finishing_pass', self._finishing_pass)
+            ) if value is not None
+        }
 
     def __repr__(self) -> str:
         return (
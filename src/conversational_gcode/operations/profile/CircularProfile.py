@@ -5,12 +5,16 @@ Classes:
 - CircularProfile
   - Operation to create a circular profile.
 """
+from math import pi
+
 from conversational_gcode.operations.Operation import Operation
 from conversational_gcode.options.JobOptions import JobOptions
 from conversational_gcode.options.Options import Options
-from conversational_gcode.validate.validation_result import ValidationResult
-from conversational_gcode.operations.Operations import helical_plunge
-from conversational_gcode.gcodes.GCodes import GCode, G0
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+from conversational_gcode.operations.Operations import helical_plunge, estimate_helical_plunge, helix_removal_rate
+from conversational_gcode.geometry.Footprint import Footprint, PROFILE
+from conversational_gcode.estimate.Estimate import Estimate
+from conversational_gcode.gcodes.GCodes import GCode, G0, HELIX
 
 
 class CircularProfile(Operation):
@@ -64,7 +68,7 @@ class CircularProfile(Operation):
                 results.append(ValidationResult(False, f'Inner profile diameter {self._diameter}mm must be greater than tool diameter {options.tool.tool_diameter}mm'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
@@ -132,7 +136,7 @@ class CircularProfile(Operation):
                        position,
                        commands,
                        tool_options,
-                       options.output.position_precision,
+                       options.output,
                        is_inner=self._is_inner,
                        is_climb=self._is_climb)
 
@@ -144,17 +148,72 @@ class CircularProfile(Operation):
         position[2] = self._start_depth + job_options.lead_in
         commands.append(G0(z=position[2], comment='Move to hole start depth'))
 
-    def to_json(self) -> str:
-        return (
-                '{' +
-                f'"centre":[{self._centre[0]},{self._centre[1]}],' +
-                f'"start_depth":{self._start_depth},' +
-                f'"diameter":{self._depth},' +
-                f'"depth":{self._depth},' +
-                f'"is_inner":{str(self._is_inner).lower()},' +
-                f'"is_climb":{str(self._is_climb).lower()},' +
-                '}'
-        ).replace(',}', '}')
+    def start_point(self, options: Options) -> list[float]:
+        return [self._centre[0], self._centre[1], options.job.clearance_height]
+
+    def estimate(self, options: Options) -> Estimate:
+        tool_options = options.tool
+        job_options = options.job
+
+        if self._is_inner:
+            path_radius = (self._diameter - tool_options.tool_diameter) / 2
+        else:
+            path_radius = (self._diameter + tool_options.tool_diameter) / 2
+
+        estimate = Estimate(start=self.start_point(options))
+        position = [*estimate.start]
+
+        # Position tool ready to begin
+        estimate.add_commands(3)
+        estimate.add_rapid(position[2] - self._start_depth - job_options.lead_in, job_options.rapid_rate)
+        position[2] = self._start_depth + job_options.lead_in
+
+        estimate_helical_plunge(self._centre, path_radius, job_options.lead_in + self._depth, position, estimate, options)
+
+        estimate.end = position
+        return estimate
+
+    def footprints(self, options: Options) -> list[Footprint]:
+        # The tool cuts a ring inside of the profile diameter for an inner profile, or outside of it for an outer one
+        if self._is_inner:
+            radius = self._diameter / 2
+            inner_radius = max(0.0, radius - options.tool.tool_diameter)
+        else:
+            inner_radius = self._diameter / 2
+            radius = inner_radius + options.tool.tool_diameter
+        return [Footprint(
+            self, PROFILE, [*self._centre], radius=radius,
+            bottom=self._start_depth - self._depth, top=self._start_depth, inner_radius=inner_radius
+        )]
+
+    def removed_volume(self, options: Options) -> float:
+        if self._is_inner:
+            radius = self._diameter / 2
+            inner_radius = max(0.0, radius - options.tool.tool_diameter)
+        else:
+            inner_radius = self._diameter / 2
+            radius = inner_radius + options.tool.tool_diameter
+        return pi * (radius ** 2 - inner_radius ** 2) * self._depth
+
+    def peak_removal_rates(self, options: Options) -> dict[str, float]:
+        tool_options = options.tool
+
+        if self._is_inner:
+            path_radius = (self._diameter - tool_options.tool_diameter) / 2
+        else:
+            path_radius = (self._diameter + tool_options.tool_diameter) / 2
+
+        return {HELIX: helix_removal_rate(path_radius, tool_options)}
+
+    def to_dict(self) -> dict:
+        return {
+            'centre': [self._centre[0], self._centre[1]],
+            'start_depth': self._start_depth,
+            'diameter': self._diameter,
+            'depth': self._depth,
+            'is_inner': self._is_inner,
+            'is_climb': self._is_climb
+        }
 
     def __repr__(self) -> str:
         return (
@@ -6,12 +6,15 @@ Classes:
   - Operation to create a rectangular profile.
 """
 
-from math import ceil, tan, pi, isclose
+from math import ceil, isclose, pi, sqrt
 
 from conversational_gcode.operations.Operation import Operation
 from conversational_gcode.options.Options import Options
-from conversational_gcode.validate.validation_result import ValidationResult
-from conversational_gcode.gcodes.GCodes import GCode, G0, G1
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+from conversational_gcode.operations.Operations import max_pass_count, check_pass_count
+from conversational_gcode.geometry.Footprint import Footprint, PROFILE
+from conversational_gcode.estimate.Estimate import Estimate
+from conversational_gcode.gcodes.GCodes import GCode, G0, G1, HELIX, ROUGHING
 
 
 class RectangularProfile(Operation):
@@ -83,7 +86,7 @@ class RectangularProfile(Operation):
                 results.append(ValidationResult(False, f'Profile size [{self._width}, {self._length}]mm must be greater than tool diameter {options.tool.tool_diameter}mm'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
@@ -146,7 +149,7 @@ class RectangularProfile(Operation):
 
     def generate(self, position: list[float], commands: list[GCode], options: Options) -> None:
         # Setup
-        precision = options.output.position_precision
+        tolerance = options.output.tolerance
         tool_options = options.tool
         job_options = options.job
 
@@ -158,7 +161,7 @@ class RectangularProfile(Operation):
         total_plunge = job_options.lead_in + self._depth
         total_xy_travel = sum(pocket_final_size) * 2
 
-        max_plunge_per_step_using_angle = total_xy_travel * tan(tool_options.max_helix_angle * pi / 180)
+        max_plunge_per_step_using_angle = total_xy_travel * tool_options.helix_slope
         plunge_per_step_using_angle = total_plunge / ceil(total_plunge / max_plunge_per_step_using_angle)
 
         max_plunge_per_step = min(tool_options.max_stepdown, plunge_per_step_using_angle)
@@ -194,32 +197,147 @@ class RectangularProfile(Operation):
                 [0, pocket_final_size[1], -y_travel_plunge]
             ]
 
-        while not isclose(position[2], self._start_depth - self._depth, abs_tol=pow(10, -precision)):
+        final_depth = self._start_depth - self._depth
+        maximum_passes = max_pass_count(total_plunge, step_plunge)
+        pass_count = 0
+        while not isclose(position[2], final_depth, abs_tol=tolerance) and position[2] > final_depth:
+            pass_count += 1
+            check_pass_count(pass_count, maximum_passes, 'Rectangular profile ramp')
             for travel in travels:
                 position[0] += travel[0]
                 position[1] += travel[1]
                 position[2] += travel[2]
-                commands.append(G1(x=position[0], y=position[1], z=position[2], f=tool_options.feed_rate))
+                commands.append(G1(x=position[0], y=position[1], z=position[2], f=tool_options.helix_feed_rate, move=HELIX))
 
         commands.append(GCode('Final pass at full depth'))
         for travel in travels:
             position[0] += travel[0]
             position[1] += travel[1]
-            commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate))
+            commands.append(G1(x=position[0], y=position[1], f=tool_options.feed_rate, move=ROUGHING))
 
-    def to_json(self) -> str:
-        return (
-                '{' +
-                f'"width":{self._width},' +
-                f'"length":{self._length},' +
-                f'"depth":{self._depth},' +
-                f'"centre":[{self._centre[0]},{self._centre[1]}],' +
-                f'"corner":[{self._corner[0]},{self._corner[1]}],' +
-                f'"start_depth":{self._start_depth},' +
-                f'"is_inner":{str(self._is_inner).lower()},' +
-                f'"is_climb":{str(self._is_climb).lower()},' +
-                '}'
-        ).replace(',}', '}')
+    def start_point(self, options: Options) -> list[float]:
+        tool_diameter = options.tool.tool_diameter
+        if self._is_inner:
+            pocket_final_size = [self._width - tool_diameter, self._length - tool_diameter]
+        else:
+            pocket_final_size = [self._width + tool_diameter, self._length + tool_diameter]
+
+        if self._centre is not None:
+            centre = self._centre
+        else:
+            centre = [self._corner[0] + self._width / 2, self._corner[1] + self._length / 2]
+
+        return [centre[0] + pocket_final_size[0] / 2, centre[1] + pocket_final_size[1] / 2, options.job.clearance_height]
+
+    def estimate(self, options: Options) -> Estimate:
+        # Setup
+        tolerance = options.output.tolerance
+        tool_options = options.tool
+        job_options = options.job
+
+        if self._is_inner:
+            pocket_final_size = [self._width - tool_options.tool_diameter, self._length - tool_options.tool_diameter]
+        else:
+            pocket_final_size = [self._width + tool_options.tool_diameter, self._length + tool_options.tool_diameter]
+
+        total_plunge = job_options.lead_in + self._depth
+        total_xy_travel = sum(pocket_final_size) * 2
+
+        max_plunge_per_step_using_angle = total_xy_travel * tool_options.helix_slope
+        plunge_per_step_using_angle = total_plunge / ceil(total_plunge / max_plunge_per_step_using_angle)
+
+        max_plunge_per_step = min(tool_options.max_stepdown, plunge_per_step_using_angle)
+        step_plunge = total_plunge / ceil(total_plunge / max_plunge_per_step)
+
+        estimate = Estimate(start=self.start_point(options))
+
+        # Position tool
+        estimate.add_commands(2)
+        estimate.add_rapid(job_options.clearance_height - self._start_depth - job_options.lead_in, job_options.rapid_rate)
+
+        # Ramp down around the profile, then one more lap at full depth
+        x_travel_plunge = step_plunge * pocket_final_size[0] / total_xy_travel
+        y_travel_plunge = step_plunge * pocket_final_size[1] / total_xy_travel
+        lap_length = 2 * (
+                sqrt(pocket_final_size[0] * pocket_final_size[0] + x_travel_plunge * x_travel_plunge) +
+                sqrt(pocket_final_size[1] * pocket_final_size[1] + y_travel_plunge * y_travel_plunge)
+        )
+        laps = max(0, ceil((total_plunge - tolerance) / step_plunge))
+
+        estimate.add_commands(4 * laps + 5)
+        estimate.add_feed(laps * lap_length, tool_options.helix_feed_rate)
+        estimate.add_feed(total_xy_travel, tool_options.feed_rate)
+
+        estimate.end = [*estimate.start[0:2], self._start_depth + job_options.lead_in - laps * step_plunge]
+        return estimate
+
+    def footprints(self, options: Options) -> list[Footprint]:
+        if self._centre is not None:
+            centre = [*self._centre]
+        else:
+            centre = [self._corner[0] + self._width / 2, self._corner[1] + self._length / 2]
+        # The tool cuts a band inside of the profile for an inner profile, or outside of it for an outer one
+        margin = 2 * options.tool.tool_diameter
+        if self._is_inner:
+            size = [self._width, self._length]
+            inner_size = [max(0.0, self._width - margin), max(0.0, self._length - margin)]
+        else:
+            size = [self._width + margin, self._length + margin]
+            inner_size = [self._width, self._length]
+        return [Footprint(
+            self, PROFILE, centre, size=size,
+            bottom=self._start_depth - self._depth, top=self._start_depth, inner_size=inner_size
+        )]
+
+    def removed_volume(self, options: Options) -> float:
+        tool_diameter = options.tool.tool_diameter
+        if self._is_inner:
+            outer_area = self._width * self._length
+            inner_area = max(0.0, self._width - 2 * tool_diameter) * max(0.0, self._length - 2 * tool_diameter)
+        else:
+            outer_area = (self._width + 2 * tool_diameter) * (self._length + 2 * tool_diameter)
+            inner_area = self._width * self._length
+        # The outside edge of the cut is rounded by the tool radius at each corner
+        corner_area = (4 - pi) * options.tool.tool_radius ** 2
+        return (outer_area - inner_area - corner_area) * self._depth
+
+    def peak_removal_rates(self, options: Options) -> dict[str, float]:
+        tool_options = options.tool
+        job_options = options.job
+
+        if self._is_inner:
+            pocket_final_size = [self._width - tool_options.tool_diameter, self._length - tool_options.tool_diameter]
+        else:
+            pocket_final_size = [self._width + tool_options.tool_diameter, self._length + tool_options.tool_diameter]
+
+        total_plunge = job_options.lead_in + self._depth
+        total_xy_travel = sum(pocket_final_size) * 2
+
+        max_plunge_per_step_using_angle = total_xy_travel * tool_options.helix_slope
+        plunge_per_step_using_angle = total_plunge / ceil(total_plunge / max_plunge_per_step_using_angle)
+
+        max_plunge_per_step = min(tool_options.max_stepdown, plunge_per_step_using_angle)
+        step_depth = min(total_plunge / ceil(total_plunge / max_plunge_per_step), self._depth)
+
+        # Each lap of the ramp cuts a slot of the full tool diameter one step deeper than the last
+        return {
+            HELIX: tool_options.tool_diameter * step_depth * tool_options.helix_feed_rate,
+            ROUGHING: tool_options.tool_diameter * step_depth * tool_options.feed_rate
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            key: value for key, value in (
+                ('width', self._width),
+                ('length', self._length),
+                ('depth', self._depth),
+                ('centre', [self._centre[0], self._centre[1]] if self._centre is not None else None),
+                ('corner', [self._corner[0], self._corner[1]] if self._corner is not None else None),
+                ('start_depth', self._start_depth),
+                ('is_inner', self._is_inner),
+                ('is_climb', self._is_climb)
+            ) if value is not None
+        }
 
     def __repr__(self) -> str:
         return (
@@ -6,7 +6,9 @@ Classes:
   - Options for a job.
 """
 
-from conversational_gcode.validate.validation_result import ValidationResult
+import json
+
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
 
 
 class JobOptions:
@@ -14,16 +16,28 @@ class JobOptions:
     Options for a job.
     """
 
-    def __init__(self, clearance_height: float = 10, lead_in: float = 0.25):
+    def __init__(self,
+                 clearance_height: float = 10,
+                 lead_in: float = 0.25,
+                 rapid_rate: float = None,
+                 local_retract: bool = None):
         """
         Initialise the job options.
         :param clearance_height: Height at which the tool is guaranteed to be clear of the work.
         Defaults to 10mm.
         :param lead_in: Height above the work surface to start plunge operations.
         Defaults to 0.25mm.
+        :param rapid_rate: Rate at which the machine moves the tool during rapid moves, used when
+        estimating cycle times. Defaults to None to assume 5000mm per minute.
+        :param local_retract: Whether to retract between operations only as high as the stock under each rapid move
+        needs, rather than to the clearance height. Defaults to None to always retract to the clearance height.
         """
         self._clearance_height = clearance_height
         self._lead_in = lead_in
+        self._rapid_rate = rapid_rate
+        self._local_retract = local_retract
+
+        self._revision = 0
 
     def validate(self) -> list[ValidationResult]:
         results = []
@@ -31,17 +45,31 @@ class JobOptions:
             results.append(ValidationResult(False, 'Clearance height must be greater than zero'))
         if self._lead_in is None or self._lead_in < 0:
             results.append(ValidationResult(False, 'Lead-in must be positive or zero'))
+        if self._rapid_rate is not None and self._rapid_rate <= 0:
+            results.append(ValidationResult(False, 'Rapid rate must be positive'))
+        if self._local_retract is not None and not isinstance(self._local_retract, bool):
+            results.append(ValidationResult(False, 'Local retract must be specified'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
     def _set_clearance_height(self, value: float) -> None:
         self._clearance_height = value
+        self._revision += 1
 
     def _set_lead_in(self, value: float) -> None:
         self._lead_in = value
+        self._revision += 1
+
+    def _set_rapid_rate(self, value: float) -> None:
+        self._rapid_rate = value
+        self._revision += 1
+
+    def _set_local_retract(self, value: bool) -> None:
+        self._local_retract = value
+        self._revision += 1
 
     clearance_height = property(
         fget=lambda self: self._clearance_height,
@@ -53,13 +81,41 @@ class JobOptions:
         fset=_set_lead_in
     )
 
+    rapid_rate = property(
+        fget=lambda self: self._rapid_rate if self._rapid_rate is not None else 5000,
+        fset=_set_rapid_rate
+    )
+
+    local_retract = property(
+        fget=lambda self: self._local_retract is not None and self._local_retract,
+        fset=_set_local_retract
+    )
+
+    revision = property(fget=lambda self: self._revision)
+
+    def to_dict(self) -> dict:
+        return {
+            key: value for key, value in (
+                ('clearance_height', self._clearance_height),
+                ('lead_in', self._lead_in),
+                ('rapid_rate', self._rapid_rate),
+                ('local_retract', self._local_retract)
+            ) if value is not None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'JobOptions':
+        return cls(**data)
+
     def to_json(self) -> str:
-        return (
-                '{' +
-                (f'"clearance_height":{self._clearance_height},' if self._clearance_height is not None else '') +
-                (f'"lead_in":{self._lead_in}' if self._lead_in is not None else '') +
-                '}'
-        ).replace(',}', '}')
+        return json.dumps(self.to_dict(), separators=(',', ':'))
 
     def __repr__(self) -> str:
-        return f'JobOptions(clearance_height={self.clearance_height}, lead_in={self.lead_in})'
+        return (
+            'JobOptions(' +
+            f'clearance_height={self.clearance_height}, ' +
+            f'lead_in={self.lead_in}, ' +
+            f'rapid_rate={self._rapid_rate}, ' +
+            f'local_retract={self._local_retract}' +
+            ')'
+        )
@@ -6,10 +6,21 @@ Classes:
   - Options for GCode generation. Contains sub-objects for more specific options.
 """
 
+import json
+from dataclasses import fields
+
 from conversational_gcode.options.ToolOptions import ToolOptions
 from conversational_gcode.options.JobOptions import JobOptions
 from conversational_gcode.options.OutputOptions import OutputOptions
-from conversational_gcode.validate.validation_result import ValidationResult
+from conversational_gcode.options.OptionsSnapshot import (
+    OptionsSnapshot, JobOptionsSnapshot, OutputOptionsSnapshot
+)
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+
+
+def _snapshot_of(snapshot_type: type, options) -> object:
+    # Read the options through their properties, so that defaults are resolved
+    return snapshot_type(**{field.name: getattr(options, field.name) for field in fields(snapshot_type) if field.init})
 
 
 class Options:
@@ -20,6 +31,8 @@ class Options:
         tool (ToolOptions): ToolOptions defining options for a cutting tool.
         job (JobOptions): JobOptions for defining options for the whole job.
         output (OutputOptions): OutputOptions for defining options relating to printing the GCode.
+        header (str): The options as indented JSON, for the header of a GCode file.
+        Rendered once and cached until any of the options change.
     """
 
     def __init__(
@@ -39,16 +52,21 @@ class Options:
         self._job = job if job is not None else JobOptions()
         self._output = output if output is not None else OutputOptions()
 
-    def validate(self) -> list[ValidationResult]:
-        results = []
-        results.extend(self._output.validate())
-        results.extend(self._job.validate())
-        results.extend(self._tool.validate())
+        self._header = None
+        self._header_revision = None
+        self._snapshot = None
+        self._snapshot_revision = None
 
-        results = list(filter(lambda result: not result.success, results))
+    def validate(self) -> list[ValidationResult]:
+        results = [
+            result
+            for options in (self._output, self._job, self._tool)
+            for result in options.validate()
+            if not result.success
+        ]
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
@@ -56,14 +74,55 @@ class Options:
     job = property(fget=lambda self: self._job)
     output = property(fget=lambda self: self._output)
 
-    def to_json(self) -> str:
-        return (
-                '{' +
-                f'"tool":{self.tool.to_json()},' +
-                f'"job":{self.job.to_json()},' +
-                f'"output":{self.output.to_json()}' +
-                '}'
+    def _get_header(self) -> str:
+        # Re-render only if a setter on any of the sub-options has fired since the last render
+        revision = (self._tool.revision, self._job.revision, self._output.revision)
+        if self._header is None or self._header_revision != revision:
+            self._header = json.dumps(self.to_dict(), indent=2)
+            self._header_revision = revision
+        return self._header
+
+    header = property(fget=_get_header)
+
+    def snapshot(self) -> OptionsSnapshot:
+        """
+        Take an immutable snapshot of the options, with defaults resolved and derived values computed.
+        The snapshot is cached until any of the options change, so repeated calls return the same object.
+        :return: The snapshot.
+        """
+        revision = (self._tool.revision, self._job.revision, self._output.revision)
+        if self._snapshot is None or self._snapshot_revision != revision:
+            self._snapshot = OptionsSnapshot(
+                tool=self._tool.snapshot(),
+                job=_snapshot_of(JobOptionsSnapshot, self._job),
+                output=_snapshot_of(OutputOptionsSnapshot, self._output),
+                header=self.header
+            )
+            self._snapshot_revision = revision
+        return self._snapshot
+
+    def to_dict(self) -> dict:
+        return {
+            'tool': self._tool.to_dict(),
+            'job': self._job.to_dict(),
+            'output': self._output.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Options':
+        """
+        Create options from the dictionary written by to_dict().
+        :param data: Dictionary with optional tool, job and output sub-dictionaries.
+        :return: The options.
+        """
+        return cls(
+            tool=ToolOptions.from_dict(data['tool']) if 'tool' in data else None,
+            job=JobOptions.from_dict(data['job']) if 'job' in data else None,
+            output=OutputOptions.from_dict(data['output']) if 'output' in data else None
         )
 
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
     def __repr__(self) -> str:
         return f'Options(tool={self.tool!r}, job={self.job!r}, output={self.output!r})'
@@ -0,0 +1,127 @@
+"""
+Immutable snapshots of the options, taken when generation starts.
+
+The mutable options resolve defaults and derive values, such as the tolerance of the position precision, every time that
+they are read. A snapshot resolves and derives them once, so that they are plain attribute reads in the generation loops,
+and it cannot change part way through a job. Snapshots of equal options are equal and hash equal, so they may be used as
+cache keys.
+
+Classes:
+- ToolOptionsSnapshot
+  - Resolved tool options, with derived values.
+- JobOptionsSnapshot
+  - Resolved job options.
+- OutputOptionsSnapshot
+  - Resolved output options, with derived values.
+- OptionsSnapshot
+  - Snapshot of all of the options, used in place of Options during generation.
+"""
+
+from dataclasses import dataclass, field
+from math import pi, tan
+
+from conversational_gcode.gcodes.GCodes import PLUNGE, HELIX, FINISHING, LINK, DISENGAGE
+
+
+@dataclass(frozen=True)
+class ToolOptionsSnapshot:
+    """
+    Resolved tool options, with derived values.
+
+    Attributes:
+        tool_radius (float): Half of the tool diameter.
+        helix_slope (float): Tangent of the maximum helix angle, the greatest plunge per unit of travel.
+    """
+    tool_flutes: int
+    tool_diameter: float
+    spindle_speed: float
+    feed_rate: float
+    min_feed_rate: float
+    max_feed_rate: float
+    plunge_feed_rate: float
+    link_feed_rate: float
+    max_stepover: float
+    max_stepdown: float
+    max_helix_stepover: float
+    helix_feed_rate: float
+    max_helix_angle: float
+    finishing_pass: float
+    finishing_feed_rate: float
+    finishing_climb: bool
+
+    tool_radius: float = field(init=False)
+    helix_slope: float = field(init=False)
+    _feed_rates: dict = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'tool_radius', self.tool_diameter / 2)
+        object.__setattr__(self, 'helix_slope', tan(self.max_helix_angle * pi / 180))
+        object.__setattr__(self, '_feed_rates', {
+            PLUNGE: self.plunge_feed_rate,
+            HELIX: self.helix_feed_rate,
+            FINISHING: self.finishing_feed_rate,
+            LINK: self.link_feed_rate,
+            DISENGAGE: self.link_feed_rate
+        })
+
+    def feed_rate_for(self, move: str | None) -> float:
+        """
+        Find the feed rate of a class of feed move.
+        :param move: Class of the move, such as PLUNGE or LINK, or None for a normal cut.
+        :return: Rate at which to feed the tool, in mm per minute.
+        """
+        return self._feed_rates.get(move, self.feed_rate)
+
+
+@dataclass(frozen=True)
+class JobOptionsSnapshot:
+    """
+    Resolved job options.
+    """
+    clearance_height: float
+    lead_in: float
+    rapid_rate: float
+    local_retract: bool
+
+
+@dataclass(frozen=True)
+class OutputOptionsSnapshot:
+    """
+    Resolved output options, with derived values.
+
+    Attributes:
+        tolerance (float): Smallest printed step of a position, 10^-position_precision.
+    """
+    position_precision: int
+    feed_precision: int
+    speed_precision: int
+    quantise_positions: bool
+
+    tolerance: float = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'tolerance', pow(10, -self.position_precision))
+
+
+@dataclass(frozen=True)
+class OptionsSnapshot:
+    """
+    Snapshot of all of the options, used in place of Options during generation.
+
+    Attributes:
+        tool (ToolOptionsSnapshot): Resolved tool options.
+        job (JobOptionsSnapshot): Resolved job options.
+        output (OutputOptionsSnapshot): Resolved output options.
+        header (str): The options as indented JSON, for the header of a GCode file. Options which were left unset are
+        left out of the header, so it is part of the snapshot's identity.
+    """
+    tool: ToolOptionsSnapshot
+    job: JobOptionsSnapshot
+    output: OutputOptionsSnapshot
+    header: str
+
+    def snapshot(self) -> 'OptionsSnapshot':
+        """
+        :return: This snapshot, so that code may snapshot options without knowing whether it already has a snapshot.
+        """
+        return self
@@ -6,7 +6,9 @@ Classes:
   - Options for printing the GCode.
 """
 
-from conversational_gcode.validate.validation_result import ValidationResult
+import json
+
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
 
 
 class OutputOptions:
@@ -18,7 +20,8 @@ class OutputOptions:
             self,
             position_precision: int = 3,
             feed_precision: int = 2,
-            speed_precision: int = 1
+            speed_precision: int = 1,
+            quantise_positions: bool = None
     ):
         """
         Initialise the options.
@@ -28,10 +31,15 @@ class OutputOptions:
         Defaults to 2.
         :param speed_precision: The number of decimal places to which to print the spindle speed.
         Defaults to 1.
+        :param quantise_positions: Whether to round generated positions to the position precision, dropping moves which
+        then go nowhere. Defaults to None to print positions as generated.
         """
         self._position_precision = position_precision
         self._feed_precision = feed_precision
         self._speed_precision = speed_precision
+        self._quantise_positions = quantise_positions
+
+        self._revision = 0
 
     def validate(self) -> list[ValidationResult]:
         results = []
@@ -41,20 +49,29 @@ class OutputOptions:
             results.append(ValidationResult(False, 'Feed precision must be zero or greater'))
         if self._speed_precision is None or self._speed_precision < 0:
             results.append(ValidationResult(False, 'Speed precision must be zero or greater'))
+        if self._quantise_positions is not None and not isinstance(self._quantise_positions, bool):
+            results.append(ValidationResult(False, 'Quantise positions must be specified'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
     def _set_position_precision(self, value: int) -> None:
         self._position_precision = value
+        self._revision += 1
 
     def _set_feed_precision(self, value: int) -> None:
         self._feed_precision = value
+        self._revision += 1
 
     def _set_speed_precision(self, value: int) -> None:
         self._speed_precision = value
+        self._revision += 1
+
+    def _set_quantise_positions(self, value: bool) -> None:
+        self._quantise_positions = value
+        self._revision += 1
 
     position_precision = property(
         fget=lambda self: self._position_precision,
@@ -68,21 +85,39 @@ class OutputOptions:
         fget=lambda self: self._speed_precision,
         fset=_set_speed_precision
     )
+    quantise_positions = property(
+        fget=lambda self: self._quantise_positions is not None and self._quantise_positions,
+        fset=_set_quantise_positions
+    )
+
+    # Derived values
+    tolerance = property(fget=lambda self: pow(10, -self._position_precision))
+
+    revision = property(fget=lambda self: self._revision)
+
+    def to_dict(self) -> dict:
+        return {
+            key: value for key, value in (
+                ('position_precision', self._position_precision),
+                ('feed_precision', self._feed_precision),
+                ('speed_precision', self._speed_precision),
+                ('quantise_positions', self._quantise_positions)
+            ) if value is not None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'OutputOptions':
+        return cls(**data)
 
     def to_json(self) -> str:
-        return (
-            '{' +
-            (f'"position_precision":{self._position_precision},' if self._position_precision is not None else '') +
-            (f'"feed_precision":{self._feed_precision},' if self._feed_precision is not None else '') +
-            (f'"speed_precision":{self._speed_precision}' if self._speed_precision is not None else '') +
-            '}'
-        ).replace(',}', '}')
+        return json.dumps(self.to_dict(), separators=(',', ':'))
 
     def __repr__(self) -> str:
         return (
             'OutputOptions(' +
             f'position_precision={self.position_precision}, ' +
             f'feed_precision={self.feed_precision}, ' +
-            f'speed_precision={self.speed_precision}' +
+            f'speed_precision={self.speed_precision}, ' +
+            f'quantise_positions={self._quantise_positions}' +
             ')'
         )
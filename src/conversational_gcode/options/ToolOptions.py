@@ -6,7 +6,12 @@ Classes:
   - Options for a cutting tool.
 """
 
-from conversational_gcode.validate.validation_result import ValidationResult
+import json
+from dataclasses import fields
+from math import pi, tan
+
+from conversational_gcode.options.OptionsSnapshot import ToolOptionsSnapshot
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
 
 
 class ToolOptions:
@@ -20,6 +25,10 @@ class ToolOptions:
 
                  spindle_speed: float = 1000,
                  feed_rate: float = 100,
+                 min_feed_rate: float = None,
+                 max_feed_rate: float = None,
+                 plunge_feed_rate: float = None,
+                 link_feed_rate: float = None,
 
                  max_stepover: float = 2,
                  max_stepdown: float = 3,
@@ -34,11 +43,19 @@ class ToolOptions:
                  ):
         """
         Initialise the options.
-        :param tool_flutes: Number of flutes on the tool. Defaults to 2mm.
+        :param tool_flutes: Number of flutes on the tool, which sets the feed rate found for a chip load. Defaults to 4.
         :param tool_diameter: Diameter of the tool. Defaults to 6mm.
         :param spindle_speed: Speed of the spindle. Defaults to 1000RPM.
         :param feed_rate: Rate at which to feed the tool while cutting.
         Defaults to 100mm per minute.
+        :param min_feed_rate: Slowest rate to which feed rate optimisation may slow heavy cuts.
+        Defaults to None to match the normal feed rate.
+        :param max_feed_rate: Fastest rate to which feed rate optimisation may speed up light cuts.
+        Defaults to None to match the normal feed rate.
+        :param plunge_feed_rate: Rate at which to feed the tool straight down, such as while drilling.
+        Defaults to None to match the normal feed rate.
+        :param link_feed_rate: Rate at which to feed the tool while it is not cutting, such as when moving away from a
+        cut wall. Defaults to None to match the normal feed rate.
         :param max_stepover: Maximum tool stepover while cutting. Defaults to 2mm.
         :param max_stepdown: Maximum tool step down while cutting. Defaults to 3mm.
         :param max_helix_stepover: Maximum tool stepover while cutting in a helix. Defaults to 2mm.
@@ -58,6 +75,10 @@ class ToolOptions:
 
         self._spindle_speed = spindle_speed
         self._feed_rate = feed_rate
+        self._min_feed_rate = min_feed_rate
+        self._max_feed_rate = max_feed_rate
+        self._plunge_feed_rate = plunge_feed_rate
+        self._link_feed_rate = link_feed_rate
 
         self._max_stepover = max_stepover
         self._max_stepdown = max_stepdown
@@ -70,6 +91,10 @@ class ToolOptions:
         self._finishing_feed_rate = finishing_feed_rate
         self._finishing_climb = finishing_climb
 
+        self._revision = 0
+        self._snapshot = None
+        self._snapshot_revision = None
+
     def validate(self) -> list[ValidationResult]:
         results = []
         if self._tool_flutes is None or self._tool_flutes < 1:
@@ -90,6 +115,17 @@ class ToolOptions:
         else:
             feed_rate_valid = True
 
+        if self._min_feed_rate is not None and self._min_feed_rate <= 0:
+            results.append(ValidationResult(False, 'Minimum feed rate must be positive'))
+        if self._max_feed_rate is not None and self._max_feed_rate <= 0:
+            results.append(ValidationResult(False, 'Maximum feed rate must be positive'))
+        if self.min_feed_rate is not None and self.max_feed_rate is not None and 0 < self.max_feed_rate < self.min_feed_rate:
+            results.append(ValidationResult(False, 'Minimum feed rate cannot be more than the maximum feed rate'))
+        if self._plunge_feed_rate is not None and self._plunge_feed_rate <= 0:
+            results.append(ValidationResult(False, 'Plunge feed rate must be positive'))
+        if self._link_feed_rate is not None and self._link_feed_rate <= 0:
+            results.append(ValidationResult(False, 'Link feed rate must be positive'))
+
         if self._max_stepover is None or self._max_stepover <= 0:
             results.append(ValidationResult(False, 'Tool step-over must be positive'))
         if diameter_valid and self._max_stepover is not None and self._max_stepover > self._tool_diameter:
@@ -115,45 +151,73 @@ class ToolOptions:
                 results.append(ValidationResult(False, 'Finishing direction must be specified'))
 
         if len(results) == 0:
-            results.append(ValidationResult())
+            results.append(SUCCESS)
 
         return results
 
     def _set_tool_flutes(self, value: int) -> None:
         self._tool_flutes = value
+        self._revision += 1
 
     def _set_tool_diameter(self, value: float) -> None:
         self._tool_diameter = value
+        self._revision += 1
 
     def _set_spindle_speed(self, value: float) -> None:
         self._spindle_speed = value
+        self._revision += 1
 
     def _set_feed_rate(self, value: float) -> None:
         self._feed_rate = value
+        self._revision += 1
+
+    def _set_min_feed_rate(self, value: float) -> None:
+        self._min_feed_rate = value
+        self._revision += 1
+
+    def _set_max_feed_rate(self, value: float) -> None:
+        self._max_feed_rate = value
+        self._revision += 1
+
+    def _set_plunge_feed_rate(self, value: float) -> None:
+        self._plunge_feed_rate = value
+        self._revision += 1
+
+    def _set_link_feed_rate(self, value: float) -> None:
+        self._link_feed_rate = value
+        self._revision += 1
 
     def _set_max_stepover(self, value: float) -> None:
         self._max_stepover = value
+        self._revision += 1
 
     def _set_max_stepdown(self, value: float) -> None:
         self._max_stepdown = value
+        self._revision += 1
 
     def _set_max_helix_stepover(self, value: float) -> None:
         self._max_helix_stepover = value
+        self._revision += 1
 
     def _set_helix_feed_rate(self, value: float) -> None:
         self._helix_feed_rate = value
+        self._revision += 1
 
     def _set_max_helix_angle(self, value: float) -> None:
         self._max_helix_angle = value
+        self._revision += 1
 
     def _set_finishing_pass(self, value: float) -> None:
         self._finishing_pass = value
+        self._revision += 1
 
     def _set_finishing_feed_rate(self, value: float) -> None:
         self._finishing_feed_rate = value
+        self._revision += 1
 
     def _set_finishing_climb(self, value: bool) -> None:
         self._finishing_climb = value
+        self._revision += 1
 
     tool_flutes = property(
         fget=lambda self: self._tool_flutes,
@@ -172,6 +236,22 @@ class ToolOptions:
         fget=lambda self: self._feed_rate,
         fset=_set_feed_rate
     )
+    min_feed_rate = property(
+        fget=lambda self: self._min_feed_rate if self._min_feed_rate is not None else self._feed_rate,
+        fset=_set_min_feed_rate
+    )
+    max_feed_rate = property(
+        fget=lambda self: self._max_feed_rate if self._max_feed_rate is not None else self._feed_rate,
+        fset=_set_max_feed_rate
+    )
+    plunge_feed_rate = property(
+        fget=lambda self: self._plunge_feed_rate if self._plunge_feed_rate is not None else self._feed_rate,
+        fset=_set_plunge_feed_rate
+    )
+    link_feed_rate = property(
+        fget=lambda self: self._link_feed_rate if self._link_feed_rate is not None else self._feed_rate,
+        fset=_set_link_feed_rate
+    )
 
     max_stepover = property(
         fget=lambda self: self._max_stepover,
@@ -208,23 +288,62 @@ class ToolOptions:
         fset=_set_finishing_climb
     )
 
+    # Derived values
+    tool_radius = property(fget=lambda self: self._tool_diameter / 2)
+    helix_slope = property(fget=lambda self: tan(self._max_helix_angle * pi / 180))
+
+    revision = property(fget=lambda self: self._revision)
+
+    def snapshot(self) -> ToolOptionsSnapshot:
+        """
+        Take an immutable snapshot of the tool options, with defaults resolved and derived values computed.
+        The snapshot is cached until any of the tool options change, so repeated calls return the same object.
+        :return: The snapshot.
+        """
+        if self._snapshot is None or self._snapshot_revision != self._revision:
+            # Read the options through their properties, so that defaults are resolved
+            self._snapshot = ToolOptionsSnapshot(**{
+                field.name: getattr(self, field.name) for field in fields(ToolOptionsSnapshot) if field.init
+            })
+            self._snapshot_revision = self._revision
+        return self._snapshot
+
+    def feed_rate_for(self, move: str | None) -> float:
+        """
+        Find the feed rate of a class of feed move.
+        :param move: Class of the move, such as PLUNGE or LINK, or None for a normal cut.
+        :return: Rate at which to feed the tool, in mm per minute.
+        """
+        return self.snapshot().feed_rate_for(move)
+
+    def to_dict(self) -> dict:
+        return {
+            key: value for key, value in (
+                ('tool_flutes', self._tool_flutes),
+                ('tool_diameter', self._tool_diameter),
+                ('spindle_speed', self._spindle_speed),
+                ('feed_rate', self._feed_rate),
+                ('min_feed_rate', self._min_feed_rate),
+                ('max_feed_rate', self._max_feed_rate),
+                ('plunge_feed_rate', self._plunge_feed_rate),
+                ('link_feed_rate', self._link_feed_rate),
+                ('max_stepover', self._max_stepover),
+                ('max_stepdown', self._max_stepdown),
+                ('max_helix_stepover', self._max_helix_stepover),
+                ('helix_feed_rate', self._helix_feed_rate),
+                ('max_helix_angle', self._max_helix_angle),
+                ('finishing_pass', self._finishing_pass),
+                ('finishing_feed_rate', self._finishing_feed_rate),
+                ('finishing_climb', self._finishing_climb)
+            ) if value is not None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ToolOptions':
+        return cls(**data)
+
     def to_json(self) -> str:
-        return (
-            '{' +
-            (f'"tool_flutes":{self._tool_flutes},' if self._tool_flutes is not None else '') +
-            (f'"tool_diameter":{self._tool_diameter},' if self._tool_diameter is not None else '') +
-            (f'"spindle_speed":{self._spindle_speed},' if self._spindle_speed is not None else '') +
-            (f'"feed_rate":{self._feed_rate},' if self._feed_rate is not None else '') +
-            (f'"max_stepover":{self._max_stepover},' if self._max_stepover is not None else '') +
-            (f'"max_stepdown":{self._max_stepdown},' if self._max_stepdown is not None else '') +
-            (f'"max_helix_stepover":{self._max_helix_stepover},' if self._max_helix_stepover is not None else '') +
-            (f'"helix_feed_rate":{self._helix_feed_rate},' if self._helix_feed_rate is not None else '') +
-            (f'"max_helix_angle":{self._max_helix_angle},' if self._max_helix_angle is not None else '') +
-            (f'"finishing_pass":{self._finishing_pass},' if self._finishing_pass is not None else '') +
-            (f'"finishing_feed_rate":{self._finishing_feed_rate},' if self._finishing_feed_rate is not None else '') +
-            (f'"finishing_climb":{str(self._finishing_climb).lower()}' if self._finishing_climb is not None else '') +
-            '}'
-        ).replace(',}', '}')
+        return json.dumps(self.to_dict(), separators=(',', ':'))
 
     def __repr__(self) -> str:
         return (
@@ -233,6 +352,10 @@ class ToolOptions:
             f'tool_diameter={self._tool_diameter}, ' +
             f'spindle_speed={self._spindle_speed}, ' +
             f'feed_rate={self._feed_rate}, ' +
+            f'min_feed_rate={self._min_feed_rate}, ' +
+            f'max_feed_rate={self._max_feed_rate}, ' +
+            f'plunge_feed_rate={self._plunge_feed_rate}, ' +
+            f'link_feed_rate={self._link_feed_rate}, ' +
             f'max_stepover={self._max_stepover}, ' +
             f'max_stepdown={self._max_stepdown}, ' +
             f'max_helix_stepover={self._max_helix_stepover}, ' +
@@ -0,0 +1,190 @@
+"""
+Post-processing of GCode to replace runs of short G1 moves with fewer longer moves.
+
+Collinear G1 moves are merged into a single G1, and G1 runs which turn smoothly in one direction are fitted with G2 or G3
+arcs. Commands are processed as a stream, holding only the run being fitted, so that the post-processor can be applied to
+GcodeGenerator.stream() without buffering the whole program.
+
+Functions:
+- fit_arcs()
+  - Merge collinear G1 moves and fit smoothly turning G1 runs with arcs, within a tolerance.
+"""
+
+from math import atan2, hypot, pi
+from typing import Iterable, Iterator
+
+from conversational_gcode.gcodes.GCodes import GCode, G0, G1, G2, G3, G81, CyclePosition
+from conversational_gcode.options.Options import Options
+
+
+def _is_mergeable(command: GCode, position: list[float]) -> bool:
+    """
+    Whether a command is a plain G1 move from a known position which may be merged with its neighbours.
+    """
+    return (
+        type(command) is G1 and command.comment is None and command.f is not None and
+        (command.x is not None or command.y is not None) and
+        None not in position
+    )
+
+
+def _end_of(command: G1, position: list[float]) -> tuple[float, float, float]:
+    return (
+        command.x if command.x is not None else position[0],
+        command.y if command.y is not None else position[1],
+        command.z if command.z is not None else position[2]
+    )
+
+
+def _fits_line(points: list[tuple[float, float, float]], tolerance: float) -> bool:
+    """
+    Whether every point lies within a tolerance of the line from the first point to the last, in order along it.
+    """
+    start, end = points[0], points[-1]
+    delta = [end[axis] - start[axis] for axis in range(3)]
+    length_squared = sum(value * value for value in delta)
+    if length_squared == 0:
+        return False
+
+    last_along = 0
+    for point in points[1:-1]:
+        offset = [point[axis] - start[axis] for axis in range(3)]
+        along = sum(offset[axis] * delta[axis] for axis in range(3)) / length_squared
+        if along < last_along or along > 1:
+            return False
+        error = [offset[axis] - along * delta[axis] for axis in range(3)]
+        if sum(value * value for value in error) > tolerance * tolerance:
+            return False
+        last_along = along
+    return True
+
+
+def _fit_arc(points: list[tuple[float, float, float]], tolerance: float, max_turn: float) -> tuple[list[float], bool] | None:
+    """
+    Fit a circular arc through the first, middle and last points of a run at constant height.
+    :return: ([X, Y] centre, True if clockwise), or None if any point or chord strays from the arc by more than the
+    tolerance, or the run does not turn smoothly in one direction.
+    """
+    if len(points) < 3 or any(point[2] != points[0][2] for point in points):
+        return None
+
+    (ax, ay, _), (bx, by, _), (cx, cy, _) = points[0], points[len(points) // 2], points[-1]
+    determinant = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if determinant == 0:
+        return None
+    a_squared, b_squared, c_squared = ax * ax + ay * ay, bx * bx + by * by, cx * cx + cy * cy
+    centre = [
+        (a_squared * (by - cy) + b_squared * (cy - ay) + c_squared * (ay - by)) / determinant,
+        (a_squared * (cx - bx) + b_squared * (ax - cx) + c_squared * (bx - ax)) / determinant
+    ]
+    radius = hypot(ax - centre[0], ay - centre[1])
+
+    sweep = 0
+    direction = 0
+    last_heading = None
+    for start, end in zip(points, points[1:]):
+        # Every point, and the middle of every chord, must lie on the arc
+        if abs(hypot(end[0] - centre[0], end[1] - centre[1]) - radius) > tolerance:
+            return None
+        if radius - hypot((start[0] + end[0]) / 2 - centre[0], (start[1] + end[1]) / 2 - centre[1]) > tolerance:
+            return None
+
+        step = atan2(
+            (start[0] - centre[0]) * (end[1] - centre[1]) - (start[1] - centre[1]) * (end[0] - centre[0]),
+            (start[0] - centre[0]) * (end[0] - centre[0]) + (start[1] - centre[1]) * (end[1] - centre[1])
+        )
+        if step == 0 or (direction != 0 and (step > 0) != (direction > 0)):
+            return None
+        direction = step
+        sweep += abs(step)
+
+        heading = atan2(end[1] - start[1], end[0] - start[0])
+        if last_heading is not None:
+            turn = (heading - last_heading + pi) % (2 * pi) - pi
+            if abs(turn) > max_turn:
+                return None
+        last_heading = heading
+
+    if sweep >= 2 * pi - max_turn:
+        return None
+    return centre, direction < 0
+
+
+def fit_arcs(commands: Iterable[GCode],
+             options: Options,
+             tolerance: float = None,
+             position: list[float] = None,
+             max_turn: float = 30,
+             max_run: int = 64) -> Iterator[GCode]:
+    """
+    Merge collinear G1 moves and fit smoothly turning G1 runs with arcs, within a tolerance.
+
+    Only consecutive G1 moves without comments, at the same feed rate and of the same class of move, are merged. The
+    merged moves start and end at the same points as the original run, and no point or chord of the run strays from the
+    new move by more than the tolerance.
+    :param commands: GCode commands to post-process, such as the iterator returned by GcodeGenerator.stream().
+    :param options: Options used to generate the commands.
+    :param tolerance: Furthest that the new moves may stray from the original ones.
+    Defaults to None for ten times the position precision.
+    :param position: Starting position of the commands. Defaults to None to start at [0, 0, 0]
+    :param max_turn: Largest change of direction, in degrees, between consecutive moves of a fitted arc. Defaults to 30
+    degrees, so that corners are never rounded.
+    :param max_run: Most moves to merge into one, which limits the number of commands held at once. Defaults to 64.
+    :return: Iterator of post-processed commands.
+    """
+    if tolerance is None:
+        tolerance = 10 * options.output.tolerance
+    max_turn = max_turn * pi / 180
+    position = [0, 0, 0] if position is None else [*position]
+
+    run = []
+    points = []
+    fit = None
+
+    def flush() -> Iterator[GCode]:
+        if len(run) == 1:
+            yield run[0]
+        elif fit == 'line':
+            z = points[-1][2] if any(command.z is not None for command in run) else None
+            yield G1(x=points[-1][0], y=points[-1][1], z=z, f=run[0].f, move=run[0].move)
+        elif fit is not None:
+            centre, clockwise = fit
+            command = G2 if clockwise else G3
+            yield command(x=points[-1][0], y=points[-1][1], i=centre[0] - points[0][0], j=centre[1] - points[0][1],
+                          f=run[0].f, move=run[0].move)
+
+    for command in commands:
+        if _is_mergeable(command, position):
+            end = _end_of(command, position)
+            if len(run) > 0 and len(run) < max_run and command.f == run[0].f and command.move == run[0].move:
+                candidate = [*points, end]
+                if _fits_line(candidate, tolerance):
+                    run.append(command)
+                    points, fit = candidate, 'line'
+                    position[0:3] = end
+                    continue
+                arc = _fit_arc(candidate, tolerance, max_turn)
+                if arc is not None:
+                    run.append(command)
+                    points, fit = candidate, arc
+                    position[0:3] = end
+                    continue
+
+            yield from flush()
+            run, points, fit = [command], [tuple(position), end], None
+            position[0:3] = end
+            continue
+
+        yield from flush()
+        run, points, fit = [], [], None
+
+        if isinstance(command, CyclePosition):
+            # The tool drills at the position then retracts to the R-plane of the cycle, whatever the depth
+            position[0:2] = _end_of(command, position)[0:2]
+        elif isinstance(command, G0):
+            position[0:3] = _end_of(command, position)
+            if isinstance(command, G81):
+                position[2] = command.r
+        yield command
+
+    yield from flush()
@@ -0,0 +1,86 @@
+"""
+Post-processing of generated GCode to adjust the feed rate of each cut to the width of material which it engages.
+
+A cut narrower than half of the tool diameter makes thinner chips than the feed per tooth, so may be fed faster for the
+same chip load, while a cut wider than the normal step-over, such as a slot, must be fed slower. Cuts deeper than the
+maximum step-down are slowed in proportion, and moves which cut nothing become links.
+
+Functions:
+- optimise_feed_rates()
+  - Scale the feed rate of each cut by its engagement, within the configured limits.
+"""
+
+from dataclasses import replace
+from math import sqrt
+
+from conversational_gcode.geometry.Footprint import Footprint
+from conversational_gcode.gcodes.GCodes import GCode, G1, G81, PLUNGE, LINK
+from conversational_gcode.options.Options import Options
+from conversational_gcode.stock.StockSimulation import StockSimulation
+
+
+def _chip_thinning(width: float, diameter: float) -> float:
+    """
+    Ratio of the greatest chip thickness to the feed per tooth, for a cut of a radial width.
+    """
+    engagement = width / diameter
+    if engagement >= 0.5:
+        return 1
+    return 2 * sqrt(engagement * (1 - engagement))
+
+
+def optimise_feed_rates(commands: list[GCode],
+                        options: Options,
+                        footprints: list[Footprint],
+                        cell_size: float = 1,
+                        top: float = 0,
+                        position: list[float] = None) -> list[GCode]:
+    """
+    Scale the feed rate of each cut by its engagement, within the configured limits.
+
+    The engagement of every command is found by simulating the commands cutting uncut stock. The feed rate of each
+    command is set to keep the same chip thickness as a cut of the maximum step-over at the commanded feed rate, then
+    limited to between the minimum and maximum feed rates of the tool options. Feed rates already outside of the limits,
+    such as a slow finishing pass, are never moved further outside of them. Moves which cut no material are classed as
+    links, fed at the faster of the link and maximum feed rates, while plunges and drilling cycles are unchanged.
+    :param commands: GCode commands to optimise, as returned by GcodeGenerator.generate().
+    :param options: Options used to generate the commands.
+    :param footprints: Footprints of the operations which generated the commands, which the simulated stock must cover.
+    :param cell_size: Width and length of each cell of the simulated stock. Defaults to 1mm.
+    :param top: Z-axis height of the top of the stock. Defaults to 0mm.
+    :param position: Starting position of the commands. Defaults to None to start at [0, 0, 0]
+    :return: New list of commands, sharing the commands whose feed rate is unchanged.
+    """
+    tool_options = options.tool
+    diameter = tool_options.tool_diameter
+    tolerance = options.output.tolerance
+    nominal_thinning = _chip_thinning(min(tool_options.max_stepover, diameter), diameter)
+
+    simulation = StockSimulation.around(footprints, 2 * diameter, cell_size, top)
+    segments = {segment.index: segment for segment in simulation.run(commands, options, position)}
+
+    optimised = []
+    for index, command in enumerate(commands):
+        segment = segments.get(index)
+        if segment is None or not isinstance(command, G1) or isinstance(command, G81) or command.f is None:
+            optimised.append(command)
+            continue
+        if command.move == PLUNGE or (command.x is None and command.y is None):
+            # Plunges are fed as commanded
+            optimised.append(command)
+            continue
+
+        if segment.width <= tolerance:
+            feed_rate = round(max(tool_options.link_feed_rate, tool_options.max_feed_rate), options.output.feed_precision)
+            optimised.append(command if feed_rate == command.f else replace(command, f=feed_rate, move=LINK))
+            continue
+
+        feed_rate = command.f * nominal_thinning / _chip_thinning(segment.width, diameter)
+        if segment.depth > tool_options.max_stepdown:
+            feed_rate *= tool_options.max_stepdown / segment.depth
+
+        feed_rate = min(max(feed_rate, min(command.f, tool_options.min_feed_rate)), max(command.f, tool_options.max_feed_rate))
+        feed_rate = round(feed_rate, options.output.feed_precision)
+        optimised.append(command if feed_rate == command.f else replace(command, f=feed_rate))
+
+    return optimised
@@ -0,0 +1,172 @@
+"""
+Post-processing of GCode to remove redundant commands, looking at a command or two at a time.
+
+Commands are processed as a stream, so that the optimiser can be applied to GcodeGenerator.stream() without buffering
+the whole program. Each rule may be disabled, and the lines and machine time saved by each rule are reported.
+
+Classes:
+- RuleSavings
+  - Lines and machine time saved by a rule.
+- PeepholeReport
+  - Savings of each rule applied by the optimiser.
+
+Functions:
+- optimise_peephole()
+  - Remove blank lines and moves which go nowhere, and merge consecutive rapid plunges and retractions.
+
+Constants:
+- BLANK_LINES, ZERO_LENGTH_FEEDS, REDUNDANT_RAPIDS, MERGED_RAPIDS
+  - Names of the rules, which are all applied by default.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from conversational_gcode.gcodes.GCodes import GCode, G0, G1, G81, CyclePosition
+from conversational_gcode.options.Options import Options
+
+# Comment-less separator lines
+BLANK_LINES = 'blank_lines'
+# G1 moves which end at their start, such as disengage moves from a cut of no engagement
+ZERO_LENGTH_FEEDS = 'zero_length_feeds'
+# G0 moves which end at their start
+REDUNDANT_RAPIDS = 'redundant_rapids'
+# G0 moves along Z followed by another G0 move along Z
+MERGED_RAPIDS = 'merged_rapids'
+
+RULES = (BLANK_LINES, ZERO_LENGTH_FEEDS, REDUNDANT_RAPIDS, MERGED_RAPIDS)
+
+
+@dataclass
+class RuleSavings:
+    """
+    Lines and machine time saved by a rule.
+
+    Attributes:
+        lines (int): Number of commands removed.
+        seconds (float): Machine time saved, in seconds.
+    """
+    lines: int = 0
+    seconds: float = 0
+
+
+@dataclass
+class PeepholeReport:
+    """
+    Savings of each rule applied by the optimiser.
+
+    Attributes:
+        rules (dict): RuleSavings of each applied rule, by name.
+        lines (int): Total number of commands removed.
+        seconds (float): Total machine time saved, in seconds.
+    """
+    rules: dict[str, RuleSavings] = field(default_factory=dict)
+
+    lines = property(fget=lambda self: sum(savings.lines for savings in self.rules.values()))
+    seconds = property(fget=lambda self: sum(savings.seconds for savings in self.rules.values()))
+
+
+def _end_of(command: G0, position: list[float]) -> list[float]:
+    return [
+        command.x if command.x is not None else position[0],
+        command.y if command.y is not None else position[1],
+        command.z if command.z is not None else position[2]
+    ]
+
+
+def _is_vertical(command: G0) -> bool:
+    """
+    Whether a command is a comment-less rapid move along only the Z-axis.
+    """
+    return type(command) is G0 and command.x is None and command.y is None and command.z is not None and command.comment is None
+
+
+def optimise_peephole(commands: Iterable[GCode],
+                      options: Options,
+                      rules: Iterable[str] = None,
+                      position: list[float] = None,
+                      report: PeepholeReport = None) -> Iterator[GCode]:
+    """
+    Remove blank lines and moves which go nowhere, and merge consecutive rapid plunges and retractions.
+
+    Moves are compared at the output precision, so a move is removed if it would print the position at which the tool
+    already is. Arcs are never removed, as an arc which ends at its start is a full circle. Commands with comments are
+    never removed, so that the remaining program is still annotated, while a rapid move along Z is only merged into a
+    following one if it has no comment.
+    :param commands: GCode commands to optimise, such as the iterator returned by GcodeGenerator.stream().
+    :param options: Options used to generate the commands.
+    :param rules: Names of the rules to apply. Defaults to None to apply all of the rules.
+    :param position: Starting position of the commands. Defaults to None to start at [0, 0, 0]
+    :param report: Report to which to add the savings of each rule as the commands are optimised.
+    Defaults to None to not report.
+    :return: Iterator of optimised commands.
+    :raises ValueError: If a rule is not recognised.
+    """
+    rules = set(RULES if rules is None else rules)
+    for rule in rules:
+        if rule not in RULES:
+            raise ValueError(f'Unknown peephole rule {rule}')
+
+    report = PeepholeReport() if report is None else report
+    for rule in rules:
+        report.rules.setdefault(rule, RuleSavings())
+
+    precision = options.output.position_precision
+    rapid_rate = options.job.rapid_rate
+    position = [0, 0, 0] if position is None else [*position]
+    # Rapid move along Z which may be merged into the next command, and the height from which it starts
+    pending = None
+    pending_start = None
+
+    for command in commands:
+        command_type = type(command)
+
+        if command_type is GCode and not command.comment and BLANK_LINES in rules:
+            report.rules[BLANK_LINES].lines += 1
+            continue
+
+        if command_type is G0 or command_type is G1:
+            end = _end_of(command, position)
+
+            rule = ZERO_LENGTH_FEEDS if command_type is G1 else REDUNDANT_RAPIDS
+            if (rule in rules and command.comment is None and
+                    all(round(end[axis], precision) == round(position[axis], precision) for axis in range(3))):
+                report.rules[rule].lines += 1
+                continue
+
+            if pending is not None and command_type is G0 and command.x is None and command.y is None:
+                savings = report.rules[MERGED_RAPIDS]
+                savings.lines += 1
+                saved_length = abs(pending.z - pending_start) + abs(end[2] - pending.z) - abs(end[2] - pending_start)
+                savings.seconds += 60 * saved_length / rapid_rate
+                pending = None
+
+            if pending is not None:
+                yield pending
+                pending = None
+
+            if MERGED_RAPIDS in rules and _is_vertical(command):
+                pending = command
+                pending_start = position[2]
+                position[0:3] = end
+                continue
+
+            position[0:3] = end
+            yield command
+            continue
+
+        if pending is not None:
+            yield pending
+            pending = None
+
+        if isinstance(command, CyclePosition):
+            # The tool drills at the position then retracts to the R-plane of the cycle, whatever the depth
+            position[0:2] = _end_of(command, position)[0:2]
+        elif isinstance(command, G0):
+            position[0:3] = _end_of(command, position)
+            if isinstance(command, G81):
+                position[2] = command.r
+        yield command
+
+    if pending is not None:
+        yield pending
@@ -0,0 +1,133 @@
+"""
+Post-processing of GCode to round positions to the precision at which they are printed.
+
+Positions are only printed to OutputOptions.position_precision decimal places, so consecutive moves may print the same
+position, and small negative values print as -0.000. Rounding the positions as they are generated, and carrying the
+rounded end of each move forward as the start of the next, keeps the printed program consistent with itself.
+
+Classes:
+- Quantiser
+  - Rounds commands one at a time, keeping track of the rounded position.
+
+Functions:
+- quantise_commands()
+  - Round the positions of commands to the output precision, dropping moves which then go nowhere.
+"""
+
+from dataclasses import replace
+from typing import Iterable, Iterator
+
+from conversational_gcode.gcodes.GCodes import GCode, G0, G1, G2, G81, G83, CyclePosition
+from conversational_gcode.gcodes.fixed_point import to_units, from_units
+from conversational_gcode.options.Options import Options
+
+
+def _end_of(command: G0, position: list) -> list:
+    return [
+        command.x if command.x is not None else position[0],
+        command.y if command.y is not None else position[1],
+        command.z if command.z is not None else position[2]
+    ]
+
+
+class Quantiser:
+    """
+    Rounds commands one at a time, keeping track of the rounded position.
+
+    The rounded position is held in integer units of the output precision, so that moves which print the same position
+    compare equal exactly, and arc offsets are found without floating point error.
+
+    Attributes:
+        position (list): Rounded [X, Y, Z] position after the commands so far.
+    """
+
+    def __init__(self, options: Options, position: list[float] = None):
+        """
+        Initialise the quantiser.
+        :param options: Options used to generate the commands.
+        :param position: Starting position of the commands. Defaults to None to start at [0, 0, 0]
+        """
+        self._precision = options.output.position_precision
+        position = [0, 0, 0] if position is None else position
+        self._units = [to_units(value, self._precision) for value in position]
+        # Unrounded position, from which arc centres are found
+        self._exact_position = [*position]
+
+    position = property(fget=lambda self: [from_units(units, self._precision) for units in self._units])
+
+    def _round(self, value: float | None) -> float | None:
+        return from_units(to_units(value, self._precision), self._precision)
+
+    def quantise(self, command: GCode) -> GCode | None:
+        """
+        Round the positions of a command.
+        :param command: Command to round.
+        :return: Rounded command, or None if the command is a comment-less G0 or G1 move which ends where it starts.
+        """
+        precision = self._precision
+
+        if isinstance(command, G81):
+            rounded = replace(command, x=self._round(command.x), y=self._round(command.y), z=self._round(command.z),
+                              r=self._round(command.r))
+            if isinstance(command, G83):
+                rounded.q = self._round(command.q)
+            self._units[0:2] = [
+                to_units(command.x, precision) if command.x is not None else self._units[0],
+                to_units(command.y, precision) if command.y is not None else self._units[1]
+            ]
+            self._units[2] = to_units(command.r, precision)
+            self._exact_position[0:2] = _end_of(command, self._exact_position)[0:2]
+            self._exact_position[2] = command.r
+            return rounded
+
+        if not isinstance(command, G0):
+            return command
+
+        end = [
+            to_units(command.x, precision) if command.x is not None else self._units[0],
+            to_units(command.y, precision) if command.y is not None else self._units[1],
+            to_units(command.z, precision) if command.z is not None and not isinstance(command, CyclePosition)
+            else self._units[2]
+        ]
+
+        if (type(command) is G0 or type(command) is G1) and command.comment is None and end == self._units:
+            self._exact_position[0:3] = _end_of(command, self._exact_position)
+            return None
+
+        rounded = replace(command, x=self._round(command.x), y=self._round(command.y), z=self._round(command.z))
+        if isinstance(command, G2):
+            # The centre is kept where it was generated, relative to the rounded start of the arc
+            centre_x = self._exact_position[0] + (command.i if command.i is not None else 0)
+            centre_y = self._exact_position[1] + (command.j if command.j is not None else 0)
+            i = to_units(centre_x, precision) - self._units[0]
+            j = to_units(centre_y, precision) - self._units[1]
+            # Offsets which were left out are only printed if rounding moves the start off the centre line
+            rounded.i = None if command.i is None and i == 0 else from_units(i, precision)
+            rounded.j = None if command.j is None and j == 0 else from_units(j, precision)
+            rounded.k = self._round(command.k)
+
+        self._units = end
+        if not isinstance(command, CyclePosition):
+            self._exact_position[0:3] = _end_of(command, self._exact_position)
+        else:
+            self._exact_position[0:2] = _end_of(command, self._exact_position)[0:2]
+        return rounded
+
+
+def quantise_commands(commands: Iterable[GCode], options: Options, position: list[float] = None) -> Iterator[GCode]:
+    """
+    Round the positions of commands to the output precision, dropping moves which then go nowhere.
+
+    Each arc keeps the centre at which it was generated, with its I and J offsets found from the rounded start of the
+    arc, so that the start and end of every arc stay on the same circle to within the output precision. Moves with
+    comments and canned cycle positions are never dropped.
+    :param commands: GCode commands to round, such as those generated by an operation.
+    :param options: Options used to generate the commands.
+    :param position: Starting position of the commands. Defaults to None to start at [0, 0, 0]
+    :return: Iterator of rounded commands, which are copies of the original commands.
+    """
+    quantiser = Quantiser(options, position)
+    for command in commands:
+        rounded = quantiser.quantise(command)
+        if rounded is not None:
+            yield rounded
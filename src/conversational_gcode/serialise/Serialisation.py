@@ -0,0 +1,287 @@
+"""
+Conversion of options, operations and jobs to and from storable formats.
+
+Everything is first converted to a dictionary with to_dict(), which is then encoded as JSON for people or as a binary
+MessagePack encoding for storing, sending between processes and hashing. The msgpack package is used for the binary
+encoding if it is installed, otherwise an equivalent encoder from the standard library is used.
+
+Functions:
+- register_operation()
+  - Register an operation type so that it can be loaded by name.
+- import_operations()
+  - Import every built-in operation module.
+- operation_to_dict()
+  - Convert an operation to a dictionary which records its type.
+- operation_from_dict()
+  - Create an operation from a dictionary written by operation_to_dict().
+- to_json()
+  - Encode a dictionary as compact JSON.
+- from_json()
+  - Decode a dictionary from JSON.
+- to_binary()
+  - Encode a dictionary in the MessagePack binary format.
+- from_binary()
+  - Decode a dictionary from the MessagePack binary format.
+- digest()
+  - Hash a dictionary for use as a cache key.
+"""
+
+import json
+from hashlib import sha256
+from importlib import import_module
+from struct import pack, unpack_from
+
+from conversational_gcode.operations.Operation import Operation
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_operation_types = {}
+# Modules of the built-in operations, which are only imported once an operation of that type is loaded
+_operation_modules = {
+    'CircularBoss': 'conversational_gcode.operations.boss.CircularBoss',
+    'CircularPocket': 'conversational_gcode.operations.pocket.CircularPocket',
+    'CircularProfile': 'conversational_gcode.operations.profile.CircularProfile',
+    'Drill': 'conversational_gcode.operations.Drill',
+    'RectangularPocket': 'conversational_gcode.operations.pocket.RectangularPocket',
+    'RectangularProfile': 'conversational_gcode.operations.profile.RectangularProfile'
+}
+
+
+def register_operation(operation_type: type[Operation]) -> type[Operation]:
+    """
+    Register an operation type so that it can be loaded by name. Can be used as a class decorator.
+    :param operation_type: Operation subclass to register.
+    :return: The operation type.
+    """
+    _operation_types[operation_type.__name__] = operation_type
+    return operation_type
+
+
+def import_operations() -> None:
+    """
+    Import every built-in operation module, which are otherwise imported when first loaded. Used to warm up worker
+    processes before they receive any jobs.
+    """
+    for type_name, module_name in _operation_modules.items():
+        if type_name not in _operation_types:
+            register_operation(getattr(import_module(module_name), type_name))
+
+
+def operation_to_dict(operation: Operation) -> dict:
+    """
+    Convert an operation to a dictionary which records its type.
+    :param operation: Operation to convert.
+    :return: Dictionary of the operation's type and arguments.
+    """
+    return {'type': type(operation).__name__, **operation.to_dict()}
+
+
+def operation_from_dict(data: dict) -> Operation:
+    """
+    Create an operation from a dictionary written by operation_to_dict().
+    :param data: Dictionary of the operation's type and arguments.
+    :return: The operation.
+    """
+    arguments = dict(data)
+    type_name = arguments.pop('type', None)
+    if type_name not in _operation_types:
+        if type_name not in _operation_modules:
+            raise ValueError(f'Unknown operation type {type_name!r}')
+        register_operation(getattr(import_module(_operation_modules[type_name]), type_name))
+
+    return _operation_types[type_name].from_dict(arguments)
+
+
+def to_json(data: dict) -> str:
+    """
+    Encode a dictionary as compact JSON.
+    :param data: Dictionary to encode.
+    :return: JSON text.
+    """
+    return json.dumps(data, separators=(',', ':'))
+
+
+def from_json(text: str) -> dict:
+    """
+    Decode a dictionary from JSON.
+    :param text: JSON text.
+    :return: Decoded dictionary.
+    """
+    return json.loads(text)
+
+
+def to_binary(data: dict) -> bytes:
+    """
+    Encode a dictionary in the MessagePack binary format.
+    :param data: Dictionary to encode.
+    :return: Encoded bytes.
+    """
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True)
+
+    chunks = []
+    _pack(data, chunks)
+    return b''.join(chunks)
+
+
+def from_binary(data: bytes) -> dict:
+    """
+    Decode a dictionary from the MessagePack binary format.
+    :param data: Encoded bytes.
+    :return: Decoded dictionary.
+    """
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False)
+
+    value, offset = _unpack(data, 0)
+    if offset != len(data):
+        raise ValueError(f'Unexpected data after offset {offset}')
+    return value
+
+
+def digest(data: dict) -> str:
+    """
+    Hash a dictionary for use as a cache key. Equal dictionaries with the same key order have equal digests.
+    :param data: Dictionary to hash.
+    :return: Hexadecimal SHA-256 digest of the binary encoding.
+    """
+    return sha256(to_binary(data)).hexdigest()
+
+
+def _pack(value, chunks: list[bytes]) -> None:
+    """
+    Encode a value in the MessagePack format, in the smallest form which msgpack itself would choose.
+    """
+    if value is None:
+        chunks.append(b'\xc0')
+    elif value is True:
+        chunks.append(b'\xc3')
+    elif value is False:
+        chunks.append(b'\xc2')
+    elif isinstance(value, int):
+        _pack_int(value, chunks)
+    elif isinstance(value, float):
+        chunks.append(pack('>Bd', 0xcb, value))
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        _pack_header(len(encoded), 0xa0, 32, (0xd9, 0xda, 0xdb), chunks)
+        chunks.append(encoded)
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), 0x90, 16, (None, 0xdc, 0xdd), chunks)
+        for item in value:
+            _pack(item, chunks)
+    elif isinstance(value, dict):
+        _pack_header(len(value), 0x80, 16, (None, 0xde, 0xdf), chunks)
+        for key, item in value.items():
+            _pack(key, chunks)
+            _pack(item, chunks)
+    else:
+        raise TypeError(f'Cannot serialise {type(value).__name__}')
+
+
+def _pack_header(length: int, fix_marker: int, fix_limit: int, markers: tuple, chunks: list[bytes]) -> None:
+    """
+    Encode the type and length of a string, array or map.
+    """
+    if length < fix_limit:
+        chunks.append(bytes([fix_marker | length]))
+    elif length < 0x100 and markers[0] is not None:
+        chunks.append(pack('>BB', markers[0], length))
+    elif length < 0x10000:
+        chunks.append(pack('>BH', markers[1], length))
+    else:
+        chunks.append(pack('>BI', markers[2], length))
+
+
+def _pack_int(value: int, chunks: list[bytes]) -> None:
+    if 0 <= value < 0x80:
+        chunks.append(bytes([value]))
+    elif -0x20 <= value < 0:
+        chunks.append(pack('>b', value))
+    elif value >= 0:
+        if value < 0x100:
+            chunks.append(pack('>BB', 0xcc, value))
+        elif value < 0x10000:
+            chunks.append(pack('>BH', 0xcd, value))
+        elif value < 0x100000000:
+            chunks.append(pack('>BI', 0xce, value))
+        else:
+            chunks.append(pack('>BQ', 0xcf, value))
+    else:
+        if value >= -0x80:
+            chunks.append(pack('>Bb', 0xd0, value))
+        elif value >= -0x8000:
+            chunks.append(pack('>Bh', 0xd1, value))
+        elif value >= -0x80000000:
+            chunks.append(pack('>Bi', 0xd2, value))
+        else:
+            chunks.append(pack('>Bq', 0xd3, value))
+
+
+# Formats of the fixed size values following a type marker
+_fixed_formats = {
+    0xca: '>f', 0xcb: '>d',
+    0xcc: '>B', 0xcd: '>H', 0xce: '>I', 0xcf: '>Q',
+    0xd0: '>b', 0xd1: '>h', 0xd2: '>i', 0xd3: '>q'
+}
+# Formats of the lengths of strings, arrays and maps following a type marker
+_length_formats = {
+    0xd9: ('>B', 'str'), 0xda: ('>H', 'str'), 0xdb: ('>I', 'str'),
+    0xdc: ('>H', 'array'), 0xdd: ('>I', 'array'),
+    0xde: ('>H', 'map'), 0xdf: ('>I', 'map')
+}
+_format_sizes = {'>B': 1, '>b': 1, '>H': 2, '>h': 2, '>I': 4, '>i': 4, '>f': 4, '>Q': 8, '>q': 8, '>d': 8}
+
+
+def _unpack(data: bytes, offset: int) -> tuple:
+    """
+    Decode a value in the MessagePack format.
+    :return: Tuple of the decoded value and the offset following it.
+    """
+    marker = data[offset]
+    offset += 1
+
+    if marker < 0x80:
+        return marker, offset
+    if marker >= 0xe0:
+        return marker - 0x100, offset
+    if marker == 0xc0:
+        return None, offset
+    if marker == 0xc2:
+        return False, offset
+    if marker == 0xc3:
+        return True, offset
+    if marker in _fixed_formats:
+        value_format = _fixed_formats[marker]
+        return unpack_from(value_format, data, offset)[0], offset + _format_sizes[value_format]
+
+    if 0xa0 <= marker < 0xc0:
+        kind, length = 'str', marker & 0x1f
+    elif 0x90 <= marker < 0xa0:
+        kind, length = 'array', marker & 0x0f
+    elif 0x80 <= marker < 0x90:
+        kind, length = 'map', marker & 0x0f
+    elif marker in _length_formats:
+        length_format, kind = _length_formats[marker]
+        length = unpack_from(length_format, data, offset)[0]
+        offset += _format_sizes[length_format]
+    else:
+        raise ValueError(f'Unsupported MessagePack type 0x{marker:02x} at offset {offset - 1}')
+
+    if kind == 'str':
+        return data[offset:offset + length].decode('utf-8'), offset + length
+    if kind == 'array':
+        items = []
+        for _ in range(length):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+
+    mapping = {}
+    for _ in range(length):
+        key, offset = _unpack(data, offset)
+        mapping[key], offset = _unpack(data, offset)
+    return mapping, offset
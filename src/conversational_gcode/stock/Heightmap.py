@@ -0,0 +1,215 @@
+"""
+Model of the remaining stock as a grid of heights.
+
+Classes:
+- Heightmap
+  - Grid of the top height of the stock, lowered as operations cut into it.
+"""
+
+from array import array
+from itertools import repeat
+from math import ceil, floor, sqrt
+
+from conversational_gcode.geometry.Footprint import Footprint
+
+
+class Heightmap:
+    """
+    Grid of the top height of the stock, lowered as operations cut into it.
+
+    Each cell holds the height of the highest stock anywhere within it. Only cells lying entirely within a cut are
+    lowered, and any cell touching a region counts towards its highest stock, so the model never reports air where
+    there may be material. Stock outside of the grid is assumed to be uncut.
+    """
+
+    def __init__(self, bounds: tuple[float, float, float, float], cell_size: float = 1, top: float = 0):
+        """
+        Initialise uncut stock.
+        :param bounds: (min X, min Y, max X, max Y) extent of the stock to model.
+        :param cell_size: Width and length of each cell. Defaults to 1mm.
+        :param top: Z-axis height of the top of the uncut stock. Defaults to 0mm.
+        """
+        self._origin = [bounds[0], bounds[1]]
+        self._cell_size = cell_size
+        self._top = top
+        self._columns = max(1, ceil((bounds[2] - bounds[0]) / cell_size))
+        self._rows = max(1, ceil((bounds[3] - bounds[1]) / cell_size))
+        self._heights = array('d', repeat(top, self._columns * self._rows))
+
+    @classmethod
+    def around(cls, footprints: list[Footprint], cell_size: float = 1, top: float = 0) -> 'Heightmap':
+        """
+        Create uncut stock covering a list of footprints.
+        :param footprints: Footprints which the stock must cover.
+        :param cell_size: Width and length of each cell. Defaults to 1mm.
+        :param top: Z-axis height of the top of the uncut stock. Defaults to 0mm.
+        :return: The heightmap.
+        """
+        all_bounds = [footprint.bounds for footprint in footprints]
+        if len(all_bounds) == 0:
+            return cls((0, 0, cell_size, cell_size), cell_size, top)
+        return cls(
+            (
+                min(bounds[0] for bounds in all_bounds) - cell_size, min(bounds[1] for bounds in all_bounds) - cell_size,
+                max(bounds[2] for bounds in all_bounds) + cell_size, max(bounds[3] for bounds in all_bounds) + cell_size
+            ),
+            cell_size,
+            top
+        )
+
+    columns = property(fget=lambda self: self._columns)
+    rows = property(fget=lambda self: self._rows)
+    cell_size = property(fget=lambda self: self._cell_size)
+    origin = property(fget=lambda self: self._origin)
+
+    def height_at(self, column: int, row: int) -> float:
+        """
+        Height of the stock in a cell.
+        :param column: Index of the cell along the X-axis.
+        :param row: Index of the cell along the Y-axis.
+        :return: Height of the highest stock in the cell.
+        """
+        return self._heights[row * self._columns + column]
+
+    def _spans(self, footprint: Footprint, inside: bool):
+        """
+        Find the cells of each row covered by a footprint.
+        :param footprint: Footprint to find.
+        :param inside: True for only cells entirely within the footprint, False for any cell touching it.
+        :return: Iterator of (row, first column, column after last) spans, clipped to the grid.
+        """
+        min_x, min_y, max_x, max_y = footprint.bounds
+        first_row = max(0, floor((min_y - self._origin[1]) / self._cell_size))
+        last_row = min(self._rows - 1, ceil((max_y - self._origin[1]) / self._cell_size) - 1)
+
+        for row in range(first_row, last_row + 1):
+            row_min_y = self._origin[1] + row * self._cell_size
+            row_max_y = row_min_y + self._cell_size
+
+            if footprint.radius is not None:
+                # Nearest and furthest Y-axis distances from the centre to the row
+                nearest = max(0.0, row_min_y - footprint.centre[1], footprint.centre[1] - row_max_y)
+                furthest = max(abs(row_min_y - footprint.centre[1]), abs(row_max_y - footprint.centre[1]))
+                outer = _chord(footprint.radius, furthest if inside else nearest)
+                inner = _chord(footprint.inner_radius, nearest if inside else furthest)
+            else:
+                if inside and (row_min_y < min_y or row_max_y > max_y):
+                    continue
+                outer = footprint.size[0] / 2
+                inner = None
+                if footprint.inner_size is not None:
+                    inner_min_y = footprint.centre[1] - footprint.inner_size[1] / 2
+                    inner_max_y = footprint.centre[1] + footprint.inner_size[1] / 2
+                    if inside and row_max_y > inner_min_y and row_min_y < inner_max_y:
+                        inner = footprint.inner_size[0] / 2
+                    elif not inside and row_min_y >= inner_min_y and row_max_y <= inner_max_y:
+                        inner = footprint.inner_size[0] / 2
+
+            if outer is None:
+                continue
+
+            centre_x = footprint.centre[0]
+            if inner is None or inner <= 0:
+                spans = [(centre_x - outer, centre_x + outer)]
+            else:
+                spans = [(centre_x - outer, centre_x - inner), (centre_x + inner, centre_x + outer)]
+
+            for span_min_x, span_max_x in spans:
+                if inside:
+                    first_column = ceil((span_min_x - self._origin[0]) / self._cell_size)
+                    end_column = floor((span_max_x - self._origin[0]) / self._cell_size)
+                else:
+                    first_column = floor((span_min_x - self._origin[0]) / self._cell_size)
+                    end_column = ceil((span_max_x - self._origin[0]) / self._cell_size)
+                first_column = max(0, first_column)
+                end_column = min(self._columns, end_column)
+                if first_column < end_column:
+                    yield row, first_column, end_column
+
+    def _covers(self, footprint: Footprint) -> bool:
+        min_x, min_y, max_x, max_y = footprint.bounds
+        return (
+            min_x >= self._origin[0] and min_y >= self._origin[1] and
+            max_x <= self._origin[0] + self._columns * self._cell_size and
+            max_y <= self._origin[1] + self._rows * self._cell_size
+        )
+
+    def highest(self, footprint: Footprint) -> float | None:
+        """
+        Find the highest stock which a footprint may touch.
+        :param footprint: Region in which to search.
+        :return: Height of the highest stock, or None if the footprint touches no cells.
+        """
+        highest = None if self._covers(footprint) else self._top
+        for row, first_column, end_column in self._spans(footprint, False):
+            start = row * self._columns
+            row_highest = max(self._heights[start + first_column:start + end_column])
+            if highest is None or row_highest > highest:
+                highest = row_highest
+        return highest
+
+    def highest_along(self, start: list[float], end: list[float], radius: float) -> float:
+        """
+        Find the highest stock which a tool may touch while moving in a straight line.
+        :param start: [X, Y] start of the move.
+        :param end: [X, Y] end of the move.
+        :param radius: Radius of the tool.
+        :return: Height of the highest stock.
+        """
+        min_x, max_x = min(start[0], end[0]) - radius, max(start[0], end[0]) + radius
+        min_y, max_y = min(start[1], end[1]) - radius, max(start[1], end[1]) + radius
+        highest = None
+        if (
+                min_x < self._origin[0] or min_y < self._origin[1] or
+                max_x > self._origin[0] + self._columns * self._cell_size or
+                max_y > self._origin[1] + self._rows * self._cell_size
+        ):
+            highest = self._top
+
+        first_row = max(0, floor((min_y - self._origin[1]) / self._cell_size))
+        last_row = min(self._rows - 1, ceil((max_y - self._origin[1]) / self._cell_size) - 1)
+        delta_y = end[1] - start[1]
+        for row in range(first_row, last_row + 1):
+            # Part of the move within the tool radius of the row, widened by the tool radius
+            row_min_y = self._origin[1] + row * self._cell_size - radius
+            row_max_y = row_min_y + self._cell_size + 2 * radius
+            if delta_y == 0:
+                low, high = 0.0, 1.0
+            else:
+                low, high = sorted(((row_min_y - start[1]) / delta_y, (row_max_y - start[1]) / delta_y))
+                low, high = max(0.0, low), min(1.0, high)
+                if low > high:
+                    continue
+            x_values = (start[0] + low * (end[0] - start[0]), start[0] + high * (end[0] - start[0]))
+            first_column = max(0, floor((min(x_values) - radius - self._origin[0]) / self._cell_size))
+            end_column = min(self._columns, ceil((max(x_values) + radius - self._origin[0]) / self._cell_size))
+            if first_column >= end_column:
+                continue
+
+            offset = row * self._columns
+            row_highest = max(self._heights[offset + first_column:offset + end_column])
+            if highest is None or row_highest > highest:
+                highest = row_highest
+
+        return self._top if highest is None else highest
+
+    def cut(self, footprint: Footprint) -> None:
+        """
+        Lower the stock within a footprint to the bottom of the footprint.
+        :param footprint: Region cut by an operation.
+        """
+        bottom = footprint.bottom
+        for row, first_column, end_column in self._spans(footprint, True):
+            start = row * self._columns
+            heights = self._heights[start + first_column:start + end_column]
+            self._heights[start + first_column:start + end_column] = array('d', map(min, heights, repeat(bottom)))
+
+
+def _chord(radius: float | None, distance: float) -> float | None:
+    """
+    Half of the length of the chord of a circle at a distance from its centre.
+    :return: Half length of the chord, or None if the circle does not reach the distance.
+    """
+    if radius is None or distance >= radius:
+        return None
+    return sqrt(radius * radius - distance * distance)
@@ -0,0 +1,53 @@
+"""
+Planning of the heights of the rapid moves between operations.
+
+Classes:
+- RetractPlanner
+  - Finds the lowest safe height for each rapid move between operations.
+"""
+
+from conversational_gcode.geometry.Footprint import Footprint
+from conversational_gcode.options.Options import Options
+from conversational_gcode.stock.Heightmap import Heightmap
+
+
+class RetractPlanner:
+    """
+    Finds the lowest safe height for each rapid move between operations.
+
+    A rapid move is safe at the lead-in above the highest stock which the tool may pass over, and above the top of the
+    operation which it moves to. With a model of the stock, the highest stock is found along the path of the move.
+    Without one, the stock is assumed to be uncut at the top of the highest operation of the job. The clearance height
+    is used whenever the safe height would reach it.
+    """
+
+    def __init__(self, options: Options, footprints: list[Footprint], stock: Heightmap = None):
+        """
+        Initialise the planner.
+        :param options: Options of the job.
+        :param footprints: Footprints of every operation of the job.
+        :param stock: Model of the remaining stock, lowered as the operations are generated.
+        Defaults to None to assume uncut stock.
+        """
+        self._options = options
+        self._stock = stock
+        if len(footprints) == 0:
+            self._stock_top = options.job.clearance_height
+        else:
+            self._stock_top = max(footprint.top for footprint in footprints)
+
+    def safe_height(self, position: list[float], target: list[float], top: float) -> float:
+        """
+        Find the lowest height at which the tool may rapid between operations.
+        :param position: [X, Y, Z] end of the previous operation.
+        :param target: [X, Y] start of the next operation.
+        :param top: Z-axis height at which the next operation starts cutting.
+        :return: Height to which to retract before the rapid move.
+        """
+        job_options = self._options.job
+        if self._stock is None:
+            highest = self._stock_top
+        else:
+            highest = self._stock.highest_along(position[0:2], target[0:2], self._options.tool.tool_radius)
+
+        return min(max(highest, top) + job_options.lead_in, job_options.clearance_height)
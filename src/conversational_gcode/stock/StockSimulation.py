@@ -0,0 +1,485 @@
+"""
+Simulation of the material removed by GCode commands, to verify a job against the regions which its operations should
+cut.
+
+Classes:
+- SegmentEngagement
+  - Material removed by a single command.
+- Deviation
+  - Point at which the simulated stock differs from the expected depth.
+- VerificationReport
+  - Engagement of every command, and the points cut too deep or left too high.
+- StockSimulation
+  - Grid of stock heights, sampled at the centre of each cell, cut by sweeping the tool along commands.
+
+Functions:
+- verify_commands()
+  - Simulate a list of commands and compare the result with the regions which should be cut.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from itertools import repeat
+from math import acos, atan2, ceil, cos, floor, hypot, inf, isclose, pi, sin, sqrt
+from operator import sub
+from typing import Iterator
+
+from conversational_gcode.geometry.Footprint import Footprint
+from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3, G80, G81, CyclePosition
+from conversational_gcode.options.Options import Options
+
+
+@dataclass
+class SegmentEngagement:
+    """
+    Material removed by a single command.
+
+    Attributes:
+        index (int): Index of the command in the simulated list.
+        command (GCode): The command.
+        removed (float): Volume of material removed, in cubic mm.
+        depth (float): Greatest axial depth of material cut.
+        width (float): Greatest radial width of material cut.
+    """
+    index: int
+    command: GCode
+    removed: float = 0
+    depth: float = 0
+    width: float = 0
+
+    rapid = property(fget=lambda self: type(self.command) is G0)
+
+
+@dataclass
+class Deviation:
+    """
+    Point at which the simulated stock differs from the expected depth.
+
+    Attributes:
+        point (list): [X, Y] centre of the cell.
+        height (float): Simulated height of the stock.
+        target (float): Lowest allowed height of a gouge, or highest allowed height of leftover material.
+    """
+    point: list[float]
+    height: float
+    target: float
+
+    error = property(fget=lambda self: abs(self.height - self.target))
+
+
+@dataclass
+class VerificationReport:
+    """
+    Engagement of every command, and the points cut too deep or left too high.
+
+    Attributes:
+        segments (list): SegmentEngagement of every command which moves the tool.
+        gouges (list): Deviations where the stock is cut below the deepest operation covering it, or where no
+        operation should cut.
+        leftovers (list): Deviations where the stock is left above the deepest operation covering it.
+    """
+    segments: list[SegmentEngagement] = field(default_factory=list)
+    gouges: list[Deviation] = field(default_factory=list)
+    leftovers: list[Deviation] = field(default_factory=list)
+
+    success = property(fget=lambda self: len(self.gouges) == 0 and len(self.leftovers) == 0)
+    rapid_cuts = property(fget=lambda self: [segment for segment in self.segments if segment.rapid and segment.removed > 0])
+
+
+class StockSimulation:
+    """
+    Grid of stock heights, sampled at the centre of each cell, cut by sweeping a flat end mill along commands.
+
+    Each row of a sweep is a single span of cells, which is lowered as one slice, so the cost of a command grows with
+    the number of rows it crosses rather than the number of cells. Stock outside of the grid is not modelled.
+
+    The grid is a plain array rather than a NumPy array, as NumPy is not a dependency, so each row is still cut in
+    Python. A job of around a hundred thousand lines takes ten seconds or more to simulate at 1mm cells, rather than
+    the few seconds a vectorised grid would allow. Larger cells are faster, as fewer rows are crossed, but less accurate.
+    """
+
+    def __init__(self, bounds: tuple[float, float, float, float], cell_size: float = 1, top: float = 0):
+        """
+        Initialise uncut stock.
+        :param bounds: (min X, min Y, max X, max Y) extent of the stock to model.
+        :param cell_size: Width and length of each cell. Defaults to 1mm.
+        :param top: Z-axis height of the top of the uncut stock. Defaults to 0mm.
+        """
+        self._origin = [bounds[0], bounds[1]]
+        self._cell_size = cell_size
+        self._top = top
+        self._columns = max(1, ceil((bounds[2] - bounds[0]) / cell_size))
+        self._rows = max(1, ceil((bounds[3] - bounds[1]) / cell_size))
+        self._heights = array('d', repeat(top, self._columns * self._rows))
+
+    @classmethod
+    def around(cls, footprints: list[Footprint], margin: float, cell_size: float = 1, top: float = 0) -> 'StockSimulation':
+        """
+        Create uncut stock covering a list of footprints.
+        :param footprints: Footprints which the stock must cover.
+        :param margin: Distance to extend the stock beyond the footprints, such as the tool diameter.
+        :param cell_size: Width and length of each cell. Defaults to 1mm.
+        :param top: Z-axis height of the top of the uncut stock. Defaults to 0mm.
+        :return: The simulation.
+        """
+        all_bounds = [footprint.bounds for footprint in footprints]
+        if len(all_bounds) == 0:
+            return cls((-margin, -margin, margin, margin), cell_size, top)
+        return cls(
+            (
+                min(bounds[0] for bounds in all_bounds) - margin, min(bounds[1] for bounds in all_bounds) - margin,
+                max(bounds[2] for bounds in all_bounds) + margin, max(bounds[3] for bounds in all_bounds) + margin
+            ),
+            cell_size,
+            top
+        )
+
+    columns = property(fget=lambda self: self._columns)
+    rows = property(fget=lambda self: self._rows)
+    cell_size = property(fget=lambda self: self._cell_size)
+    origin = property(fget=lambda self: self._origin)
+    top = property(fget=lambda self: self._top)
+
+    def height_at(self, column: int, row: int) -> float:
+        """
+        Height of the stock at the centre of a cell.
+        :param column: Index of the cell along the X-axis.
+        :param row: Index of the cell along the Y-axis.
+        :return: Height of the stock.
+        """
+        return self._heights[row * self._columns + column]
+
+    def centre_of(self, column: int, row: int) -> list[float]:
+        """
+        Centre of a cell.
+        :param column: Index of the cell along the X-axis.
+        :param row: Index of the cell along the Y-axis.
+        :return: [X, Y] centre of the cell.
+        """
+        return [
+            self._origin[0] + (column + 0.5) * self._cell_size,
+            self._origin[1] + (row + 0.5) * self._cell_size
+        ]
+
+    def height_near(self, point: list[float]) -> float | None:
+        """
+        Height of the stock in the cell containing a point.
+        :param point: [X, Y] point to find.
+        :return: Height of the stock, or None if the point is outside of the grid.
+        """
+        column = floor((point[0] - self._origin[0]) / self._cell_size)
+        row = floor((point[1] - self._origin[1]) / self._cell_size)
+        if not (0 <= column < self._columns and 0 <= row < self._rows):
+            return None
+        return self._heights[row * self._columns + column]
+
+    def sweep(self, start: list[float], end: list[float], radius: float, tolerance: float = 0) -> tuple[float, float, float]:
+        """
+        Remove the material swept by a flat end mill moving in a straight line.
+
+        The radial width of the cut is the area of material newly covered by the tool divided by the length of the
+        move, which is exact for a steady cut and accurate to the cell size. A plunge engages the full diameter if it
+        cuts any material.
+        :param start: [X, Y, Z] start position of the tool tip.
+        :param end: [X, Y, Z] end position of the tool tip.
+        :param radius: Radius of the tool.
+        :param tolerance: Depth which must be cut from a cell for it to count towards the radial width. Defaults to 0.
+        :return: Tuple of the volume of material removed, its greatest depth and the radial width of the cut.
+        """
+        changes = self._find_cut(start, end, radius)
+        for offset, _, cut in changes:
+            self._heights[offset:offset + len(cut)] = cut
+        return self._measure(changes, start, end, radius, tolerance)
+
+    def _find_cut(self, start: list[float], end: list[float], radius: float) -> list[tuple[int, array, array]]:
+        """
+        Find the material swept by a flat end mill moving in a straight line, without removing it.
+        :return: List of (index of first cell, heights before, heights after) slices of each row which is cut.
+        """
+        lowest = min(start[2], end[2])
+        # No cell is ever higher than the top of the stock
+        if lowest >= self._top:
+            return []
+
+        delta = [end[0] - start[0], end[1] - start[1]]
+        length_squared = delta[0] * delta[0] + delta[1] * delta[1]
+        flat = length_squared == 0 or start[2] == end[2]
+
+        cell_size = self._cell_size
+        first_row = max(0, ceil((min(start[1], end[1]) - radius - self._origin[1]) / cell_size - 0.5))
+        last_row = min(self._rows - 1, floor((max(start[1], end[1]) + radius - self._origin[1]) / cell_size - 0.5))
+
+        changes = []
+        rows = [self._origin[1] + (row + 0.5) * cell_size for row in range(first_row, last_row + 1)]
+        for y, low, high in _capsule_spans(start, delta, radius, rows):
+            row = round((y - self._origin[1]) / cell_size - 0.5)
+            first_column = max(0, ceil((low - self._origin[0]) / cell_size - 0.5))
+            end_column = min(self._columns, floor((high - self._origin[0]) / cell_size - 0.5) + 1)
+            if first_column >= end_column:
+                continue
+
+            offset = row * self._columns + first_column
+            heights = self._heights[offset:offset + end_column - first_column]
+            if max(heights) <= lowest:
+                continue
+
+            if flat:
+                cut = array('d', map(min, heights, repeat(lowest)))
+            else:
+                x_positions = (self._origin[0] + (column + 0.5) * cell_size for column in range(first_column, end_column))
+                cut = array('d', (
+                    height if height <= lowest else min(height, _lowest_tip(start, end, delta, length_squared, radius, [x, y]))
+                    for height, x in zip(heights, x_positions)
+                ))
+            if cut != heights:
+                changes.append((offset, heights, cut))
+
+        return changes
+
+    def _measure(self,
+                 changes: list[tuple[int, array, array]],
+                 start: list[float],
+                 end: list[float],
+                 radius: float,
+                 tolerance: float) -> tuple[float, float, float]:
+        removed = sum(sum(heights) - sum(cut) for _, heights, cut in changes)
+        depth = max((max(map(sub, heights, cut)) for _, heights, cut in changes), default=0)
+
+        delta = [end[0] - start[0], end[1] - start[1]]
+        length = hypot(delta[0], delta[1])
+        if length == 0:
+            width = 2 * radius if depth > tolerance else 0
+        else:
+            # A tool moving along a line covers a new area of twice its radius by the length of the move, beyond the
+            # area under it at the start, which would already have been cut by reaching it
+            cells = 0
+            for offset, heights, cut in changes:
+                row, first_column = divmod(offset, self._columns)
+                for column, height, cut_height in zip(range(first_column, first_column + len(cut)), heights, cut):
+                    if height - cut_height > tolerance:
+                        x, y = self.centre_of(column, row)
+                        if hypot(x - start[0], y - start[1]) > radius:
+                            cells += 1
+            width = min(2 * radius, cells * self._cell_size * self._cell_size / length)
+
+        return removed * self._cell_size * self._cell_size, depth, width
+
+    def run(self, commands: list[GCode], options: Options, position: list[float] = None) -> list[SegmentEngagement]:
+        """
+        Cut the stock with every command which moves the tool.
+
+        Arcs are divided into straight moves, each deviating from the arc by no more than a quarter of a cell. Canned
+        drilling cycles plunge to the bottom of each hole and retract to the R-plane.
+        :param commands: GCode commands to simulate, as returned by GcodeGenerator.generate().
+        :param options: Options used to generate the commands.
+        :param position: Starting position of the commands. Defaults to None to start at [0, 0, 0]
+        :return: SegmentEngagement of every command which moves the tool, in order.
+        """
+        radius = options.tool.tool_radius
+        tolerance = options.output.tolerance
+        position = [0, 0, 0] if position is None else [*position]
+        cycle = None
+        segments = []
+
+        for index, command in enumerate(commands):
+            if isinstance(command, CyclePosition):
+                if cycle is None:
+                    continue
+                moves = self._drill_moves(position, command.x, command.y, cycle)
+            elif isinstance(command, G81):
+                cycle = command
+                moves = self._drill_moves(position, command.x, command.y, cycle)
+            elif isinstance(command, G80):
+                cycle = None
+                continue
+            elif isinstance(command, G0):
+                new_position = [
+                    command.x if command.x is not None else position[0],
+                    command.y if command.y is not None else position[1],
+                    command.z if command.z is not None else position[2]
+                ]
+                if isinstance(command, G2):
+                    centre = [
+                        position[0] + (command.i if command.i is not None else 0),
+                        position[1] + (command.j if command.j is not None else 0)
+                    ]
+                    moves = self._arc_moves(position, new_position, centre, not isinstance(command, G3))
+                else:
+                    moves = [new_position]
+            else:
+                continue
+
+            segment = SegmentEngagement(index, command)
+            for move in moves:
+                removed, depth, width = self.sweep(position, move, radius, tolerance)
+                segment.removed += removed
+                segment.depth = max(segment.depth, depth)
+                segment.width = max(segment.width, width)
+                position = move
+            segments.append(segment)
+
+        return segments
+
+    @staticmethod
+    def _drill_moves(position: list[float], x: float, y: float, cycle: G81) -> list[list[float]]:
+        target = [x if x is not None else position[0], y if y is not None else position[1]]
+        return [
+            [target[0], target[1], position[2]],
+            [target[0], target[1], cycle.r],
+            [target[0], target[1], cycle.z],
+            [target[0], target[1], cycle.r]
+        ]
+
+    def _arc_moves(self, start: list[float], end: list[float], centre: list[float], clockwise: bool) -> list[list[float]]:
+        radius = hypot(start[0] - centre[0], start[1] - centre[1])
+        start_angle = atan2(start[1] - centre[1], start[0] - centre[0])
+        end_angle = atan2(end[1] - centre[1], end[0] - centre[0])
+
+        sweep = (start_angle - end_angle) if clockwise else (end_angle - start_angle)
+        sweep %= 2 * pi
+        if isclose(sweep, 0, abs_tol=1e-9) or isclose(sweep, 2 * pi, abs_tol=1e-9):
+            sweep = 2 * pi
+
+        sagitta = self._cell_size / 4
+        step = 2 * acos(1 - sagitta / radius) if radius > sagitta else pi / 2
+        count = max(1, ceil(sweep / step))
+        direction = -1 if clockwise else 1
+
+        moves = []
+        for index in range(1, count):
+            angle = start_angle + direction * sweep * index / count
+            moves.append([
+                centre[0] + radius * cos(angle),
+                centre[1] + radius * sin(angle),
+                start[2] + (end[2] - start[2]) * index / count
+            ])
+        moves.append(end)
+        return moves
+
+
+def _capsule_spans(start: list[float], delta: list[float], radius: float, rows: list[float]) -> Iterator[tuple[float, float, float]]:
+    """
+    Find the X-axis range of each row covered by a tool moving in a straight line.
+    :param start: [X, Y] start position of the tool.
+    :param delta: [X, Y] distance moved by the tool.
+    :param radius: Radius of the tool.
+    :param rows: Y-axis positions of the rows.
+    :return: Iterator of (Y-axis position, lowest X-axis position, highest X-axis position) of each covered row.
+    """
+    start_x, start_y = start[0], start[1]
+    end_x, end_y = start_x + delta[0], start_y + delta[1]
+    radius_squared = radius * radius
+    length_squared = delta[0] * delta[0] + delta[1] * delta[1]
+    length = sqrt(length_squared)
+
+    for y in rows:
+        low, high = inf, -inf
+
+        # The ends of the move
+        for centre_x, offset in ((start_x, y - start_y), (end_x, y - end_y)):
+            if offset * offset <= radius_squared:
+                half_chord = sqrt(radius_squared - offset * offset)
+                low, high = min(low, centre_x - half_chord), max(high, centre_x + half_chord)
+
+        # Points between the ends of the move, and within the radius of its line
+        if length_squared > 0:
+            offset = y - start_y
+            band_low, band_high = -inf, inf
+            for along, lowest, highest in (
+                (delta[0], -offset * delta[1], length_squared - offset * delta[1]),
+                (delta[1], offset * delta[0] - radius * length, offset * delta[0] + radius * length)
+            ):
+                if along == 0:
+                    if not lowest <= 0 <= highest:
+                        band_low, band_high = inf, -inf
+                elif along > 0:
+                    band_low, band_high = max(band_low, start_x + lowest / along), min(band_high, start_x + highest / along)
+                else:
+                    band_low, band_high = max(band_low, start_x + highest / along), min(band_high, start_x + lowest / along)
+            if band_low <= band_high:
+                low, high = min(low, band_low), max(high, band_high)
+
+        if low <= high:
+            yield y, low, high
+
+
+def _lowest_tip(start: list[float], end: list[float], delta: list[float], length_squared: float, radius: float, point: list[float]) -> float:
+    """
+    Find the lowest height of the tip of a tool, moving in a straight line, while it covers a point.
+    """
+    along = ((point[0] - start[0]) * delta[0] + (point[1] - start[1]) * delta[1]) / length_squared
+    across_squared = (point[0] - start[0]) ** 2 + (point[1] - start[1]) ** 2 - along * along * length_squared
+    half_width = sqrt(max(0.0, radius * radius - across_squared) / length_squared)
+    fraction = min(1.0, along + half_width) if end[2] < start[2] else max(0.0, along - half_width)
+    return start[2] + fraction * (end[2] - start[2])
+
+
+def _reachable(footprint: Footprint, point: list[float], radius: float) -> bool:
+    """
+    Check whether a tool can reach a point inside a footprint. A round tool cannot reach the outer corners of a
+    rectangular footprint.
+    """
+    if footprint.size is None:
+        return True
+    corner = [footprint.size[0] / 2 - radius, footprint.size[1] / 2 - radius]
+    offset = [abs(point[0] - footprint.centre[0]) - corner[0], abs(point[1] - footprint.centre[1]) - corner[1]]
+    return offset[0] <= 0 or offset[1] <= 0 or hypot(offset[0], offset[1]) <= radius
+
+
+def verify_commands(commands: list[GCode],
+                    options: Options,
+                    footprints: list[Footprint],
+                    cell_size: float = 1,
+                    top: float = 0,
+                    position: list[float] = None) -> VerificationReport:
+    """
+    Simulate a list of commands and compare the result with the regions which should be cut.
+
+    Every cell of the stock may be cut down to the bottom of the deepest footprint covering it, or not at all if none
+    do, and must be cut down to it wherever the tool can reach. Cells within the tolerance of the edge of a footprint,
+    which is the larger of the output precision and the accuracy of the divided arcs, are not checked against it.
+    :param commands: GCode commands to simulate, as returned by GcodeGenerator.generate().
+    :param options: Options used to generate the commands.
+    :param footprints: Footprints of the operations which generated the commands.
+    :param cell_size: Width and length of each cell of the simulated stock. Defaults to 1mm.
+    :param top: Z-axis height of the top of the stock. Defaults to 0mm.
+    :param position: Starting position of the commands. Defaults to None to start at [0, 0, 0]
+    :return: Report of the engagement of every command and the cells cut too deep or left too high.
+    """
+    radius = options.tool.tool_radius
+    tolerance = options.output.tolerance
+    edge_tolerance = max(tolerance, cell_size / 4)
+
+    simulation = StockSimulation.around(footprints, 2 * options.tool.tool_diameter, cell_size, top)
+    report = VerificationReport(simulation.run(commands, options, position))
+
+    columns = simulation.columns
+    lowest = array('d', repeat(top, columns * simulation.rows))
+    highest = array('d', repeat(inf, columns * simulation.rows))
+    origin = simulation.origin
+    for footprint in footprints:
+        min_x, min_y, max_x, max_y = footprint.bounds
+        first_column = max(0, floor((min_x - edge_tolerance - origin[0]) / cell_size))
+        end_column = min(columns, ceil((max_x + edge_tolerance - origin[0]) / cell_size))
+        first_row = max(0, floor((min_y - edge_tolerance - origin[1]) / cell_size))
+        end_row = min(simulation.rows, ceil((max_y + edge_tolerance - origin[1]) / cell_size))
+        for row in range(first_row, end_row):
+            for column in range(first_column, end_column):
+                point = simulation.centre_of(column, row)
+                distance = footprint.signed_distance(point)
+                index = row * columns + column
+                if distance <= edge_tolerance:
+                    lowest[index] = min(lowest[index], footprint.bottom)
+                if distance < -edge_tolerance and _reachable(footprint, point, radius + edge_tolerance):
+                    highest[index] = min(highest[index], footprint.bottom)
+
+    for row in range(simulation.rows):
+        for column in range(columns):
+            index = row * columns + column
+            height = simulation.height_at(column, row)
+            if height < lowest[index] - tolerance:
+                report.gouges.append(Deviation(simulation.centre_of(column, row), height, lowest[index]))
+            elif height > highest[index] + tolerance:
+                report.leftovers.append(Deviation(simulation.centre_of(column, row), height, highest[index]))
+
+    return report
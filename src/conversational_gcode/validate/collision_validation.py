@@ -0,0 +1,88 @@
+"""
+Validation of the geometry of a whole job, checking for operations which cut into each other and rapid moves which
+collide with the stock.
+
+Functions:
+- validate_collisions()
+  - Check a job for overlapping operations and rapid moves through material.
+"""
+
+from statistics import median
+
+from conversational_gcode.geometry.Footprint import Footprint, segment_intersects, BOSS, DRILL
+from conversational_gcode.geometry.SpatialGrid import SpatialGrid
+from conversational_gcode.options.Options import Options
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
+
+
+def _describe_overlap(first: Footprint, second: Footprint) -> str:
+    if first.kind == DRILL and second.kind == DRILL:
+        return f'Drill holes at {first.centre} and {second.centre} overlap'
+    if first.kind == DRILL or second.kind == DRILL:
+        drill, other = (first, second) if first.kind == DRILL else (second, first)
+        return f'Drill hole at {drill.centre} of {drill.operation!r} is inside {other.operation!r}'
+    if first.kind == BOSS or second.kind == BOSS:
+        boss, other = (first, second) if first.kind == BOSS else (second, first)
+        return f'{boss.operation!r} intersects {other.operation!r}'
+    return f'{first.operation!r} overlaps {second.operation!r}'
+
+
+def validate_collisions(operations: list, options: Options, position: list[float] = None) -> list[ValidationResult]:
+    """
+    Check a job for overlapping operations and rapid moves through material.
+
+    Operations overlap if the regions and depths which they cut overlap, for example a drill hole inside a pocket.
+    Rapid moves between operations are made at the clearance height, so collide with any other operation which starts
+    at or above it. The end of each operation is only estimated if there is such an operation. The footprints of the
+    operations are held in a spatial grid, so that only nearby footprints are compared.
+    :param operations: Operations of the job, in the order in which they are generated.
+    :param options: Options of the job.
+    :param position: Starting position of the job. Defaults to None to start at [0, 0, 0]
+    :return: List of ValidationResults. Contains only 1 item if there are no collisions.
+    """
+    tolerance = options.output.tolerance
+    clearance_height = options.job.clearance_height
+
+    footprints = [footprint for operation in operations for footprint in operation.footprints(options)]
+    if len(footprints) == 0:
+        return [SUCCESS]
+
+    sizes = [max(bounds[2] - bounds[0], bounds[3] - bounds[1]) for bounds in (footprint.bounds for footprint in footprints)]
+    grid = SpatialGrid(max(median(sizes), tolerance))
+    for index, footprint in enumerate(footprints):
+        grid.insert(index, footprint.bounds)
+
+    results = []
+    for index, footprint in enumerate(footprints):
+        for other_index in sorted(grid.query(footprint.bounds)):
+            if other_index <= index:
+                continue
+            other = footprints[other_index]
+            # Different parts of the same operation are designed to cut together, apart from repeated drill holes
+            if other.operation is footprint.operation and footprint.kind != DRILL:
+                continue
+            if footprint.overlaps_depth(other, tolerance) and footprint.intersects(other, tolerance):
+                results.append(ValidationResult(False, _describe_overlap(footprint, other)))
+
+    # The tool moves between operations at the clearance height, so only operations starting at or above it are hit
+    raised = [footprint for footprint in footprints if footprint.top >= clearance_height]
+    if len(raised) > 0:
+        rapid_start = [0, 0] if position is None else position[0:2]
+        for operation in operations:
+            rapid_end = operation.start_point(options)[0:2]
+            for footprint in raised:
+                # The rapid to the start of an operation is its own approach, rather than a collision
+                if footprint.operation is operation:
+                    continue
+                if segment_intersects(rapid_start, rapid_end, footprint):
+                    results.append(ValidationResult(
+                        False,
+                        f'Rapid from {rapid_start} to {rapid_end} at the clearance height {clearance_height} crosses '
+                        f'{footprint.operation!r}, which starts at {footprint.top}'
+                    ))
+            rapid_start = operation.estimate(options).end[0:2]
+
+    if len(results) == 0:
+        results.append(SUCCESS)
+
+    return results
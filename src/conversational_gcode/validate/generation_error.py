@@ -0,0 +1,29 @@
+"""
+Error raised when GCode generation cannot complete.
+
+Classes:
+- GenerationError
+  - Contains the reason that generation was abandoned.
+"""
+
+from conversational_gcode.validate.validation_result import ValidationResult
+
+
+class GenerationError(Exception):
+    """
+    Raised when GCode generation cannot complete, such as a toolpath loop exceeding its maximum
+    pass count or the generation exceeding its budget.
+
+    Attributes:
+        result (ValidationResult): Failed validation result explaining the error.
+    """
+
+    def __init__(self, message: str):
+        """
+        Initialise the error.
+        :param message: Message to explain why generation was abandoned.
+        """
+        super().__init__(message)
+        self._result = ValidationResult(False, message)
+
+    result = property(fget=lambda self: self._result)
@@ -0,0 +1,40 @@
+"""
+Validation of large numbers of points at once.
+
+Functions:
+- find_invalid_point()
+  - Find the first point which is not a pair of finite numbers.
+"""
+
+from array import array
+from itertools import chain
+from math import isfinite
+
+
+def find_invalid_point(points: list[list[float]]) -> int | None:
+    """
+    Find the first point which is not a pair of finite numbers.
+
+    All of the points are first checked together, which is fast when every point is valid. Only if that fails are the
+    points checked one at a time to find the invalid point.
+    :param points: List of [X, Y] points.
+    :return: Index of the first invalid point, or None if every point is valid.
+    """
+    try:
+        if all(len(point) == 2 for point in points):
+            coordinates = array('d', chain.from_iterable(points))
+            if all(map(isfinite, coordinates)):
+                return None
+    except TypeError:
+        pass
+
+    for index, point in enumerate(points):
+        try:
+            if len(point) != 2:
+                return index
+        except TypeError:
+            return index
+        if not all(isinstance(coordinate, (int, float)) and isfinite(coordinate) for coordinate in point):
+            return index
+
+    return None
@@ -4,6 +4,10 @@ Result of validating a configuration.
 Classes:
 - ValidationResult
   - Contains validation status and message.
+
+Constants:
+- SUCCESS
+  - Shared successful ValidationResult, to avoid allocating one for every valid object.
 """
 
 
@@ -34,3 +38,6 @@ class ValidationResult:
 
     def __repr__(self) -> str:
         return f'ValidationResult(success={self._success}, message={self._message})'
+
+
+SUCCESS = ValidationResult()
@@ -1,6 +1,8 @@
 from unittest import TestCase
+from hashlib import blake2b
 from os.path import join, dirname
 from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.gcodes.StreamDigest import StreamDigest
 from conversational_gcode.options.Options import Options
 
 
@@ -11,10 +13,18 @@ class EndToEndTester(TestCase):
         self.gcode_generator = GcodeGenerator(self.options)
 
     def assertFileMatches(self, filepath: str, write_reference: bool = False):
-        generated_commands = [command.format(self.options.output) for command in self.gcode_generator.generate()]
+        stream_digest = StreamDigest(self.options)
+        generated_commands = '\n'.join(
+            command.format(self.options.output) for command in stream_digest.watch(self.gcode_generator.generate())
+        ).split('\n')
 
         full_filepath = join(dirname(__file__), filepath)
 
+        # References are written without a final newline
+        with open(full_filepath, 'rb') as reference_file:
+            if blake2b(reference_file.read() + b'\n').hexdigest() == stream_digest.hexdigest() and not write_reference:
+                return
+
         if write_reference:
             with open(full_filepath, 'w') as reference_file:
                 reference_file.write('\n'.join(generated_commands))
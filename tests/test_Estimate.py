@@ -0,0 +1,161 @@
+from math import pi
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.estimate.Estimate import Estimate, arc_length, distance, measure_commands
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.boss.CircularBoss import CircularBoss
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.operations.profile.CircularProfile import CircularProfile
+from conversational_gcode.operations.profile.RectangularProfile import RectangularProfile
+from conversational_gcode.options.Options import Options
+from conversational_gcode.validate.generation_error import GenerationError
+
+
+class TestEstimateFunctions(TestCase):
+
+    def test_distance(self):
+        self.assertAlmostEqual(5, distance([0, 0, 0], [3, 4, 0]))
+        self.assertAlmostEqual(4, distance([0, 0, None], [3, 4, 4]) - 1)
+
+    def test_arc_length(self):
+        self.assertAlmostEqual(pi, arc_length([1, 0, 0], [-1, 0, 0], [0, 0], True))
+        self.assertAlmostEqual(pi / 2, arc_length([1, 0, 0], [0, -1, 0], [0, 0], True))
+        self.assertAlmostEqual(3 * pi / 2, arc_length([1, 0, 0], [0, -1, 0], [0, 0], False))
+        self.assertAlmostEqual(2 * pi, arc_length([1, 0, 0], [1, 0, 0], [0, 0], True))
+
+    def test_add(self):
+        total = Estimate(1, 2, 3, 4, [0, 0, 0], [1, 1, 1]) + Estimate(1, 2, 3, 4, [1, 1, 1], [2, 2, 2])
+
+        self.assertEqual(2, total.command_count)
+        self.assertEqual(10, total.toolpath_length)
+        self.assertEqual(8, total.cycle_time)
+        self.assertEqual([0, 0, 0], total.start)
+        self.assertEqual([2, 2, 2], total.end)
+
+    def test_add_estimate(self):
+        total = Estimate(1, 2, 3, 4, [0, 0, 0], [1, 1, 1])
+        total.add_estimate(Estimate(1, 2, 3, 4, [1, 1, 1], [2, 2, 2]))
+
+        self.assertEqual(2, total.command_count)
+        self.assertEqual(10, total.toolpath_length)
+        self.assertEqual(8, total.cycle_time)
+        self.assertEqual([0, 0, 0], total.start)
+        self.assertEqual([1, 1, 1], total.end)
+
+
+class TestOperationEstimates(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def assertEstimateMatches(self, operation):
+        """Assert that an operation's estimate matches a measurement of its generated commands."""
+        estimate = operation.estimate(self.options)
+        for start_value, estimated_value in zip(operation.start_point(self.options), estimate.start):
+            self.assertAlmostEqual(start_value, estimated_value)
+
+        commands = []
+        operation.generate([*estimate.start], commands, self.options)
+        measured = measure_commands(commands, self.options, estimate.start)
+
+        self.assertEqual(measured.command_count, estimate.command_count)
+        self.assertAlmostEqual(measured.feed_length, estimate.feed_length)
+        self.assertAlmostEqual(measured.rapid_length, estimate.rapid_length)
+        self.assertAlmostEqual(measured.cycle_time, estimate.cycle_time)
+        for measured_value, estimated_value in zip(measured.end, estimate.end):
+            self.assertAlmostEqual(measured_value, estimated_value)
+
+    def test_circular_pocket(self):
+        self.assertEstimateMatches(CircularPocket(centre=[5, 5], diameter=26, depth=5))
+
+    def test_circular_pocket_finishing_pass(self):
+        self.options.tool.finishing_pass = 0.5
+        self.assertEstimateMatches(CircularPocket(diameter=26, depth=2, finishing_pass=True))
+
+    def test_circular_boss(self):
+        self.assertEstimateMatches(CircularBoss(initial_diameter=30, final_diameter=12, height=7))
+
+    def test_circular_profile(self):
+        self.assertEstimateMatches(CircularProfile(diameter=20, depth=4))
+
+    def test_rectangular_profile(self):
+        self.assertEstimateMatches(RectangularProfile(width=20, length=30, depth=4))
+
+    def test_rectangular_pocket(self):
+        self.assertEstimateMatches(RectangularPocket(width=20, length=20, depth=2))
+        self.assertEstimateMatches(RectangularPocket(width=20, length=30, depth=5, start_depth=-1))
+        self.assertEstimateMatches(RectangularPocket(width=30, length=20, depth=2, corner=[1, 2]))
+
+    def test_rectangular_pocket_large_stepover(self):
+        self.options.tool.max_stepover = 5
+        self.assertEstimateMatches(RectangularPocket(width=20, length=40, depth=3, centre=[-3.1, 0.7]))
+        self.assertEstimateMatches(RectangularPocket(width=15, length=15, depth=2, centre=[2.3, -1.9]))
+
+    def test_rectangular_pocket_finishing_pass(self):
+        self.options.tool.finishing_pass = 0.5
+        self.options.tool.finishing_climb = False
+        self.assertEstimateMatches(RectangularPocket(width=20, length=30, depth=2, finishing_pass=True))
+
+    def test_tiny_stepdown(self):
+        self.options.tool.max_stepdown = 0.0001
+        for operation in [
+            CircularPocket(diameter=20, depth=2),
+            CircularBoss(),
+            RectangularPocket(width=20, length=30, depth=2)
+        ]:
+            with self.assertRaises(GenerationError):
+                operation.estimate(self.options)
+
+    def test_drill(self):
+        self.assertEstimateMatches(Drill(centres=[[0, 0], [10, 5]], depth=5))
+        self.assertEstimateMatches(Drill(centres=[[0, 0], [10, 5]], depth=5, peck_interval=1, dwell=500))
+
+
+class TestOperationEstimatesWithMoveFeedRates(TestOperationEstimates):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.tool.plunge_feed_rate = 40
+        self.options.tool.helix_feed_rate = 60
+        self.options.tool.finishing_feed_rate = 80
+        self.options.tool.link_feed_rate = 300
+
+
+class TestGcodeGeneratorEstimate(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+
+    def test_job_estimate(self):
+        self.gcode_generator.add_operation(RectangularPocket(width=20, length=30, depth=4, centre=[5, 5]))
+        self.gcode_generator.add_operation(CircularPocket(centre=[40, 0], diameter=12, depth=3))
+        self.gcode_generator.add_operation(Drill(centres=[[0, 50], [10, 50]], depth=5))
+
+        estimate = self.gcode_generator.estimate([1, 2, 3])
+        commands = self.gcode_generator.generate([1, 2, 3])
+        measured = measure_commands(commands, self.options, [1, 2, 3])
+
+        self.assertEqual(len(commands), estimate.command_count)
+        self.assertAlmostEqual(measured.toolpath_length, estimate.toolpath_length)
+        self.assertAlmostEqual(measured.cycle_time, estimate.cycle_time)
+
+    def test_rapid_rate(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=26, depth=2))
+        self.options.job.rapid_rate = 1000
+        slow = self.gcode_generator.estimate()
+        self.options.job.rapid_rate = 10000
+        fast = self.gcode_generator.estimate()
+
+        self.assertEqual(slow.rapid_length, fast.rapid_length)
+        self.assertGreater(slow.cycle_time, fast.cycle_time)
+
+    def test_invalid_job(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=2, depth=2))
+
+        results = self.gcode_generator.estimate()
+
+        self.assertIsInstance(results, list)
+        self.assertGreater(len(results), 0)
@@ -0,0 +1,101 @@
+import json
+import tempfile
+from math import pi
+from pathlib import Path
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.feeds.FeedsAndSpeeds import calculate_feeds_and_speeds, chip_thinning_factor
+from conversational_gcode.feeds.Material import Material, load_materials
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+
+
+class TestChipThinningFactor(TestCase):
+
+    def test_heavy_stepover(self):
+        self.assertEqual(1, chip_thinning_factor(3, 6))
+        self.assertEqual(1, chip_thinning_factor(6, 6))
+
+    def test_light_stepover(self):
+        self.assertAlmostEqual(6 / (2 * (0.6 * 5.4) ** 0.5), chip_thinning_factor(0.6, 6))
+        self.assertGreater(chip_thinning_factor(0.3, 6), chip_thinning_factor(0.6, 6))
+        self.assertAlmostEqual(1, chip_thinning_factor(2.9999999, 6))
+
+
+class TestLoadMaterials(TestCase):
+
+    def test_included_materials(self):
+        materials = load_materials()
+
+        self.assertIn('aluminium', materials)
+        self.assertEqual('aluminium', materials['aluminium'].name)
+
+    def test_local_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'materials.json'
+            path.write_text(json.dumps({
+                'delrin': {'surface_speed': 200, 'chip_load': 0.01, 'specific_energy': 0.3, 'max_stepdown': 1}
+            }))
+
+            materials = load_materials(path)
+
+        self.assertEqual({'delrin': Material('delrin', 200, 0.01, 0.3, 1)}, materials)
+
+
+class TestCalculateFeedsAndSpeeds(TestCase):
+
+    def setUp(self):
+        self.material = Material('test', surface_speed=300, chip_load=0.01, specific_energy=0.7, max_stepdown=1)
+
+    def test_unlimited(self):
+        feeds_and_speeds = calculate_feeds_and_speeds(self.material, 6, 3)
+
+        self.assertAlmostEqual(300000 / (pi * 6), feeds_and_speeds.spindle_speed)
+        self.assertAlmostEqual(3, feeds_and_speeds.max_stepover)
+        self.assertAlmostEqual(6, feeds_and_speeds.max_stepdown)
+        self.assertAlmostEqual(0.06, feeds_and_speeds.feed_per_tooth)
+        self.assertAlmostEqual(0.06 * 3 * feeds_and_speeds.spindle_speed, feeds_and_speeds.feed_rate)
+        self.assertAlmostEqual(3 * 6 * feeds_and_speeds.feed_rate, feeds_and_speeds.material_removal_rate)
+
+    def test_spindle_speed_limited(self):
+        feeds_and_speeds = calculate_feeds_and_speeds(self.material, 2, 2, max_spindle_speed=10000)
+
+        self.assertEqual(10000, feeds_and_speeds.spindle_speed)
+
+    def test_feed_rate_limited(self):
+        feeds_and_speeds = calculate_feeds_and_speeds(self.material, 6, 3, max_feed_rate=1000)
+
+        self.assertEqual(1000, feeds_and_speeds.feed_rate)
+        self.assertLess(feeds_and_speeds.feed_per_tooth, 0.06)
+
+    def test_power_limited(self):
+        feeds_and_speeds = calculate_feeds_and_speeds(self.material, 6, 3, max_power=300)
+
+        self.assertAlmostEqual(300, feeds_and_speeds.power)
+        self.assertAlmostEqual(300 * 60 / 0.7, feeds_and_speeds.material_removal_rate)
+        # The lightest stepover which reaches the power limit at full depth, thinned chips allowing a faster feed
+        self.assertLess(feeds_and_speeds.max_stepover, 3)
+        self.assertGreater(feeds_and_speeds.feed_per_tooth, 0.06)
+        unlimited = calculate_feeds_and_speeds(self.material, 6, 3)
+        self.assertLess(feeds_and_speeds.max_stepdown, unlimited.max_stepdown + 1e-9)
+        chip_thickness = feeds_and_speeds.feed_per_tooth / chip_thinning_factor(feeds_and_speeds.max_stepover, 6)
+        self.assertAlmostEqual(0.06, chip_thickness)
+
+
+class TestFillFeedsAndSpeeds(TestCase):
+
+    def test_tool_options_filled(self):
+        options = Options()
+        gcode_generator = GcodeGenerator(options)
+        gcode_generator.add_operation(RectangularPocket(width=20, length=30, depth=5))
+
+        feeds_and_speeds = gcode_generator.fill_feeds_and_speeds(load_materials()['mdf'])
+
+        self.assertEqual(options.job.rapid_rate, feeds_and_speeds.feed_rate)
+        self.assertEqual(feeds_and_speeds.feed_rate, options.tool.feed_rate)
+        self.assertEqual(feeds_and_speeds.spindle_speed, options.tool.spindle_speed)
+        self.assertEqual(feeds_and_speeds.max_stepover, options.tool.max_stepover)
+        self.assertEqual(feeds_and_speeds.max_stepdown, options.tool.max_stepdown)
+        self.assertTrue(gcode_generator.validate()[0].success)
+        self.assertIn(f'"feed_rate": {feeds_and_speeds.feed_rate}', options.header)
@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from conversational_gcode.geometry.Footprint import Footprint, segment_intersects, POCKET
+from conversational_gcode.geometry.SpatialGrid import SpatialGrid
+
+
+class TestFootprint(TestCase):
+
+    def circle(self, x: float, y: float, radius: float, bottom: float = -1, top: float = 0) -> Footprint:
+        return Footprint(None, POCKET, [x, y], radius=radius, bottom=bottom, top=top)
+
+    def rectangle(self, x: float, y: float, width: float, length: float) -> Footprint:
+        return Footprint(None, POCKET, [x, y], size=[width, length], bottom=-1, top=0)
+
+    def test_bounds(self):
+        self.assertEqual((-1, 1, 3, 5), self.circle(1, 3, 2).bounds)
+        self.assertEqual((-1, 0, 3, 6), self.rectangle(1, 3, 4, 6).bounds)
+
+    def test_circles(self):
+        self.assertTrue(self.circle(0, 0, 2).intersects(self.circle(3, 0, 2)))
+        self.assertFalse(self.circle(0, 0, 2).intersects(self.circle(4, 0, 2), 0.001))
+        self.assertFalse(self.circle(0, 0, 2).intersects(self.circle(5, 0, 2)))
+
+    def test_rectangles(self):
+        self.assertTrue(self.rectangle(0, 0, 4, 4).intersects(self.rectangle(3, 3, 4, 4)))
+        self.assertFalse(self.rectangle(0, 0, 4, 4).intersects(self.rectangle(4, 0, 4, 4), 0.001))
+        self.assertFalse(self.rectangle(0, 0, 4, 4).intersects(self.rectangle(0, 5, 4, 4)))
+
+    def test_circle_and_rectangle(self):
+        self.assertTrue(self.circle(3, 3, 1.5).intersects(self.rectangle(0, 0, 4, 4)))
+        self.assertFalse(self.rectangle(0, 0, 4, 4).intersects(self.circle(3, 3, 1.4)))
+        self.assertTrue(self.rectangle(0, 0, 4, 4).intersects(self.circle(0, 0, 1)))
+
+    def test_uncut_centre(self):
+        ring = Footprint(None, POCKET, [0, 0], radius=10, inner_radius=5)
+        band = Footprint(None, POCKET, [0, 0], size=[20, 20], inner_size=[10, 10])
+
+        self.assertFalse(ring.intersects(self.circle(1, 0, 4)))
+        self.assertFalse(self.rectangle(0, 0, 6, 6).intersects(ring))
+        self.assertTrue(ring.intersects(self.circle(2, 0, 4)))
+        self.assertTrue(ring.intersects(self.rectangle(0, 0, 8, 8)))
+        self.assertFalse(band.intersects(self.circle(0, 0, 5)))
+        self.assertFalse(band.intersects(self.rectangle(1, 1, 8, 8), 0.001))
+        self.assertTrue(band.intersects(self.circle(1, 0, 5)))
+        self.assertTrue(band.intersects(ring))
+
+    def test_depths(self):
+        self.assertTrue(self.circle(0, 0, 1, -2, 0).overlaps_depth(self.circle(0, 0, 1, -3, -1)))
+        self.assertFalse(self.circle(0, 0, 1, -2, 0).overlaps_depth(self.circle(0, 0, 1, -4, -2), 0.001))
+
+    def test_signed_distance(self):
+        self.assertAlmostEqual(-1, self.circle(0, 0, 2).signed_distance([1, 0]))
+        self.assertAlmostEqual(1, self.rectangle(0, 0, 4, 4).signed_distance([3, 0]))
+        self.assertAlmostEqual(2 ** 0.5, self.rectangle(0, 0, 4, 4).signed_distance([3, 3]))
+        ring = Footprint(None, POCKET, [0, 0], radius=4, inner_radius=2)
+        self.assertAlmostEqual(-1, ring.signed_distance([0, 3]))
+        self.assertAlmostEqual(1, ring.signed_distance([0, 1]))
+
+    def test_segment(self):
+        self.assertTrue(segment_intersects([-5, 0], [5, 0], self.circle(0, 1, 2)))
+        self.assertFalse(segment_intersects([-5, 0], [5, 0], self.circle(0, 3, 2)))
+        self.assertFalse(segment_intersects([-5, 0], [-3, 0], self.circle(0, 0, 2)))
+        self.assertTrue(segment_intersects([-5, -5], [5, 5], self.rectangle(0, 0, 1, 1)))
+        self.assertFalse(segment_intersects([-5, 5], [5, 6], self.rectangle(0, 0, 1, 1)))
+        self.assertFalse(segment_intersects([-5, 2], [5, 2], self.rectangle(0, 0, 1, 1)))
+        self.assertTrue(segment_intersects([0, -5], [0, 5], self.rectangle(0, 0, 1, 1)))
+
+
+class TestSpatialGrid(TestCase):
+
+    def test_query(self):
+        grid = SpatialGrid(10)
+        grid.insert(0, (0, 0, 5, 5))
+        grid.insert(1, (25, 25, 35, 35))
+        grid.insert(2, (-15, -15, -11, -11))
+
+        self.assertEqual({0}, grid.query((1, 1, 2, 2)))
+        self.assertEqual({0, 1}, grid.query((5, 5, 25, 25)))
+        self.assertEqual({0, 1, 2}, grid.query((-1000, -1000, 1000, 1000)))
+        self.assertEqual(set(), grid.query((100, 100, 101, 101)))
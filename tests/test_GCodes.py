@@ -1,3 +1,4 @@
+from dataclasses import replace
 from unittest import TestCase
 
 from conversational_gcode.options.OutputOptions import OutputOptions
@@ -54,6 +55,30 @@ class TestGCode(TestCode):
         self.assertNotEqual(expected, actual)
 
 
+class TestCommentBlock(TestCode):
+
+    def test_comment_block_without_comment(self):
+        system_under_test = CommentBlock()
+        self.assertEqual(';', system_under_test.format(self.output_options))
+
+    def test_comment_block_with_comment(self):
+        system_under_test = CommentBlock(f'{self.comment}\n  {self.comment}')
+        self.assertEqual(
+            f'; {self.comment}\n;   {self.comment}',
+            system_under_test.format(self.output_options)
+        )
+
+    def test_equality(self):
+        expected = CommentBlock(self.comment)
+        actual = CommentBlock(self.comment)
+        self.assertEqual(expected, actual)
+
+    def test_inequality(self):
+        expected = CommentBlock(self.comment)
+        self.assertNotEqual(expected, CommentBlock(f'not {self.comment}'))
+        self.assertNotEqual(expected, GCode(self.comment))
+
+
 class TestM2(TestCode):
 
     def test_m2_without_comment(self):
@@ -266,6 +291,14 @@ class TestG1(TestCode):
         actual = G1(x=self.x, y=self.y, z=self.z, f=self.f + 1)
         self.assertNotEqual(expected, actual)
 
+    def test_move_class(self):
+        system_under_test = G1(x=self.x, y=self.y, z=self.z, f=self.f, move=LINK)
+        self.assertEqual(
+            f'G1 {self.x_coord} {self.y_coord} {self.z_coord} {self.feed_element};',
+            system_under_test.format(self.output_options)
+        )
+        self.assertEqual(G1(x=self.x, y=self.y, z=self.z, f=self.f), system_under_test)
+
 
 class TestG2(TestCode):
 
@@ -673,3 +706,32 @@ class TestCyclePosition(TestCode):
         expected = CyclePosition(x=self.x, y=self.y, z=self.z)
         actual = CyclePosition(x=self.x, y=self.y, z=self.z + 1)
         self.assertNotEqual(expected, actual)
+
+
+class TestHashing(TestCode):
+
+    def test_equal_commands_hash_equal(self):
+        commands = [
+            GCode(self.comment), CommentBlock(self.comment), M2(), M3(s=self.speed), M5(), G80(),
+            G0(x=self.x, y=self.y, z=self.z), G1(x=self.x, f=self.f), G2(x=self.x, i=self.i, f=self.f),
+            G3(x=self.x, j=self.j, f=self.f), G81(z=self.z, r=self.r, f=self.f), G82(z=self.z, r=self.r, p=self.p, f=self.f),
+            G83(z=self.z, r=self.r, q=self.q, f=self.f), CyclePosition(x=self.x, y=self.y)
+        ]
+        copies = [replace(command) for command in commands]
+
+        for command, copy in zip(commands, copies):
+            with self.subTest(command=command):
+                self.assertEqual(command, copy)
+                self.assertEqual(hash(command), hash(copy))
+
+        self.assertEqual(len(commands), len(set(commands + copies)))
+
+    def test_types_differ(self):
+        self.assertNotEqual(G0(x=self.x), G1(x=self.x))
+        self.assertNotEqual(G1(x=self.x), G0(x=self.x))
+        self.assertNotEqual(G2(x=self.x, f=self.f), G3(x=self.x, f=self.f))
+        self.assertNotEqual(GCode(self.comment), CommentBlock(self.comment))
+
+    def test_move_not_compared(self):
+        self.assertEqual(G1(x=self.x, f=self.f, move=ROUGHING), G1(x=self.x, f=self.f, move=LINK))
+        self.assertEqual(hash(G1(x=self.x, f=self.f, move=ROUGHING)), hash(G1(x=self.x, f=self.f, move=LINK)))
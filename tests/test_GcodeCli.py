@@ -0,0 +1,63 @@
+import json
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from conversational_gcode.GcodeCli import main
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+
+
+class TestGcodeCli(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.job = {
+            'options': {'tool': {'tool_diameter': 6, 'feed_rate': 380}},
+            'operations': [
+                {'type': 'CircularPocket', 'centre': [0, 0], 'diameter': 20, 'depth': 2},
+                {'type': 'Drill', 'centres': [[10, 10], [20, 10]], 'depth': 2}
+            ]
+        }
+        generator = GcodeGenerator.from_dict(self.job)
+        self.expected = [command.format(generator.options.output) for command in generator.generate()]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_job(self, name: str, job: dict) -> str:
+        path = join(self.directory.name, name)
+        with open(path, 'w') as job_file:
+            json.dump(job, job_file)
+        return path
+
+    def read_lines(self, path: str) -> list[str]:
+        with open(path, 'r') as gcode_file:
+            return gcode_file.read().rstrip('\n').split('\n')
+
+    def test_single_job(self):
+        job_path = self.write_job('job.json', self.job)
+        output_path = join(self.directory.name, 'job.nc')
+
+        self.assertEqual(0, main([job_path, '-o', output_path]))
+        self.assertEqual('\n'.join(self.expected).split('\n'), self.read_lines(output_path))
+
+    def test_invalid_job(self):
+        job_path = self.write_job('job.json', {'operations': [{'type': 'CircularPocket', 'diameter': 2}]})
+
+        self.assertEqual(1, main([job_path, '-o', join(self.directory.name, 'job.nc')]))
+
+    def test_jobs_dir(self):
+        for name in ['a.json', 'b.json', 'c.json']:
+            self.write_job(name, self.job)
+        output_dir = join(self.directory.name, 'output')
+
+        self.assertEqual(0, main(['--jobs-dir', self.directory.name, '--output-dir', output_dir, '-j', '2']))
+        for name in ['a.nc', 'b.nc', 'c.nc']:
+            self.assertEqual('\n'.join(self.expected).split('\n'), self.read_lines(join(output_dir, name)))
+
+    def test_jobs_dir_with_failure(self):
+        self.write_job('a.json', self.job)
+        self.write_job('b.json', {'operations': [{'type': 'Unknown'}]})
+
+        self.assertEqual(1, main(['--jobs-dir', self.directory.name]))
+        self.assertEqual('\n'.join(self.expected).split('\n'), self.read_lines(join(self.directory.name, 'a.nc')))
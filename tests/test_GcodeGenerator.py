@@ -0,0 +1,145 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.options.Options import Options
+from conversational_gcode.validate.generation_error import GenerationError
+from conversational_gcode.validate.validation_result import SUCCESS
+
+
+class TestGcodeGeneratorBudget(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(CircularPocket(diameter=26, depth=2))
+
+    def test_unlimited_budget(self):
+        commands = self.gcode_generator.generate(max_commands=1000, max_seconds=60)
+
+        self.assertEqual(len(self.gcode_generator.generate()), len(commands))
+
+    def test_command_budget_exceeded(self):
+        results = self.gcode_generator.generate(max_commands=10)
+
+        self.assertEqual(1, len(results))
+        self.assertIn('CircularPocket(', results[0])
+        self.assertIn('budget of 10 commands', results[0])
+
+    def test_time_budget_exceeded(self):
+        self.options.tool.max_stepover = 0.000001
+
+        results = self.gcode_generator.generate(max_seconds=0.1)
+
+        self.assertEqual(1, len(results))
+        self.assertIn('budget of 0.1 seconds', results[0])
+
+
+class TestGcodeGeneratorStream(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(CircularPocket(diameter=26, depth=2))
+        self.gcode_generator.add_operation(CircularPocket(centre=[30, 0], diameter=12, depth=4))
+
+    def test_stream_matches_generate(self):
+        self.assertEqual(self.gcode_generator.generate(), list(self.gcode_generator.stream()))
+
+    def test_stream_invalid(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=2, depth=2))
+
+        with self.assertRaises(GenerationError):
+            list(self.gcode_generator.stream())
+
+
+class TestGcodeGeneratorAsync(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(CircularPocket(diameter=26, depth=2))
+        self.gcode_generator.add_operation(CircularPocket(centre=[30, 0], diameter=12, depth=4))
+
+    def expected_text(self) -> str:
+        return ''.join(f'{command.format(self.options.output)}\n' for command in self.gcode_generator.generate())
+
+    def test_stream_text_matches_generate(self):
+        self.assertEqual(self.expected_text(), ''.join(self.gcode_generator.stream_text()))
+
+    def test_generate_async_matches_generate(self):
+        async def collect():
+            return [chunk async for chunk in self.gcode_generator.generate_async()]
+
+        chunks = asyncio.run(collect())
+
+        self.assertEqual(4, len(chunks))
+        self.assertEqual(self.expected_text(), ''.join(chunks))
+
+    def test_generate_async_invalid(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=2, depth=2))
+
+        async def collect():
+            return [chunk async for chunk in self.gcode_generator.generate_async()]
+
+        with self.assertRaises(GenerationError):
+            asyncio.run(collect())
+
+    def test_generate_async_cancelled(self):
+        self.options.tool.max_stepover = 0.000001
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        async def consume():
+            async for _ in self.gcode_generator.generate_async(executor=executor):
+                pass
+
+        async def cancel_after_start():
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_after_start())
+
+        # The abandoned operation stops in the executor rather than running to completion
+        start = monotonic()
+        executor.shutdown(wait=True)
+        self.assertLess(monotonic() - start, 1)
+
+
+class TestGcodeGeneratorValidation(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(CircularPocket(diameter=2, depth=2))
+        self.gcode_generator.add_operation(Drill(centres=[[0, 0], [1, None]]))
+
+    def test_valid(self):
+        gcode_generator = GcodeGenerator(self.options)
+        gcode_generator.add_operation(CircularPocket(diameter=26, depth=2))
+
+        results = gcode_generator.validate(fail_fast=True)
+
+        self.assertEqual([SUCCESS], results)
+
+    def test_collect_all(self):
+        results = self.gcode_generator.validate()
+
+        self.assertEqual(2, len(results))
+        self.assertIn('Hole diameter', results[0].message)
+        self.assertIn('Drill centre 1', results[1].message)
+
+    def test_fail_fast(self):
+        self.options.tool.feed_rate = -1
+
+        results = self.gcode_generator.validate(fail_fast=True)
+
+        self.assertEqual(1, len(results))
+        self.assertEqual('Feed rate must be positive', results[0].message)
+        self.assertEqual(['Feed rate must be positive'], self.gcode_generator.generate(fail_fast=True))
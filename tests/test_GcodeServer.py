@@ -0,0 +1,200 @@
+import json
+import socket
+from http.client import HTTPConnection
+from os.path import join
+from queue import Queue
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from unittest import TestCase, skipUnless
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.GcodeServer import GcodeServer, JobCache, LatencyMetrics, _stream_job
+from conversational_gcode.serialise.Serialisation import digest
+from conversational_gcode.validate.generation_error import GenerationError
+
+
+class TestJobCache(TestCase):
+
+    def test_least_recently_used(self):
+        cache = JobCache(2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        self.assertEqual('A', cache.get('a'))
+
+        cache.put('c', 'C')
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual('A', cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual('C', cache.get('c'))
+
+
+class TestLatencyMetrics(TestCase):
+
+    def test_metrics(self):
+        metrics = LatencyMetrics()
+        self.assertIsNone(metrics.to_dict()['latency'])
+
+        metrics.record(1, True, False)
+        metrics.record(3, True, True)
+        metrics.record(2, False, False)
+
+        results = metrics.to_dict()
+        self.assertEqual(3, results['requests'])
+        self.assertEqual(1, results['failures'])
+        self.assertEqual(1, results['cache_hits'])
+        self.assertEqual(1, results['cache_misses'])
+        self.assertEqual(2, results['latency']['mean'])
+        self.assertEqual(2, results['latency']['p50'])
+        self.assertEqual(3, results['latency']['max'])
+
+
+class TestStreamJob(TestCase):
+
+    job = {
+        'options': {'tool': {'tool_diameter': 6, 'max_stepover': 0.3, 'max_stepdown': 0.5}},
+        'operations': [{'type': 'CircularPocket', 'centre': [x * 50, 0], 'diameter': 40, 'depth': 10} for x in range(4)]
+    }
+
+    def test_cancelled(self):
+        queue = Queue()
+        cancelled = Event()
+        cancelled.set()
+
+        with self.assertRaises(GenerationError):
+            _stream_job(self.job, queue, cancelled)
+        self.assertTrue(queue.empty())
+
+    def test_waits_for_queue(self):
+        queue = Queue(maxsize=1)
+
+        with self.assertRaises(GenerationError) as context:
+            _stream_job(self.job, queue, Event(), max_seconds=0.5)
+        self.assertIn('budget of 0.5 seconds', str(context.exception))
+        self.assertEqual(1, queue.qsize())
+
+
+class _UnixHTTPConnection(HTTPConnection):
+
+    def __init__(self, path: str):
+        super().__init__('localhost')
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+
+class TestGcodeServer(TestCase):
+
+    job = {
+        'options': {'tool': {'tool_diameter': 6}},
+        'operations': [{'type': 'CircularPocket', 'centre': [0, 0], 'diameter': 20, 'depth': 2}]
+    }
+
+    def start(self, **kwargs) -> GcodeServer:
+        server = GcodeServer(**kwargs)
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            thread.join()
+            server.close()
+        self.addCleanup(stop)
+        return server
+
+    def expected_gcode(self) -> str:
+        generator = GcodeGenerator.from_dict(self.job)
+        return '\n'.join(command.format(generator.options.output) for command in generator.generate()) + '\n'
+
+    def post(self, connection: HTTPConnection, job) -> tuple[int, dict, str]:
+        connection.request('POST', '/generate', body=json.dumps(job), headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read().decode('utf-8')
+
+    def test_generate_and_cache(self):
+        server = self.start(port=0)
+        connection = HTTPConnection(*server.address)
+        self.addCleanup(connection.close)
+
+        status, headers, body = self.post(connection, self.job)
+        self.assertEqual(200, status)
+        self.assertEqual('chunked', headers['Transfer-Encoding'])
+        self.assertEqual('miss', headers['X-Cache'])
+        self.assertEqual(self.expected_gcode(), body)
+
+        status, headers, body = self.post(connection, self.job)
+        self.assertEqual(200, status)
+        self.assertEqual('hit', headers['X-Cache'])
+        self.assertEqual(self.expected_gcode(), body)
+
+        connection.request('GET', '/metrics')
+        metrics = json.loads(connection.getresponse().read())
+        self.assertEqual(2, metrics['requests'])
+        self.assertEqual(1, metrics['cache_hits'])
+        self.assertEqual(1, metrics['cached_jobs'])
+        self.assertEqual(2, metrics['latency']['count'])
+
+    def test_invalid_job(self):
+        server = self.start(port=0)
+        connection = HTTPConnection(*server.address)
+        self.addCleanup(connection.close)
+
+        status, _, body = self.post(connection, {'operations': [{'type': 'CircularPocket', 'diameter': 2}]})
+        self.assertEqual(400, status)
+        self.assertEqual(1, len(json.loads(body)))
+
+        status, _, body = self.post(connection, {'operations': [{'type': 'Unknown'}]})
+        self.assertEqual(400, status)
+        self.assertIn('Unknown', json.loads(body)[0])
+
+    def test_job_failing_validation(self):
+        server = self.start(port=0)
+        connection = HTTPConnection(*server.address)
+        self.addCleanup(connection.close)
+
+        status, headers, body = self.post(
+            connection, {'operations': [{'type': 'CircularPocket', 'centre': [0, 0], 'diameter': 'abc', 'depth': 2}]}
+        )
+        self.assertEqual(400, status)
+        self.assertEqual('application/json', headers['Content-Type'])
+        self.assertIn('Invalid job', json.loads(body)[0])
+
+        connection.request('GET', '/metrics')
+        metrics = json.loads(connection.getresponse().read())
+        self.assertEqual(1, metrics['requests'])
+        self.assertEqual(1, metrics['failures'])
+
+    def test_streams_large_job(self):
+        server = self.start(port=0)
+        connection = HTTPConnection(*server.address)
+        self.addCleanup(connection.close)
+        job = {
+            'options': {'tool': {'tool_diameter': 6, 'max_stepover': 0.3, 'max_stepdown': 0.5}},
+            'operations': [
+                {'type': 'CircularPocket', 'centre': [x * 50, 0], 'diameter': 40, 'depth': 10} for x in range(4)
+            ]
+        }
+
+        status, headers, body = self.post(connection, job)
+
+        generator = GcodeGenerator.from_dict(job)
+        expected = '\n'.join(command.format(generator.options.output) for command in generator.generate()) + '\n'
+        self.assertEqual(200, status)
+        self.assertGreater(len(body), 64 * 1024)
+        self.assertEqual(expected, body)
+        self.assertEqual(expected, server.cache.get(digest(job)))
+
+    @skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix sockets are not supported')
+    def test_unix_socket(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = join(directory.name, 'gcode.sock')
+        self.start(unix_socket=path)
+        connection = _UnixHTTPConnection(path)
+        self.addCleanup(connection.close)
+
+        status, _, body = self.post(connection, self.job)
+        self.assertEqual(200, status)
+        self.assertEqual(self.expected_gcode(), body)
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.geometry.Footprint import Footprint, POCKET, BOSS
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+from conversational_gcode.stock.Heightmap import Heightmap
+
+
+class TestHeightmap(TestCase):
+
+    def setUp(self):
+        self.system_under_test = Heightmap((-10, -10, 10, 10), 0.5)
+
+    def test_initial_stock(self):
+        self.assertEqual(40, self.system_under_test.columns)
+        self.assertEqual(40, self.system_under_test.rows)
+        self.assertEqual(0, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], radius=5, bottom=-1)))
+
+    def test_cut_rectangle(self):
+        self.system_under_test.cut(Footprint(None, POCKET, [0, 0], size=[10, 10], bottom=-3))
+
+        self.assertEqual(-3, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], size=[10, 10])))
+        self.assertEqual(-3, self.system_under_test.highest(Footprint(None, POCKET, [1, 1], radius=3)))
+        self.assertEqual(0, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], size=[10.5, 10])))
+
+    def test_cut_circle(self):
+        self.system_under_test.cut(Footprint(None, POCKET, [0, 0], radius=5, bottom=-3))
+
+        self.assertEqual(-3, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], radius=4)))
+        self.assertEqual(-3, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], size=[6, 6])))
+        self.assertEqual(0, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], size=[8, 8])))
+
+    def test_cut_is_never_raised(self):
+        self.system_under_test.cut(Footprint(None, POCKET, [0, 0], radius=5, bottom=-3))
+        self.system_under_test.cut(Footprint(None, POCKET, [0, 0], radius=5, bottom=-1))
+
+        self.assertEqual(-3, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], radius=4)))
+
+    def test_cut_ring(self):
+        self.system_under_test.cut(Footprint(None, BOSS, [0, 0], radius=8, inner_radius=3, bottom=-3))
+
+        self.assertEqual(0, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], radius=2)))
+        self.assertEqual(-3, self.system_under_test.highest(Footprint(None, POCKET, [5.5, 0], radius=1.5)))
+
+    def test_outside_grid(self):
+        self.system_under_test.cut(Footprint(None, POCKET, [0, 0], size=[20, 20], bottom=-3))
+
+        self.assertEqual(0, self.system_under_test.highest(Footprint(None, POCKET, [0, 0], size=[30, 30])))
+
+
+class TestGcodeGeneratorStock(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+
+    def stock(self) -> Heightmap:
+        return self.gcode_generator.create_stock(0.5)
+
+    def test_uncut_stock(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=20, depth=4))
+
+        self.assertEqual(self.gcode_generator.generate(), self.gcode_generator.generate(stock=self.stock()))
+
+    def test_trim_nested_pocket(self):
+        self.gcode_generator.add_operation(RectangularPocket(width=60, length=60, depth=6))
+        self.gcode_generator.add_operation(CircularPocket(centre=[5, 5], diameter=20, depth=10))
+
+        commands = self.gcode_generator.generate(stock=self.stock())
+
+        trimmed = CircularPocket(centre=[5, 5], start_depth=-6, diameter=20, depth=4)
+        trimmed_commands = []
+        trimmed.generate([5, 5, 10], trimmed_commands, self.options)
+        self.assertLess(len(commands), len(self.gcode_generator.generate()))
+        self.assertIn(trimmed_commands[5], commands)
+
+    def test_skip_air_cut(self):
+        self.gcode_generator.add_operation(RectangularPocket(width=60, length=60, depth=6))
+        self.gcode_generator.add_operation(CircularPocket(centre=[5, 5], diameter=20, depth=4))
+        self.gcode_generator.add_operation(Drill(centres=[[0, 0]], depth=2))
+
+        comments = [command.comment for command in self.gcode_generator.generate(stock=self.stock())]
+
+        self.assertEqual(2, len([comment for comment in comments if comment is not None and comment.startswith('Skipped')]))
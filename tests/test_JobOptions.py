@@ -10,6 +10,8 @@ class TestJobOptions(ValidationAsserter):
     def test_initial_values(self):
         self.assertEqual(10, self.system_under_test.clearance_height)
         self.assertEqual(0.25, self.system_under_test.lead_in)
+        self.assertEqual(5000, self.system_under_test.rapid_rate)
+        self.assertEqual(False, self.system_under_test.local_retract)
 
     def test_initial_validation(self):
         self.assertSuccess(self.system_under_test)
@@ -33,3 +35,23 @@ class TestJobOptions(ValidationAsserter):
 
         self.system_under_test.lead_in = None
         self.assertFailure(self.system_under_test)
+
+    def test_validation_rapid_rate(self):
+        self.system_under_test.rapid_rate = 0
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.rapid_rate = -1
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.rapid_rate = None
+        self.assertSuccess(self.system_under_test)
+
+    def test_validation_local_retract(self):
+        self.system_under_test.local_retract = True
+        self.assertSuccess(self.system_under_test)
+
+        self.system_under_test.local_retract = 'yes'
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.local_retract = None
+        self.assertSuccess(self.system_under_test)
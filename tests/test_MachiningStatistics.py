@@ -0,0 +1,146 @@
+from math import pi
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.estimate.Estimate import measure_commands
+from conversational_gcode.estimate.MachiningStatistics import MachiningStatistics, measure_statistics
+from conversational_gcode.gcodes.GCodes import *
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.boss.CircularBoss import CircularBoss
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.operations.profile.CircularProfile import CircularProfile
+from conversational_gcode.operations.profile.RectangularProfile import RectangularProfile
+from conversational_gcode.options.Options import Options
+
+
+class TestMachiningStatistics(TestCase):
+
+    def test_rates(self):
+        statistics = MachiningStatistics(
+            volume=100, feed_times={ROUGHING: 20, HELIX: 10, LINK: 30}, peak_material_removal_rate=400
+        )
+
+        self.assertEqual(30, statistics.cutting_time)
+        self.assertAlmostEqual(200, statistics.average_material_removal_rate)
+        self.assertAlmostEqual(0.5, statistics.utilisation)
+
+    def test_no_cutting(self):
+        statistics = MachiningStatistics()
+
+        self.assertEqual(0, statistics.average_material_removal_rate)
+        self.assertEqual(0, statistics.utilisation)
+
+
+class TestMeasureStatistics(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def test_feed_classes(self):
+        commands = [
+            G0(x=10, comment='Move'),
+            G1(z=-1, f=60, move=PLUNGE),
+            G1(x=20, f=120),
+            GCode('Comment'),
+            G1(x=30, f=120, move=ROUGHING),
+            G1(x=31, f=60, move=DISENGAGE),
+            G0(z=5)
+        ]
+
+        statistics = measure_statistics(commands, self.options, 50, {PLUNGE: 100, ROUGHING: 200, HELIX: 300}, [0, 0, 0])
+
+        self.assertEqual(50, statistics.volume)
+        self.assertEqual({PLUNGE: 1, ROUGHING: 10, DISENGAGE: 1}, {move: round(time, 6) for move, time in statistics.feed_times.items()})
+        self.assertAlmostEqual(60 * 16 / self.options.job.rapid_rate, statistics.rapid_time)
+        self.assertAlmostEqual(11, statistics.cutting_time)
+        # Helical moves are not used, so their rate is not the peak
+        self.assertEqual(200, statistics.peak_material_removal_rate)
+
+    def test_drilling_cycle(self):
+        commands = [
+            G81(x=0, y=0, z=-3, r=1, f=80, move=PLUNGE),
+            CyclePosition(x=10, y=0),
+            G80(),
+            GCode()
+        ]
+
+        statistics = measure_statistics(commands, self.options, 0, {}, [0, 0, 10])
+
+        self.assertAlmostEqual(2 * 60 * 4 / 80, statistics.feed_times[PLUNGE])
+        self.assertAlmostEqual(measure_commands(commands, self.options, [0, 0, 10]).cycle_time,
+                               statistics.feed_times[PLUNGE] + statistics.rapid_time)
+
+
+class TestOperationStatistics(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.tool.finishing_pass = 0.3
+        self.operations = [
+            CircularPocket(diameter=20, depth=5, finishing_pass=True),
+            RectangularPocket(width=20, length=30, depth=5, finishing_pass=True),
+            CircularBoss(initial_diameter=30, final_diameter=20, height=4),
+            CircularProfile(diameter=20, depth=4),
+            RectangularProfile(width=20, length=20, depth=4, is_inner=False),
+            Drill(centres=[[0, 0], [10, 0]], depth=3, peck_interval=1)
+        ]
+
+    def test_commands_unchanged(self):
+        for operation in self.operations:
+            with self.subTest(operation=operation):
+                commands = []
+                operation.generate([0, 0, 10], commands, self.options)
+                position = [0, 0, 10]
+                measured_commands = []
+
+                statistics = operation.generate_with_statistics(position, measured_commands, self.options)
+
+                self.assertEqual(commands, measured_commands)
+                self.assertIs(operation, statistics.operation)
+                cycle_time = measure_commands(commands, self.options, [0, 0, 10]).cycle_time
+                self.assertAlmostEqual(cycle_time, sum(statistics.feed_times.values()) + statistics.rapid_time)
+                self.assertGreater(statistics.volume, 0)
+                self.assertGreater(statistics.peak_material_removal_rate, 0)
+                self.assertLessEqual(statistics.average_material_removal_rate, statistics.peak_material_removal_rate)
+
+    def test_volumes(self):
+        tool_radius = self.options.tool.tool_radius
+
+        self.assertAlmostEqual(pi * 100 * 5, self.operations[0].removed_volume(self.options))
+        self.assertAlmostEqual((600 - (4 - pi) * tool_radius ** 2) * 5, self.operations[1].removed_volume(self.options))
+        self.assertAlmostEqual(pi * (225 - 100) * 4, self.operations[2].removed_volume(self.options))
+        self.assertAlmostEqual(pi * (100 - 16) * 4, self.operations[3].removed_volume(self.options))
+        self.assertAlmostEqual((32 * 32 - 400 - (4 - pi) * tool_radius ** 2) * 4,
+                               self.operations[4].removed_volume(self.options))
+        self.assertAlmostEqual(2 * pi * tool_radius ** 2 * 3, self.operations[5].removed_volume(self.options))
+
+    def test_boss_helix_cuts_air(self):
+        rates = self.operations[2].peak_removal_rates(self.options)
+
+        self.assertEqual(0, rates[HELIX])
+        self.assertGreater(rates[ROUGHING], 0)
+
+
+class TestGeneratorStatistics(TestCase):
+
+    def test_statistics(self):
+        options = Options()
+        gcode_generator = GcodeGenerator(options)
+        operations = [CircularPocket(diameter=20, depth=5, centre=[0, 0]), Drill(centres=[[50, 50]], depth=3)]
+        for operation in operations:
+            gcode_generator.add_operation(operation)
+
+        statistics = gcode_generator.statistics()
+
+        self.assertEqual(operations, [item.operation for item in statistics])
+        self.assertIn(HELIX, statistics[0].feed_times)
+        self.assertEqual([PLUNGE], list(statistics[1].feed_times))
+
+    def test_invalid(self):
+        options = Options()
+        options.tool.feed_rate = -1
+        gcode_generator = GcodeGenerator(options)
+        gcode_generator.add_operation(CircularPocket(diameter=20, depth=5))
+
+        self.assertEqual(['Feed rate must be positive'], gcode_generator.statistics())
@@ -2,7 +2,9 @@ from unittest import TestCase
 
 from conversational_gcode.options.JobOptions import JobOptions
 from conversational_gcode.options.ToolOptions import ToolOptions
-from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3
+from conversational_gcode.options.OutputOptions import OutputOptions
+from conversational_gcode.gcodes.GCodes import GCode, G0, G2, G3, HELIX
+from conversational_gcode.validate.generation_error import GenerationError
 
 from conversational_gcode.operations.Operations import *
 
@@ -161,7 +163,7 @@ class TestOperationsRapidWithZHop(TestCase):
 class TestOperationsHelicalPlunge(TestCase):
 
     def setUp(self):
-        self.tool_options = ToolOptions()
+        self.tool_options = ToolOptions(helix_feed_rate=50)
 
     def assertPlunge(
             self,
@@ -193,10 +195,11 @@ class TestOperationsHelicalPlunge(TestCase):
                     y=centre[1],
                     z=centre[2] - count * self.tool_options.max_stepdown,
                     i=-radius,
-                    f=self.tool_options.feed_rate
+                    f=self.tool_options.helix_feed_rate
                 ),
                 commands[1 + count]
             )
+            self.assertEqual(HELIX, commands[1 + count].move)
 
         self.assertEqual(
             arc_command(
@@ -204,7 +207,7 @@ class TestOperationsHelicalPlunge(TestCase):
                 y=centre[1],
                 z=centre[2] - 3 * self.tool_options.max_stepdown,
                 i=-radius,
-                f=self.tool_options.feed_rate,
+                f=self.tool_options.helix_feed_rate,
                 comment='Final full pass at depth'
             ),
             commands[5]
@@ -229,7 +232,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=True,
             is_climb=False
         )
@@ -257,7 +260,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=True,
             is_climb=True
         )
@@ -285,7 +288,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=False,
             is_climb=False
         )
@@ -313,7 +316,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=False,
             is_climb=True
         )
@@ -341,7 +344,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=True,
             is_climb=False
         )
@@ -369,7 +372,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=True,
             is_climb=True
         )
@@ -397,7 +400,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=False,
             is_climb=False
         )
@@ -425,7 +428,7 @@ class TestOperationsHelicalPlunge(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2,
+            output_options=OutputOptions(position_precision=2),
             is_inner=False,
             is_climb=True
         )
@@ -510,7 +513,7 @@ class TestOperationsSpiralOut(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2
+            output_options=OutputOptions(position_precision=2)
         )
 
         self.assertSpiral(
@@ -537,7 +540,7 @@ class TestOperationsSpiralOut(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2
+            output_options=OutputOptions(position_precision=2)
         )
 
         self.assertSpiral(
@@ -622,7 +625,7 @@ class TestOperationsSpiralIn(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2
+            output_options=OutputOptions(position_precision=2)
         )
 
         self.assertSpiral(
@@ -649,7 +652,7 @@ class TestOperationsSpiralIn(TestCase):
             position=position,
             commands=commands,
             tool_options=self.tool_options,
-            precision=2
+            output_options=OutputOptions(position_precision=2)
         )
 
         self.assertSpiral(
@@ -662,3 +665,42 @@ class TestOperationsSpiralIn(TestCase):
             position=position,
             commands=commands
         )
+
+
+class TestOperationsPassCount(TestCase):
+
+    def test_max_pass_count_allows_one_extra_pass(self):
+        self.assertEqual(4, max_pass_count(3, 1))
+        self.assertEqual(4, max_pass_count(2.5, 1))
+        self.assertEqual(4, max_pass_count(-3, 1))
+
+    def test_max_pass_count_zero_distance(self):
+        self.assertEqual(0, max_pass_count(0, 0))
+
+    def test_max_pass_count_zero_step(self):
+        with self.assertRaises(GenerationError):
+            max_pass_count(3, 0)
+
+    def test_check_pass_count(self):
+        check_pass_count(4, 4, 'Loop')
+
+        with self.assertRaises(GenerationError) as context:
+            check_pass_count(5, 4, 'Loop')
+
+        self.assertEqual('Loop did not finish within 4 passes', context.exception.result.message)
+
+    def test_spiral_out_terminates_with_drifting_radius(self):
+        tool_options = ToolOptions(max_stepover=0.1)
+        commands = []
+        position = [0.1, 0, 0]
+
+        spiral_out(
+            current_radius=0.1,
+            final_path_radius=0.7,
+            position=position,
+            commands=commands,
+            tool_options=tool_options,
+            output_options=OutputOptions(position_precision=20)
+        )
+
+        self.assertEqual(6 * 2 + 2, len(commands))
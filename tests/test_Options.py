@@ -1,3 +1,5 @@
+import json
+
 from validation_asserter import ValidationAsserter
 from conversational_gcode.options.Options import Options
 
@@ -14,3 +16,21 @@ class TestJobOptions(ValidationAsserter):
 
     def test_initial_validation(self):
         self.assertSuccess(self.system_under_test)
+
+    def test_header(self):
+        header = self.system_under_test.header
+        self.assertEqual(json.dumps(json.loads(self.system_under_test.to_json()), indent=2), header)
+        self.assertIs(header, self.system_under_test.header)
+
+    def test_header_invalidated(self):
+        header = self.system_under_test.header
+
+        self.system_under_test.tool.feed_rate = 250
+        self.assertIn('"feed_rate": 250', self.system_under_test.header)
+
+        self.system_under_test.job.lead_in = 2
+        self.assertIn('"lead_in": 2', self.system_under_test.header)
+
+        self.system_under_test.output.position_precision = 4
+        self.assertIn('"position_precision": 4', self.system_under_test.header)
+        self.assertNotEqual(header, self.system_under_test.header)
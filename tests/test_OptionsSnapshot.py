@@ -0,0 +1,85 @@
+from dataclasses import FrozenInstanceError
+from math import tan, pi
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.gcodes.GCodes import PLUNGE, HELIX, FINISHING, LINK, DISENGAGE
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+
+
+class TestOptionsSnapshot(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def test_defaults_resolved(self):
+        snapshot = self.options.snapshot()
+
+        self.assertEqual(self.options.tool.plunge_feed_rate, snapshot.tool.plunge_feed_rate)
+        self.assertEqual(5000, snapshot.job.rapid_rate)
+        self.assertFalse(snapshot.job.local_retract)
+        self.assertFalse(snapshot.output.quantise_positions)
+        self.assertEqual(self.options.header, snapshot.header)
+
+    def test_derived_values(self):
+        self.options.tool.tool_diameter = 6
+        self.options.tool.max_helix_angle = 3
+        self.options.output.position_precision = 2
+        snapshot = self.options.snapshot()
+
+        self.assertEqual(3, snapshot.tool.tool_radius)
+        self.assertEqual(tan(3 * pi / 180), snapshot.tool.helix_slope)
+        self.assertEqual(0.01, snapshot.output.tolerance)
+        self.assertEqual(self.options.tool.tool_radius, snapshot.tool.tool_radius)
+        self.assertEqual(self.options.tool.helix_slope, snapshot.tool.helix_slope)
+        self.assertEqual(self.options.output.tolerance, snapshot.output.tolerance)
+
+    def test_feed_rate_for(self):
+        snapshot = self.options.snapshot()
+
+        for move in (None, PLUNGE, HELIX, FINISHING, LINK, DISENGAGE):
+            self.assertEqual(self.options.tool.feed_rate_for(move), snapshot.tool.feed_rate_for(move))
+
+    def test_frozen(self):
+        snapshot = self.options.snapshot()
+
+        with self.assertRaises(FrozenInstanceError):
+            snapshot.tool.feed_rate = 100
+        with self.assertRaises(FrozenInstanceError):
+            snapshot.output = None
+
+    def test_cached(self):
+        snapshot = self.options.snapshot()
+
+        self.assertIs(snapshot, self.options.snapshot())
+        self.assertIs(snapshot, snapshot.snapshot())
+
+        self.options.tool.feed_rate = 250
+
+        changed = self.options.snapshot()
+        self.assertIsNot(snapshot, changed)
+        self.assertEqual(250, changed.tool.feed_rate)
+        self.assertNotEqual(snapshot, changed)
+
+    def test_hashable(self):
+        other = Options()
+        self.assertEqual(self.options.snapshot(), other.snapshot())
+        self.assertEqual(hash(self.options.snapshot()), hash(other.snapshot()))
+
+        other.job.rapid_rate = 5000
+        # Equal effective values, but an explicit rapid rate is written to the header
+        self.assertNotEqual(self.options.snapshot(), other.snapshot())
+
+        cache = {self.options.snapshot(): 'first'}
+        self.assertEqual('first', cache[Options().snapshot()])
+
+    def test_generation_unchanged(self):
+        gcode_generator = GcodeGenerator(self.options)
+        gcode_generator.add_operation(RectangularPocket(width=20, length=30, depth=5))
+        commands = gcode_generator.generate()
+
+        snapshot = self.options.snapshot()
+        self.assertEqual(gcode_generator.estimate().cycle_time, gcode_generator.estimate().cycle_time)
+        self.assertEqual(commands, gcode_generator.generate())
+        self.assertIs(snapshot, self.options.snapshot())
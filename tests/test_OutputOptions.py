@@ -11,6 +11,7 @@ class TestOutputOptions(ValidationAsserter):
         self.assertEqual(3, self.system_under_test.position_precision)
         self.assertEqual(2, self.system_under_test.feed_precision)
         self.assertEqual(1, self.system_under_test.speed_precision)
+        self.assertEqual(False, self.system_under_test.quantise_positions)
 
     def test_initial_validation(self):
         self.assertSuccess(self.system_under_test)
@@ -44,3 +45,13 @@ class TestOutputOptions(ValidationAsserter):
 
         self.system_under_test.speed_precision = None
         self.assertFailure(self.system_under_test)
+
+    def test_validation_quantise_positions(self):
+        self.system_under_test.quantise_positions = True
+        self.assertSuccess(self.system_under_test)
+
+        self.system_under_test.quantise_positions = 'yes'
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.quantise_positions = None
+        self.assertSuccess(self.system_under_test)
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.estimate.Estimate import measure_commands
+from conversational_gcode.gcodes.GCodes import G0
+from conversational_gcode.geometry.Footprint import Footprint, POCKET, BOSS
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.boss.CircularBoss import CircularBoss
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.operations.profile.RectangularProfile import RectangularProfile
+from conversational_gcode.options.JobOptions import JobOptions
+from conversational_gcode.options.Options import Options
+from conversational_gcode.stock.Heightmap import Heightmap
+from conversational_gcode.stock.RetractPlanner import RetractPlanner
+
+
+class TestRetractPlanner(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.footprints = [
+            Footprint(None, POCKET, [0, 0], size=[40, 40], bottom=-6, top=0),
+            Footprint(None, POCKET, [5, 5], radius=5, bottom=-8, top=-6)
+        ]
+
+    def test_uncut_stock(self):
+        system_under_test = RetractPlanner(self.options, self.footprints)
+
+        self.assertEqual(0.25, system_under_test.safe_height([0, 0, -6], [5, 5], -6))
+
+    def test_clearance_height(self):
+        self.footprints.append(Footprint(None, BOSS, [50, 0], radius=5, inner_radius=3, bottom=0, top=20))
+        system_under_test = RetractPlanner(self.options, self.footprints)
+
+        self.assertEqual(10, system_under_test.safe_height([0, 0, -6], [5, 5], -6))
+
+    def test_cut_stock(self):
+        stock = Heightmap.around(self.footprints, 0.5)
+        stock.cut(self.footprints[0])
+        system_under_test = RetractPlanner(self.options, self.footprints, stock)
+
+        self.assertEqual(-5.75, system_under_test.safe_height([0, 0, -6], [5, 5], -6))
+        self.assertEqual(0.25, system_under_test.safe_height([0, 0, -6], [30, 0], -6))
+
+
+class TestGenerateWithLocalRetract(TestCase):
+
+    def setUp(self):
+        self.options = Options(job=JobOptions(local_retract=True))
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(RectangularPocket(width=20, length=20, depth=3, centre=[0, 0]))
+        self.gcode_generator.add_operation(CircularPocket(centre=[40, 0], diameter=12, depth=2))
+        self.gcode_generator.add_operation(Drill(centres=[[60, 0], [70, 0]], depth=3))
+        self.gcode_generator.add_operation(CircularBoss(centre=[0, 60], initial_diameter=30, final_diameter=12, height=3))
+        self.gcode_generator.add_operation(RectangularProfile(width=10, length=10, depth=2, centre=[40, 40]))
+
+    def test_retract_heights(self):
+        commands = self.gcode_generator.generate()
+
+        heights = [command.z for command in commands if isinstance(command, G0) and command.comment == 'Clear tool']
+        self.assertEqual([10, 0.25, 0.25, 0.25, 0.25, 10], heights)
+
+    def test_shorter_rapids(self):
+        estimate = self.gcode_generator.estimate()
+        self.options.job.local_retract = False
+
+        self.assertLess(estimate.rapid_length, self.gcode_generator.estimate().rapid_length)
+
+    def test_estimate_matches_commands(self):
+        estimate = self.gcode_generator.estimate()
+        measured = measure_commands(self.gcode_generator.generate(), self.options, [0, 0, 0])
+
+        self.assertEqual(measured.command_count, estimate.command_count)
+        self.assertAlmostEqual(measured.rapid_length, estimate.rapid_length)
+        self.assertAlmostEqual(measured.cycle_time, estimate.cycle_time)
+
+    def test_nested_pocket_with_stock(self):
+        gcode_generator = GcodeGenerator(self.options)
+        gcode_generator.add_operation(RectangularPocket(width=60, length=60, depth=6, centre=[0, 0]))
+        gcode_generator.add_operation(CircularPocket(centre=[5, 5], diameter=10, start_depth=-6, depth=2))
+
+        commands = gcode_generator.generate(stock=gcode_generator.create_stock(0.5))
+
+        heights = [command.z for command in commands if isinstance(command, G0) and command.comment == 'Clear tool']
+        self.assertEqual([10, -5.75, 10], heights)
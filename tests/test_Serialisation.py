@@ -0,0 +1,88 @@
+import json
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.boss.CircularBoss import CircularBoss
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.operations.profile.CircularProfile import CircularProfile
+from conversational_gcode.operations.profile.RectangularProfile import RectangularProfile
+from conversational_gcode.options.Options import Options
+from conversational_gcode.options.ToolOptions import ToolOptions
+from conversational_gcode.serialise.Serialisation import operation_to_dict, operation_from_dict, to_json, from_json, \
+    to_binary, from_binary, digest
+
+
+class TestSerialisation(TestCase):
+
+    def setUp(self):
+        self.operations = [
+            CircularBoss(centre=[1, 2], top_height=-1, initial_diameter=30, final_diameter=12.5, height=4, finishing_pass=True),
+            CircularPocket(centre=[-3, 4.5], start_depth=-1, diameter=20, depth=2),
+            CircularProfile(centre=[1, 1], diameter=15, depth=4, is_inner=False, is_climb=True),
+            Drill(centres=[[0, 0], [10, -5.5]], depth=5, peck_interval=1, dwell=250),
+            RectangularPocket(width=20, length=30, depth=2, corner=[-1, -2], finishing_pass=True),
+            RectangularProfile(width=20, length=30, depth=2, centre=[5, 5], is_inner=False)
+        ]
+
+    def test_json_round_trip(self):
+        for operation in self.operations:
+            with self.subTest(operation=operation):
+                data = from_json(to_json(operation_to_dict(operation)))
+                self.assertEqual(repr(operation), repr(operation_from_dict(data)))
+
+    def test_binary_round_trip(self):
+        for operation in self.operations:
+            with self.subTest(operation=operation):
+                data = from_binary(to_binary(operation_to_dict(operation)))
+                self.assertEqual(repr(operation), repr(operation_from_dict(data)))
+
+    def test_to_json(self):
+        profile = json.loads(CircularProfile(diameter=15, depth=4).to_json())
+        self.assertEqual(15, profile['diameter'])
+        self.assertEqual(4, profile['depth'])
+
+        pocket = json.loads(RectangularPocket(corner=[1, 2]).to_json())
+        self.assertEqual([1, 2], pocket['corner'])
+        self.assertNotIn('centre', pocket)
+
+    def test_options_round_trip(self):
+        options = Options(tool=ToolOptions(tool_diameter=3, finishing_pass=0.5, finishing_climb=False))
+        options.job.rapid_rate = 2000
+        options.output.position_precision = 4
+
+        loaded = Options.from_dict(from_binary(to_binary(options.to_dict())))
+
+        self.assertEqual(options.to_json(), loaded.to_json())
+        self.assertEqual(repr(options), repr(loaded))
+
+    def test_job_round_trip(self):
+        generator = GcodeGenerator(Options())
+        for operation in self.operations:
+            generator.add_operation(operation)
+
+        loaded = GcodeGenerator.from_dict(from_binary(to_binary(generator.to_dict())))
+
+        self.assertEqual(generator.generate(), loaded.generate())
+        self.assertEqual(digest(generator.to_dict()), digest(loaded.to_dict()))
+
+    def test_digest(self):
+        data = operation_to_dict(self.operations[0])
+        self.assertEqual(digest(data), digest(dict(data)))
+        data['height'] = 5
+        self.assertNotEqual(digest(operation_to_dict(self.operations[0])), digest(data))
+
+    def test_binary_values(self):
+        data = {
+            'integers': [0, 127, 128, 255, 65536, 2 ** 40, -1, -32, -33, -129, -32769, -2 ** 40],
+            'floats': [0.5, -1e-9, 1e300],
+            'constants': [None, True, False],
+            'text': ['', 'a' * 31, 'b' * 32, 'c' * 256, 'é' * 70000],
+            'nested': {str(index): list(range(index)) for index in range(20)}
+        }
+        self.assertEqual(data, from_binary(to_binary(data)))
+
+    def test_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            operation_from_dict({'type': 'Lathe'})
@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.gcodes.GCodes import G0, G1
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+from conversational_gcode.stock.StockSimulation import StockSimulation
+
+
+class TestStockSimulation(TestCase):
+
+    def setUp(self):
+        self.system_under_test = StockSimulation((-20, -20, 20, 20), 0.25)
+
+    def test_sweep(self):
+        removed, depth, width = self.system_under_test.sweep([-10, 0, -2], [10, 0, -2], 3)
+
+        self.assertEqual(2, depth)
+        self.assertEqual(6, width)
+        # A 20mm slot with rounded ends
+        self.assertAlmostEqual(2 * (20 * 6 + 3.14159 * 9), removed, delta=5)
+        self.assertEqual(-2, self.system_under_test.height_near([0, 2.5]))
+        self.assertEqual(0, self.system_under_test.height_near([0, 3.5]))
+        self.assertEqual((0, 0, 0), self.system_under_test.sweep([-10, 0, -2], [10, 0, -2], 3))
+
+    def test_ramp(self):
+        removed, depth, _ = self.system_under_test.sweep([-10, 0, 0], [10, 0, -2], 1)
+
+        self.assertAlmostEqual(2, depth, delta=0.2)
+        # The tool reaches its lowest over the point when its far edge leaves it
+        self.assertAlmostEqual(-1.11, self.system_under_test.height_near([0.1, 0.1]), delta=0.01)
+
+    def test_radial_width(self):
+        self.system_under_test.sweep([-10, 0, -2], [10, 0, -2], 3)
+
+        self.assertAlmostEqual(1, self.system_under_test.sweep([-10, 1, -2], [10, 1, -2], 3)[2], delta=0.25)
+        self.assertEqual(6, self.system_under_test.sweep([0, 0, 0], [0, 0, -3], 3)[2])
+
+
+class TestVerifyCommands(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+
+    def test_circular_pocket(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=20, depth=3))
+        commands = self.gcode_generator.generate()
+
+        report = self.gcode_generator.verify(commands, cell_size=0.5)
+
+        self.assertTrue(report.success)
+        self.assertEqual(0, len(report.rapid_cuts))
+        self.assertEqual(len([command for command in commands if isinstance(command, G0)]), len(report.segments))
+        self.assertLessEqual(max(segment.depth for segment in report.segments), self.options.tool.max_stepdown)
+        self.assertLessEqual(max(segment.width for segment in report.segments), self.options.tool.tool_diameter)
+        self.assertAlmostEqual(3.14159 * 100 * 3, sum(segment.removed for segment in report.segments), delta=30)
+
+    def test_rectangular_pocket(self):
+        self.gcode_generator.add_operation(RectangularPocket(width=30, length=20, depth=3))
+
+        self.assertTrue(self.gcode_generator.verify(self.gcode_generator.generate(), cell_size=0.5).success)
+
+    def test_leftover(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=20, depth=3))
+        commands = self.gcode_generator.generate()
+        # Stop after the first pass
+        last_pass = max(index for index, command in enumerate(commands) if command.comment is not None and 'pass' in command.comment)
+
+        report = self.gcode_generator.verify(commands[:last_pass], cell_size=0.5)
+
+        self.assertFalse(report.success)
+        self.assertEqual(0, len(report.gouges))
+        self.assertLess(0, len(report.leftovers))
+
+    def test_gouge(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=20, depth=3))
+        commands = self.gcode_generator.generate()
+        commands.insert(-4, G1(x=15, y=0, f=100))
+
+        report = self.gcode_generator.verify(commands, cell_size=0.5)
+
+        self.assertFalse(report.success)
+        self.assertLess(0, len(report.gouges))
+        self.assertTrue(all(gouge.point[0] > 9 for gouge in report.gouges))
+
+    def test_rapid_cut(self):
+        self.gcode_generator.add_operation(CircularPocket(diameter=20, depth=3))
+        commands = self.gcode_generator.generate()
+        commands.insert(-4, G0(x=15, y=0))
+
+        report = self.gcode_generator.verify(commands, cell_size=0.5)
+
+        self.assertEqual(1, len(report.rapid_cuts))
+        self.assertIs(commands[-5], report.rapid_cuts[0].command)
@@ -0,0 +1,71 @@
+from hashlib import blake2b
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.gcodes.GCodes import GCode, CommentBlock, G0, G1
+from conversational_gcode.gcodes.StreamDigest import StreamDigest, command_digest
+from conversational_gcode.gcodes.parsing import parse_gcode
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+
+
+class TestStreamDigest(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(RectangularPocket(width=20, length=30, depth=4))
+
+    def test_command_digest(self):
+        self.assertEqual(command_digest(G0(x=1), self.options), command_digest(G0(x=1.0001), self.options))
+        self.assertNotEqual(command_digest(G0(x=1), self.options), command_digest(G1(x=1, f=100), self.options))
+        self.assertNotEqual(command_digest(G0(x=1, comment='A'), self.options), command_digest(G0(x=1), self.options))
+        self.assertEqual(
+            command_digest(G0(x=1, comment='A'), self.options, ignore_comments=True),
+            command_digest(G0(x=1), self.options, ignore_comments=True)
+        )
+
+    def test_matches_text(self):
+        text = ''.join(self.gcode_generator.stream_text())
+
+        self.assertEqual(blake2b(text.encode()).hexdigest(), self.gcode_generator.digest())
+
+        stream_digest = StreamDigest(self.options)
+        for _ in stream_digest.watch(parse_gcode(text)):
+            pass
+        self.assertEqual(self.gcode_generator.digest(), stream_digest.hexdigest())
+        self.assertEqual(text.count('\n'), stream_digest.command_count)
+
+    def test_matches_parsed_text_ignoring_comments(self):
+        text = ''.join(self.gcode_generator.stream_text())
+
+        stream_digest = StreamDigest(self.options, ignore_comments=True)
+        for _ in stream_digest.watch(parse_gcode(text)):
+            pass
+
+        self.assertEqual(self.gcode_generator.digest(ignore_comments=True), stream_digest.hexdigest())
+
+    def test_incremental(self):
+        stream_digest = StreamDigest(self.options)
+        commands = self.gcode_generator.generate()
+        for command in commands[:10]:
+            stream_digest.update(command)
+        partial = stream_digest.hexdigest()
+        for command in commands[10:]:
+            stream_digest.update(command)
+
+        self.assertNotEqual(partial, stream_digest.hexdigest())
+        self.assertEqual(self.gcode_generator.digest(), stream_digest.hexdigest())
+
+    def test_ignore_comments(self):
+        commented = [CommentBlock('Header\nlines'), G0(x=1, comment='Move'), GCode('Pass'), G1(x=2, f=100)]
+        plain = [CommentBlock('Other'), G0(x=1), GCode('Other pass'), G1(x=2, f=100)]
+
+        digests = []
+        for commands in (commented, plain):
+            stream_digest = StreamDigest(self.options, ignore_comments=True)
+            list(stream_digest.watch(commands))
+            digests.append(stream_digest.hexdigest())
+
+        self.assertEqual(digests[0], digests[1])
+        self.assertNotEqual(self.gcode_generator.digest(), self.gcode_generator.digest(ignore_comments=True))
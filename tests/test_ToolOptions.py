@@ -1,5 +1,6 @@
 from validation_asserter import ValidationAsserter
 from conversational_gcode.options.ToolOptions import ToolOptions
+from conversational_gcode.gcodes.GCodes import PLUNGE, HELIX, ROUGHING, FINISHING, LINK, DISENGAGE
 
 
 class TestToolOptions(ValidationAsserter):
@@ -13,6 +14,10 @@ class TestToolOptions(ValidationAsserter):
 
         self.assertEqual(1000, self.system_under_test.spindle_speed)
         self.assertEqual(100, self.system_under_test.feed_rate)
+        self.assertEqual(100, self.system_under_test.min_feed_rate)
+        self.assertEqual(100, self.system_under_test.max_feed_rate)
+        self.assertEqual(100, self.system_under_test.plunge_feed_rate)
+        self.assertEqual(100, self.system_under_test.link_feed_rate)
 
         self.assertEqual(2, self.system_under_test.max_stepover)
         self.assertEqual(3, self.system_under_test.max_stepdown)
@@ -120,6 +125,47 @@ class TestToolOptions(ValidationAsserter):
         self.system_under_test.helix_feed_rate = None
         self.assertSuccess(self.system_under_test)
 
+    def test_validation_feed_rate_limits(self):
+        self.system_under_test.min_feed_rate = 0
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.min_feed_rate = 50
+        self.system_under_test.max_feed_rate = -1
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.max_feed_rate = 40
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.max_feed_rate = 200
+        self.assertSuccess(self.system_under_test)
+
+        self.system_under_test.min_feed_rate = None
+        self.system_under_test.max_feed_rate = None
+        self.assertSuccess(self.system_under_test)
+
+    def test_validation_move_feed_rates(self):
+        self.system_under_test.plunge_feed_rate = 0
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.plunge_feed_rate = 50
+        self.system_under_test.link_feed_rate = -1
+        self.assertFailure(self.system_under_test)
+
+        self.system_under_test.link_feed_rate = 500
+        self.assertSuccess(self.system_under_test)
+
+    def test_feed_rate_for(self):
+        system_under_test = ToolOptions(feed_rate=100, plunge_feed_rate=30, helix_feed_rate=60, finishing_feed_rate=80,
+                                        link_feed_rate=400)
+
+        self.assertEqual(30, system_under_test.feed_rate_for(PLUNGE))
+        self.assertEqual(60, system_under_test.feed_rate_for(HELIX))
+        self.assertEqual(100, system_under_test.feed_rate_for(ROUGHING))
+        self.assertEqual(80, system_under_test.feed_rate_for(FINISHING))
+        self.assertEqual(400, system_under_test.feed_rate_for(LINK))
+        self.assertEqual(400, system_under_test.feed_rate_for(DISENGAGE))
+        self.assertEqual(100, system_under_test.feed_rate_for(None))
+
     def test_validation_max_helix_angle(self):
         self.system_under_test.max_helix_angle = 0
         self.assertFailure(self.system_under_test)
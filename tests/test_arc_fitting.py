@@ -0,0 +1,74 @@
+from itertools import count
+from math import cos, sin, pi
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.estimate.Estimate import measure_commands
+from conversational_gcode.gcodes.GCodes import G0, G1, G2, G3, ROUGHING
+from conversational_gcode.operations.profile.RectangularProfile import RectangularProfile
+from conversational_gcode.options.Options import Options
+from conversational_gcode.postprocess.arc_fitting import fit_arcs
+
+
+class TestFitArcs(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def test_merge_collinear(self):
+        commands = [G1(x=1, f=100), G1(x=2, f=100), G1(x=3, f=100), G1(x=3, y=4, f=100)]
+
+        self.assertEqual([G1(x=3, y=0, f=100), G1(x=3, y=4, f=100)], list(fit_arcs(commands, self.options)))
+
+    def test_fit_arc(self):
+        commands = [G0(x=10, y=0, z=-1)] + [
+            G1(x=10 * cos(step * pi / 36), y=10 * sin(step * pi / 36), f=100, move=ROUGHING) for step in range(1, 37)
+        ]
+
+        fitted = list(fit_arcs(commands, self.options, tolerance=0.05))
+
+        self.assertEqual(2, len(fitted))
+        self.assertIsInstance(fitted[1], G3)
+        self.assertAlmostEqual(-10, fitted[1].x)
+        self.assertAlmostEqual(0, fitted[1].y)
+        self.assertAlmostEqual(-10, fitted[1].i)
+        self.assertAlmostEqual(0, fitted[1].j)
+        self.assertEqual(ROUGHING, fitted[1].move)
+
+    def test_clockwise_arc(self):
+        commands = [G1(x=10 - 10 * cos(step * pi / 36), y=10 * sin(step * pi / 36), f=100) for step in range(1, 19)]
+
+        fitted = list(fit_arcs(commands, self.options, tolerance=0.05))
+
+        self.assertEqual(1, len(fitted))
+        self.assertIsInstance(fitted[0], G2)
+        self.assertAlmostEqual(10, fitted[0].i)
+
+    def test_coarse_polyline_kept(self):
+        commands = [G1(x=10 - 10 * cos(step * pi / 18), y=10 * sin(step * pi / 18), f=100) for step in range(1, 10)]
+
+        self.assertEqual(commands, list(fit_arcs(commands, self.options)))
+
+    def test_corners_kept(self):
+        commands = [G1(x=10, f=100), G1(y=10, f=100), G1(x=0, f=100), G1(y=0, f=100)]
+
+        self.assertEqual(commands, list(fit_arcs(commands, self.options)))
+
+    def test_runs_broken(self):
+        commands = [G1(x=1, f=100), G1(x=2, f=200), G1(x=3, f=200, comment='Keep'), G1(x=4, f=200)]
+
+        self.assertEqual(commands, list(fit_arcs(commands, self.options)))
+
+    def test_streaming(self):
+        commands = (G1(x=step, f=100) for step in count(1))
+
+        self.assertEqual(G1(x=64, y=0, f=100), next(fit_arcs(commands, self.options)))
+
+    def test_generated_toolpath_unchanged(self):
+        gcode_generator = GcodeGenerator(self.options)
+        gcode_generator.add_operation(RectangularProfile(width=20, length=30, depth=4))
+
+        fitted = list(fit_arcs(gcode_generator.stream(), self.options))
+
+        measured = measure_commands(gcode_generator.generate(), self.options, [0, 0, 0])
+        self.assertAlmostEqual(measured.feed_length, measure_commands(fitted, self.options, [0, 0, 0]).feed_length)
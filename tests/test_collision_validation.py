@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.boss.CircularBoss import CircularBoss
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.operations.profile.RectangularProfile import RectangularProfile
+from conversational_gcode.options.Options import Options
+from conversational_gcode.validate.collision_validation import validate_collisions
+
+
+class TestCollisionValidation(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def assertMessages(self, operations: list, expected: list[str]):
+        results = validate_collisions(operations, self.options)
+        if len(expected) == 0:
+            self.assertEqual(1, len(results))
+            self.assertTrue(results[0].success)
+            return
+
+        self.assertEqual(len(expected), len(results))
+        for result, message in zip(results, expected):
+            self.assertFalse(result.success)
+            self.assertIn(message, result.message)
+
+    def test_separate_operations(self):
+        self.assertMessages([
+            CircularPocket(centre=[0, 0], diameter=20, depth=2),
+            RectangularPocket(centre=[30, 0], width=20, length=20, depth=2),
+            Drill(centres=[[0, 30], [10, 30]], depth=2)
+        ], [])
+
+    def test_overlapping_pockets(self):
+        self.assertMessages([
+            CircularPocket(centre=[0, 0], diameter=20, depth=2),
+            RectangularPocket(centre=[15, 0], width=20, length=20, depth=2)
+        ], ['CircularPocket(diameter=20, centre=[0, 0]'])
+
+    def test_pockets_at_different_depths(self):
+        self.assertMessages([
+            CircularPocket(centre=[0, 0], diameter=20, depth=2),
+            CircularPocket(centre=[0, 0], start_depth=-2, diameter=10, depth=2)
+        ], [])
+
+    def test_drill_inside_pocket(self):
+        self.assertMessages([
+            CircularPocket(centre=[0, 0], diameter=20, depth=2),
+            Drill(centres=[[30, 0], [5, 0]], depth=4)
+        ], ['Drill hole at [5, 0]'])
+
+    def test_overlapping_drill_holes(self):
+        self.assertMessages([Drill(centres=[[0, 0], [3, 0], [20, 0]], depth=4)], ['Drill holes at [0, 0] and [3, 0]'])
+
+    def test_boss_intersecting_pocket(self):
+        self.assertMessages([
+            CircularBoss(centre=[0, 0], initial_diameter=20, final_diameter=10, height=5),
+            RectangularPocket(centre=[20, 0], width=10, length=10, depth=2)
+        ], ['CircularBoss('])
+
+    def test_drill_inside_boss_centre(self):
+        self.assertMessages([
+            CircularBoss(centre=[0, 0], initial_diameter=30, final_diameter=20, height=5),
+            Drill(centres=[[0, 0]], depth=8)
+        ], [])
+
+    def test_pocket_inside_outer_profile(self):
+        self.assertMessages([
+            RectangularProfile(centre=[0, 0], width=40, length=40, depth=5, is_inner=False),
+            CircularPocket(centre=[0, 0], diameter=20, depth=2)
+        ], [])
+
+    def test_pocket_crossing_outer_profile(self):
+        self.assertMessages([
+            RectangularProfile(centre=[0, 0], width=40, length=40, depth=5, is_inner=False),
+            CircularPocket(centre=[18, 0], diameter=20, depth=2)
+        ], ['overlaps'])
+
+    def test_rapid_through_material(self):
+        self.assertMessages([
+            CircularPocket(centre=[-20, 0], diameter=10, depth=2),
+            CircularPocket(centre=[0, 0], start_depth=12, diameter=10, depth=2),
+            CircularPocket(centre=[20, 0], diameter=10, depth=2)
+        ], ['Rapid from [0, 0] to [-20, 0]', 'to [20, 0]'])
+
+    def test_many_operations(self):
+        centres = [[x * 10, y * 10] for x in range(100) for y in range(50)]
+        self.assertMessages([Drill(centres=centres, depth=2)], [])
+
+    def test_generator(self):
+        generator = GcodeGenerator(self.options)
+        generator.add_operation(CircularPocket(centre=[0, 0], diameter=20, depth=2))
+        generator.add_operation(Drill(centres=[[5, 0]], depth=4))
+
+        self.assertTrue(generator.validate()[0].success)
+        self.assertFalse(generator.validate(collisions=True)[0].success)
+        self.assertIn('Drill hole at [5, 0]', generator.generate(collisions=True)[0])
@@ -0,0 +1,125 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.estimate.Estimate import measure_commands
+from conversational_gcode.gcodes.GCodes import *
+from conversational_gcode.gcodes.diffing import diff_programs, CHANGED, ADDED, REMOVED, MOVED
+from conversational_gcode.gcodes.parsing import parse_gcode
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+
+
+def _pass(heading: str, y: float) -> list[GCode]:
+    return [GCode(heading), G0(x=0, y=y), G1(x=10, y=y, f=100), G1(x=10, y=y + 1, f=100)]
+
+
+class TestDiffPrograms(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def _generator(self, options: Options) -> GcodeGenerator:
+        gcode_generator = GcodeGenerator(options)
+        gcode_generator.add_operation(RectangularPocket(width=20, length=30, depth=4))
+        return gcode_generator
+
+    def test_identical(self):
+        gcode_generator = self._generator(self.options)
+
+        diff = diff_programs(gcode_generator.stream(), parse_gcode(''.join(gcode_generator.stream_text())), self.options)
+
+        self.assertTrue(diff.identical)
+        self.assertEqual([], diff.changes)
+        self.assertAlmostEqual(0, diff.cycle_time_delta, places=2)
+        measured = measure_commands(gcode_generator.generate(), self.options)
+        self.assertEqual(measured.command_count, diff.old.command_count)
+        self.assertAlmostEqual(measured.cycle_time, diff.old.cycle_time)
+
+    def test_within_tolerance(self):
+        old = _pass('First pass', 0)
+        new = _pass('First pass', 0.0004)
+
+        self.assertTrue(diff_programs(old, new, self.options).identical)
+        self.assertFalse(diff_programs(old, new, self.options, tolerance=0.0001).identical)
+
+    def test_changed_command(self):
+        old = [*_pass('First pass', 0), *_pass('Second pass', 2)]
+        new = [*_pass('First pass', 0), *_pass('Second pass', 2.5)]
+
+        diff = diff_programs(old, new, self.options, position=[0, 0, 0])
+
+        self.assertEqual((6, 6, 'G0 X0.000 Y2.000; became G0 X0.000 Y2.500;'), diff.first_divergence)
+        self.assertEqual(1, len(diff.changes))
+        self.assertEqual(CHANGED, diff.changes[0].kind)
+        self.assertEqual('Second pass', diff.changes[0].heading)
+        self.assertGreater(diff.cycle_time_delta, 0)
+
+    def test_stepover(self):
+        options = Options()
+        options.tool.max_stepover = 1.5
+
+        diff = diff_programs(self._generator(self.options).stream(), self._generator(options).stream(), self.options)
+
+        self.assertEqual(7, diff.first_divergence[0])
+        self.assertIn('"max_stepover": 1.5', diff.first_divergence[2])
+        self.assertTrue(all(change.kind == CHANGED for change in diff.changes))
+        self.assertIn('Clear centre in 1.429mm passes', [change.heading for change in diff.changes])
+        self.assertGreater(diff.cycle_time_delta, 0)
+
+    def test_changed_heading(self):
+        old = _pass('Clear nearest corners', 0)
+        new = _pass('Drill holes', 0)
+
+        diff = diff_programs(old, new, self.options)
+
+        self.assertEqual((1, 1, "'Clear nearest corners' became 'Drill holes'"), diff.first_divergence)
+        self.assertEqual([CHANGED], [change.kind for change in diff.changes])
+
+    def test_added_and_removed(self):
+        old = [*_pass('First pass', 0), *_pass('Second pass', 2), *_pass('Third pass', 4)]
+        new = [*_pass('First pass', 0), *_pass('Extra pass', 1), *_pass('Second pass', 2)]
+
+        diff = diff_programs(old, new, self.options)
+
+        self.assertEqual((None, 5, "'Extra pass' was added"), diff.first_divergence)
+        self.assertEqual(
+            [(ADDED, 'Extra pass', None, 5), (REMOVED, 'Third pass', 9, None)],
+            [(change.kind, change.heading, change.old_line, change.new_line) for change in diff.changes]
+        )
+
+    def test_moved(self):
+        old = [*_pass('First pass', 0), *_pass('Second pass', 2), *_pass('Third pass', 4)]
+        new = [*_pass('Second pass', 2), *_pass('Third pass', 4), *_pass('First pass', 0)]
+
+        diff = diff_programs(old, new, self.options)
+
+        self.assertEqual(
+            [(MOVED, 'First pass', 1, 9)],
+            [(change.kind, change.heading, change.old_line, change.new_line) for change in diff.changes]
+        )
+
+    def test_window(self):
+        old = [*_pass('First pass', 0), *_pass('Second pass', 2)]
+        new = [*_pass('Extra pass', 1), *_pass('Extra pass', 1), *_pass('First pass', 0), *_pass('Second pass', 2)]
+
+        self.assertEqual(
+            [ADDED, ADDED],
+            [change.kind for change in diff_programs(old, new, self.options, window=3).changes]
+        )
+        self.assertEqual(
+            [CHANGED, CHANGED, ADDED, ADDED],
+            [change.kind for change in diff_programs(old, new, self.options, window=2).changes]
+        )
+
+    def test_moved_outside_window(self):
+        old = [
+            *_pass('F pass', 0), *_pass('G pass', 1), *_pass('S pass', 2),
+            *_pass('H pass', 3), *_pass('K pass', 4), *_pass('T pass', 5)
+        ]
+        new = [*_pass('S pass', 2), *_pass('T pass', 5), *_pass('X pass', 6), *_pass('F pass', 0)]
+
+        self.assertEqual(
+            [(REMOVED, 'F pass'), (REMOVED, 'G pass'), (REMOVED, 'H pass'), (REMOVED, 'K pass'), (ADDED, 'X pass'),
+             (ADDED, 'F pass')],
+            [(change.kind, change.heading) for change in diff_programs(old, new, self.options, window=3).changes]
+        )
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.estimate.Estimate import measure_commands
+from conversational_gcode.gcodes.GCodes import G1, G81, LINK
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+from conversational_gcode.options.ToolOptions import ToolOptions
+
+
+class TestOptimiseFeedRates(TestCase):
+
+    def setUp(self):
+        self.options = Options(tool=ToolOptions(min_feed_rate=50, max_feed_rate=200))
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(RectangularPocket(width=30, length=20, depth=3))
+        self.gcode_generator.add_operation(Drill(centres=[[30, 0]], depth=3))
+        self.commands = self.gcode_generator.generate()
+
+    def test_default_limits(self):
+        gcode_generator = GcodeGenerator(Options())
+        gcode_generator.add_operation(RectangularPocket(width=30, length=20, depth=3))
+        commands = gcode_generator.generate()
+
+        optimised = gcode_generator.optimise_feed_rates(commands)
+
+        self.assertTrue(all(command.f <= 100 for command in optimised if isinstance(command, G1)))
+
+    def test_within_limits(self):
+        optimised = self.gcode_generator.optimise_feed_rates(self.commands, cell_size=0.5)
+
+        feed_rates = [command.f for command in optimised if isinstance(command, G1)]
+        self.assertTrue(all(50 <= feed_rate <= 200 for feed_rate in feed_rates))
+        self.assertIn(200, feed_rates)
+        self.assertTrue(any(feed_rate < 100 for feed_rate in feed_rates))
+
+    def test_shorter_cycle_time(self):
+        optimised = self.gcode_generator.optimise_feed_rates(self.commands, cell_size=0.5)
+
+        self.assertLess(
+            measure_commands(optimised, self.options, [0, 0, 0]).cycle_time,
+            measure_commands(self.commands, self.options, [0, 0, 0]).cycle_time
+        )
+
+    def test_toolpath_unchanged(self):
+        optimised = self.gcode_generator.optimise_feed_rates(self.commands, cell_size=0.5)
+
+        self.assertEqual(len(self.commands), len(optimised))
+        for command, optimised_command in zip(self.commands, optimised):
+            if not isinstance(command, G1):
+                self.assertIs(command, optimised_command)
+            elif isinstance(command, G81) or (command.x is None and command.y is None):
+                self.assertIs(command, optimised_command)
+            else:
+                self.assertEqual([command.x, command.y, command.z], [optimised_command.x, optimised_command.y, optimised_command.z])
+
+    def test_links_at_link_feed_rate(self):
+        self.options.tool.link_feed_rate = 500
+        optimised = self.gcode_generator.optimise_feed_rates(self.commands, cell_size=0.5)
+
+        links = [command for command in optimised if isinstance(command, G1) and command.move == LINK]
+        self.assertGreater(len(links), 0)
+        self.assertTrue(all(command.f == 500 for command in links))
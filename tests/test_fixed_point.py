@@ -0,0 +1,37 @@
+from random import Random
+from unittest import TestCase
+
+from conversational_gcode.gcodes.fixed_point import to_units, from_units
+
+
+class TestFixedPoint(TestCase):
+
+    def test_units(self):
+        # 1.2345 is held as slightly less than 1.2345, so prints as 1.234
+        self.assertEqual(1234, to_units(1.2345, 3))
+        self.assertEqual(-18224, to_units(-18.2235, 3))
+        self.assertEqual(0, to_units(-0.0001, 3))
+        self.assertEqual(12, to_units(12.4, 0))
+        self.assertIsNone(to_units(None, 3))
+        self.assertEqual(-18.224, from_units(-18224, 3))
+        self.assertIsNone(from_units(None, 3))
+
+    def test_matches_float_formatting(self):
+        random = Random(0)
+        for precision in range(5):
+            for _ in range(2000):
+                value = round(random.uniform(-500, 500), random.randint(0, 7))
+                units = to_units(value, precision)
+                printed = f'{value:.{precision}f}'
+                with self.subTest(value=value, precision=precision):
+                    # Values which round to zero are printed without the sign of a negative zero
+                    self.assertEqual(printed.lstrip('-') if units == 0 else printed, f'{from_units(units, precision):.{precision}f}')
+
+    def test_exact_sums(self):
+        step = to_units(0.1, 3)
+        position = 0
+        for _ in range(1000):
+            position += step
+
+        self.assertEqual(100000, position)
+        self.assertEqual('100.000', f'{from_units(position, 3):.3f}')
@@ -0,0 +1,103 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.feeds.FeedsAndSpeeds import chip_thinning_factor
+from conversational_gcode.feeds.Material import Material
+from conversational_gcode.feeds.parameter_search import candidate_parameters, search_parameters
+from conversational_gcode.operations.boss.CircularBoss import CircularBoss
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.options.Options import Options
+
+
+class TestCandidateParameters(TestCase):
+
+    def test_grid(self):
+        options = Options()
+
+        candidates = candidate_parameters(options.tool, max_engagement=0.4, max_stepdown=5, steps=4, helix_steps=3)
+
+        self.assertEqual(4 * 4 * 3, len(candidates))
+        self.assertEqual((0.6, 0.5, 0.6), tuple(round(value, 6) for value in candidates[0]))
+        self.assertEqual((2.4, 5, 3), tuple(round(value, 6) for value in candidates[-1]))
+
+
+class TestSearchParameters(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.tool.feed_rate = 1000
+        self.options.tool.spindle_speed = 12000
+        self.operations = [
+            CircularPocket(diameter=40, depth=10),
+            CircularBoss(initial_diameter=60, final_diameter=30, height=8, centre=[100, 0])
+        ]
+        self.material = Material('test', surface_speed=300, chip_load=0.004, specific_energy=0.7, max_stepdown=1)
+
+    def test_cycle_time_reduced(self):
+        revision = self.options.tool.revision
+
+        search = search_parameters(self.operations, self.options)
+
+        self.assertEqual(revision, self.options.tool.revision)
+        self.assertEqual(500, search.candidate_count)
+        self.assertLess(search.cycle_time, search.initial_cycle_time)
+        self.assertGreater(search.time_saved, 0)
+
+        search.apply(self.options.tool)
+
+        self.assertTrue(self.options.tool.validate()[0].success)
+        estimated = sum(operation.estimate(self.options).cycle_time for operation in self.operations)
+        self.assertAlmostEqual(search.cycle_time, estimated)
+
+    def test_chip_load_limit(self):
+        material = Material('test', surface_speed=300, chip_load=0.003, specific_energy=0.7, max_stepdown=1)
+
+        search = search_parameters(self.operations, self.options, material=material)
+
+        # Only light stepovers thin the chip enough for the feed per tooth
+        self.assertLess(search.candidate_count, 500)
+        self.assertGreater(search.candidate_count, 0)
+        feed_per_tooth = 1000 / (4 * 12000)
+        chip_thickness = feed_per_tooth / chip_thinning_factor(search.max_stepover, 6)
+        self.assertLessEqual(chip_thickness, 0.003 * 6 + 1e-9)
+        self.assertLess(search.max_stepover, 3)
+
+    def test_power_limit(self):
+        search = search_parameters(self.operations, self.options, material=self.material, max_power=20)
+
+        self.assertLessEqual(search.max_stepover * search.max_stepdown * 1000 * 0.7 / 60, 20 + 1e-9)
+
+    def test_no_candidates(self):
+        search = search_parameters(self.operations, self.options, material=self.material, max_power=0.001)
+
+        self.assertEqual(0, search.candidate_count)
+        self.assertEqual(self.options.tool.max_stepover, search.max_stepover)
+        self.assertEqual(search.initial_cycle_time, search.cycle_time)
+
+    def test_process_pool(self):
+        self.assertEqual(
+            search_parameters(self.operations, self.options, steps=4, helix_steps=2),
+            search_parameters(self.operations, self.options, steps=4, helix_steps=2, workers=2)
+        )
+
+
+class TestGeneratorSearchParameters(TestCase):
+
+    def test_search(self):
+        options = Options()
+        gcode_generator = GcodeGenerator(options)
+        gcode_generator.add_operation(CircularPocket(diameter=40, depth=10))
+
+        search = gcode_generator.search_parameters()
+        initial = gcode_generator.estimate().cycle_time
+        search.apply(options.tool)
+
+        self.assertAlmostEqual(initial - search.time_saved, gcode_generator.estimate().cycle_time)
+
+    def test_invalid(self):
+        options = Options()
+        options.tool.feed_rate = -1
+        gcode_generator = GcodeGenerator(options)
+        gcode_generator.add_operation(CircularPocket(diameter=40, depth=10))
+
+        self.assertEqual(['Feed rate must be positive'], gcode_generator.search_parameters())
@@ -0,0 +1,92 @@
+from glob import glob
+from mmap import mmap, ACCESS_READ
+from os.path import join, dirname
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.gcodes.GCodes import *
+from conversational_gcode.gcodes.parsing import parse_gcode, parse_file
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.options.Options import Options
+
+
+class TestParseGcode(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def test_commands(self):
+        text = '\n'.join([
+            ';',
+            '; Comment',
+            'M3 S1000.0; Start spindle',
+            'G0 Z10.000; Clear tool',
+            'G1 X1.000 Y-2.500 F100.00;',
+            'G2 X3.000 Y4.000 I-1.000 J0.000 F90.00;',
+            'G3 X3.000 Y4.000 Z-1.000 I1.000 F90.00;',
+            'G83 X0.000 Y0.000 Z-5.000 R0.250 Q1.000 P500 F100.00; Start drilling cycle',
+            'X10.000 Y5.000;',
+            'G80; End drilling cycle',
+            'M5; Stop spindle',
+            'M2; End program'
+        ])
+
+        self.assertEqual(
+            [
+                GCode(),
+                GCode('Comment'),
+                M3(s=1000, comment='Start spindle'),
+                G0(z=10, comment='Clear tool'),
+                G1(x=1, y=-2.5, f=100),
+                G2(x=3, y=4, i=-1, j=0, f=90),
+                G3(x=3, y=4, z=-1, i=1, f=90),
+                G83(x=0, y=0, z=-5, r=0.25, q=1, p=500, f=100, comment='Start drilling cycle'),
+                CyclePosition(x=10, y=5),
+                G80(comment='End drilling cycle'),
+                M5(comment='Stop spindle'),
+                M2(comment='End program')
+            ],
+            list(parse_gcode(text))
+        )
+
+    def test_round_trip_references(self):
+        paths = glob(join(dirname(__file__), 'resources', 'e2e', '*', '*.nc'))
+        self.assertGreater(len(paths), 0)
+
+        for path in paths:
+            with open(path) as file:
+                text = file.read()
+            with self.subTest(path=path):
+                self.assertEqual(text, '\n'.join(command.format(self.options.output) for command in parse_gcode(text)))
+
+    def test_round_trip_generated(self):
+        gcode_generator = GcodeGenerator(self.options)
+        gcode_generator.add_operation(Drill(centres=[[0, 0], [10, 5]], depth=5, dwell=500))
+        text = ''.join(gcode_generator.stream_text())
+
+        self.assertEqual(text, ''.join(f'{command.format(self.options.output)}\n' for command in parse_gcode(text)))
+
+    def test_lines_and_bytes(self):
+        self.assertEqual(
+            [G0(x=1), G1(x=2, f=100)],
+            list(parse_gcode([b'G0 X1.000;\n', 'g1 x2.000 f100.00;\r\n']))
+        )
+
+    def test_file_and_mmap(self):
+        with TemporaryDirectory() as directory:
+            path = join(directory, 'job.nc')
+            with open(path, 'w') as file:
+                file.write('G0 X1.000;\nG1 X2.000 F100.00;\n')
+
+            self.assertEqual([G0(x=1), G1(x=2, f=100)], list(parse_file(path)))
+            with open(path, 'rb') as file, mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+                self.assertEqual([G0(x=1), G1(x=2, f=100)], list(parse_gcode(iter(mapped.readline, b''))))
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(ValueError, 'Line 2: Unsupported command G90'):
+            list(parse_gcode('G0 X1;\nG90;'))
+        with self.assertRaisesRegex(ValueError, 'Line 1: Unexpected word I1 in G1'):
+            list(parse_gcode('G1 X1 I1 F100;'))
+        with self.assertRaisesRegex(ValueError, 'Line 1: Invalid number in Xa'):
+            list(parse_gcode('G0 Xa;'))
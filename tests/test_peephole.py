@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.estimate.Estimate import measure_commands
+from conversational_gcode.gcodes.GCodes import *
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+from conversational_gcode.postprocess.peephole import (
+    optimise_peephole, PeepholeReport, BLANK_LINES, ZERO_LENGTH_FEEDS, REDUNDANT_RAPIDS, MERGED_RAPIDS
+)
+
+
+class TestOptimisePeephole(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def test_blank_lines(self):
+        report = PeepholeReport()
+        commands = [GCode(), GCode('Keep'), GCode(''), M5()]
+
+        self.assertEqual([GCode('Keep'), M5()], list(optimise_peephole(commands, self.options, report=report)))
+        self.assertEqual(2, report.rules[BLANK_LINES].lines)
+
+    def test_zero_length_feeds(self):
+        report = PeepholeReport()
+        commands = [
+            G1(x=1, f=100), G1(x=1.0001, y=0, f=100), G1(x=1, f=100, comment='Keep'), G2(x=1, i=-1, f=100)
+        ]
+
+        self.assertEqual(
+            [G1(x=1, f=100), G1(x=1, f=100, comment='Keep'), G2(x=1, i=-1, f=100)],
+            list(optimise_peephole(commands, self.options, report=report))
+        )
+        self.assertEqual(1, report.rules[ZERO_LENGTH_FEEDS].lines)
+        self.assertEqual(0, report.rules[ZERO_LENGTH_FEEDS].seconds)
+
+    def test_redundant_rapids(self):
+        report = PeepholeReport()
+        commands = [G0(z=5), G0(x=0, y=0), G0(x=2, y=2), G0(z=5, comment='Clear tool')]
+
+        self.assertEqual(
+            [G0(z=5), G0(x=2, y=2), G0(z=5, comment='Clear tool')],
+            list(optimise_peephole(commands, self.options, report=report))
+        )
+        self.assertEqual(1, report.rules[REDUNDANT_RAPIDS].lines)
+
+    def test_merged_rapids(self):
+        report = PeepholeReport()
+        commands = [G0(z=10), G0(z=-1.75), G0(z=-2), G1(x=5, f=100), G0(z=-1.75), G0(z=10, comment='Clear tool')]
+
+        self.assertEqual(
+            [G0(z=-2), G1(x=5, f=100), G0(z=10, comment='Clear tool')],
+            list(optimise_peephole(commands, self.options, report=report))
+        )
+        self.assertEqual(3, report.rules[MERGED_RAPIDS].lines)
+        self.assertAlmostEqual(60 * 20 / self.options.job.rapid_rate, report.rules[MERGED_RAPIDS].seconds)
+
+    def test_rules_configurable(self):
+        report = PeepholeReport()
+        commands = [GCode(), G0(z=1), G0(z=2), G0(z=2)]
+
+        self.assertEqual(
+            [GCode(), G0(z=1), G0(z=2)],
+            list(optimise_peephole(commands, self.options, rules=[REDUNDANT_RAPIDS], report=report))
+        )
+        self.assertEqual([REDUNDANT_RAPIDS], list(report.rules))
+        with self.assertRaisesRegex(ValueError, 'Unknown peephole rule other'):
+            list(optimise_peephole(commands, self.options, rules=['other']))
+
+    def test_cycles_unchanged(self):
+        commands = [G0(x=0, y=0), G81(x=0, y=0, z=-3, r=0.25, f=100), CyclePosition(x=0, y=0), G80(), G0(z=0.25)]
+
+        self.assertEqual(
+            [G0(x=0, y=0), G81(x=0, y=0, z=-3, r=0.25, f=100), CyclePosition(x=0, y=0), G80()],
+            list(optimise_peephole(commands, self.options, position=[5, 5, 10]))
+        )
+
+    def test_cycle_retracts_to_r_plane(self):
+        commands = [
+            G81(x=0, y=0, z=-3, r=0.25, f=100), CyclePosition(x=5, y=0, z=-4), G80(), G0(z=0.25), G0(x=5, y=0),
+            G1(x=6, f=100)
+        ]
+
+        self.assertEqual(
+            [G81(x=0, y=0, z=-3, r=0.25, f=100), CyclePosition(x=5, y=0, z=-4), G80(), G1(x=6, f=100)],
+            list(optimise_peephole(commands, self.options, position=[0, 0, 10]))
+        )
+
+    def test_generated_job(self):
+        gcode_generator = GcodeGenerator(self.options)
+        gcode_generator.add_operation(RectangularPocket(width=20, length=30, depth=5))
+        gcode_generator.add_operation(Drill(centres=[[0, 0], [5, 5]], depth=3))
+        commands = gcode_generator.generate()
+        report = PeepholeReport()
+
+        optimised = list(optimise_peephole(gcode_generator.stream(), self.options, report=report))
+
+        self.assertEqual(len(commands) - report.lines, len(optimised))
+        self.assertGreater(report.rules[BLANK_LINES].lines, 0)
+        measured = measure_commands(commands, self.options, [0, 0, 0])
+        optimised_measured = measure_commands(optimised, self.options, [0, 0, 0])
+        self.assertAlmostEqual(measured.feed_length, optimised_measured.feed_length)
+        self.assertAlmostEqual(measured.cycle_time - report.seconds, optimised_measured.cycle_time)
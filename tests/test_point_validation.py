@@ -0,0 +1,20 @@
+from unittest import TestCase
+
+from conversational_gcode.validate.point_validation import find_invalid_point
+
+
+class TestPointValidation(TestCase):
+
+    def test_valid_points(self):
+        self.assertIsNone(find_invalid_point([]))
+        self.assertIsNone(find_invalid_point([[0, 0], (1.5, -2), [10, 1e6]]))
+        self.assertIsNone(find_invalid_point([[x, x] for x in range(10000)]))
+
+    def test_invalid_points(self):
+        self.assertEqual(1, find_invalid_point([[0, 0], [1], [2, 2]]))
+        self.assertEqual(2, find_invalid_point([[0, 0], [1, 1], [2, 2, 2]]))
+        self.assertEqual(0, find_invalid_point([[None, 0]]))
+        self.assertEqual(1, find_invalid_point([[0, 0], ['1', 0]]))
+        self.assertEqual(1, find_invalid_point([[0, 0], [float('nan'), 0]]))
+        self.assertEqual(0, find_invalid_point([[float('inf'), 0]]))
+        self.assertEqual(1, find_invalid_point([[0, 0], 1]))
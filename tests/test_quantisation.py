@@ -0,0 +1,97 @@
+from math import hypot
+from unittest import TestCase
+
+from conversational_gcode.GcodeGenerator import GcodeGenerator
+from conversational_gcode.gcodes.GCodes import *
+from conversational_gcode.operations.Drill import Drill
+from conversational_gcode.operations.pocket.CircularPocket import CircularPocket
+from conversational_gcode.operations.pocket.RectangularPocket import RectangularPocket
+from conversational_gcode.options.Options import Options
+from conversational_gcode.postprocess.quantisation import quantise_commands
+
+
+class TestQuantiseCommands(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+
+    def test_rounded(self):
+        commands = [G0(x=1.00049, y=-0.0001), G1(z=-2.00051, f=100, comment='Cut')]
+
+        quantised = list(quantise_commands(commands, self.options))
+
+        self.assertEqual([G0(x=1, y=0), G1(z=-2.001, f=100, comment='Cut')], quantised)
+        self.assertEqual('G0 X1.000 Y0.000;', quantised[0].format(self.options.output))
+        self.assertEqual(G0(x=1.00049, y=-0.0001), commands[0])
+
+    def test_collapsed_moves_dropped(self):
+        commands = [G1(x=1, f=100), G1(x=1.0004, f=100), G0(x=0.9996), G0(x=1.0001, comment='Keep'), G1(x=1.0006, f=100)]
+
+        self.assertEqual(
+            [G1(x=1, f=100), G0(x=1, comment='Keep'), G1(x=1.001, f=100)],
+            list(quantise_commands(commands, self.options))
+        )
+
+    def test_arc_centre_kept(self):
+        # The first move collapses onto the start, and the second arc starts at a position which rounds up, so its
+        # offset to the centre is taken from the rounded start
+        commands = [G1(x=0.0004, y=0.0004, f=100), G2(x=2.0004, y=0.0004, i=1, f=100)]
+
+        quantised = list(quantise_commands(commands, self.options))
+
+        self.assertEqual([G2(x=2, y=0, i=1, f=100)], quantised)
+
+        commands = [G1(x=0.0006, y=0.0006, f=100), G2(x=2.0006, y=0.0006, i=1.0004, j=0.0004, f=100)]
+
+        arc = list(quantise_commands(commands, self.options))[1]
+
+        self.assertEqual(G2(x=2.001, y=0.001, i=1, j=0, f=100), arc)
+        start = [0.001, 0.001]
+        centre = [start[0] + arc.i, start[1] + arc.j]
+        self.assertAlmostEqual(hypot(start[0] - centre[0], start[1] - centre[1]), hypot(arc.x - centre[0], arc.y - centre[1]))
+
+    def test_full_circles_and_cycles_kept(self):
+        commands = [
+            G2(x=0, y=0, i=1, f=100),
+            G81(x=0.0001, y=0, z=-3.00049, r=0.25, f=100),
+            CyclePosition(x=0, y=0),
+            G80()
+        ]
+
+        self.assertEqual(
+            [G2(x=0, y=0, i=1, f=100), G81(x=0, y=0, z=-3, r=0.25, f=100), CyclePosition(x=0, y=0), G80()],
+            list(quantise_commands(commands, self.options))
+        )
+
+
+class TestGeneratorQuantisation(TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.gcode_generator = GcodeGenerator(self.options)
+        self.gcode_generator.add_operation(RectangularPocket(width=20.3337, length=30.1, depth=5.0001, centre=[1.00049, 2]))
+        self.gcode_generator.add_operation(CircularPocket(diameter=20.777, depth=3, centre=[50, 0]))
+        self.gcode_generator.add_operation(Drill(centres=[[0, 0], [5, 5]], depth=3))
+
+    def test_generated_quantised(self):
+        self.options.output.quantise_positions = True
+
+        commands = self.gcode_generator.generate()
+
+        self.assertEqual(commands, list(self.gcode_generator.stream()))
+        self.assertEqual(
+            ''.join(f'{command.format(self.options.output)}\n' for command in commands),
+            ''.join(self.gcode_generator.stream_text())
+        )
+        for command in commands:
+            if isinstance(command, G0):
+                for value in (command.x, command.y, command.z):
+                    if value is not None:
+                        self.assertEqual(round(value, 3), value)
+            self.assertNotIn('-0.000', command.format(self.options.output))
+
+    def test_moves_dropped(self):
+        generated = self.gcode_generator.generate()
+        self.options.output.quantise_positions = True
+
+        self.assertLess(len(self.gcode_generator.generate()), len(generated))
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from conversational_gcode.validate.validation_result import ValidationResult
+from conversational_gcode.validate.validation_result import ValidationResult, SUCCESS
 
 
 class TestJobOptions(TestCase):
@@ -23,3 +23,7 @@ class TestJobOptions(TestCase):
 
         self.assertFalse(system_under_test.success)
         self.assertEqual(message, system_under_test.message)
+
+    def test_shared_success(self):
+        self.assertTrue(SUCCESS.success)
+        self.assertEqual('Valid', SUCCESS.message)